@@ -0,0 +1,932 @@
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from tabulate import tabulate
+from task_binary import BinaryTaskManager, json_to_binary
+from task_manager import Task, TaskManager
+from task_parallel import ParallelEngine, ParallelJournalStorage
+from task_serializer import available_backends, get_serializer
+from task_server import TaskClient, TaskServer
+from task_shard import ShardedTaskManager
+from task_sqlite import SqliteTaskManager
+from task_store import TaskStore
+from task_storage import JournalStorage, JsonStorage, _read_snapshot, _write_snapshot
+
+CATEGORIES = ["Работа", "Личное", "Покупки", "Учеба", "Здоровье", "Дом", "Финансы", "Путешествия"]
+PRIORITIES = ["Низкий", "Средний", "Высокий"]
+STATUSES = ["Не выполнена", "Выполнена"]
+
+CATEGORY_WEIGHTS = [40, 20, 12, 10, 7, 6, 3, 2]
+PRIORITY_WEIGHTS = [30, 50, 20]
+TITLE_VERBS = [
+    "Подготовить", "Проверить", "Отправить", "Обсудить", "Купить", "Оплатить", "Записаться на", "Разобрать",
+    "Согласовать", "Позвонить по поводу", "Обновить", "Забронировать",
+]
+TITLE_OBJECTS = [
+    "отчет", "презентацию", "договор", "счет", "продукты", "подарок", "билеты", "документы", "план проекта",
+    "домашнее задание", "прием у врача", "квартальный бюджет", "резюме", "заявку", "почту", "гостиницу",
+]
+DESCRIPTION_DETAILS = [
+    "до конца недели", "вместе с командой", "по итогам встречи", "срочно", "не забыть взять документы",
+    "уточнить сумму", "после обеда", "в выходные", "с учетом замечаний", "ёмкость склада и сроки поставки",
+]
+SUITE_SIZES = [10, 10_000, 1_000_000]
+RESULTS_VERSION = 1
+
+
+def generate_realistic_tasks(count, seed=0, today=date(2025, 1, 1)):
+    """
+    Сгенерировать детерминированный набор задач, похожий на реальные данные (как example.json, но любого размера).
+
+    Названия и описания собираются из русских фраз, категории и приоритеты распределены неравномерно
+    (задач «Работа» в 20 раз больше, чем «Путешествия»), у части задач нет срока, а задачи с истекшим
+    сроком чаще выполнены. При одинаковых count и seed набор задач всегда одинаков.
+
+    :param count: Количество задач.
+    :param seed: Начальное значение генератора случайных чисел.
+    :param today: Дата, относительно которой задачи считаются просроченными.
+    :return: Генератор словарей задач.
+    """
+    rng = random.Random(seed)
+    start = today - timedelta(days=365)
+    category_weights = list(itertools.accumulate(CATEGORY_WEIGHTS))
+    priority_weights = list(itertools.accumulate(PRIORITY_WEIGHTS))
+    for task_id in range(1, count + 1):
+        due_date = None if rng.random() < 0.15 else start + timedelta(days=rng.randrange(545))
+        overdue = due_date is not None and due_date < today
+        details = rng.sample(DESCRIPTION_DETAILS, rng.randint(1, 3))
+        yield {
+            "id": task_id,
+            "title": f"{rng.choice(TITLE_VERBS)} {rng.choice(TITLE_OBJECTS)}",
+            "description": f"{rng.choice(TITLE_VERBS)} {rng.choice(TITLE_OBJECTS)} {', '.join(details)}.",
+            "category": rng.choices(CATEGORIES, cum_weights=category_weights)[0],
+            "due_date": due_date.isoformat() if due_date else "",
+            "priority": rng.choices(PRIORITIES, cum_weights=priority_weights)[0],
+            "status": STATUSES[rng.random() < (0.7 if overdue else 0.1)],
+        }
+
+
+def write_task_file(file_name, count, seed=0):
+    """
+    Записать сгенерированный generate_realistic_tasks() файл задач потоково.
+
+    Файл .jsonl записывается построчно, остальные — в формате tasks.json.
+
+    :param file_name: Имя файла.
+    :param count: Количество задач.
+    :param seed: Начальное значение генератора случайных чисел.
+    """
+    with open(file_name, "wb") as file:
+        get_serializer("json").write_tasks(file, generate_realistic_tasks(count, seed), file_name.endswith(".jsonl"))
+
+
+def timed(func, repeat=5):
+    """
+    Измерить лучшее время выполнения функции.
+
+    :param func: Функция без аргументов.
+    :param repeat: Число повторов.
+    :return: Лучшее время в миллисекундах.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def bench_filtering(count):
+    """
+    Сравнить фильтрацию по индексам и полным перебором.
+
+    :param count: Количество задач.
+    :return: Список строк таблицы результатов.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "tasks.json")
+        write_task_file(file_name, count)
+        manager = TaskManager(file_name=file_name, storage=JsonStorage(file_name))
+
+    today, week_start, week_end = date(2025, 1, 1), date(2024, 3, 1), date(2024, 3, 7)
+    cases = [
+        (
+            "категории",
+            lambda: {task.category for task in manager.tasks},
+            manager.get_categories,
+        ),
+        (
+            "по категории",
+            lambda: [task for task in manager.tasks if task.category == "Дом"],
+            lambda: manager.filter_tasks(category="Дом"),
+        ),
+        (
+            "по статусу",
+            lambda: [task for task in manager.tasks if task.status == "Выполнена"],
+            lambda: manager.filter_tasks(status="Выполнена"),
+        ),
+        (
+            "просроченные",
+            lambda: [
+                task for task in manager.tasks
+                if task.due_date and task.due_date < today and task.status != "Выполнена"
+            ],
+            lambda: manager.get_overdue_tasks(today),
+        ),
+        (
+            "срок в интервале",
+            lambda: [task for task in manager.tasks if task.due_date and week_start <= task.due_date <= week_end],
+            lambda: manager.get_tasks_due_between(week_start, week_end),
+        ),
+        (
+            "ближайшие 20",
+            lambda: sorted(
+                (
+                    task for task in manager.tasks
+                    if task.due_date and task.due_date >= week_start and task.status != "Выполнена"
+                ),
+                key=lambda task: (task.due_date, task.id),
+            )[:20],
+            lambda: manager.get_upcoming_tasks(20, week_start),
+        ),
+    ]
+    rows = []
+    for name, scan, indexed in cases:
+        scan_ms = timed(scan)
+        indexed_ms = timed(indexed)
+        rows.append([count, name, f"{scan_ms:.2f}", f"{indexed_ms:.2f}", f"{scan_ms / max(indexed_ms, 1e-6):.1f}x"])
+    return rows
+
+
+class LegacyTask:
+    """
+    Задача в прежнем представлении: атрибуты в __dict__, строки не интернируются.
+    """
+
+    def __init__(self, task_id, title, description, category, due_date, priority, status):
+        self.id = task_id
+        self.title = title
+        self.description = description
+        self.category = category
+        self.due_date = due_date
+        self.priority = priority
+        self.status = status
+
+
+def _retained_bytes(text, build):
+    """
+    Измерить память, которую занимает структура, построенная из JSON текста.
+
+    :param text: JSON текст со списком задач.
+    :param build: Функция, строящая структуру по списку словарей задач.
+    :return: Число байт, оставшихся занятыми после удаления промежуточных словарей.
+    """
+    gc.collect()
+    tracemalloc.start()
+    records = json.loads(text)
+    result = build(records)
+    del records
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return retained
+
+
+def bench_memory(count):
+    """
+    Сравнить расход памяти на задачу для разных представлений.
+
+    :param count: Количество задач.
+    :return: Список строк таблицы результатов.
+    """
+    text = json.dumps(list(generate_realistic_tasks(count)), ensure_ascii=False)
+    cases = [
+        ("Task с __dict__ (до)", lambda records: [LegacyTask(*record.values()) for record in records]),
+        ("Task со __slots__ (после)", lambda records: [Task.from_dict(record) for record in records]),
+        ("TaskStore", TaskStore.from_records),
+    ]
+    return [[count, name, f"{_retained_bytes(text, build) / count:.0f}"] for name, build in cases]
+
+
+def bench_startup(count):
+    """
+    Измерить время от создания TaskManager до вывода первой страницы задач.
+
+    :param count: Количество задач.
+    :return: Список строк таблицы результатов.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for extension in ("json", "jsonl"):
+            file_name = os.path.join(tmp_dir, f"tasks.{extension}")
+            write_task_file(file_name, count)
+            for background_load in (False, True):
+                started = time.perf_counter()
+                storage = JsonStorage(file_name)
+                manager = TaskManager(file_name=file_name, storage=storage, background_load=background_load)
+                with redirect_stdout(io.StringIO()):
+                    if background_load:
+                        manager.show_tasks()
+                    else:
+                        manager.show_tasks(list(itertools.islice(manager.tasks, manager.first_page_size)))
+                first_render = time.perf_counter() - started
+                manager.wait_until_loaded()
+                loaded = time.perf_counter() - started
+                mode = "фоновая" if background_load else "полная"
+                rows.append([count, extension, mode, f"{first_render * 1000:.1f}", f"{loaded * 1000:.1f}"])
+        file_name = os.path.join(tmp_dir, "tasks.bin")
+        json_to_binary(os.path.join(tmp_dir, "tasks.json"), file_name)
+        started = time.perf_counter()
+        manager = BinaryTaskManager(file_name)
+        with redirect_stdout(io.StringIO()):
+            manager.show_tasks()
+        first_render = time.perf_counter() - started
+        manager.close()
+        rows.append([count, "bin", "mmap", f"{first_render * 1000:.1f}", "—"])
+    return rows
+
+
+def bench_render(count, full_limit=100_000):
+    """
+    Сравнить вывод всего списка через tabulate и постраничный вывод.
+
+    :param count: Количество задач.
+    :param full_limit: Максимальное число задач, для которого измеряется вывод всего списка.
+    :return: Список строк таблицы результатов.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "tasks.json")
+        write_task_file(file_name, count)
+        manager = TaskManager(file_name=file_name, storage=JsonStorage(file_name))
+
+    def render_all():
+        table = [
+            [task.id, task.title, task.category, task.due_date, task.priority, task.status] for task in manager.tasks
+        ]
+        tabulate(table, headers=["ID", "Название", "Категория", "Срок", "Приоритет", "Статус"], tablefmt="grid")
+
+    def render_page(table_format):
+        manager.table_format = table_format
+        with redirect_stdout(io.StringIO()):
+            manager.show_tasks()
+
+    full = f"{timed(render_all, repeat=1):.1f}" if count <= full_limit else "—"
+    return [[
+        count, full, f"{timed(lambda: render_page('grid')):.2f}", f"{timed(lambda: render_page('fast')):.2f}",
+    ]]
+
+
+def _time_once(func):
+    """
+    Измерить время одного выполнения функции.
+
+    :param func: Функция без аргументов.
+    :return: Время в миллисекундах.
+    """
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_backends(count, operations=20):
+    """
+    Сравнить хранилища задач на загрузке, добавлении, редактировании, удалении и поиске.
+
+    Каждая операция изменения сохраняется отдельно, как в меню приложения.
+
+    :param count: Количество задач.
+    :param operations: Число операций каждого вида.
+    :return: Список строк таблицы результатов.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "source.json")
+        write_task_file(source, count)
+        backends = [
+            ("json", "tasks.json", lambda name: TaskManager(file_name=name, storage=JsonStorage(name))),
+            ("journal", "journal.json", lambda name: TaskManager(file_name=name, storage=JournalStorage(name))),
+            ("sqlite", "tasks.db", lambda name: SqliteTaskManager(file_name=name)),
+            ("binary", "tasks.bin", lambda name: BinaryTaskManager(file_name=name)),
+            ("sharded", "tasks.shards", lambda name: ShardedTaskManager(file_name=name)),
+        ]
+        for backend, name, open_manager in backends:
+            file_name = os.path.join(tmp_dir, name)
+            open_manager(file_name).import_tasks(source)
+            manager = None
+
+            def load():
+                nonlocal manager
+                manager = open_manager(file_name)
+
+            def add():
+                for number in range(operations):
+                    manager.add_task(f"Новая задача {number}", "Описание", "Работа", "2025-01-01", "Средний")
+
+            def edit():
+                for task_id in range(1, operations + 1):
+                    manager.get_task_by_id(task_id).edit(title=f"Измененная задача {task_id}")
+                    manager.save_tasks()
+
+            def delete():
+                for task_id in range(operations + 1, 2 * operations + 1):
+                    manager.tasks.remove(manager.get_task_by_id(task_id))
+                    manager.save_tasks()
+
+            def search():
+                manager.search_tasks("договор срочно")
+                manager.filter_tasks(category="Дом", status="Выполнена")
+
+            timings = [_time_once(load)] + [_time_once(step) / operations for step in (add, edit, delete)]
+            timings.append(_time_once(search))
+            manager.close()
+            rows.append([count, backend, *(f"{timing:.2f}" for timing in timings)])
+    return rows
+
+
+def bench_shards(count):
+    """
+    Сравнить хранение по сегментам категорий с журналом на операциях, которым нужна одна категория.
+
+    Для каждого хранилища измеряются открытие с выводом первой страницы, фильтр по одной категории,
+    изменение одной задачи этой категории с сохранением и удаление всех задач другой категории.
+
+    :param count: Количество задач.
+    :return: Список строк таблицы результатов.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "source.json")
+        write_task_file(source, count)
+        backends = [
+            ("journal", "tasks.json", lambda name: TaskManager(file_name=name)),
+            ("sharded", "tasks.shards", lambda name: ShardedTaskManager(file_name=name)),
+        ]
+        for backend, name, open_manager in backends:
+            file_name = os.path.join(tmp_dir, name)
+            manager = open_manager(file_name)
+            manager.import_tasks(source)
+            manager.close()
+            manager = None
+
+            def first_page():
+                nonlocal manager
+                manager = open_manager(file_name)
+                with redirect_stdout(io.StringIO()):
+                    manager.show_tasks()
+
+            def edit():
+                task = manager.filter_tasks(category=categories[-1])[0]
+                task.edit(title="Измененная задача")
+                manager.save_tasks()
+
+            timings = [_time_once(first_page)]
+            categories = [category for category in manager.get_categories() if category != manager.tasks[0].category]
+            timings += [
+                _time_once(lambda: manager.filter_tasks(category=categories[-1])), _time_once(edit),
+                _time_once(lambda: manager.delete_category(categories[0])),
+            ]
+            manager.close()
+            rows.append([count, backend, *(f"{timing:.1f}" for timing in timings)])
+    return rows
+
+
+def _is_high_priority(record):
+    """
+    Предикат массового изменения бенчмарка parallel: задачи с высоким приоритетом.
+
+    :param record: Словарь задачи.
+    :return: True, если приоритет высокий.
+    """
+    return record["priority"] == "Высокий"
+
+
+def bench_parallel(count, max_workers=None):
+    """
+    Измерить ускорение операций ParallelEngine при росте числа процессов от 1 до max_workers.
+
+    Измеряются разбор tasks.json стандартным модулем json и JSONL самой быстрой библиотекой, поиск
+    подстрок, поиск по регулярному выражению и массовая отметка о выполнении задач с высоким
+    приоритетом (с сохранением). Пул процессов запускается до замеров.
+
+    :param count: Количество задач.
+    :param max_workers: Наибольшее число процессов. Если None, по числу процессоров.
+    :return: Список строк таблицы результатов.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = sorted({1, max_workers, *(2 ** power for power in range(1, max_workers.bit_length()))})
+    rows = []
+    baseline = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "source.jsonl")
+        write_task_file(source, count)
+        json_name = os.path.join(tmp_dir, "source.json")
+        write_task_file(json_name, count)
+        for workers in counts:
+            file_name = os.path.join(tmp_dir, f"tasks-{workers}.jsonl")
+            shutil.copyfile(source, file_name)
+            with ParallelEngine(workers) as engine:
+                engine._map(abs, [(number,) for number in range(workers)])
+                timings = [
+                    ("разбор tasks.json (json)", lambda: engine.parse_file(json_name, get_serializer("json"))),
+                    ("разбор JSONL", lambda: engine.parse_file(source)),
+                ]
+                manager = TaskManager(file_name, storage=ParallelJournalStorage(file_name, engine))
+                timings += [
+                    ("поиск подстрок", lambda: engine.search(manager, "отчет OR счет")),
+                    ("регулярное выражение", lambda: engine.search_regex(manager, r"\b(отч|сч)ет\w*\s+\w+")),
+                    ("массовая отметка", lambda: engine.mark_done(manager, _is_high_priority)),
+                ]
+                for operation, func in timings:
+                    elapsed = _time_once(func)
+                    baseline.setdefault(operation, elapsed)
+                    rows.append([count, operation, workers, f"{elapsed:.1f}", f"{baseline[operation] / elapsed:.2f}"])
+                manager.close()
+    rows.sort(key=lambda row: row[1])
+    return rows
+
+
+def bench_bulk_insert(count, sample=200):
+    """
+    Сравнить добавление задач с сохранением после каждой задачи и в одной транзакции batch().
+
+    Время без транзакции оценивается по первым sample задачам: при полной перезаписи файла
+    добавление всех задач по одной заняло бы слишком много времени.
+
+    :param count: Количество задач.
+    :param sample: Число задач, по которым оценивается добавление без транзакции.
+    :return: Список строк таблицы результатов.
+    """
+    rows = []
+    records = list(generate_realistic_tasks(count))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for backend, storage_class in (("json", JsonStorage), ("journal", JournalStorage)):
+            def add_all(file_name, records, use_batch):
+                manager = TaskManager(file_name=file_name, storage=storage_class(file_name))
+                with manager.batch() if use_batch else contextlib.nullcontext():
+                    for record in records:
+                        manager.add_task(
+                            record["title"], record["description"], record["category"], record["due_date"],
+                            record["priority"],
+                        )
+                manager.close()
+
+            single = _time_once(lambda: add_all(os.path.join(tmp_dir, f"single.{backend}"), records[:sample], False))
+            batched = _time_once(lambda: add_all(os.path.join(tmp_dir, f"batch.{backend}"), records, True))
+            rows.append([count, backend, f"{single / sample * count / 1000:.1f}", f"{batched / 1000:.2f}"])
+    return rows
+
+
+_STORAGES = {"json": JsonStorage, "journal": JournalStorage}
+
+
+def _concurrent_writer(file_name, backend, operations, start):
+    """
+    Добавить и изменить задачи из отдельного процесса (для bench_concurrency).
+
+    :param file_name: Имя файла задач.
+    :param backend: Имя хранилища: json или journal.
+    :param operations: Число добавляемых задач.
+    :param start: Событие одновременного старта всех процессов.
+    """
+    manager = TaskManager(file_name=file_name, storage=_STORAGES[backend](file_name))
+    start.wait()
+    for number in range(operations):
+        task = manager.add_task(f"Task {number}", "Description", "Работа", "2024-12-31", "Низкий")
+        task.edit(description=f"Edited {task.id}")
+        manager.save_tasks()
+    manager.close()
+
+
+def bench_concurrency(operations, writers=8):
+    """
+    Измерить пропускную способность и проверить отсутствие потерянных изменений при одновременной записи.
+
+    Каждый процесс добавляет operations задач и сразу изменяет каждую, сохраняя после каждой операции.
+
+    :param operations: Число задач, добавляемых каждым процессом.
+    :param writers: Число процессов.
+    :return: Список строк таблицы результатов.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for backend in _STORAGES:
+            file_name = os.path.join(tmp_dir, f"tasks.{backend}")
+            start = multiprocessing.Event()
+            processes = [
+                multiprocessing.Process(target=_concurrent_writer, args=(file_name, backend, operations, start))
+                for _ in range(writers)
+            ]
+            for process in processes:
+                process.start()
+            began = time.perf_counter()
+            start.set()
+            for process in processes:
+                process.join()
+            elapsed = time.perf_counter() - began
+
+            tasks = TaskManager(file_name=file_name, storage=_STORAGES[backend](file_name)).tasks
+            expected = writers * operations
+            ids = {task.id for task in tasks}
+            lost = expected - len(ids) + sum(task.description != f"Edited {task.id}" for task in tasks)
+            rows.append([writers, expected, backend, f"{expected * 2 / elapsed:.0f}", lost])
+    return rows
+
+
+def _run_server(file_name, ports):
+    """
+    Запустить сервер задач в отдельном процессе (для bench_server).
+
+    :param file_name: Имя файла задач.
+    :param ports: Очередь, в которую передается порт запущенного сервера.
+    """
+    async def serve():
+        server = TaskServer(TaskManager(file_name, save_delay=0.5), port=0)
+        await server.start()
+        ports.put(server.port)
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+async def _load_test(port, count, requests, clients, write_share, seed=0):
+    """
+    Отправить запросы к серверу с нескольких одновременных соединений.
+
+    :param port: Порт сервера.
+    :param count: Число задач на сервере (для выбора случайных ID).
+    :param requests: Общее число запросов.
+    :param clients: Число одновременных соединений.
+    :param write_share: Доля запросов на добавление и изменение задач.
+    :param seed: Начальное значение генератора случайных чисел.
+    :return: Пара (список задержек в миллисекундах, общее время в секундах).
+    """
+    rng = random.Random(seed)
+    latencies = []
+
+    async def run_client(client, operations):
+        for _ in range(operations):
+            task_id = rng.randint(1, count)
+            if rng.random() < write_share:
+                if rng.random() < 0.5:
+                    request = ("POST", "/tasks", {
+                        "title": "Новая задача", "description": "", "category": rng.choice(CATEGORIES),
+                        "due_date": "2025-01-01", "priority": rng.choice(PRIORITIES),
+                    })
+                else:
+                    request = ("PATCH", f"/tasks/{task_id}", {"priority": rng.choice(PRIORITIES)})
+            else:
+                request = rng.choice((
+                    ("GET", f"/tasks/{task_id}", None),
+                    ("GET", f"/tasks?category={rng.choice(CATEGORIES)}&limit=20", None),
+                    ("GET", f"/search?q={task_id}&limit=20", None),
+                ))
+            started = time.perf_counter()
+            await client.request(*request)
+            latencies.append((time.perf_counter() - started) * 1000)
+        await client.close()
+
+    began = time.perf_counter()
+    await asyncio.gather(*(run_client(TaskClient(port=port), requests // clients) for _ in range(clients)))
+    return latencies, time.perf_counter() - began
+
+
+def bench_server(count, requests=5000, clients=32):
+    """
+    Нагрузочный тест HTTP/JSON сервера: пропускная способность и процентили задержки.
+
+    Сервер работает в отдельном процессе, клиенты — одновременные соединения asyncio.
+
+    :param count: Количество задач на сервере.
+    :param requests: Общее число запросов в каждом сценарии.
+    :param clients: Число одновременных соединений.
+    :return: Список строк таблицы результатов.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "tasks.json")
+        write_task_file(file_name, count)
+        ports = multiprocessing.Queue()
+        server = multiprocessing.Process(target=_run_server, args=(file_name, ports), daemon=True)
+        server.start()
+        try:
+            port = ports.get(timeout=600)
+            for scenario, write_share in (("чтение", 0.0), ("80% чтение, 20% запись", 0.2)):
+                latencies, elapsed = asyncio.run(_load_test(port, count, requests, clients, write_share))
+                percentiles = statistics.quantiles(latencies, n=100)
+                rows.append([
+                    count, scenario, clients, f"{len(latencies) / elapsed:.0f}", f"{percentiles[49]:.2f}",
+                    f"{percentiles[89]:.2f}", f"{percentiles[98]:.2f}", f"{max(latencies):.2f}",
+                ])
+        finally:
+            server.terminate()
+            server.join()
+    return rows
+
+
+def bench_serialization(count):
+    """
+    Измерить скорость сохранения и загрузки снимка задач в МБ/с для каждой библиотеки сериализации.
+
+    Первая строка — прежний способ: json.dump с отступами по списку словарей и потоковое чтение.
+
+    :param count: Количество задач.
+    :return: Список строк таблицы результатов.
+    """
+    tasks = [Task.from_dict(record) for record in generate_realistic_tasks(count)]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        def measure(name, mode, file_name, save, load):
+            save_ms = timed(save, repeat=3)
+            size = os.path.getsize(file_name) / 1e6
+            load_ms = timed(load, repeat=3)
+            rows.append([
+                count, name, mode, f"{size:.1f}", f"{size / save_ms * 1000:.1f}", f"{size / load_ms * 1000:.1f}",
+            ])
+
+        def dump_baseline(file_name):
+            with open(file_name, "w", encoding="utf-8") as file:
+                json.dump([task.to_dict() for task in tasks], file, ensure_ascii=False, indent=4)
+
+        file_name = os.path.join(tmp_dir, "baseline.json")
+        measure(
+            "json.dump", "с отступами", file_name, lambda: dump_baseline(file_name),
+            lambda: _read_snapshot(file_name, get_serializer("json")),
+        )
+        for backend in available_backends():
+            for mode, compact, extension in (
+                ("с отступами", False, "json"), ("компактный", True, "json"), ("JSONL", False, "jsonl"),
+            ):
+                serializer = get_serializer(backend, compact)
+                file_name = os.path.join(tmp_dir, f"{backend}.{mode}.{extension}")
+                measure(
+                    backend, mode, file_name, lambda: _write_snapshot(file_name, tasks, False, serializer),
+                    lambda: _read_snapshot(file_name, serializer),
+                )
+    return rows
+
+
+def _timings(func, repeat):
+    """
+    Выполнить функцию несколько раз и измерить время каждого выполнения.
+
+    :param func: Функция без аргументов.
+    :param repeat: Число повторов.
+    :return: Список времен в миллисекундах.
+    """
+    return [_time_once(func) for _ in range(repeat)]
+
+
+def run_suite(count, seed=0, repeat=5, operations=100):
+    """
+    Измерить основные операции менеджера задач на сгенерированном файле задач.
+
+    Операции: загрузка файла (load_tasks), сохранение изменения полной перезаписью снимка
+    (save_tasks.snapshot) и записью в журнал (save_tasks.journal), добавление задачи (add_task),
+    поиск по ID (get_task_by_id), фильтрация по самой частой категории и по статусу (filter_tasks.*),
+    поиск по ключевому слову (search_tasks), сводная статистика (get_statistics) и вывод первой страницы
+    таблицы (show_tasks).
+
+    :param count: Количество задач.
+    :param seed: Начальное значение генератора задач и случайных ID.
+    :param repeat: Число повторов каждого замера.
+    :param operations: Число добавлений задач и поисков по ID в одном замере.
+    :return: Список результатов: словари с полями size, operation, ops, best_ms и median_ms
+        (время одной операции в миллисекундах).
+    """
+    rng = random.Random(seed)
+    results = []
+
+    def measure(operation, func, ops=1):
+        timings = [timing / ops for timing in _timings(func, repeat)]
+        results.append({
+            "size": count, "operation": operation, "ops": ops, "best_ms": round(min(timings), 6),
+            "median_ms": round(statistics.median(timings), 6),
+        })
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "tasks.json")
+        write_task_file(file_name, count, seed)
+        measure("load_tasks", lambda: TaskManager(file_name=file_name, storage=JsonStorage(file_name)).close())
+
+        for operation, storage_class in (("save_tasks.snapshot", JsonStorage), ("save_tasks.journal", JournalStorage)):
+            manager = TaskManager(file_name=file_name, storage=storage_class(file_name))
+            task = manager.get_task_by_id(1)
+
+            def save():
+                task.edit(title=f"{task.title}!")
+                manager.save_tasks()
+
+            measure(operation, save)
+            manager.close()
+
+        manager = TaskManager(file_name=file_name)
+
+        def add():
+            for number in range(operations):
+                manager.add_task(f"Новая задача {number}", "Описание", "Работа", "2025-01-01", "Средний")
+
+        measure("add_task", add, operations)
+        task_ids = [rng.randint(1, count) for _ in range(operations * 100)]
+        measure("get_task_by_id", lambda: [manager.get_task_by_id(task_id) for task_id in task_ids], len(task_ids))
+        measure("filter_tasks.category", lambda: manager.filter_tasks(category=CATEGORIES[0]))
+        measure("filter_tasks.status", lambda: manager.filter_tasks(status="Выполнена"))
+        measure("search_tasks", lambda: manager.search_tasks("отчет"))
+        measure("get_statistics", manager.get_statistics)
+        with redirect_stdout(io.StringIO()):
+            measure("show_tasks", manager.show_tasks)
+        manager.close()
+    return results
+
+
+def save_results(file_name, results, seed=0):
+    """
+    Сохранить результаты run_suite() в JSON файл вместе с описанием окружения.
+
+    :param file_name: Имя файла.
+    :param results: Список результатов.
+    :param seed: Начальное значение генератора задач.
+    """
+    data = {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "serializers": available_backends(),
+        },
+        "seed": seed,
+        "results": results,
+    }
+    with open(file_name, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=4)
+
+
+def load_results(file_name):
+    """
+    Загрузить результаты, сохраненные save_results().
+
+    :param file_name: Имя файла.
+    :return: Список результатов.
+    :raises ValueError: Если версия формата файла не поддерживается.
+    """
+    with open(file_name, encoding="utf-8") as file:
+        data = json.load(file)
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Неподдерживаемая версия файла результатов: {data.get('version')}.")
+    return data["results"]
+
+
+def compare_results(baseline, current, tolerance=0.2):
+    """
+    Сравнить результаты двух запусков по лучшему времени операций.
+
+    :param baseline: Результаты прежнего запуска.
+    :param current: Результаты текущего запуска.
+    :param tolerance: Допустимое замедление (0.2 — на 20%), больше которого операция считается регрессией.
+    :return: Пара (строки таблицы сравнения, число регрессий).
+    """
+    previous = {(result["size"], result["operation"]): result["best_ms"] for result in baseline}
+    rows = []
+    regressions = 0
+    for result in current:
+        before = previous.get((result["size"], result["operation"]))
+        if before is None:
+            continue
+        ratio = result["best_ms"] / before if before else 1.0
+        regression = ratio > 1 + tolerance
+        regressions += regression
+        rows.append([
+            result["size"], result["operation"], f"{before:.4g}", f"{result['best_ms']:.4g}", f"{ratio:.2f}x",
+            "регрессия" if regression else "",
+        ])
+    return rows, regressions
+
+
+def main():
+    """
+    Запустить бенчмарки.
+
+    :return: Код завершения: 1, если набор suite замедлился относительно --baseline, иначе 0.
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарки менеджера задач.")
+    parser.add_argument(
+        "benchmark",
+        choices=[
+            "suite", "generate", "filter", "memory", "startup", "render", "backends", "bulk", "concurrency", "server",
+            "serialize", "shards", "parallel",
+        ],
+    )
+    parser.add_argument("sizes", nargs="*", type=int, help="Количество задач (можно несколько).")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора задач.")
+    parser.add_argument("--repeat", type=int, default=5, help="Число повторов каждого замера (suite).")
+    parser.add_argument(
+        "--output",
+        help="suite: файл JSON для результатов; generate: имя файла задач, {count} заменяется числом задач.",
+    )
+    parser.add_argument("--baseline", help="suite: файл результатов прежнего запуска для сравнения.")
+    parser.add_argument("--workers", type=int, help="parallel: наибольшее число процессов (по числу процессоров).")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="suite: допустимое замедление (0.2 — на 20%%).",
+    )
+    args = parser.parse_args()
+    sizes = args.sizes or (SUITE_SIZES if args.benchmark in ("suite", "generate") else [10_000, 100_000, 1_000_000])
+
+    rows = []
+    if args.benchmark == "generate":
+        for count in sizes:
+            file_name = (args.output or "tasks-{count}.json").format(count=count)
+            write_task_file(file_name, count, args.seed)
+            print(f"{file_name}: {count} задач")
+        return 0
+    elif args.benchmark == "suite":
+        results = []
+        for count in sizes:
+            results.extend(run_suite(count, args.seed, args.repeat))
+        if args.output:
+            save_results(args.output, results, args.seed)
+        rows = [
+            [result["size"], result["operation"], f"{result['best_ms']:.4g}", f"{result['median_ms']:.4g}"]
+            for result in results
+        ]
+        headers = ["Задач", "Операция", "Лучшее, мс/оп", "Медиана, мс/оп"]
+        if args.baseline:
+            print(tabulate(rows, headers=headers, tablefmt="grid"))
+            rows, regressions = compare_results(load_results(args.baseline), results, args.tolerance)
+            headers = ["Задач", "Операция", "Было, мс/оп", "Стало, мс/оп", "Отношение", ""]
+            print(tabulate(rows, headers=headers, tablefmt="grid"))
+            return 1 if regressions else 0
+    elif args.benchmark == "filter":
+        for count in sizes:
+            rows.extend(bench_filtering(count))
+        headers = ["Задач", "Запрос", "Перебор, мс", "Индекс, мс", "Ускорение"]
+    elif args.benchmark == "memory":
+        for count in sizes:
+            rows.extend(bench_memory(count))
+        headers = ["Задач", "Представление", "Байт на задачу"]
+    elif args.benchmark == "startup":
+        for count in sizes:
+            rows.extend(bench_startup(count))
+        headers = ["Задач", "Формат", "Загрузка", "Первая страница, мс", "Все задачи, мс"]
+    elif args.benchmark == "render":
+        for count in sizes:
+            rows.extend(bench_render(count))
+        headers = ["Задач", "Весь список, мс", "Страница grid, мс", "Страница fast, мс"]
+    elif args.benchmark == "bulk":
+        for count in sizes:
+            rows.extend(bench_bulk_insert(count))
+        headers = ["Задач", "Хранилище", "По одной (оценка), с", "batch(), с"]
+    elif args.benchmark == "serialize":
+        for count in sizes:
+            rows.extend(bench_serialization(count))
+        headers = ["Задач", "Библиотека", "Формат", "Размер, МБ", "Сохранение, МБ/с", "Загрузка, МБ/с"]
+    elif args.benchmark == "server":
+        for count in sizes:
+            rows.extend(bench_server(count))
+        headers = ["Задач", "Сценарий", "Соединений", "Запросов/с", "p50, мс", "p90, мс", "p99, мс", "Макс., мс"]
+    elif args.benchmark == "shards":
+        for count in sizes:
+            rows.extend(bench_shards(count))
+        headers = [
+            "Задач", "Хранилище", "Открытие и первая страница, мс", "Фильтр по категории, мс", "Изменение, мс",
+            "Удаление категории, мс",
+        ]
+    elif args.benchmark == "parallel":
+        for count in sizes:
+            rows.extend(bench_parallel(count, args.workers))
+        headers = ["Задач", "Операция", "Процессов", "Время, мс", "Ускорение"]
+    elif args.benchmark == "concurrency":
+        for count in sizes:
+            rows.extend(bench_concurrency(count))
+        headers = ["Процессов", "Задач", "Хранилище", "Операций/с", "Потеряно изменений"]
+    else:
+        for count in sizes:
+            rows.extend(bench_backends(count))
+        headers = [
+            "Задач", "Хранилище", "Загрузка, мс", "Добавление, мс/оп", "Изменение, мс/оп", "Удаление, мс/оп",
+            "Поиск, мс",
+        ]
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
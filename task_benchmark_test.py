@@ -0,0 +1,53 @@
+import collections
+import os
+import tempfile
+import unittest
+from task_benchmark import (
+    CATEGORIES, compare_results, generate_realistic_tasks, load_results, run_suite, save_results, write_task_file,
+)
+from task_manager import TaskManager
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем временный каталог."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def test_generator(self):
+        """Тест на повторяемость генератора, неравномерность категорий и загрузку сгенерированного файла."""
+        tasks = list(generate_realistic_tasks(2000, seed=7))
+        self.assertEqual(tasks, list(generate_realistic_tasks(2000, seed=7)))
+        self.assertNotEqual(tasks, list(generate_realistic_tasks(2000, seed=8)))
+        categories = collections.Counter(task["category"] for task in tasks)
+        self.assertGreater(categories[CATEGORIES[0]], 5 * categories[CATEGORIES[-1]])
+
+        for extension in ("json", "jsonl"):
+            file_name = os.path.join(self.tmp_dir.name, f"tasks.{extension}")
+            write_task_file(file_name, 50, seed=7)
+            manager = TaskManager(file_name=file_name)
+            self.assertEqual([task.to_dict() for task in manager.tasks], tasks[:50])
+            manager.close()
+
+    def test_results_roundtrip_and_compare(self):
+        """Тест на сохранение результатов и обнаружение регрессии при сравнении запусков."""
+        results = run_suite(10, repeat=1, operations=5)
+        self.assertIn("get_task_by_id", [result["operation"] for result in results])
+        file_name = os.path.join(self.tmp_dir.name, "results.json")
+        save_results(file_name, results)
+        baseline = load_results(file_name)
+        self.assertEqual(baseline, results)
+
+        slower = [dict(result) for result in results]
+        slower[0]["best_ms"] *= 2
+        rows, regressions = compare_results(baseline, slower)
+        self.assertEqual((len(rows), regressions), (len(results), 1))
+        self.assertEqual(rows[0][-1], "регрессия")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,1277 @@
+import argparse
+import bisect
+import heapq
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
+from datetime import date
+from operator import attrgetter, itemgetter
+from task_index import FullTextIndex, StatsIndex
+from task_manager import Task, TaskManager, format_date, parse_date, parse_legacy_date
+from task_profile import timed
+from task_serializer import FIELDS
+from task_storage import JournalStorage, _write_atomic, export_json, renumber, replay
+
+MAGIC = b"TASKBIN\0"
+FORMAT_VERSION = 1
+BINARY_EXTENSION = ".bin"
+CODED_FIELDS = ("category", "priority", "status")
+
+_SECTIONS = (
+    "count", "next_id", "due_count", "meta_offset", "meta_size", "records_offset", "ids_offset",
+    "id_positions_offset", "due_positions_offset", "due_values_offset", "postings_offset", "postings_count",
+    "strings_offset", "strings_size",
+)
+_HEADER = struct.Struct(f"<8sHHI{len(_SECTIONS)}Q")
+_RECORD = struct.Struct("<qIIIIiHHH2x")
+_RECORD_ID = struct.Struct("<q")
+_RECORD_CODES = struct.Struct("<HHH")
+_CODES_OFFSET = 28
+_ALIGNMENT = 8
+_MAX_STRINGS = 1 << 32
+_MAX_CODES = 1 << 16
+_task_attributes = attrgetter(*FIELDS)
+_record_values = itemgetter(*FIELDS)
+
+_TextRow = namedtuple("_TextRow", "id title description")
+
+
+def _check_byteorder():
+    """
+    Проверить, что числа платформы хранятся в порядке байтов формата (little-endian).
+
+    :raises ValueError: Если платформа big-endian.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Двоичный снимок задач поддерживается только на платформах little-endian.")
+
+
+def write_binary_snapshot(path, tasks, next_id=None, fsync=True):
+    """
+    Атомарно записать задачи в двоичный снимок.
+
+    Файл состоит из заголовка с версией формата и смещениями разделов и разделов, выровненных по 8 байт:
+    словари значений категории, приоритета и статуса (JSON) с границами списков позиций и счетчиками задач, таблица
+    записей фиксированной длины (ID, смещения и длины названия и описания в пуле строк, срок как
+    порядковый номер дня, коды категории, приоритета и статуса), ID в порядке возрастания с позициями
+    записей, позиции задач со сроком в порядке (срок, ID) со сроками, списки позиций задач для каждого
+    значения категории, приоритета и статуса и пул строк в UTF-8. Числа записываются в little-endian.
+
+    :param path: Путь к файлу снимка.
+    :param tasks: Итерируемый набор задач или словарей задач.
+    :param next_id: Счетчик ID. Если None или меньше наибольшего ID плюс один, берется наибольший ID плюс один.
+    :param fsync: Сбросить файл и каталог на диск.
+    :raises ValueError: Если ID задач повторяются, срок не является датой или данные не помещаются в формат.
+        Сроки в формате дд.мм.гггг из файлов, записанных до проверки сроков, записываются как даты.
+    """
+    _check_byteorder()
+    table = []
+    ids = array("q")
+    dues = array("i")
+    strings = bytearray()
+    codes = {field: {} for field in CODED_FIELDS}
+    postings = {field: [] for field in CODED_FIELDS}
+    stats = StatsIndex()
+    for position, item in enumerate(tasks):
+        task_id, title, description, category, due_date, priority, status = (
+            _record_values(item) if type(item) is dict else _task_attributes(item)
+        )
+        text = due_date if type(item) is dict else item._due_text
+        due_date = parse_legacy_date(due_date)
+        if due_date is None and text:
+            raise ValueError(
+                f"Задача {task_id}: срок выполнения {text!r} не является датой и не может быть записан в двоичный "
+                "снимок. Задайте срок в формате гггг-мм-дд."
+            )
+        ordinal = due_date.toordinal() if due_date else 0
+        stats.count(category, status, priority, due_date)
+        title, description = title.encode("utf-8"), description.encode("utf-8")
+        title_offset = len(strings)
+        strings += title
+        strings += description
+        row_codes = []
+        for field, value in zip(CODED_FIELDS, (category, priority, status)):
+            code = codes[field].get(value)
+            if code is None:
+                code = codes[field][value] = len(postings[field])
+                postings[field].append([])
+            postings[field][code].append(position)
+            row_codes.append(code)
+        table.append(_RECORD.pack(
+            task_id, title_offset, len(title), title_offset + len(title), len(description), ordinal, *row_codes
+        ))
+        ids.append(task_id)
+        dues.append(ordinal)
+    if len(strings) >= _MAX_STRINGS:
+        raise ValueError("Названия и описания задач не помещаются в двоичный снимок (больше 4 ГиБ).")
+    if any(len(values) > _MAX_CODES for values in codes.values()):
+        raise ValueError("Слишком много различных категорий, приоритетов или статусов для двоичного снимка.")
+
+    count = len(table)
+    order = sorted(range(count), key=ids.__getitem__)
+    sorted_ids = array("q", (ids[position] for position in order))
+    for previous, current in zip(sorted_ids, sorted_ids[1:]):
+        if previous == current:
+            raise ValueError(f"Повторяющийся ID задачи: {current}.")
+    due_order = sorted((position for position in range(count) if dues[position]), key=lambda p: (dues[p], ids[p]))
+    flat_postings = array("I")
+    bounds = {}
+    for field in CODED_FIELDS:
+        bounds[field] = []
+        for positions in postings[field]:
+            bounds[field].append([len(flat_postings), len(positions)])
+            flat_postings.extend(positions)
+    meta = json.dumps(
+        {"values": {field: list(codes[field]) for field in CODED_FIELDS}, "postings": bounds, "stats": stats.to_dict()},
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    sections = [
+        meta, b"".join(table), sorted_ids.tobytes(), array("I", order).tobytes(), array("I", due_order).tobytes(),
+        array("i", (dues[position] for position in due_order)).tobytes(), flat_postings.tobytes(), bytes(strings),
+    ]
+    offsets = []
+    offset = _HEADER.size
+    for data in sections:
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        offsets.append(offset)
+        offset += len(data)
+    next_id = max(next_id or 1, (sorted_ids[-1] + 1) if count else 1)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, _RECORD.size, count, next_id, len(due_order), offsets[0], len(meta), offsets[1],
+        offsets[2], offsets[3], offsets[4], offsets[5], offsets[6], len(flat_postings), offsets[7], len(strings),
+    )
+
+    def write(file):
+        file.write(header)
+        for offset, data in zip(offsets, sections):
+            file.write(b"\0" * (offset - file.tell()))
+            file.write(data)
+
+    _write_atomic(path, write, fsync)
+
+
+def is_binary_snapshot(path):
+    """
+    Проверить, является ли файл двоичным снимком задач.
+
+    :param path: Путь к файлу.
+    :return: True, если файл начинается с MAGIC.
+    """
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return False
+
+
+class BinarySnapshot:
+    """
+    Двоичный снимок задач, открытый через mmap.
+
+    Открытие читает только заголовок и словари значений, поэтому не зависит от числа задач.
+    Задачи декодируются по позиции записи при обращении; поиск позиции по ID — двоичный поиск
+    по отсортированным ID. Снимок нужно закрыть методом close() или блоком with.
+
+    Атрибуты:
+        File_name (str): Имя файла снимка.
+        Count (int): Число задач.
+        Next_id (int): Счетчик ID на момент записи снимка.
+        Values (dict): Значения категорий, приоритетов и статусов по кодам: {поле: список значений}.
+        Stats (dict): Счетчики задач снимка (см. StatsIndex.to_dict) или None, если снимок записан до их появления.
+    """
+
+    def __init__(self, file_name):
+        """
+        Открыть снимок.
+
+        :param file_name: Имя файла снимка.
+        :raises ValueError: Если файл не является двоичным снимком или версия формата не поддерживается.
+        """
+        _check_byteorder()
+        self.file_name = file_name
+        self._views = []
+        with open(file_name, "rb") as file:
+            if os.fstat(file.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"Файл {file_name} не является двоичным снимком задач.")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self):
+        """
+        Разобрать заголовок и словари значений и отобразить разделы снимка на массивы.
+
+        :raises ValueError: Если файл не является двоичным снимком, поврежден или версия формата не поддерживается.
+        """
+        magic, version, _, record_size, *sections = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"Файл {self.file_name} не является двоичным снимком задач.")
+        if version != FORMAT_VERSION or record_size != _RECORD.size:
+            raise ValueError(f"Неподдерживаемая версия двоичного снимка {self.file_name}: {version}.")
+        header = dict(zip(_SECTIONS, sections))
+        self.count = header["count"]
+        self.next_id = header["next_id"]
+        self._records = header["records_offset"]
+        self._strings = header["strings_offset"]
+        view = memoryview(self._mmap)
+        self._views.append(view)
+
+        def section(offset, length, fmt):
+            end = offset + length * struct.calcsize(fmt)
+            if end > len(view):
+                raise ValueError(f"Двоичный снимок {self.file_name} поврежден.")
+            array_view = view[offset:end].cast(fmt)
+            self._views.append(array_view)
+            return array_view
+
+        section(self._records, self.count * _RECORD.size, "B")
+        section(self._strings, header["strings_size"], "B")
+        meta = json.loads(bytes(section(header["meta_offset"], header["meta_size"], "B")))
+        self.values = {field: [sys.intern(value) for value in meta["values"][field]] for field in CODED_FIELDS}
+        self._codes = {
+            field: {value: code for code, value in enumerate(values)} for field, values in self.values.items()
+        }
+        self._bounds = meta["postings"]
+        self.stats = meta.get("stats")
+        self.ids = section(header["ids_offset"], self.count, "q")
+        self._id_positions = section(header["id_positions_offset"], self.count, "I")
+        self._due_positions = section(header["due_positions_offset"], header["due_count"], "I")
+        self._due_values = section(header["due_values_offset"], header["due_count"], "i")
+        self._postings = section(header["postings_offset"], header["postings_count"], "I")
+        self._dates = {}
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Закрыть снимок. Уже декодированные задачи остаются действительными.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+    def position(self, task_id):
+        """
+        Найти позицию записи задачи по ID двоичным поиском.
+
+        :param task_id: Идентификатор задачи.
+        :return: Позиция записи или None, если задачи нет в снимке.
+        """
+        index = bisect.bisect_left(self.ids, task_id)
+        if index < self.count and self.ids[index] == task_id:
+            return self._id_positions[index]
+        return None
+
+    def task_id(self, position):
+        """
+        Прочитать ID задачи по позиции записи.
+
+        :param position: Позиция записи.
+        :return: Идентификатор задачи.
+        """
+        return _RECORD_ID.unpack_from(self._mmap, self._records + position * _RECORD.size)[0]
+
+    def codes(self, position):
+        """
+        Прочитать коды категории, приоритета и статуса задачи, не декодируя строки.
+
+        :param position: Позиция записи.
+        :return: Кортеж кодов в порядке CODED_FIELDS.
+        """
+        return _RECORD_CODES.unpack_from(self._mmap, self._records + position * _RECORD.size + _CODES_OFFSET)
+
+    def _text(self, offset, length):
+        """
+        Декодировать строку из пула строк.
+
+        :param offset: Смещение строки в пуле.
+        :param length: Длина строки в байтах.
+        :return: Строка.
+        """
+        start = self._strings + offset
+        return self._mmap[start:start + length].decode("utf-8")
+
+    def _date(self, ordinal):
+        """
+        Получить срок по порядковому номеру дня. Одинаковые сроки возвращаются одним объектом date.
+
+        :param ordinal: Порядковый номер дня (date.toordinal) или 0, если срок не задан.
+        :return: Объект date или None.
+        """
+        if not ordinal:
+            return None
+        value = self._dates.get(ordinal)
+        if value is None:
+            value = self._dates[ordinal] = date.fromordinal(ordinal)
+        return value
+
+    def fields(self, position):
+        """
+        Декодировать поля задачи.
+
+        :param position: Позиция записи.
+        :return: Кортеж значений в порядке FIELDS; срок — date или None.
+        """
+        task_id, title_offset, title_length, description_offset, description_length, due, category, priority, status = (
+            _RECORD.unpack_from(self._mmap, self._records + position * _RECORD.size)
+        )
+        return (
+            task_id, self._text(title_offset, title_length), self._text(description_offset, description_length),
+            self.values["category"][category], self._date(due), self.values["priority"][priority],
+            self.values["status"][status],
+        )
+
+    def counted_fields(self, position):
+        """
+        Прочитать поля задачи, по которым ведутся счетчики, не декодируя строки.
+
+        :param position: Позиция записи.
+        :return: Кортеж (категория, статус, приоритет, срок — date или None).
+        """
+        due, category, priority, status = _RECORD.unpack_from(self._mmap, self._records + position * _RECORD.size)[5:]
+        values = self.values
+        return values["category"][category], values["status"][status], values["priority"][priority], self._date(due)
+
+    def task(self, position):
+        """
+        Декодировать задачу.
+
+        :param position: Позиция записи.
+        :return: Новый объект задачи.
+        """
+        return Task(*self.fields(position))
+
+    def record(self, position):
+        """
+        Декодировать задачу в словарь формата tasks.json.
+
+        :param position: Позиция записи.
+        :return: Словарь задачи.
+        """
+        record = dict(zip(FIELDS, self.fields(position)))
+        record["due_date"] = format_date(record["due_date"])
+        return record
+
+    def records(self):
+        """
+        Декодировать все задачи в порядке записей.
+
+        :return: Генератор словарей задач.
+        """
+        for position in range(self.count):
+            yield self.record(position)
+
+    def text(self, position):
+        """
+        Декодировать только название и описание задачи (для полнотекстового индекса).
+
+        :param position: Позиция записи.
+        :return: Кортеж (ID, название, описание).
+        """
+        task_id, title_offset, title_length, description_offset, description_length = (
+            _RECORD.unpack_from(self._mmap, self._records + position * _RECORD.size)[:5]
+        )
+        return task_id, self._text(title_offset, title_length), self._text(description_offset, description_length)
+
+    def code(self, field, value, ignore_case=False):
+        """
+        Найти коды значения поля.
+
+        :param field: Поле: category, priority или status.
+        :param value: Значение.
+        :param ignore_case: Сравнивать без учета регистра.
+        :return: Список кодов (пустой, если значения нет в снимке).
+        """
+        if not ignore_case:
+            code = self._codes[field].get(value)
+            return [] if code is None else [code]
+        value = value.casefold()
+        return [code for code, key in enumerate(self.values[field]) if key.casefold() == value]
+
+    def postings_size(self, field, code):
+        """
+        Получить число задач с данным кодом поля.
+
+        :param field: Поле: category, priority или status.
+        :param code: Код значения.
+        :return: Число задач.
+        """
+        return self._bounds[field][code][1]
+
+    def postings(self, field, code):
+        """
+        Перебрать позиции задач с данным кодом поля в порядке возрастания.
+
+        :param field: Поле: category, priority или status.
+        :param code: Код значения.
+        :return: Генератор позиций.
+        """
+        start, length = self._bounds[field][code]
+        postings = self._postings
+        return (postings[index] for index in range(start, start + length))
+
+    def due_positions(self, start=None, end=None, include_end=True):
+        """
+        Перебрать позиции задач со сроком в интервале в порядке (срок, ID).
+
+        :param start: Начало интервала (date, включительно) или None.
+        :param end: Конец интервала (date) или None.
+        :param include_end: Включать задачи со сроком end.
+        :return: Генератор позиций.
+        """
+        values = self._due_values
+        low = 0 if start is None else bisect.bisect_left(values, start.toordinal())
+        if end is None:
+            high = len(values)
+        else:
+            high = (bisect.bisect_right if include_end else bisect.bisect_left)(values, end.toordinal())
+        positions = self._due_positions
+        return (positions[index] for index in range(low, high))
+
+
+def iter_binary_snapshot(path):
+    """
+    Читать задачи двоичного снимка по одной.
+
+    :param path: Путь к файлу снимка.
+    :return: Генератор словарей задач (пустой, если файла нет).
+    """
+    if not os.path.exists(path):
+        return
+    with BinarySnapshot(path) as snapshot:
+        yield from snapshot.records()
+
+
+class BinaryStorage(JournalStorage):
+    """
+    Хранилище задач с двоичным снимком и журналом упреждающей записи.
+
+    Изменения записываются в журнал так же, как в JournalStorage, а при уплотнении журнал
+    сливается со снимком, который записывается в двоичном формате (см. write_binary_snapshot).
+    TaskManager с этим хранилищем загружает все задачи, как обычно; BinaryTaskManager
+    открывает снимок через mmap и декодирует задачи при обращении.
+    """
+
+    def read_snapshot(self):
+        """
+        Читать задачи снимка по одной, без записей журнала.
+
+        :return: Итератор словарей задач (пустой, если снимка нет).
+        """
+        return iter_binary_snapshot(self.file_name)
+
+    def write_snapshot(self, records, fsync=True):
+        """
+        Атомарно записать двоичный снимок задач.
+
+        :param records: Итерируемый набор задач или словарей задач.
+        :param fsync: Сбросить файл и каталог на диск.
+        """
+        write_binary_snapshot(self.file_name, records, self.next_id, fsync)
+
+    def open_snapshot(self):
+        """
+        Открыть снимок через mmap и прочитать журналы, не применяя их.
+
+        :return: Пара (BinarySnapshot или None, если снимка еще нет, записи журналов).
+        """
+        with self.lock(shared=True):
+            records = self._read_journals()
+            snapshot = BinarySnapshot(self.file_name) if os.path.exists(self.file_name) else None
+        self.next_id = replay({}, records, snapshot.next_id if snapshot is not None else 1)
+        return snapshot, records
+
+
+class BinaryTaskList:
+    """
+    Коллекция задач поверх двоичного снимка.
+
+    Поддерживает тот же интерфейс, что и TaskList. Задачи снимка декодируются при первом обращении
+    и запоминаются, поэтому одна задача всегда представлена одним объектом. Изменения после записи
+    снимка хранятся поверх него: позиции удаленных и измененных задач и добавленные задачи.
+    Порядок обхода — порядок записей снимка, затем добавленные задачи.
+
+    Атрибуты:
+        Manager (BinaryTaskManager): Менеджер, которому принадлежит коллекция.
+        Snapshot (BinarySnapshot): Снимок или None, если файла снимка еще нет.
+    """
+
+    def __init__(self, manager, snapshot):
+        """
+        Инициализация коллекции.
+
+        :param manager: Менеджер задач.
+        :param snapshot: Открытый снимок или None.
+        """
+        self.manager = manager
+        self.snapshot = snapshot
+        self._cache = {}
+        self._deleted = set()
+        self._deleted_order = None
+        self._dirty = set()
+        self._added = {}
+        self._cleared = False
+
+    def _base_size(self):
+        """
+        Получить число записей снимка, видимых коллекции (0 после очистки).
+
+        :return: Число записей, включая удаленные.
+        """
+        return 0 if self.snapshot is None or self._cleared else self.snapshot.count
+
+    def _position(self, task_id):
+        """
+        Найти позицию неудаленной задачи снимка по ID.
+
+        :param task_id: Идентификатор задачи.
+        :return: Позиция записи или None.
+        """
+        if not self._base_size():
+            return None
+        position = self.snapshot.position(task_id)
+        return None if position in self._deleted else position
+
+    def _task(self, position):
+        """
+        Получить задачу снимка, декодировав ее при первом обращении.
+
+        :param position: Позиция записи.
+        :return: Задача.
+        """
+        task = self._cache.get(position)
+        if task is None:
+            task = self._cache[position] = self.snapshot.task(position)
+            task._listener = self.manager._task_changed
+        return task
+
+    def _positions(self, start=0):
+        """
+        Перебрать позиции неудаленных задач снимка.
+
+        :param start: Позиция, с которой начинается перебор.
+        :return: Генератор позиций.
+        """
+        deleted = self._deleted
+        for position in range(start, self._base_size()):
+            if position not in deleted:
+                yield position
+
+    def _nth_position(self, index):
+        """
+        Найти позицию index-й неудаленной задачи снимка: такую позицию p, что до нее включительно
+        удалено ровно p - index записей.
+
+        :param index: Номер задачи среди неудаленных.
+        :return: Позиция записи.
+        """
+        if self._deleted_order is None:
+            self._deleted_order = sorted(self._deleted)
+        position = index
+        while True:
+            shifted = index + bisect.bisect_right(self._deleted_order, position)
+            if shifted == position:
+                return position
+            position = shifted
+
+    def _iter_from(self, index):
+        """
+        Перебрать задачи, начиная с позиции index в порядке обхода.
+
+        :param index: Позиция первой задачи.
+        :return: Генератор задач.
+        """
+        base = self._base_size() - len(self._deleted)
+        if index < base:
+            for position in self._positions(self._nth_position(index)):
+                yield self._task(position)
+            index = 0
+        else:
+            index -= base
+        yield from itertools.islice(self._added.values(), index, None)
+
+    def _overlay(self):
+        """
+        Перебрать измененные задачи снимка и добавленные задачи: их поля могут отличаться от записей снимка.
+
+        :return: Генератор пар (позиция записи или None для добавленных, задача).
+        """
+        for position in self._dirty:
+            yield position, self._cache[position]
+        for task in self._added.values():
+            yield None, task
+
+    def __len__(self):
+        return self._base_size() - len(self._deleted) + len(self._added)
+
+    def __iter__(self):
+        return self._iter_from(0)
+
+    def __contains__(self, task):
+        return self.get(task.id) is task
+
+    def __getitem__(self, index):
+        """
+        Получить задачу (или срез задач) по позиции в порядке обхода, декодируя только нужные задачи.
+
+        :param index: Позиция или срез.
+        :return: Задача или список задач.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return list(itertools.islice(self._iter_from(start), max(stop - start, 0)))
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс задачи вне диапазона.")
+        return next(self._iter_from(index))
+
+    def get(self, task_id):
+        """
+        Получить задачу по ID.
+
+        :param task_id: Идентификатор задачи.
+        :return: Задача или None, если не найдена.
+        """
+        task = self._added.get(task_id)
+        if task is None:
+            position = self._position(task_id)
+            if position is not None:
+                task = self._task(position)
+        return task
+
+    def append(self, task):
+        """
+        Добавить задачу.
+
+        :param task: Задача.
+        :raises ValueError: Если задача с таким ID уже есть.
+        """
+        with self.manager._lock:
+            if self.get(task.id) is not None:
+                raise ValueError(f"Задача с ID {task.id} уже существует.")
+            self._added[task.id] = task
+            self.manager._task_added(task)
+
+    def remove(self, task):
+        """
+        Удалить задачу.
+
+        :param task: Задача.
+        :raises ValueError: Если задачи нет в коллекции.
+        """
+        with self.manager._lock:
+            if task not in self:
+                raise ValueError(f"Задача с ID {task.id} не найдена.")
+            self.manager._remember_tasks(self)
+            self._pop(task.id)
+            self.manager._task_removed(task)
+
+    def clear(self):
+        """
+        Удалить все задачи.
+        """
+        with self.manager._lock:
+            self.manager._remember_tasks(self)
+            if not self._base_size():
+                task_ids = []
+            elif self._deleted:
+                task_ids = [self.snapshot.task_id(position) for position in self._positions()]
+            else:
+                task_ids = self.snapshot.ids.tolist()
+            task_ids.extend(self._added)
+            self._pop_all()
+            self.manager._tasks_cleared(task_ids)
+
+    def _put(self, task):
+        """
+        Добавить задачу или заменить задачу с тем же ID без уведомления менеджера.
+
+        :param task: Задача.
+        """
+        task._listener = self.manager._task_changed
+        position = self._position(task.id)
+        if position is None:
+            self._added[task.id] = task
+        else:
+            self._cache[position] = task
+            self._dirty.add(position)
+
+    def _pop(self, task_id):
+        """
+        Удалить задачу без уведомления менеджера.
+
+        :param task_id: Идентификатор задачи.
+        :return: Удаленная задача или None, если ее не было.
+        """
+        task = self._added.pop(task_id, None)
+        if task is None:
+            position = self._position(task_id)
+            if position is None:
+                return None
+            task = self._task(position)
+            self._deleted.add(position)
+            self._deleted_order = None
+            self._dirty.discard(position)
+        task._listener = None
+        return task
+
+    def _changed(self, task, old):
+        """
+        Учесть изменение полей задачи снимка: фильтры будут проверять ее по объекту, а не по записи снимка.
+
+        :param task: Измененная задача.
+        :param old: Словарь прежних значений измененных полей.
+        """
+        if self._added.get(task.id) is not task:
+            position = self._position(task.id)
+            if position is not None:
+                self._dirty.add(position)
+
+    def _pop_all(self):
+        """
+        Удалить все задачи без уведомления менеджера: снимок скрывается целиком.
+        """
+        for task in itertools.chain(self._cache.values(), self._added.values()):
+            task._listener = None
+        self._cleared = True
+        self._cache, self._added = {}, {}
+        self._deleted, self._dirty = set(), set()
+        self._deleted_order = None
+
+    def replay(self, records):
+        """
+        Применить записи журнала без уведомления менеджера.
+
+        :param records: Записи журнала.
+        """
+        for record in records:
+            match record["op"]:
+                case "add":
+                    task = self.get(record["task"]["id"])
+                    if task is None:
+                        self._put(Task.from_dict(record["task"]))
+                        continue
+                    fields = record["task"]
+                case "edit":
+                    task, fields = self.get(record["id"]), record["fields"]
+                case "mark_done":
+                    task, fields = self.get(record["id"]), {"status": "Выполнена"}
+                case "delete":
+                    self._pop(record["id"])
+                    continue
+                case "clear":
+                    self._pop_all()
+                    continue
+                case _:
+                    continue
+            if task is not None:
+                old = self.manager._assign(task, fields)
+                if old:
+                    self._changed(task, old)
+
+    def checkpoint(self):
+        """
+        Запомнить состав коллекции (для отката транзакции).
+
+        :return: Непрозрачное значение для restore().
+        """
+        return self._cleared, set(self._deleted), set(self._dirty), dict(self._cache), dict(self._added)
+
+    def restore(self, checkpoint, skip=()):
+        """
+        Восстановить состав коллекции, запомненный checkpoint(). Объекты задач, декодированные позже, сохраняются.
+
+        :param checkpoint: Значение, полученное от checkpoint().
+        :param skip: Идентификаторы объектов (id()) добавленных задач, которые не нужно восстанавливать.
+        """
+        self._cleared, self._deleted, dirty, cache, added = checkpoint
+        self._deleted_order = None
+        self._cache = {**self._cache, **cache}
+        self._dirty = (self._dirty | dirty) - self._deleted
+        listener = self.manager._task_changed
+        for position, task in self._cache.items():
+            task._listener = None if self._cleared or position in self._deleted else listener
+        self._added = {task_id: task for task_id, task in added.items() if id(task) not in skip}
+        for task in self._added.values():
+            task._listener = listener
+
+    def materialized(self):
+        """
+        Получить задачи коллекции, для которых уже созданы объекты.
+
+        :return: Список задач.
+        """
+        tasks = [task for position, task in self._cache.items() if position not in self._deleted]
+        return tasks + list(self._added.values())
+
+    def select(self, criteria, ignore_case=False):
+        """
+        Найти задачи по значениям категории, статуса и приоритета.
+
+        Задачи снимка берутся из самого короткого списка позиций подходящих значений, остальные поля
+        проверяются по кодам записи без декодирования строк; декодируются только найденные задачи.
+
+        :param criteria: Словарь {поле: значение}.
+        :param ignore_case: Сравнивать значения без учета регистра.
+        :return: Список задач в порядке обхода.
+        """
+        if ignore_case:
+            criteria = {field: value.casefold() for field, value in criteria.items()}
+
+        def accepts(task):
+            for field, value in criteria.items():
+                actual = getattr(task, field)
+                if (actual.casefold() if ignore_case else actual) != value:
+                    return False
+            return True
+
+        positions = [position for position in self._dirty if accepts(self._cache[position])]
+        if self._base_size():
+            snapshot, deleted, dirty = self.snapshot, self._deleted, self._dirty
+            codes = {field: set(snapshot.code(field, value, ignore_case)) for field, value in criteria.items()}
+            if all(codes.values()):
+                field = min(codes, key=lambda name: sum(snapshot.postings_size(name, code) for code in codes[name]))
+                checks = [(CODED_FIELDS.index(name), values) for name, values in codes.items() if name != field]
+                for position in heapq.merge(*(snapshot.postings(field, code) for code in codes[field])):
+                    if position in deleted or position in dirty:
+                        continue
+                    row = snapshot.codes(position)
+                    if all(row[index] in values for index, values in checks):
+                        positions.append(position)
+            positions.sort()
+        tasks = [self._task(position) for position in positions]
+        return tasks + [task for task in self._added.values() if accepts(task)]
+
+    def categories(self):
+        """
+        Получить категории, в которых есть задачи.
+
+        :return: Список категорий: сначала из словаря снимка, затем новые.
+        """
+        categories = {}
+        if self._base_size():
+            snapshot, deleted, dirty = self.snapshot, self._deleted, self._dirty
+            for code, category in enumerate(snapshot.values["category"]):
+                if any(p not in deleted and p not in dirty for p in snapshot.postings("category", code)):
+                    categories[category] = None
+        for _, task in self._overlay():
+            categories[task.category] = None
+        return list(categories)
+
+    def due(self, start=None, end=None, include_end=True, open_only=False, limit=None):
+        """
+        Найти задачи со сроком в интервале по индексу сроков снимка.
+
+        :param start: Начало интервала (date, включительно) или None.
+        :param end: Конец интервала (date) или None.
+        :param include_end: Включать задачи со сроком end.
+        :param open_only: Только невыполненные задачи.
+        :param limit: Максимальное число задач или None.
+        :return: Список задач, упорядоченный по сроку и ID.
+        """
+        def accepts(task):
+            due_date = task.due_date
+            if due_date is None or (start is not None and due_date < start):
+                return False
+            if end is not None and (due_date > end if include_end else due_date >= end):
+                return False
+            return not (open_only and task.status == "Выполнена")
+
+        tasks = [task for _, task in self._overlay() if accepts(task)]
+        if self._base_size():
+            snapshot, deleted, dirty = self.snapshot, self._deleted, self._dirty
+            done = snapshot.code("status", "Выполнена") if open_only else []
+            found = 0
+            for position in snapshot.due_positions(start, end, include_end):
+                if position in deleted or position in dirty or (done and snapshot.codes(position)[2] == done[0]):
+                    continue
+                tasks.append(self._task(position))
+                found += 1
+                if found == limit:
+                    break
+        tasks.sort(key=lambda task: (task.due_date, task.id))
+        return tasks if limit is None else tasks[:limit]
+
+    def stats(self):
+        """
+        Посчитать задачи коллекции, не декодируя задачи снимка: счетчики, записанные в снимок, исправляются
+        по удаленным и измененным задачам и дополняются добавленными. Для снимка без счетчиков задачи
+        снимка считаются по кодам записей.
+
+        :return: Экземпляр StatsIndex.
+        """
+        stats = StatsIndex()
+        if self._base_size():
+            snapshot = self.snapshot
+            if snapshot.stats is None:
+                for position in self._positions():
+                    if position not in self._dirty:
+                        stats.count(*snapshot.counted_fields(position))
+            else:
+                stats.merge(snapshot.stats)
+                for position in self._deleted | self._dirty:
+                    stats.count(*snapshot.counted_fields(position), -1)
+        for _, task in self._overlay():
+            stats.add(task)
+        return stats
+
+    def text_rows(self):
+        """
+        Перебрать ID, названия и описания всех задач, не создавая объекты Task для задач снимка.
+
+        :return: Генератор объектов с атрибутами id, title и description.
+        """
+        for position in self._positions():
+            if position in self._dirty:
+                yield self._cache[position]
+            else:
+                yield _TextRow(*self.snapshot.text(position))
+        yield from self._added.values()
+
+    def records(self):
+        """
+        Перебрать все задачи в виде словарей, не создавая объекты Task для задач снимка.
+
+        :return: Генератор словарей задач.
+        """
+        for position in self._positions():
+            yield self._cache[position].to_dict() if position in self._dirty else self.snapshot.record(position)
+        for task in self._added.values():
+            yield task.to_dict()
+
+    def close(self):
+        """
+        Закрыть снимок.
+        """
+        if self.snapshot is not None:
+            self.snapshot.close()
+
+
+class BinaryTaskManager(TaskManager):
+    """
+    Менеджер задач поверх двоичного снимка, открытого через mmap.
+
+    Запуск не декодирует задачи: открывается снимок и применяются записи журнала, поэтому время
+    запуска не зависит от числа задач. Задача декодируется при первом обращении — поиске по ID,
+    выводе страницы, попадании в результат фильтра. Фильтры по категории, статусу и приоритету
+    используют списки позиций снимка, запросы по сроку — индекс сроков снимка. Полнотекстовый
+    индекс строится при первом поиске (без создания объектов задач), порядок сортировки — при
+    первой сортировке (с декодированием всех задач), счетчики статистики — при первом запросе по
+    счетчикам, записанным в снимок; дальше они обновляются, как в TaskManager.
+
+    Атрибуты:
+        File_name (str): Имя файла снимка.
+        Storage (BinaryStorage): Хранилище задач.
+        Tasks (BinaryTaskList): Коллекция задач.
+    """
+
+    def __init__(self, file_name="tasks.bin", storage=None, save_delay=0, shared_read=False):
+        """
+        Инициализация менеджера задач.
+
+        :param file_name: Имя файла снимка.
+        :param storage: Хранилище BinaryStorage. Если None, используется журнал рядом с file_name.
+        :param save_delay: Задержка отложенной записи в секундах (0 — сохранять сразу).
+        :param shared_read: Подхватывать изменения других процессов перед каждым запросом.
+        """
+        super().__init__(
+            file_name, storage=storage if storage is not None else BinaryStorage(file_name), save_delay=save_delay,
+            shared_read=shared_read,
+        )
+
+    @staticmethod
+    def _create_indexes():
+        """
+        Создать вторичные индексы: они строятся по снимку при первом запросе.
+
+        :return: Пустой словарь.
+        """
+        return {}
+
+    @timed("load")
+    def load_tasks(self):
+        """
+        Открыть снимок и применить к нему записи журнала.
+
+        :return: Коллекция задач.
+        """
+        snapshot, records = self.storage.open_snapshot()
+        tasks = BinaryTaskList(self, snapshot)
+        tasks.replay(records)
+        self.next_id = self.storage.next_id
+        return tasks
+
+    def _reload(self):
+        """
+        Открыть снимок заново и повторно применить к нему несохраненные изменения этого менеджера.
+
+        Объекты уже декодированных задач сохраняются, поэтому ссылки на них остаются действительными.
+        Порядки сортировки и полнотекстовый индекс будут построены заново при следующем запросе.
+        """
+        snapshot, records = self.storage.open_snapshot()
+        mapping, free_id = renumber(self.storage.pending, self.storage.next_id)
+        self.unsaved.renumber(mapping)
+        old, tasks = self._tasks, BinaryTaskList(self, snapshot)
+        tasks.replay(records)
+        tasks.replay(self.storage.pending)
+        for task in old.materialized():
+            task.id = mapping.get(task.id, task.id)
+            current = tasks.get(task.id)
+            if current is None:
+                task._listener = None
+            elif current is not task:
+                self._assign(task, current.to_dict())
+                tasks._put(task)
+        old.close()
+        self._tasks = tasks
+        self._indexes.clear()
+        self.next_id = self.storage.next_id = replay({}, self.storage.pending, max(free_id, self.storage.next_id))
+
+    def _remember_tasks(self, tasks):
+        """
+        Запомнить состав задач перед первым удалением в транзакции.
+
+        :param tasks: Коллекция задач.
+        """
+        if self._undo is not None and self._undo_tasks is None:
+            self._undo_tasks = tasks.checkpoint()
+
+    def _rollback(self, next_id):
+        """
+        Отменить изменения транзакции в хранилище, в коллекции задач и в индексах.
+
+        Если в транзакции удалялись задачи, состав коллекции восстанавливается по запомненному,
+        а порядки сортировки и полнотекстовый индекс будут построены заново при следующем запросе.
+
+        :param next_id: Значение счетчика ID в начале транзакции.
+        """
+        self.storage.rollback()
+        self.next_id = next_id
+        tasks = self._tasks
+        indexes = self._indexes.values() if self._undo_tasks is None else ()
+        added = set()
+        for op, task, old in reversed(self._undo):
+            if op == "add":
+                added.add(id(task))
+                if task in tasks:
+                    tasks._pop(task.id)
+                    for index in indexes:
+                        index.discard(task)
+            else:
+                current = {field: getattr(task, field) for field in old}
+                for field, value in old.items():
+                    setattr(task, field, value)
+                task.version += 1
+                if task in tasks:
+                    for index in indexes:
+                        index.update(task, current)
+        if self._undo_tasks is not None:
+            tasks.restore(self._undo_tasks, added)
+            self._indexes.clear()
+
+    def close(self):
+        """
+        Сохранить изменения, закрыть хранилище и снимок.
+        """
+        super().close()
+        self._tasks.close()
+
+    def export_tasks(self, file_name):
+        """
+        Экспортировать задачи в файл формата tasks.json, не создавая объекты задач снимка.
+
+        :param file_name: Имя файла для экспорта.
+        """
+        export_json(self.tasks.records(), file_name)
+
+    def get_categories(self):
+        """
+        Получить список категорий, в которых есть задачи.
+
+        :return: Список категорий.
+        """
+        self._refresh_if_shared()
+        return self.tasks.categories()
+
+    @timed("filter")
+    def filter_tasks(self, category=None, status=None, priority=None, ignore_case=False):
+        """
+        Найти задачи по категории, статусу и приоритету по спискам позиций снимка.
+
+        :param category: Категория задачи.
+        :param status: Статус задачи.
+        :param priority: Приоритет задачи.
+        :param ignore_case: Сравнивать значения без учета регистра.
+        :return: Список подходящих задач.
+        """
+        self._refresh_if_shared()
+        criteria = {
+            field: value
+            for field, value in (("category", category), ("status", status), ("priority", priority))
+            if value is not None
+        }
+        if not criteria:
+            return list(self.tasks)
+        return self.tasks.select(criteria, ignore_case)
+
+    @timed("due")
+    def get_tasks_due_between(self, start, end):
+        """
+        Найти задачи со сроком выполнения в интервале.
+
+        :param start: Начало интервала (гггг-мм-дд или date, включительно).
+        :param end: Конец интервала (гггг-мм-дд или date, включительно).
+        :return: Список задач, упорядоченный по сроку.
+        :raises ValueError: Если граница интервала не является датой.
+        """
+        start, end = parse_date(start), parse_date(end)
+        self._refresh_if_shared()
+        return self.tasks.due(start, end)
+
+    @timed("due")
+    def get_overdue_tasks(self, today=None):
+        """
+        Найти невыполненные задачи с истекшим сроком.
+
+        :param today: Текущая дата (гггг-мм-дд или date). Если None, берется сегодняшняя.
+        :return: Список задач, упорядоченный по сроку.
+        """
+        today = parse_date(today) or date.today()
+        self._refresh_if_shared()
+        return self.tasks.due(end=today, include_end=False, open_only=True)
+
+    @timed("due")
+    def get_upcoming_tasks(self, limit=None, today=None, end=None):
+        """
+        Найти ближайшие по сроку невыполненные задачи, срок которых еще не истек.
+
+        :param limit: Максимальное число задач. Если None, возвращаются все.
+        :param today: Текущая дата (гггг-мм-дд или date). Если None, берется сегодняшняя.
+        :param end: Последний день (включительно). Если None, срок не ограничен сверху.
+        :return: Список задач, упорядоченный по сроку.
+        """
+        today = parse_date(today) or date.today()
+        self._refresh_if_shared()
+        return self.tasks.due(today, parse_date(end), open_only=True, limit=limit)
+
+    def _statistics(self):
+        """
+        Получить счетчики задач. Первое обращение считает их по счетчикам снимка и изменениям после его записи;
+        дальше они обновляются, как в TaskManager.
+
+        :return: Экземпляр StatsIndex.
+        """
+        index = self._indexes.get("stats")
+        if index is None:
+            index = self._indexes["stats"] = self.tasks.stats()
+        return index
+
+    @timed("search")
+    def search_tasks(self, query, match_all=None):
+        """
+        Найти задачи по словам в названии и описании. Первый поиск строит полнотекстовый индекс.
+
+        :param query: Текст запроса (слова через OR или ИЛИ — любое из слов).
+        :param match_all: True — все слова (AND), False — любое слово (OR), None — определить по запросу.
+        :return: Список задач, упорядоченный по убыванию релевантности.
+        """
+        query, match_all = self._parse_query(query, match_all)
+        self._refresh_if_shared()
+        with self._lock:
+            index = self._indexes.get("text")
+            if index is None:
+                index = FullTextIndex()
+                index.rebuild(self.tasks.text_rows())
+                self._indexes["text"] = index
+            task_ids = index.search(query, match_all)
+        return [self.tasks.get(task_id) for task_id in task_ids]
+
+
+def _check_target(file_name):
+    """
+    Проверить, что рядом с файлом, в который записывается результат преобразования, нет журнала.
+
+    :param file_name: Имя файла.
+    :raises ValueError: Если журнал есть: он относится к прежнему содержимому файла.
+    """
+    for journal in (f"{file_name}.journal", f"{file_name}.journal.1"):
+        if os.path.exists(journal):
+            raise ValueError(f"Рядом с файлом {file_name} есть журнал {journal}: удалите его или выберите другой файл.")
+
+
+def json_to_binary(source, target):
+    """
+    Преобразовать файл задач формата tasks.json (или JSONL) с его журналом в двоичный снимок.
+
+    :param source: Файл задач.
+    :param target: Файл двоичного снимка.
+    :return: Число задач.
+    :raises ValueError: Если рядом с target есть журнал или задачи нельзя записать в двоичный снимок.
+    """
+    _check_target(target)
+    storage = JournalStorage(source)
+    records = list(storage.iter_load())
+    write_binary_snapshot(target, records, storage.next_id)
+    return len(records)
+
+
+def binary_to_json(source, target):
+    """
+    Преобразовать двоичный снимок с его журналом в файл задач формата tasks.json (или JSONL по расширению).
+
+    :param source: Файл двоичного снимка.
+    :param target: Файл задач.
+    :return: Число задач.
+    :raises ValueError: Если рядом с target есть журнал или source не является двоичным снимком.
+    """
+    _check_target(target)
+    records = list(BinaryStorage(source).iter_load())
+    export_json(records, target)
+    return len(records)
+
+
+def main(argv=None):
+    """
+    Преобразовать файл задач: двоичный снимок — в формат tasks.json, остальные файлы — в двоичный снимок.
+
+    :param argv: Аргументы командной строки. Если None, берутся из sys.argv.
+    :return: Код завершения: 0 — успешно, 1 — ошибка.
+    """
+    parser = argparse.ArgumentParser(description="Преобразование файла задач между tasks.json и двоичным снимком.")
+    parser.add_argument("source", help="Исходный файл: tasks.json, JSONL или двоичный снимок.")
+    parser.add_argument("target", help="Файл результата.")
+    args = parser.parse_args(argv)
+    try:
+        if is_binary_snapshot(args.source):
+            count = binary_to_json(args.source, args.target)
+        else:
+            count = json_to_binary(args.source, args.target)
+    except (OSError, ValueError) as error:
+        print(f"Ошибка: {error}", file=sys.stderr)
+        return 1
+    print(f"Преобразовано задач: {count}.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
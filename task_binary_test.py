@@ -0,0 +1,206 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from task_benchmark import generate_realistic_tasks
+from task_binary import (
+    MAGIC, BinarySnapshot, BinaryTaskManager, binary_to_json, is_binary_snapshot, json_to_binary, main,
+    write_binary_snapshot,
+)
+from task_manager import Task, TaskManager
+from task_storage import import_json
+
+
+def ids(tasks):
+    """Получить ID задач."""
+    return [task.id for task in tasks]
+
+
+class TestBinarySnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем временный каталог и одинаковые задачи в двоичном снимке и в tasks.json."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.bin")
+        self.records = list(generate_realistic_tasks(300, seed=5))
+        write_binary_snapshot(self.file_name, self.records)
+        self.expected = TaskManager(os.path.join(self.tmp_dir.name, "tasks.json"))
+        with self.expected.batch():
+            for record in self.records:
+                self.expected.tasks.append(Task.from_dict(record))
+
+    def tearDown(self):
+        """Закрытие менеджера и удаление временного каталога."""
+        self.expected.close()
+        self.tmp_dir.cleanup()
+
+    def assertSameQueries(self, manager):
+        """Проверить, что запросы менеджера дают те же задачи, что и TaskManager."""
+        expected = self.expected
+        self.assertEqual([task.to_dict() for task in manager.tasks], [task.to_dict() for task in expected.tasks])
+        self.assertEqual(ids(manager.tasks[10:25]), ids(expected.tasks[10:25]))
+        self.assertEqual(sorted(manager.get_categories()), sorted(expected.get_categories()))
+        for criteria in ({"category": "Работа"}, {"category": "работа", "status": "выполнена"}, {"priority": "Нет"}):
+            ignore_case = criteria.get("category", "").islower()
+            self.assertEqual(
+                ids(manager.filter_tasks(**criteria, ignore_case=ignore_case)),
+                ids(expected.filter_tasks(**criteria, ignore_case=ignore_case)),
+            )
+        self.assertEqual(
+            ids(manager.get_tasks_due_between("2025-01-01", "2025-01-15")),
+            ids(expected.get_tasks_due_between("2025-01-01", "2025-01-15")),
+        )
+        self.assertEqual(ids(manager.get_overdue_tasks("2025-01-10")), ids(expected.get_overdue_tasks("2025-01-10")))
+        self.assertEqual(
+            ids(manager.get_upcoming_tasks(7, "2025-01-10")), ids(expected.get_upcoming_tasks(7, "2025-01-10"))
+        )
+        self.assertEqual(ids(manager.search_tasks("отчет OR счет")), ids(expected.search_tasks("отчет OR счет")))
+        self.assertEqual(ids(manager.sort_tasks()), ids(expected.sort_tasks()))
+        self.assertEqual(manager.get_statistics("2025-01-10"), expected.get_statistics("2025-01-10"))
+
+    def test_snapshot(self):
+        """Тест на чтение записей снимка, поиск по ID и проверку заголовка."""
+        self.assertTrue(is_binary_snapshot(self.file_name))
+        with BinarySnapshot(self.file_name) as snapshot:
+            self.assertEqual(list(snapshot.records()), self.records)
+            self.assertEqual(snapshot.next_id, 301)
+            self.assertEqual(snapshot.record(snapshot.position(42)), self.records[41])
+            self.assertIsNone(snapshot.position(1000))
+
+        with open(self.file_name, "r+b") as file:
+            file.seek(len(MAGIC))
+            file.write(struct.pack("<H", 99))
+        with self.assertRaisesRegex(ValueError, "версия"):
+            BinarySnapshot(self.file_name)
+        other = os.path.join(self.tmp_dir.name, "other.bin")
+        with open(other, "wb") as file:
+            file.write(b"[]" * 64)
+        with self.assertRaisesRegex(ValueError, "не является"):
+            BinarySnapshot(other)
+        with self.assertRaisesRegex(ValueError, "Повторяющийся ID"):
+            write_binary_snapshot(self.file_name, self.records[:2] + self.records[:1])
+
+    def test_lazy_decoding(self):
+        """Тест на то, что запуск и вывод страницы декодируют только нужные задачи."""
+        manager = BinaryTaskManager(self.file_name)
+        self.assertEqual((len(manager.tasks), len(manager.tasks._cache)), (300, 0))
+        with redirect_stdout(io.StringIO()):
+            manager.show_tasks(page=3, page_size=10)
+        self.assertEqual(sorted(manager.tasks._cache), list(range(20, 30)))
+        self.assertIs(manager.get_task_by_id(25), manager.tasks[24])
+        found = manager.search_tasks("отчет")
+        self.assertEqual(len(manager.tasks._cache), len({task.id for task in found} | set(range(21, 31))))
+        self.assertEqual(manager.get_statistics("2025-01-10"), self.expected.get_statistics("2025-01-10"))
+        self.assertEqual(len(manager.tasks._cache), len({task.id for task in found} | set(range(21, 31))))
+        manager.close()
+
+    def test_legacy_due_dates(self):
+        """Тест на преобразование задач, записанных до проверки сроков: срок дд.мм.гггг записывается как дата."""
+        file_name = os.path.join(self.tmp_dir.name, "legacy.bin")
+        record = dict(self.records[0], id=1, due_date="31.12.2024")
+        write_binary_snapshot(file_name, [record, Task.from_dict(dict(record, id=2))])
+        manager = BinaryTaskManager(file_name)
+        self.assertEqual([task.to_dict() for task in manager.tasks], [
+            dict(record, due_date="2024-12-31"), dict(record, id=2, due_date="2024-12-31"),
+        ])
+        manager.close()
+        with self.assertLogs("task_manager.load"):
+            task = Task.from_dict(dict(record, due_date="завтра"))
+        for item in (dict(record, due_date="завтра"), task):
+            with self.assertRaisesRegex(ValueError, "завтра"):
+                write_binary_snapshot(file_name, [item])
+
+    def test_statistics_without_saved_counters(self):
+        """Тест на статистику по снимку, записанному без счетчиков: задачи считаются по записям снимка."""
+        manager = BinaryTaskManager(self.file_name)
+        manager.tasks.remove(manager.get_task_by_id(4))
+        manager.get_task_by_id(5).mark_as_done()
+        self.expected.tasks.remove(self.expected.get_task_by_id(4))
+        self.expected.get_task_by_id(5).mark_as_done()
+        manager.tasks.snapshot.stats = None
+        self.assertEqual(manager.get_statistics("2025-01-10"), self.expected.get_statistics("2025-01-10"))
+        manager.close()
+
+    def test_changes(self):
+        """Тест на запросы после изменений, после повторного открытия и после уплотнения журнала в снимок."""
+        for manager in (BinaryTaskManager(self.file_name), self.expected):
+            manager.search_tasks("отчет")
+            manager.sort_tasks()
+            with manager.batch():
+                manager.get_task_by_id(3).edit(title="Новый отчет", category="Новая", due_date="2025-01-05")
+                manager.get_task_by_id(8).mark_as_done()
+                manager.tasks.remove(manager.get_task_by_id(10))
+                manager.add_task("Счет за свет", "Оплатить", "Работа", "2025-01-12", "Высокий")
+        self.assertSameQueries(manager)
+        manager.close()
+
+        manager = BinaryTaskManager(self.file_name)
+        self.assertSameQueries(manager)
+        manager.storage.compact(wait=True)
+        manager.close()
+        manager = BinaryTaskManager(self.file_name)
+        self.assertEqual(len(manager.storage.pending), 0)
+        self.assertSameQueries(manager)
+        manager.close()
+
+    def test_rollback(self):
+        """Тест на откат транзакции с изменением, удалением, очисткой и добавлением задач."""
+        manager = BinaryTaskManager(self.file_name)
+        task = manager.get_task_by_id(7)
+        with self.assertRaises(RuntimeError), manager.batch():
+            manager.get_task_by_id(2).edit(title="Изменено")
+            manager.tasks.remove(task)
+            manager.tasks.clear()
+            manager.add_task("Новая", "", "Работа", "", "Низкий")
+            raise RuntimeError
+        self.assertIs(manager.get_task_by_id(7), task)
+        self.assertFalse(manager.has_unsaved_changes())
+        self.assertSameQueries(manager)
+        manager.close()
+
+    def test_other_process_changes(self):
+        """Тест на изменения другого процесса: по журналу и после уплотнения, сохраняя объекты задач."""
+        manager = BinaryTaskManager(self.file_name)
+        task = manager.get_task_by_id(5)
+        other = BinaryTaskManager(self.file_name)
+        other.get_task_by_id(5).edit(title="Изменено другим процессом")
+        other.add_task("Чужая задача", "", "Дом", "", "Низкий")
+        other.close()
+        self.assertTrue(manager.refresh())
+        self.assertEqual((task.title, manager.get_task_by_id(301).title), ("Изменено другим процессом", "Чужая задача"))
+
+        other = BinaryTaskManager(self.file_name)
+        other.tasks.remove(other.get_task_by_id(6))
+        other.storage.compact(wait=True)
+        other.close()
+        manager.add_task("Своя задача", "", "Дом", "", "Низкий")
+        self.assertIs(manager.get_task_by_id(5), task)
+        self.assertEqual((manager.get_task_by_id(6), len(manager.tasks)), (None, 301))
+        manager.close()
+
+    def test_convert(self):
+        """Тест на преобразование tasks.json в двоичный снимок и обратно, в том числе из командной строки."""
+        json_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        self.expected.get_task_by_id(1).mark_as_done()
+        self.expected.close()
+        binary_name = os.path.join(self.tmp_dir.name, "converted.bin")
+        self.assertEqual(json_to_binary(json_name, binary_name), 300)
+        with BinarySnapshot(binary_name) as snapshot:
+            self.assertEqual(snapshot.record(0)["status"], "Выполнена")
+        back = os.path.join(self.tmp_dir.name, "back.json")
+        self.assertEqual(binary_to_json(binary_name, back), 300)
+        self.assertEqual(import_json(back), [task.to_dict() for task in self.expected.tasks])
+
+        with redirect_stderr(io.StringIO()):
+            self.assertEqual(main([binary_name, os.path.join(self.tmp_dir.name, "cli.jsonl")]), 0)
+            self.assertEqual(main([json_name, binary_name]), 0)
+            BinaryTaskManager(binary_name).close()
+            with open(f"{binary_name}.journal", "ab"):
+                pass
+            self.assertEqual(main([json_name, binary_name]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,372 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from contextlib import contextmanager
+from task_binary import BINARY_EXTENSION, BinaryTaskManager
+from task_manager import TaskManager
+from task_parallel import ParallelEngine
+from task_profile import profile_session
+from task_shard import SHARDS_EXTENSION, ShardedTaskManager
+from task_sqlite import SqliteTaskManager
+from task_storage import iter_snapshot
+
+COLUMNS = ("id", "title", "description", "category", "due_date", "priority", "status")
+FORMATS = ("jsonl", "csv", "json")
+
+
+def detect_format(file_name, default="jsonl"):
+    """
+    Определить формат файла задач по расширению.
+
+    :param file_name: Имя файла или "-" для стандартного ввода/вывода.
+    :param default: Формат, если расширение не распознано.
+    :return: Формат: jsonl, csv или json.
+    """
+    extension = os.path.splitext(file_name)[1].lstrip(".").lower()
+    return extension if extension in FORMATS else default
+
+
+def read_records(file, fmt):
+    """
+    Читать задачи из открытого файла потоково.
+
+    :param file: Текстовый файл, открытый на чтение.
+    :param fmt: Формат: jsonl, csv или json.
+    :return: Генератор словарей задач.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(file)
+    elif fmt == "json" and file is not sys.stdin:
+        yield from iter_snapshot(file.name)
+    elif fmt == "json":
+        yield from json.load(file)
+    else:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_records(file, records, fmt):
+    """
+    Записать задачи в открытый файл потоково.
+
+    :param file: Текстовый файл, открытый на запись.
+    :param records: Итерируемый набор словарей задач.
+    :param fmt: Формат: jsonl, csv или json.
+    :return: Число записанных задач.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(file, COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        for count, record in enumerate(records, start=1):
+            writer.writerow(record)
+    elif fmt == "json":
+        file.write("[")
+        for count, record in enumerate(records, start=1):
+            file.write(("\n    " if count == 1 else ",\n    ") + json.dumps(record, ensure_ascii=False))
+        file.write("\n]\n" if count else "]\n")
+    else:
+        for count, record in enumerate(records, start=1):
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return count
+
+
+@contextmanager
+def _open(file_name, mode):
+    """
+    Открыть файл задач или стандартный поток, если имя файла "-".
+
+    :param file_name: Имя файла или "-".
+    :param mode: Режим открытия: "r" или "w".
+    :return: Контекстный менеджер открытого файла.
+    """
+    if file_name == "-":
+        yield sys.stdin if mode == "r" else sys.stdout
+    else:
+        with open(file_name, mode, encoding="utf-8", newline="") as file:
+            yield file
+
+
+def _task(manager, task_id):
+    """
+    Найти задачу по ID.
+
+    :param manager: Менеджер задач.
+    :param task_id: Идентификатор задачи.
+    :return: Задача.
+    :raises LookupError: Если задача не найдена.
+    """
+    task = manager.get_task_by_id(task_id)
+    if task is None:
+        raise LookupError(f"Задача {task_id} не найдена.")
+    return task
+
+
+def _output(manager, tasks, args):
+    """
+    Вывести задачи таблицей или в формате jsonl/csv/json.
+
+    :param manager: Менеджер задач.
+    :param tasks: Итерируемый набор задач.
+    :param args: Аргументы командной строки (format, page, limit).
+    """
+    if args.format == "table":
+        tasks = list(tasks)
+        manager.show_tasks(tasks, page=args.page, page_size=args.limit or max(len(tasks), 1))
+    else:
+        write_records(sys.stdout, (task.to_dict() for task in tasks), args.format)
+
+
+def cmd_add(manager, args):
+    """
+    Добавить задачу и вывести ее ID.
+
+    :param manager: Менеджер задач.
+    :param args: Аргументы команды.
+    """
+    task = manager.add_task(args.title, args.description, args.category, args.due_date, args.priority)
+    print(task.id)
+
+
+def cmd_edit(manager, args):
+    """
+    Изменить заданные поля задачи.
+
+    :param manager: Менеджер задач.
+    :param args: Аргументы команды.
+    """
+    task = _task(manager, args.id)
+    task.edit(args.title, args.description, args.category, args.due_date, args.priority)
+    manager.save_tasks()
+
+
+def cmd_done(manager, args):
+    """
+    Отметить задачи как выполненные одной транзакцией.
+
+    :param manager: Менеджер задач.
+    :param args: Аргументы команды.
+    """
+    with manager.batch():
+        for task_id in args.ids:
+            _task(manager, task_id).mark_as_done()
+
+
+def cmd_delete(manager, args):
+    """
+    Удалить задачи по ID, по категории или все одной транзакцией.
+
+    :param manager: Менеджер задач.
+    :param args: Аргументы команды.
+    """
+    with manager.batch():
+        if args.all:
+            manager.tasks.clear()
+        elif args.category is not None:
+            manager.delete_category(args.category)
+        else:
+            for task_id in args.ids:
+                manager.tasks.remove(_task(manager, task_id))
+
+
+def cmd_list(manager, args):
+    """
+    Вывести задачи с фильтрацией по категории, статусу и приоритету.
+
+    :param manager: Менеджер задач.
+    :param args: Аргументы команды.
+    """
+    if args.category is None and args.status is None and args.priority is None:
+        _output(manager, manager.tasks, args)
+    else:
+        _output(manager, manager.filter_tasks(args.category, args.status, args.priority), args)
+
+
+def cmd_search(manager, args):
+    """
+    Вывести задачи, найденные по словам в названии и описании: по полнотекстовому индексу или, с --substring
+    и --regex, полным просмотром задач в пуле процессов.
+
+    :param manager: Менеджер задач.
+    :param args: Аргументы команды.
+    """
+    if not (args.substring or args.regex):
+        _output(manager, manager.search_tasks(args.query), args)
+        return
+    with ParallelEngine(args.workers) as engine:
+        if args.regex:
+            tasks = engine.search_regex(manager, args.query)
+        else:
+            tasks = engine.search(manager, args.query)
+    _output(manager, tasks, args)
+
+
+def cmd_stats(manager, args):
+    """
+    Вывести статистику задач в формате JSON.
+
+    :param manager: Менеджер задач.
+    :param args: Аргументы команды.
+    """
+    print(json.dumps(manager.get_statistics(args.today), ensure_ascii=False, indent=4))
+
+
+def cmd_import(manager, args):
+    """
+    Импортировать задачи из файла или стандартного ввода потоково, порциями по chunk_size задач.
+
+    С --replace записи сначала проверяются целиком (см. TaskManager.replace_tasks): если в них есть ошибка,
+    прежние задачи остаются без изменений.
+
+    :param manager: Менеджер задач.
+    :param args: Аргументы команды.
+    """
+    fmt = args.format or detect_format(args.file)
+    with _open(args.file, "r") as file:
+        records = read_records(file, fmt)
+        if args.replace:
+            count = manager.replace_tasks(records, args.chunk_size)
+        else:
+            count = manager.append_tasks(records, args.chunk_size)
+    print(f"Импортировано задач: {count}.", file=sys.stderr)
+
+
+def cmd_export(manager, args):
+    """
+    Экспортировать задачи в файл или стандартный вывод потоково.
+
+    :param manager: Менеджер задач.
+    :param args: Аргументы команды.
+    """
+    fmt = args.format or detect_format(args.file)
+    with _open(args.file, "w") as file:
+        count = write_records(file, (task.to_dict() for task in manager.tasks), fmt)
+    print(f"Экспортировано задач: {count}.", file=sys.stderr)
+
+
+def build_parser():
+    """
+    Создать разбор аргументов командной строки.
+
+    :return: Экземпляр argparse.ArgumentParser.
+    """
+    parser = argparse.ArgumentParser(description="Менеджер задач из командной строки.")
+    parser.add_argument(
+        "--file", dest="tasks_file", default="tasks.json",
+        help=(
+            "Файл задач (по умолчанию tasks.json). Файл .bin открывается как двоичный снимок через mmap, "
+            "каталог .shards — как хранилище по сегментам категорий."
+        ),
+    )
+    parser.add_argument("--db", help="База SQLite вместо файла задач: задачи не загружаются в память.")
+    parser.add_argument(
+        "--profile", action="store_true", help="Вывести в stderr время операций менеджера задач после команды.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_fields(command):
+        command.add_argument("--description", default="", help="Описание задачи.")
+        command.add_argument("--category", default="", help="Категория задачи.")
+        command.add_argument("--due-date", default="", help="Срок выполнения (гггг-мм-дд).")
+        command.add_argument("--priority", default="", help="Приоритет (низкий, средний, высокий).")
+
+    def add_output(command):
+        command.add_argument("--format", choices=("table",) + FORMATS, default="table", help="Формат вывода.")
+        command.add_argument("--page", type=int, default=1, help="Номер страницы таблицы.")
+        command.add_argument("--limit", type=int, help="Число задач на странице таблицы.")
+
+    command = commands.add_parser("add", help="Добавить задачу и вывести ее ID.")
+    command.add_argument("title", help="Название задачи.")
+    add_fields(command)
+    command.set_defaults(handler=cmd_add)
+
+    command = commands.add_parser("edit", help="Изменить поля задачи.")
+    command.add_argument("id", type=int, help="ID задачи.")
+    command.add_argument("--title", default="", help="Название задачи.")
+    add_fields(command)
+    command.set_defaults(handler=cmd_edit)
+
+    command = commands.add_parser("done", help="Отметить задачи как выполненные.")
+    command.add_argument("ids", type=int, nargs="+", metavar="id", help="ID задач.")
+    command.set_defaults(handler=cmd_done)
+
+    command = commands.add_parser("delete", help="Удалить задачи по ID, по категории или все.")
+    target = command.add_mutually_exclusive_group(required=True)
+    target.add_argument("ids", type=int, nargs="*", metavar="id", default=[], help="ID задач.")
+    target.add_argument("--category", help="Удалить задачи категории.")
+    target.add_argument("--all", action="store_true", help="Удалить все задачи.")
+    command.set_defaults(handler=cmd_delete)
+
+    command = commands.add_parser("list", help="Вывести задачи с фильтрацией.")
+    command.add_argument("--category", help="Категория задачи.")
+    command.add_argument("--status", help="Статус задачи.")
+    command.add_argument("--priority", help="Приоритет задачи.")
+    add_output(command)
+    command.set_defaults(handler=cmd_list)
+
+    command = commands.add_parser("search", help="Найти задачи по словам в названии и описании.")
+    command.add_argument("query", help="Текст запроса (слова через OR — любое из слов).")
+    mode = command.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--substring", action="store_true", help="Искать подстроки в любом месте текста полным просмотром задач.",
+    )
+    mode.add_argument("--regex", action="store_true", help="Запрос — регулярное выражение (полный просмотр задач).")
+    command.add_argument(
+        "--workers", type=int, help="Число процессов для полного просмотра (по умолчанию по числу процессоров).",
+    )
+    add_output(command)
+    command.set_defaults(handler=cmd_search)
+
+    command = commands.add_parser("stats", help="Вывести статистику задач в формате JSON.")
+    command.add_argument("--today", help="Дата для подсчета просроченных задач (гггг-мм-дд, по умолчанию сегодня).")
+    command.set_defaults(handler=cmd_stats)
+
+    command = commands.add_parser("import", help="Импортировать задачи из файла или стандартного ввода.")
+    command.add_argument("file", help="Файл задач или - для стандартного ввода.")
+    command.add_argument("--format", choices=FORMATS, help="Формат (по умолчанию по расширению, иначе jsonl).")
+    command.add_argument(
+        "--replace", action="store_true", help="Заменить существующие задачи импортируемыми.",
+    )
+    command.add_argument("--chunk-size", type=int, default=10000, help="Число задач в одной транзакции.")
+    command.set_defaults(handler=cmd_import)
+
+    command = commands.add_parser("export", help="Экспортировать задачи в файл или стандартный вывод.")
+    command.add_argument("file", help="Файл задач или - для стандартного вывода.")
+    command.add_argument("--format", choices=FORMATS, help="Формат (по умолчанию по расширению, иначе jsonl).")
+    command.set_defaults(handler=cmd_export)
+    return parser
+
+
+def main(argv=None):
+    """
+    Выполнить команду менеджера задач из командной строки.
+
+    :param argv: Аргументы командной строки. Если None, берутся из sys.argv.
+    :return: Код завершения: 0 — успешно, 1 — ошибка.
+    """
+    args = build_parser().parse_args(argv)
+    with profile_session(report=args.profile):
+        if args.db:
+            manager = SqliteTaskManager(args.db)
+        elif args.tasks_file.endswith(BINARY_EXTENSION):
+            manager = BinaryTaskManager(args.tasks_file)
+        elif args.tasks_file.endswith(SHARDS_EXTENSION):
+            manager = ShardedTaskManager(args.tasks_file)
+        else:
+            manager = TaskManager(args.tasks_file)
+        try:
+            args.handler(manager, args)
+        except (LookupError, ValueError, csv.Error) as error:
+            message = f"нет поля {error}" if isinstance(error, KeyError) else error
+            print(f"Ошибка: {message}", file=sys.stderr)
+            return 1
+        finally:
+            manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+from task_cli import main, read_records, write_records
+from task_storage import JournalStorage
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем временный каталог для файлов задач."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def run_cli(self, *argv, db=False):
+        """Выполнить команду и вернуть код завершения и стандартный вывод."""
+        output = io.StringIO()
+        storage = ["--db", os.path.join(self.tmp_dir.name, "tasks.db")] if db else ["--file", self.file_name]
+        with redirect_stdout(output), redirect_stderr(io.StringIO()):
+            code = main([*storage, *argv])
+        return code, output.getvalue()
+
+    def list_tasks(self, *argv, db=False):
+        """Получить задачи командой list в формате JSONL."""
+        code, output = self.run_cli("list", "--format", "jsonl", *argv, db=db)
+        self.assertEqual(code, 0)
+        return [json.loads(line) for line in output.splitlines()]
+
+    def test_commands(self):
+        """Тест на команды add, edit, done, delete, list и stats."""
+        self.assertEqual(self.run_cli("add", "Отчет", "--category", "Работа", "--priority", "Высокий"), (0, "1\n"))
+        self.assertEqual(self.run_cli("add", "Ёлка", "--category", "Личное"), (0, "2\n"))
+        self.assertEqual(self.run_cli("add", "Билеты", "--category", "Личное"), (0, "3\n"))
+        self.run_cli("edit", "2", "--title", "Купить ёлку")
+        self.run_cli("done", "1", "2")
+        self.run_cli("delete", "3")
+
+        tasks = self.list_tasks()
+        self.assertEqual([(task["title"], task["status"]) for task in tasks], [
+            ("Отчет", "Выполнена"), ("Купить ёлку", "Выполнена"),
+        ])
+        self.assertEqual([task["id"] for task in self.list_tasks("--category", "Личное")], [2])
+        code, output = self.run_cli("search", "ёлку")
+        self.assertIn("Купить ёлку", output)
+        code, output = self.run_cli("stats", "--today", "2025-01-01")
+        self.assertEqual((code, json.loads(output)["completion_rate"]), (0, 1.0))
+
+        self.run_cli("delete", "--category", "Работа")
+        self.assertEqual([task["id"] for task in self.list_tasks()], [2])
+        self.run_cli("delete", "--all")
+        self.assertEqual(self.list_tasks(), [])
+
+    def test_unknown_task(self):
+        """Тест на код ошибки и отмену всей команды, если задача не найдена."""
+        self.run_cli("add", "Task 1")
+        self.assertEqual(self.run_cli("done", "1", "5")[0], 1)
+        self.assertEqual(self.list_tasks()[0]["status"], "Не выполнена")
+
+    def test_import_export(self):
+        """Тест на экспорт и импорт задач в форматах CSV, JSONL и JSON."""
+        self.run_cli("add", "Task 1", "--description", "Строка, с запятой")
+        self.run_cli("add", "Task 2")
+        self.run_cli("done", "2")
+        expected = self.list_tasks()
+        for extension in ("csv", "jsonl", "json"):
+            export_name = os.path.join(self.tmp_dir.name, f"export.{extension}")
+            self.assertEqual(self.run_cli("export", export_name)[0], 0)
+            self.run_cli("import", export_name, "--replace")
+            self.assertEqual(self.list_tasks(), expected)
+
+        self.run_cli("import", os.path.join(self.tmp_dir.name, "export.csv"))
+        self.assertEqual([task["id"] for task in self.list_tasks()], [1, 2, 3, 4])
+
+    def test_failed_replace(self):
+        """Тест на импорт с --replace, прерванный ошибкой: прежние задачи остаются без изменений."""
+        import_name = os.path.join(self.tmp_dir.name, "import.jsonl")
+        with open(import_name, "w", encoding="utf-8") as file:
+            for due_date in ("2024-12-31", "2025-01-01", "31.12.2024"):
+                file.write(json.dumps({
+                    "title": "Imported", "description": "", "category": "Работа", "due_date": due_date,
+                    "priority": "Низкий",
+                }) + "\n")
+        for db in (False, True):
+            self.run_cli("add", "Task 1", db=db)
+            self.run_cli("add", "Task 2", db=db)
+            expected = self.list_tasks(db=db)
+            self.assertEqual(self.run_cli("import", import_name, "--replace", "--chunk-size", "1", db=db)[0], 1)
+            self.assertEqual(self.list_tasks(db=db), expected)
+
+    def test_replace_chunks(self):
+        """Тест на импорт с --replace: несохраненные изменения хранилища не превышают --chunk-size."""
+        records = "".join(
+            json.dumps({"title": f"Task {number}", "description": "", "category": "Работа", "due_date": "",
+                        "priority": "Низкий"}) + "\n"
+            for number in range(25)
+        )
+        for _ in range(15):
+            self.run_cli("add", "Old task")
+        sizes = []
+        save = JournalStorage.save
+
+        def tracked_save(storage, tasks):
+            sizes.append(len(storage.pending))
+            save(storage, tasks)
+
+        with patch("sys.stdin", io.StringIO(records)), patch.object(JournalStorage, "save", tracked_save):
+            self.assertEqual(self.run_cli("import", "-", "--replace", "--chunk-size", "10")[0], 0)
+        self.assertLessEqual(max(sizes), 10)
+        self.assertEqual([task["title"] for task in self.list_tasks()], [f"Task {number}" for number in range(25)])
+
+    def test_pipe_to_sqlite(self):
+        """Тест на импорт из стандартного ввода в базу SQLite и экспорт в стандартный вывод."""
+        records = "".join(
+            json.dumps({"title": f"Task {number}", "description": "", "category": "Работа", "due_date": "",
+                        "priority": "Низкий"}) + "\n"
+            for number in range(25)
+        )
+        with patch("sys.stdin", io.StringIO(records)):
+            self.assertEqual(self.run_cli("import", "-", "--chunk-size", "10", db=True)[0], 0)
+
+        code, output = self.run_cli("export", "-", "--format", "csv", db=True)
+        self.assertEqual(len(output.splitlines()), 26)
+        self.assertEqual(len(self.list_tasks("--status", "Не выполнена", db=True)), 25)
+
+    def test_records_roundtrip(self):
+        """Тест на потоковое чтение и запись задач в форматах JSONL и CSV с переводами строк."""
+        records = [{
+            "id": 1, "title": "Task 1", "description": "Многострочное\nописание", "category": "Работа",
+            "due_date": "2024-12-31", "priority": "Низкий", "status": "Не выполнена",
+        }]
+        for fmt in ("jsonl", "csv"):
+            file = io.StringIO()
+            self.assertEqual(write_records(file, iter(records), fmt), 1)
+            file.seek(0)
+            loaded = list(read_records(file, fmt))
+            self.assertEqual(loaded[0]["description"], records[0]["description"])
+
+
+if __name__ == "__main__":
+    unittest.main()
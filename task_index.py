@@ -0,0 +1,837 @@
+import bisect
+import functools
+import itertools
+import json
+import math
+import os
+import re
+from datetime import date
+from operator import attrgetter
+from task_storage import _write_atomic
+
+MERGE_THRESHOLD = 64
+PRIORITY_RANKS = {"низкий": 0, "средний": 1, "высокий": 2}
+
+
+def _merge_sorted(items, pending):
+    """
+    Добавить накопленные элементы в отсортированный список.
+
+    Несколько элементов вставляются двоичным поиском, а большая пачка (например, после
+    массового добавления задач) добавляется в конец одной сортировкой, которая для почти
+    упорядоченного списка работает за линейное время.
+
+    :param items: Отсортированный список, изменяется на месте.
+    :param pending: Список добавляемых элементов, очищается.
+    """
+    if len(pending) <= MERGE_THRESHOLD:
+        for item in pending:
+            bisect.insort(items, item)
+    else:
+        items.extend(pending)
+        items.sort()
+    pending.clear()
+
+
+class HashIndex:
+    """
+    Хеш-индекс задач по значению поля.
+
+    Атрибуты:
+        Field (str): Имя индексируемого поля задачи.
+        Buckets (dict): Словарь {значение: {id: задача}}.
+    """
+
+    def __init__(self, field):
+        """
+        Инициализация индекса.
+
+        :param field: Имя индексируемого поля задачи.
+        """
+        self.field = field
+        self.buckets = {}
+
+    def add(self, task):
+        """
+        Добавить задачу в индекс.
+
+        :param task: Задача.
+        """
+        self.buckets.setdefault(getattr(task, self.field), {})[task.id] = task
+
+    def discard(self, task, value=None):
+        """
+        Удалить задачу из индекса.
+
+        :param task: Задача.
+        :param value: Значение поля, под которым задача лежит в индексе. Если None, берется текущее.
+        """
+        if value is None:
+            value = getattr(task, self.field)
+        bucket = self.buckets.get(value)
+        if bucket is not None:
+            bucket.pop(task.id, None)
+            if not bucket:
+                del self.buckets[value]
+
+    def update(self, task, old):
+        """
+        Обновить положение задачи в индексе после изменения полей.
+
+        :param task: Измененная задача.
+        :param old: Словарь прежних значений измененных полей.
+        """
+        if self.field in old:
+            self.discard(task, old[self.field])
+            self.add(task)
+
+    def clear(self):
+        """
+        Очистить индекс.
+        """
+        self.buckets.clear()
+
+    def rebuild(self, tasks):
+        """
+        Построить индекс заново по набору задач.
+
+        :param tasks: Итерируемый набор задач.
+        """
+        self.clear()
+        for task in tasks:
+            self.add(task)
+
+    def values(self):
+        """
+        Получить все значения поля, под которыми есть задачи.
+
+        :return: Список значений.
+        """
+        return list(self.buckets)
+
+    def get(self, value):
+        """
+        Получить задачи с данным значением поля.
+
+        :param value: Значение поля.
+        :return: Список задач.
+        """
+        return list(self.buckets.get(value, {}).values())
+
+
+class SortedIndex:
+    """
+    Упорядоченный индекс задач по значению поля для запросов по диапазону.
+
+    Пустые значения поля в индекс не попадают. Условие condition позволяет держать
+    в индексе только часть задач (например, только невыполненные). Добавленные задачи
+    накапливаются и встраиваются в упорядоченный список перед следующим запросом.
+
+    Атрибуты:
+        Field (str): Имя индексируемого поля задачи.
+        Condition (callable): Условие попадания задачи в индекс или None.
+        Depends_on (tuple): Поля, от которых зависит условие.
+        Keys (list): Отсортированный список троек (значение, id, задача).
+    """
+
+    def __init__(self, field, condition=None, depends_on=()):
+        """
+        Инициализация индекса.
+
+        :param field: Имя индексируемого поля задачи.
+        :param condition: Условие попадания задачи в индекс. Если None, индексируются все задачи.
+        :param depends_on: Поля, от которых зависит условие.
+        """
+        self.field = field
+        self.condition = condition
+        self.depends_on = depends_on
+        self.keys = []
+        self._pending = []
+
+    def _accepts(self, task):
+        """
+        Проверить, должна ли задача попасть в индекс.
+
+        :param task: Задача.
+        :return: True, если задача индексируется.
+        """
+        return bool(getattr(task, self.field)) and (self.condition is None or self.condition(task))
+
+    def add(self, task):
+        """
+        Добавить задачу в индекс.
+
+        :param task: Задача.
+        """
+        if self._accepts(task):
+            self._pending.append((getattr(task, self.field), task.id, task))
+
+    def discard(self, task, value=None):
+        """
+        Удалить задачу из индекса.
+
+        :param task: Задача.
+        :param value: Значение поля, под которым задача лежит в индексе. Если None, берется текущее.
+            Задачи с пустым значением в индексе не лежат.
+        """
+        if value is None:
+            value = getattr(task, self.field)
+        if not value:
+            return
+        _merge_sorted(self.keys, self._pending)
+        position = bisect.bisect_left(self.keys, (value, task.id))
+        if position < len(self.keys) and self.keys[position][2] is task:
+            del self.keys[position]
+
+    def update(self, task, old):
+        """
+        Обновить положение задачи в индексе после изменения полей.
+
+        :param task: Измененная задача.
+        :param old: Словарь прежних значений измененных полей.
+        """
+        if self.field in old or any(field in old for field in self.depends_on):
+            self.discard(task, old.get(self.field, getattr(task, self.field)))
+            self.add(task)
+
+    def clear(self):
+        """
+        Очистить индекс.
+        """
+        self.keys.clear()
+        self._pending.clear()
+
+    def rebuild(self, tasks):
+        """
+        Построить индекс заново по набору задач одной сортировкой.
+
+        :param tasks: Итерируемый набор задач.
+        """
+        field = self.field
+        self.keys = sorted((getattr(task, field), task.id, task) for task in tasks if self._accepts(task))
+        self._pending.clear()
+
+    def range(self, start=None, end=None, include_end=True, limit=None):
+        """
+        Получить задачи, у которых значение поля лежит в диапазоне.
+
+        Границы диапазона находятся двоичным поиском, поэтому запрос занимает O(log N + k),
+        где k — число возвращаемых задач.
+
+        :param start: Нижняя граница (включительно). Если None, диапазон не ограничен снизу.
+        :param end: Верхняя граница. Если None, диапазон не ограничен сверху.
+        :param include_end: Включать ли верхнюю границу.
+        :param limit: Максимальное число задач (первые по значению). Если None, не ограничено.
+        :return: Список задач в порядке возрастания значения.
+        """
+        _merge_sorted(self.keys, self._pending)
+        low = 0 if start is None else bisect.bisect_left(self.keys, (start,))
+        if end is None:
+            high = len(self.keys)
+        elif include_end:
+            high = bisect.bisect_right(self.keys, (end, float("inf")))
+        else:
+            high = bisect.bisect_left(self.keys, (end,))
+        if limit is not None:
+            high = min(high, low + limit)
+        return [task for _, _, task in itertools.islice(self.keys, low, high)]
+
+
+def _bump(counter, key, delta):
+    """
+    Изменить счетчик значения и удалить значение, если счетчик стал нулевым.
+
+    :param counter: Словарь {значение: число задач}.
+    :param key: Значение.
+    :param delta: Изменение счетчика.
+    """
+    count = counter.get(key, 0) + delta
+    if count:
+        counter[key] = count
+    else:
+        counter.pop(key, None)
+
+
+class StatsIndex:
+    """
+    Счетчики задач по категориям, статусам и приоритетам и число невыполненных задач по сроку.
+
+    Счетчики обновляются при каждом добавлении, изменении и удалении задачи за O(1), поэтому
+    сводка summary() не просматривает задачи. Число просроченных задач считается по счетчикам
+    сроков и запоминается вместе с датой, на которую посчитано: пока дата та же, оно тоже
+    обновляется при изменениях за O(1), а при смене даты пересчитывается по числу различных
+    сроков, а не задач. Счетчики можно сохранить в файл (save, load) или в словарь (to_dict)
+    и сложить со счетчиками другой части задач (merge).
+
+    Атрибуты:
+        Total (int): Число задач.
+        Counts (dict): Счетчики {поле: {значение: число задач}} для полей category, status и priority.
+        Open_due (dict): Число невыполненных задач по сроку выполнения {date: число задач}.
+    """
+
+    fields = ("category", "status", "priority")
+
+    def __init__(self):
+        """
+        Инициализация пустых счетчиков.
+        """
+        self.total = 0
+        self.counts = {field: {} for field in self.fields}
+        self.open_due = {}
+        self._today = None
+        self._overdue = 0
+
+    def count(self, category, status, priority, due_date, delta=1):
+        """
+        Учесть задачу с данными значениями полей.
+
+        :param category: Категория.
+        :param status: Статус.
+        :param priority: Приоритет.
+        :param due_date: Срок выполнения (date) или None.
+        :param delta: 1 — задача добавлена, -1 — удалена.
+        """
+        self.total += delta
+        counts = self.counts
+        _bump(counts["category"], category, delta)
+        _bump(counts["status"], status, delta)
+        _bump(counts["priority"], priority, delta)
+        if due_date is not None and status != "Выполнена":
+            _bump(self.open_due, due_date, delta)
+            if self._today is not None and due_date < self._today:
+                self._overdue += delta
+
+    def add(self, task):
+        """
+        Учесть добавленную задачу.
+
+        :param task: Задача.
+        """
+        self.count(task.category, task.status, task.priority, task.due_date)
+
+    def discard(self, task, value=None):
+        """
+        Перестать учитывать удаленную задачу.
+
+        :param task: Задача.
+        :param value: Не используется: задача учитывается по текущим значениям полей.
+        """
+        self.count(task.category, task.status, task.priority, task.due_date, -1)
+
+    def update(self, task, old):
+        """
+        Обновить счетчики после изменения полей задачи.
+
+        :param task: Измененная задача.
+        :param old: Словарь прежних значений измененных полей.
+        """
+        if "category" in old or "status" in old or "priority" in old or "due_date" in old:
+            self.count(
+                old.get("category", task.category), old.get("status", task.status),
+                old.get("priority", task.priority), old.get("due_date", task.due_date), -1,
+            )
+            self.add(task)
+
+    def clear(self):
+        """
+        Обнулить счетчики.
+        """
+        self.total = 0
+        for counter in self.counts.values():
+            counter.clear()
+        self.open_due.clear()
+        self._today = None
+
+    def rebuild(self, tasks):
+        """
+        Посчитать задачи заново.
+
+        :param tasks: Итерируемый набор задач.
+        """
+        self.clear()
+        count = self.count
+        for task in tasks:
+            count(task.category, task.status, task.priority, task.due_date)
+
+    def overdue(self, today):
+        """
+        Получить число невыполненных задач, срок которых раньше today.
+
+        :param today: Текущая дата (date).
+        :return: Число просроченных задач.
+        """
+        if today != self._today:
+            self._overdue = sum(count for due_date, count in self.open_due.items() if due_date < today)
+            self._today = today
+        return self._overdue
+
+    def summary(self, today):
+        """
+        Получить сводку счетчиков.
+
+        :param today: Текущая дата (date) для числа просроченных задач.
+        :return: Словарь: total, done, open, overdue, completion_rate (доля выполненных задач от 0 до 1),
+            by_category, by_status и by_priority ({значение: число задач} по убыванию числа задач).
+        """
+        done = self.counts["status"].get("Выполнена", 0)
+        summary = {
+            "total": self.total,
+            "done": done,
+            "open": self.total - done,
+            "overdue": self.overdue(today),
+            "completion_rate": done / self.total if self.total else 0.0,
+        }
+        for field in self.fields:
+            counter = self.counts[field]
+            summary[f"by_{field}"] = dict(sorted(counter.items(), key=lambda item: -item[1]))
+        return summary
+
+    def to_dict(self):
+        """
+        Получить счетчики в виде словаря, пригодного для JSON.
+
+        :return: Словарь: total, счетчики category, status, priority и open_due (сроки в формате гггг-мм-дд).
+        """
+        data = {"total": self.total, **{field: dict(counter) for field, counter in self.counts.items()}}
+        data["open_due"] = {due_date.isoformat(): count for due_date, count in self.open_due.items()}
+        return data
+
+    def merge(self, data):
+        """
+        Прибавить счетчики, полученные от to_dict().
+
+        :param data: Словарь счетчиков.
+        """
+        self.total += data["total"]
+        for field, counter in self.counts.items():
+            for value, count in data[field].items():
+                _bump(counter, value, count)
+        for due_date, count in data["open_due"].items():
+            _bump(self.open_due, date.fromisoformat(due_date), count)
+        self._today = None
+
+    def save(self, file_name, fingerprint, fsync=True):
+        """
+        Атомарно сохранить счетчики в файл.
+
+        :param file_name: Имя файла счетчиков.
+        :param fingerprint: Отпечаток данных, по которым посчитаны счетчики.
+        :param fsync: Сбросить файл и каталог на диск.
+        """
+        data = json.dumps({"fingerprint": fingerprint, "stats": self.to_dict()}, ensure_ascii=False).encode("utf-8")
+        _write_atomic(file_name, lambda file: file.write(data), fsync)
+
+    def load(self, file_name, fingerprint):
+        """
+        Загрузить счетчики из файла, если они посчитаны по тем же данным.
+
+        :param file_name: Имя файла счетчиков.
+        :param fingerprint: Отпечаток текущих данных.
+        :return: True, если счетчики загружены.
+        """
+        if not os.path.exists(file_name):
+            return False
+        with open(file_name, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if data["fingerprint"] != fingerprint:
+            return False
+        self.clear()
+        self.merge(data["stats"])
+        return True
+
+
+def priority_rank(priority):
+    """
+    Получить порядковый номер приоритета без учета регистра.
+
+    :param priority: Приоритет задачи (низкий, средний, высокий).
+    :return: 0, 1 или 2; -1 для неизвестного приоритета.
+    """
+    return PRIORITY_RANKS.get(priority.lower(), -1)
+
+
+SORT_KEYS = {
+    "priority": lambda task: priority_rank(task.priority),
+    "due_date": lambda task: task.due_date or date.max,
+    "status": lambda task: task.status == "Выполнена",
+    "category": lambda task: task.category.casefold(),
+    "title": lambda task: task.title.casefold(),
+}
+_task_id = attrgetter("id")
+
+
+class _OldValues:
+    """
+    Задача с прежними значениями измененных полей: по ней находится прежнее место задачи в порядке сортировки.
+    """
+
+    __slots__ = ("_task", "_old")
+
+    def __init__(self, task, old):
+        self._task = task
+        self._old = old
+
+    def __getattr__(self, field):
+        return self._old[field] if field in self._old else getattr(self._task, field)
+
+
+class SortOrder:
+    """
+    Кэшированный порядок задач по нескольким ключам сортировки.
+
+    Ключ — имя поля из SORT_KEYS, с префиксом "-" для сортировки по убыванию. Приоритет
+    сравнивается по порядку низкий < средний < высокий, задачи без срока идут после задач
+    со сроком, невыполненные — перед выполненными, а названия и категории — без учета
+    регистра. Задачи с равными ключами упорядочены по ID.
+
+    Порядок строится одной сортировкой при первом запросе и затем поддерживается так же,
+    как упорядоченный индекс: рядом с задачами хранятся значения их ключей на момент
+    вставки, добавленные задачи встраиваются перед следующим запросом, а удаленные
+    и измененные находятся двоичным поиском по прежним значениям. Изменения полей,
+    не входящих в ключи, порядок не затрагивают.
+
+    Атрибуты:
+        Keys (tuple): Ключи сортировки.
+        Depends_on (set): Поля, от которых зависит порядок.
+        Tasks (list): Упорядоченный список задач или None, если порядок еще не построен.
+    """
+
+    def __init__(self, keys):
+        """
+        Инициализация порядка.
+
+        :param keys: Ключи сортировки, например ("-priority", "due_date").
+        :raises ValueError: Если ключ неизвестен или ключи не заданы.
+        """
+        self.keys = tuple(keys)
+        if not self.keys:
+            raise ValueError("Не заданы ключи сортировки.")
+        self._values = []
+        for key in self.keys:
+            field = key.removeprefix("-")
+            if field not in SORT_KEYS:
+                raise ValueError(f"Неизвестный ключ сортировки: {key}. Допустимые: {', '.join(SORT_KEYS)}.")
+            self._values.append((SORT_KEYS[field], key.startswith("-")))
+        self.depends_on = {key.removeprefix("-") for key in self.keys}
+        self.tasks = None
+        self._entries = None
+        self._pending = {}
+        self._sort_key = functools.cmp_to_key(self._compare)
+
+    def _entry(self, task):
+        """
+        Вычислить значения ключей задачи.
+
+        :param task: Задача.
+        :return: Кортеж значений ключей и ID задачи.
+        """
+        return *(value(task) for value, _ in self._values), task.id
+
+    def _compare(self, first, second):
+        """
+        Сравнить значения ключей двух задач с учетом направления сортировки.
+
+        :param first: Значения ключей первой задачи (см. _entry).
+        :param second: Значения ключей второй задачи.
+        :return: Отрицательное число, ноль или положительное число.
+        """
+        for (_, descending), a, b in zip(self._values, first, second):
+            if a != b:
+                return (a < b) - (a > b) if descending else (a > b) - (a < b)
+        return (first[-1] > second[-1]) - (first[-1] < second[-1])
+
+    def sort(self, tasks):
+        """
+        Упорядочить набор задач без кэширования.
+
+        Сортирует устойчивой сортировкой по каждому ключу, начиная с последнего, поэтому
+        значения ключей вычисляются один раз на задачу и проход.
+
+        :param tasks: Итерируемый набор задач.
+        :return: Новый упорядоченный список задач.
+        """
+        result = sorted(tasks, key=_task_id)
+        for value, descending in reversed(self._values):
+            result.sort(key=value, reverse=descending)
+        return result
+
+    def ordered(self, tasks):
+        """
+        Получить упорядоченный список всех задач, построив или дополнив его при необходимости.
+
+        :param tasks: Коллекция всех задач (используется, если порядок еще не построен).
+        :return: Упорядоченный список задач. Список принадлежит порядку: его нельзя изменять.
+        """
+        if self.tasks is None or len(self._pending) > MERGE_THRESHOLD:
+            if self.tasks is not None:
+                tasks = itertools.chain(self.tasks, self._pending.values())
+            self.tasks = self.sort(tasks)
+            self._entries = [self._entry(task) for task in self.tasks]
+        else:
+            for task in self._pending.values():
+                entry = self._entry(task)
+                position = bisect.bisect_right(self._entries, self._sort_key(entry), key=self._sort_key)
+                self._entries.insert(position, entry)
+                self.tasks.insert(position, task)
+        self._pending.clear()
+        return self.tasks
+
+    def add(self, task):
+        """
+        Добавить задачу в порядок. Задача встраивается перед следующим запросом.
+
+        :param task: Задача.
+        """
+        if self.tasks is not None:
+            self._pending[id(task)] = task
+
+    def discard(self, task, value=None, old=None):
+        """
+        Удалить задачу из порядка.
+
+        :param task: Задача.
+        :param value: Не используется (совместимость с другими индексами).
+        :param old: Словарь прежних значений полей, под которыми задача стоит в порядке.
+        """
+        if self.tasks is None or self._pending.pop(id(task), None) is not None:
+            return
+        entry = self._entry(task if not old else _OldValues(task, old))
+        position = bisect.bisect_left(self._entries, self._sort_key(entry), key=self._sort_key)
+        if position < len(self.tasks) and self.tasks[position] is task:
+            del self.tasks[position]
+            del self._entries[position]
+
+    def update(self, task, old):
+        """
+        Переставить задачу после изменения полей, если изменились поля ключей сортировки.
+
+        :param task: Измененная задача.
+        :param old: Словарь прежних значений измененных полей.
+        """
+        if self.tasks is not None and not self.depends_on.isdisjoint(old):
+            self.discard(task, old=old)
+            self.add(task)
+
+    def clear(self):
+        """
+        Очистить порядок.
+        """
+        self.tasks = self._entries = None
+        self._pending.clear()
+
+    def rebuild(self, tasks):
+        """
+        Сбросить порядок: он будет построен заново при следующем запросе.
+
+        :param tasks: Итерируемый набор задач (не используется).
+        """
+        self.clear()
+
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Разбить текст на слова с приведением регистра (с учетом Unicode, «ё» приравнивается к «е»).
+
+    :param text: Текст.
+    :return: Список слов.
+    """
+    return _WORD.findall(text.casefold().replace("ё", "е"))
+
+
+class FullTextIndex:
+    """
+    Инвертированный индекс по словам в названии и описании задач.
+
+    Слово из названия весит больше, чем слово из описания. Слова запроса
+    сопоставляются как префиксы слов задачи, а результаты ранжируются по tf-idf.
+
+    Атрибуты:
+        Fields (dict): Индексируемые поля и их веса.
+        Postings (dict): Словарь {слово: {id: вес}}.
+        Vocabulary (list): Отсортированный список слов для поиска по префиксу.
+    """
+
+    fields = {"title": 2, "description": 1}
+
+    def __init__(self):
+        """
+        Инициализация индекса.
+        """
+        self.postings = {}
+        self.vocabulary = []
+        self._new_tokens = []
+        self.doc_count = 0
+
+    def _weights(self, values):
+        """
+        Посчитать веса слов задачи.
+
+        :param values: Словарь {поле: текст}.
+        :return: Словарь {слово: вес}.
+        """
+        weights = {}
+        for field, weight in self.fields.items():
+            for token in tokenize(values[field] or ""):
+                weights[token] = weights.get(token, 0) + weight
+        return weights
+
+    def _add_values(self, task_id, values):
+        """
+        Добавить слова задачи в индекс.
+
+        :param task_id: Идентификатор задачи.
+        :param values: Словарь {поле: текст}.
+        """
+        for token, weight in self._weights(values).items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                self._new_tokens.append(token)
+            posting[task_id] = weight
+        self.doc_count += 1
+
+    def _discard_values(self, task_id, values):
+        """
+        Удалить слова задачи из индекса.
+
+        :param task_id: Идентификатор задачи.
+        :param values: Словарь {поле: текст}, под которыми задача лежит в индексе.
+        """
+        _merge_sorted(self.vocabulary, self._new_tokens)
+        for token in self._weights(values):
+            posting = self.postings.get(token)
+            if posting is not None and posting.pop(task_id, None) is not None and not posting:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+        self.doc_count -= 1
+
+    def add(self, task):
+        """
+        Добавить задачу в индекс.
+
+        :param task: Задача.
+        """
+        self._add_values(task.id, {field: getattr(task, field) for field in self.fields})
+
+    def discard(self, task, value=None):
+        """
+        Удалить задачу из индекса.
+
+        :param task: Задача.
+        :param value: Не используется, нужен для совместимости с другими индексами.
+        """
+        self._discard_values(task.id, {field: getattr(task, field) for field in self.fields})
+
+    def update(self, task, old):
+        """
+        Обновить слова задачи после изменения полей.
+
+        :param task: Измененная задача.
+        :param old: Словарь прежних значений измененных полей.
+        """
+        if any(field in old for field in self.fields):
+            self._discard_values(task.id, {field: old.get(field, getattr(task, field)) for field in self.fields})
+            self.add(task)
+
+    def clear(self):
+        """
+        Очистить индекс.
+        """
+        self.postings.clear()
+        self.vocabulary.clear()
+        self._new_tokens.clear()
+        self.doc_count = 0
+
+    def rebuild(self, tasks):
+        """
+        Построить индекс заново по набору задач.
+
+        :param tasks: Итерируемый набор задач.
+        """
+        self.clear()
+        for task in tasks:
+            for token, weight in self._weights({field: getattr(task, field) for field in self.fields}).items():
+                self.postings.setdefault(token, {})[task.id] = weight
+            self.doc_count += 1
+        self.vocabulary = sorted(self.postings)
+        self._new_tokens.clear()
+
+    def _expand(self, term):
+        """
+        Найти слова индекса, начинающиеся с данного слова запроса.
+
+        :param term: Слово запроса.
+        :return: Итератор по спискам вхождений подходящих слов.
+        """
+        _merge_sorted(self.vocabulary, self._new_tokens)
+        position = bisect.bisect_left(self.vocabulary, term)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(term):
+            yield self.postings[self.vocabulary[position]]
+            position += 1
+
+    def search(self, query, match_all=True):
+        """
+        Найти задачи по словам запроса.
+
+        :param query: Текст запроса.
+        :param match_all: True — задача должна содержать все слова запроса (AND), False — любое (OR).
+        :return: Список ID задач, упорядоченный по убыванию релевантности.
+        """
+        scores = None
+        for term in dict.fromkeys(tokenize(query)):
+            term_scores = {}
+            for posting in self._expand(term):
+                idf = math.log(1 + self.doc_count / len(posting))
+                for task_id, weight in posting.items():
+                    term_scores[task_id] = term_scores.get(task_id, 0) + weight * idf
+            if scores is None:
+                scores = term_scores
+            elif match_all:
+                scores = {
+                    task_id: score + term_scores[task_id]
+                    for task_id, score in scores.items() if task_id in term_scores
+                }
+            else:
+                for task_id, score in term_scores.items():
+                    scores[task_id] = scores.get(task_id, 0) + score
+        if not scores:
+            return []
+        return sorted(scores, key=lambda task_id: (-scores[task_id], task_id))
+
+    def save(self, file_name, fingerprint, fsync=True):
+        """
+        Атомарно сохранить индекс в файл.
+
+        :param file_name: Имя файла индекса.
+        :param fingerprint: Отпечаток данных, по которым построен индекс.
+        :param fsync: Сбросить файл и каталог на диск.
+        """
+        data = {"fingerprint": fingerprint, "doc_count": self.doc_count, "postings": self.postings}
+        data = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        _write_atomic(file_name, lambda file: file.write(data), fsync)
+
+    def load(self, file_name, fingerprint):
+        """
+        Загрузить индекс из файла, если он построен по тем же данным.
+
+        :param file_name: Имя файла индекса.
+        :param fingerprint: Отпечаток текущих данных.
+        :return: True, если индекс загружен.
+        """
+        if not os.path.exists(file_name):
+            return False
+        with open(file_name, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if data["fingerprint"] != fingerprint:
+            return False
+        self.postings = {
+            token: {int(task_id): weight for task_id, weight in posting.items()}
+            for token, posting in data["postings"].items()
+        }
+        self.vocabulary = sorted(self.postings)
+        self._new_tokens.clear()
+        self.doc_count = data["doc_count"]
+        return True
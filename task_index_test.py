@@ -0,0 +1,319 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+from task_index import StatsIndex
+from task_manager import TaskManager
+from task_storage import JournalStorage, JsonStorage
+
+
+class TestSecondaryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем менеджер задач во временном каталоге."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.manager = TaskManager(file_name=os.path.join(self.tmp_dir.name, "tasks.json"))
+        self.manager.add_task("Task 1", "Description", "Работа", "2024-12-01", "Высокий")
+        self.manager.add_task("Task 2", "Description", "Личное", "2024-12-05", "Средний")
+        self.manager.add_task("Task 3", "Description", "Работа", "2024-12-10", "Низкий")
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def test_filter_by_category_and_priority(self):
+        """Тест на фильтрацию по нескольким индексам."""
+        self.assertEqual(self.manager.get_categories(), ["Работа", "Личное"])
+        self.assertEqual([task.id for task in self.manager.filter_tasks(category="Работа")], [1, 3])
+        self.assertEqual([task.id for task in self.manager.filter_tasks(category="работа", ignore_case=True)], [1, 3])
+        self.assertEqual([task.id for task in self.manager.filter_tasks(category="Работа", priority="Низкий")], [3])
+
+    def test_indexes_follow_edit_done_and_delete(self):
+        """Тест на обновление индексов при редактировании, выполнении и удалении задач."""
+        self.manager.get_task_by_id(1).edit(category="Личное")
+        self.manager.get_task_by_id(2).mark_as_done()
+        self.manager.tasks.remove(self.manager.get_task_by_id(3))
+
+        self.assertEqual(self.manager.get_categories(), ["Личное"])
+        self.assertEqual([task.id for task in self.manager.filter_tasks(status="Выполнена")], [2])
+        self.assertEqual([task.id for task in self.manager.filter_tasks(status="Не выполнена")], [1])
+
+    def test_due_date_queries(self):
+        """Тест на запросы по сроку выполнения."""
+        self.manager.get_task_by_id(1).mark_as_done()
+        self.manager.get_task_by_id(3).edit(due_date="2024-11-01")
+
+        self.assertEqual([task.id for task in self.manager.get_overdue_tasks("2024-12-06")], [3, 2])
+        self.assertEqual([task.id for task in self.manager.get_tasks_due_between("2024-12-01", "2024-12-05")], [1, 2])
+
+    def test_upcoming_and_this_week(self):
+        """Тест на ближайшие задачи и задачи на неделе при редактировании, выполнении и удалении."""
+        self.manager.add_task("Task 4", "Description", "Работа", "", "Низкий")
+        self.assertEqual([task.id for task in self.manager.get_upcoming_tasks(2, "2024-12-02")], [2, 3])
+        self.assertEqual([task.id for task in self.manager.get_tasks_due_this_week("2024-12-02")], [2])
+
+        self.manager.get_task_by_id(3).edit(due_date="2024-12-08")
+        self.manager.get_task_by_id(4).edit(due_date="2024-12-03")
+        self.assertEqual([task.id for task in self.manager.get_tasks_due_this_week("2024-12-02")], [4, 2, 3])
+        self.manager.get_task_by_id(2).mark_as_done()
+        self.manager.tasks.remove(self.manager.get_task_by_id(4))
+        self.assertEqual([task.id for task in self.manager.get_upcoming_tasks(today="2024-12-02")], [3])
+
+    def test_due_date_validation(self):
+        """Тест на отклонение некорректных сроков выполнения без изменения задач."""
+        for value in ("31.12.2024", "2024-02-30", "завтра"):
+            with self.assertRaises(ValueError):
+                self.manager.add_task("Task 4", "Description", "Работа", value, "Низкий")
+            with self.assertRaises(ValueError):
+                self.manager.get_task_by_id(1).edit(title="Новое название", due_date=value)
+        self.assertEqual(len(self.manager.tasks), 3)
+        self.assertEqual(self.manager.get_task_by_id(1).title, "Task 1")
+        self.assertFalse(self.manager.has_unsaved_changes())
+
+    def test_legacy_due_dates(self):
+        """Тест на файл, записанный до проверки сроков: сроки в другом формате сохраняются, пока их не изменят."""
+        records = [
+            {"id": 1, "title": "Task 1", "description": "", "category": "Работа", "due_date": "31.12.2024",
+             "priority": "Высокий", "status": "Не выполнена"},
+            {"id": 2, "title": "Task 2", "description": "", "category": "Работа", "due_date": "завтра",
+             "priority": "Низкий", "status": "Не выполнена"},
+            {"id": 3, "title": "Task 3", "description": "", "category": "Личное", "due_date": "2024-12-10",
+             "priority": "Низкий", "status": "Не выполнена"},
+        ]
+        for storage_class in (JsonStorage, JournalStorage):
+            file_name = os.path.join(self.tmp_dir.name, f"legacy-{storage_class.__name__}.json")
+            with open(file_name, "w", encoding="utf-8") as file:
+                json.dump(records, file, ensure_ascii=False)
+
+            with self.assertLogs("task_manager.load") as logs:
+                manager = TaskManager(file_name=file_name, storage=storage_class(file_name))
+            self.assertEqual(len(logs.output), 1)
+            self.assertIn("завтра", logs.output[0])
+            self.assertEqual([task.due_date for task in manager.tasks], [date(2024, 12, 31), None, date(2024, 12, 10)])
+            self.assertEqual([task.id for task in manager.get_overdue_tasks("2025-01-01")], [3, 1])
+            with self.assertRaises(ValueError):
+                manager.get_task_by_id(1).edit(due_date="31.12.2024")
+            with self.assertRaises(RuntimeError), manager.batch():
+                manager.get_task_by_id(1).edit(due_date="2025-01-31")
+                raise RuntimeError
+            manager.get_task_by_id(3).mark_as_done()
+            manager.close()
+            if storage_class is JournalStorage:
+                storage_class(file_name).compact(wait=True)
+            with open(file_name, encoding="utf-8") as file:
+                saved = {record["id"]: record["due_date"] for record in json.load(file)}
+            self.assertEqual(saved, {1: "31.12.2024", 2: "завтра", 3: "2024-12-10"})
+
+            with self.assertLogs("task_manager.load"):
+                manager = TaskManager(file_name=file_name, storage=storage_class(file_name))
+            manager.get_task_by_id(1).edit(due_date="2025-01-31")
+            manager.get_task_by_id(2).edit(due_date="2025-02-01")
+            self.assertEqual([task.to_dict()["due_date"] for task in manager.tasks][:2], ["2025-01-31", "2025-02-01"])
+            manager.close()
+
+
+class TestSortOrder(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем менеджер задач с разными приоритетами и сроками."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.manager = TaskManager(file_name=os.path.join(self.tmp_dir.name, "tasks.json"))
+        self.manager.add_task("Бета", "Description", "Работа", "2024-12-10", "низкий")
+        self.manager.add_task("альфа", "Description", "Личное", "", "Высокий")
+        self.manager.add_task("Гамма", "Description", "Работа", "2024-12-05", "Высокий")
+        self.manager.add_task("Дельта", "Description", "Личное", "2024-12-01", "Средний")
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def ids(self, *keys):
+        """Получить ID задач, упорядоченных по ключам."""
+        return [task.id for task in self.manager.sort_tasks(keys)]
+
+    def test_sort_keys(self):
+        """Тест на порядок приоритетов, задачи без срока в конце и сортировку по нескольким ключам."""
+        self.assertEqual(self.ids("-priority", "due_date"), [3, 2, 4, 1])
+        self.assertEqual(self.ids("priority"), [1, 4, 2, 3])
+        self.assertEqual(self.ids("due_date"), [4, 3, 1, 2])
+        self.assertEqual(self.ids("title"), [2, 1, 3, 4])
+        self.assertEqual(self.ids("category", "-due_date"), [2, 4, 1, 3])
+        self.manager.get_task_by_id(3).mark_as_done()
+        self.assertEqual(self.ids("status", "title"), [2, 1, 4, 3])
+        with self.assertRaises(ValueError):
+            self.manager.sort_tasks(("size",))
+
+    def test_cached_order_follows_changes(self):
+        """Тест на совпадение кэшированного порядка с полной сортировкой после случайных изменений."""
+        rng = random.Random(3)
+        keys = ("-priority", "due_date")
+        self.manager.sort_tasks(keys)
+        cached = self.manager.indexes["sort:-priority,due_date"]
+        tasks = cached.tasks
+        for number in range(300):
+            match rng.choice(("add", "edit", "edit", "done", "delete")) if self.manager.tasks else "add":
+                case "add":
+                    self.manager.add_task(
+                        f"Task {number}", "Description", "Работа", f"2024-12-{rng.randint(1, 28):02}",
+                        rng.choice(("Низкий", "Средний", "Высокий")),
+                    )
+                case "edit":
+                    task = rng.choice(self.manager.tasks)
+                    task.edit(due_date=f"2024-11-{rng.randint(1, 30):02}", priority=rng.choice(("Низкий", "Высокий")))
+                case "done":
+                    rng.choice(self.manager.tasks).mark_as_done()
+                case "delete":
+                    self.manager.tasks.remove(rng.choice(self.manager.tasks))
+            if number % 20 == 0:
+                self.assertEqual(self.manager.sort_tasks(keys), cached.sort(self.manager.tasks))
+        self.assertEqual(self.manager.sort_tasks(keys), cached.sort(self.manager.tasks))
+        self.assertIs(cached.tasks, tasks)
+
+        self.manager.get_task_by_id(self.manager.tasks[0].id).edit(title="Другое название")
+        self.assertEqual(cached.sort(self.manager.tasks), cached.tasks)
+
+
+class TestFullTextIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем менеджер задач во временном каталоге."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        self.manager = TaskManager(file_name=self.file_name, persist_search_index=True)
+        self.manager.add_task("Квартальный отчет", "Собрать цифры", "Работа", "2024-12-01", "Высокий")
+        self.manager.add_task("Купить ёлку", "Отчет не нужен", "Личное", "2024-12-05", "Средний")
+        self.manager.add_task("Позвонить маме", "Про отчет и ёлку", "Личное", "2024-12-10", "Низкий")
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def test_search_title_and_description(self):
+        """Тест на поиск по названию и описанию с ранжированием и без учета регистра."""
+        self.assertEqual([task.id for task in self.manager.search_tasks("ОТЧЕТ")], [1, 2, 3])
+        self.assertEqual([task.id for task in self.manager.search_tasks("отч елк")], [2, 3])
+        self.assertEqual([task.id for task in self.manager.search_tasks("купить OR позвонить")], [2, 3])
+        self.assertEqual(self.manager.search_tasks("отпуск"), [])
+
+    def test_search_follows_edit_and_delete(self):
+        """Тест на обновление полнотекстового индекса при редактировании и удалении."""
+        self.manager.get_task_by_id(1).edit(title="Годовой план", description="Без цифр")
+        self.manager.tasks.remove(self.manager.get_task_by_id(2))
+
+        self.assertEqual([task.id for task in self.manager.search_tasks("отчет")], [3])
+        self.assertEqual([task.id for task in self.manager.search_tasks("годовой")], [1])
+
+    def test_index_is_persisted(self):
+        """Тест на загрузку сохраненного индекса вместо перестроения."""
+        self.manager.close()
+        new_manager = TaskManager(file_name=self.file_name, persist_search_index=True)
+
+        self.assertTrue(os.path.exists(f"{self.file_name}.search"))
+        self.assertEqual(new_manager.indexes["text"].postings, self.manager.indexes["text"].postings)
+
+        new_manager.add_task("Новый отчет", "", "Работа", "2024-12-31", "Низкий")
+        new_manager.save_tasks()
+        rebuilt = TaskManager(file_name=self.file_name, persist_search_index=True)
+        self.assertEqual(len(rebuilt.search_tasks("отчет")), 4)
+
+
+class TestStatsIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем менеджер задач с сохранением счетчиков во временном каталоге."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        self.manager = TaskManager(file_name=self.file_name, persist_stats=True)
+        self.manager.add_task("Task 1", "Description", "Работа", "2024-12-01", "Высокий")
+        self.manager.add_task("Task 2", "Description", "Личное", "2024-12-05", "Средний")
+        self.manager.add_task("Task 3", "Description", "Работа", "", "Низкий")
+
+    def tearDown(self):
+        """Закрытие менеджера и удаление временного каталога."""
+        self.manager.close()
+        self.tmp_dir.cleanup()
+
+    def assertCounted(self, manager):
+        """Проверить, что статистика совпадает с подсчетом по всем задачам."""
+        tasks = list(manager.tasks)
+        statistics = manager.get_statistics("2024-12-03")
+        done = sum(task.status == "Выполнена" for task in tasks)
+        self.assertEqual(statistics["total"], len(tasks))
+        self.assertEqual((statistics["done"], statistics["open"]), (done, len(tasks) - done))
+        self.assertEqual(statistics["overdue"], len(manager.get_overdue_tasks("2024-12-03")))
+        for field in ("category", "status", "priority"):
+            counts = {}
+            for task in tasks:
+                counts[getattr(task, field)] = counts.get(getattr(task, field), 0) + 1
+            self.assertEqual(statistics[f"by_{field}"], counts)
+
+    def test_statistics(self):
+        """Тест на сводку счетчиков: доля выполненных задач, просроченные задачи и порядок значений."""
+        self.manager.get_task_by_id(2).mark_as_done()
+        self.assertEqual(self.manager.get_statistics("2024-12-10"), {
+            "total": 3, "done": 1, "open": 2, "overdue": 1, "completion_rate": 1 / 3,
+            "by_category": {"Работа": 2, "Личное": 1},
+            "by_status": {"Не выполнена": 2, "Выполнена": 1},
+            "by_priority": {"Высокий": 1, "Средний": 1, "Низкий": 1},
+        })
+        self.manager.tasks.clear()
+        self.assertEqual(self.manager.get_statistics()["completion_rate"], 0.0)
+
+    def test_counters_follow_changes(self):
+        """Тест на обновление счетчиков при изменении, выполнении, удалении задач и откате транзакции."""
+        self.assertCounted(self.manager)
+        self.manager.get_task_by_id(3).edit(category="Личное", due_date="2024-11-30")
+        self.assertCounted(self.manager)
+        self.manager.get_task_by_id(1).mark_as_done()
+        self.assertCounted(self.manager)
+        with self.assertRaises(RuntimeError), self.manager.batch():
+            self.manager.add_task("Task 4", "", "Дом", "2024-12-01", "Низкий")
+            self.manager.get_task_by_id(2).edit(due_date="2024-12-02", priority="Низкий")
+            self.manager.tasks.remove(self.manager.get_task_by_id(3))
+            raise RuntimeError
+        self.assertCounted(self.manager)
+        self.manager.delete_category("Работа")
+        self.assertCounted(self.manager)
+
+        other = TaskManager(file_name=self.file_name)
+        other.add_task("Task 5", "", "Дом", "2024-12-01", "Низкий")
+        other.close()
+        self.manager.refresh()
+        self.assertCounted(self.manager)
+
+    def test_overdue_is_cached_for_date(self):
+        """Тест на обновление запомненного числа просроченных задач без пересчета по срокам."""
+        stats = self.manager.indexes["stats"]
+        self.assertEqual(stats.overdue(date(2024, 12, 3)), 1)
+        self.manager.add_task("Task 4", "", "Дом", "2024-11-01", "Низкий")
+        self.manager.get_task_by_id(1).mark_as_done()
+        self.manager.get_task_by_id(2).edit(due_date="2024-12-02")
+        stats.open_due.clear()
+        self.assertEqual(stats.overdue(date(2024, 12, 3)), 2)
+
+    def test_counters_are_persisted(self):
+        """Тест на загрузку сохраненных счетчиков при открытии и во время фоновой загрузки."""
+        self.manager.get_task_by_id(1).mark_as_done()
+        expected = self.manager.get_statistics("2024-12-03")
+        self.manager.close()
+        self.assertTrue(os.path.exists(f"{self.file_name}.stats"))
+
+        manager = TaskManager(file_name=self.file_name, persist_stats=True, background_load=True)
+        with patch.object(manager, "is_loading", return_value=True):
+            self.assertEqual(manager.get_statistics("2024-12-03"), expected)
+        self.assertCounted(manager)
+        manager.add_task("Task 4", "", "Дом", "2024-11-01", "Низкий")
+        manager.save_tasks()
+        self.assertFalse(StatsIndex().load(f"{self.file_name}.stats", manager.storage.fingerprint()))
+        manager.close()
+
+        manager = TaskManager(file_name=self.file_name, persist_stats=True)
+        self.assertEqual(manager.get_statistics("2024-12-03")["total"], 4)
+        self.assertCounted(manager)
+        manager.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,143 @@
+import itertools
 import json
-import os
+import logging
+import re
+import sys
+import tempfile
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import date, timedelta
 from tabulate import tabulate
+from task_index import FullTextIndex, HashIndex, SortedIndex, SortOrder, StatsIndex
+from task_profile import profile_session, profiler, timed
+from task_storage import JournalStorage, export_json, import_json, renumber, replay
+
+
+_OR = re.compile(r"\s+(?:OR|ИЛИ)\s+")
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_LEGACY_DATE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})")
+_INTERNED_FIELDS = ("category", "priority", "status")
+DEFAULT_SORT = ("-priority", "due_date")
+_dates = {}
+load_log = logging.getLogger("task_manager.load")
+
+
+def _intern(value):
+    """
+    Интернировать строку, чтобы одинаковые значения хранились в памяти один раз.
+
+    :param value: Значение поля.
+    :return: Интернированная строка или исходное значение, если это не строка.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+def parse_date(value):
+    """
+    Преобразовать срок выполнения в дату.
+
+    Разобранные даты запоминаются, поэтому задачи с одинаковым сроком ссылаются на один объект date,
+    а повторный разбор сводится к поиску в словаре.
+
+    :param value: Строка гггг-мм-дд, объект date, пустая строка или None.
+    :return: Объект date или None, если срок не задан.
+    :raises ValueError: Если строка не является датой в формате гггг-мм-дд.
+    """
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    parsed = _dates.get(value)
+    if parsed is None:
+        if type(value) is not str or not _DATE.fullmatch(value):
+            raise ValueError(f"Неверный срок выполнения: {value!r}. Ожидается дата в формате гггг-мм-дд.")
+        try:
+            parsed = date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Несуществующая дата: {value}.") from None
+        _dates[value] = parsed
+    return parsed
+
+
+def parse_legacy_date(value):
+    """
+    Преобразовать в дату срок выполнения, записанный до проверки сроков: гггг-мм-дд или дд.мм.гггг.
+
+    :param value: Сохраненное значение срока.
+    :return: Объект date или None, если срок не задан или не является датой.
+    """
+    try:
+        return parse_date(value)
+    except ValueError:
+        pass
+    match = _LEGACY_DATE.fullmatch(value.strip()) if type(value) is str else None
+    if match is None:
+        return None
+    day, month, year = map(int, match.groups())
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def parse_stored_date(value, task_id=None):
+    """
+    Преобразовать в дату срок выполнения, прочитанный из хранилища.
+
+    Файлы, записанные до проверки сроков, могут содержать срок в другом формате. Срок дд.мм.гггг
+    разбирается в дату (см. parse_legacy_date()). Другой текст не мешает загрузке: задача считается
+    задачей без срока, а в журнал task_manager.load записывается предупреждение.
+
+    :param value: Сохраненное значение срока.
+    :param task_id: ID задачи для предупреждения.
+    :return: Объект date или None, если срок не задан или не является датой.
+    """
+    parsed = parse_legacy_date(value)
+    if parsed is None and value:
+        load_log.warning(
+            "Задача %s: срок выполнения %r не является датой. Задача загружена без срока, исходное значение "
+            "сохраняется в файле, пока срок не изменят.", task_id, value,
+        )
+    return parsed
+
+
+def format_date(value):
+    """
+    Преобразовать срок выполнения в строку формата tasks.json.
+
+    :param value: Объект date или None.
+    :return: Строка гггг-мм-дд или пустая строка, если срок не задан.
+    """
+    return value.isoformat() if value else ""
+
+
+def _truncate(value, width):
+    """
+    Обрезать значение ячейки таблицы до заданной ширины.
+
+    :param value: Значение ячейки.
+    :param width: Максимальная ширина.
+    :return: Строка не длиннее width символов.
+    """
+    value = str(value)
+    return value if len(value) <= width else value[:width - 1] + "…"
+
+
+def _format_fast(rows, headers):
+    """
+    Отформатировать таблицу без tabulate: ширина столбцов берется только по выводимым строкам.
+
+    :param rows: Строки таблицы.
+    :param headers: Заголовки столбцов.
+    :return: Текст таблицы.
+    """
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    lines = [
+        "  ".join(str(header).ljust(width) for header, width in zip(headers, widths)),
+        "  ".join("-" * width for width in widths),
+    ]
+    lines.extend("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)) for row in rows)
+    return "\n".join(lines)
 
 
 class Task:
@@ -12,11 +149,25 @@ class Task:
         Title (str): Название задачи.
         Description (str): Описание задачи.
         Category (str): Категория задачи.
-        Due_date (str): Срок выполнения задачи (в формате гггг-мм-дд).
+        Due_date (date): Срок выполнения задачи или None, если срок не задан.
         Priority (str): Приоритет задачи (низкий, средний, высокий).
         Status (str): Статус задачи (по умолчанию "Не выполнена").
+        Version (int): Счетчик изменений полей задачи, увеличивается при каждом изменении.
+
+    Срок, прочитанный из файла, записанного до проверки сроков, в другом формате (например, 31.12.2024),
+    записывается обратно в исходном виде, пока его не изменят (см. from_stored() и stored_due_date()).
+
+    Задача хранит поля в __slots__, значения категории, приоритета и статуса интернируются,
+    а срок разбирается в date один раз и для одинаковых дат хранится одним объектом:
+    при миллионах задач это заметно сокращает расход памяти.
+    Поля следует менять методами edit() и mark_as_done(): только они сообщают менеджеру
+    об изменении, чтобы тот обновил индексы и сохранил задачу.
     """
 
+    __slots__ = (
+        "id", "title", "description", "category", "due_date", "priority", "status", "version", "_listener", "_due_text",
+    )
+
     def __init__(self, task_id, title, description, category, due_date, priority, status="Не выполнена"):
         """
         Инициализация задачи.
@@ -25,44 +176,73 @@ class Task:
         :param title: Название задачи.
         :param description: Описание задачи.
         :param category: Категория задачи.
-        :param due_date: Срок выполнения задачи.
+        :param due_date: Срок выполнения задачи: строка гггг-мм-дд, date или пустое значение.
         :param priority: Приоритет задачи.
         :param status: Статус задачи.
+        :raises ValueError: Если срок выполнения не является датой.
         """
         self.id = task_id
         self.title = title
         self.description = description
-        self.category = category
-        self.due_date = due_date
-        self.priority = priority
-        self.status = status
+        self.category = _intern(category)
+        self.due_date = parse_date(due_date)
+        self.priority = _intern(priority)
+        self.status = _intern(status)
+        self.version = 0
+        self._listener = None
+        self._due_text = None
+
+    def _notify(self, op, old):
+        """
+        Увеличить счетчик изменений и сообщить владельцу задачи об изменении.
+
+        :param op: Тип изменения (edit или mark_done).
+        :param old: Словарь прежних значений измененных полей. Если пуст, задача не менялась.
+        """
+        if old:
+            self.version += 1
+            if self._listener is not None:
+                self._listener(self, op, old)
 
     def mark_as_done(self):
         """
-        Отметить задачу как выполненную.
+        Отметить задачу как выполненную. Повторная отметка ничего не меняет.
         """
+        if self.status == "Выполнена":
+            return
+        old = {"status": self.status}
         self.status = "Выполнена"
+        self._notify("mark_done", old)
 
     def edit(self, title=None, description=None, category=None, due_date=None, priority=None):
         """
-        Редактировать задачу.
+        Редактировать задачу. Пустые значения и значения, совпадающие с текущими, не меняют задачу.
 
         :param title: Новое название задачи.
         :param description: Новое описание задачи.
         :param category: Новая категория задачи.
-        :param due_date: Новый срок выполнения задачи.
+        :param due_date: Новый срок выполнения задачи: строка гггг-мм-дд или date.
         :param priority: Новый приоритет задачи.
+        :raises ValueError: Если срок выполнения не является датой. Задача при этом не меняется.
         """
-        if title:
+        due_date = parse_date(due_date)
+        old = {}
+        if title and title != self.title:
+            old["title"] = self.title
             self.title = title
-        if description:
+        if description and description != self.description:
+            old["description"] = self.description
             self.description = description
-        if category:
-            self.category = category
-        if due_date:
+        if category and category != self.category:
+            old["category"] = self.category
+            self.category = _intern(category)
+        if due_date and due_date != self.due_date:
+            old["due_date"] = self.due_date
             self.due_date = due_date
-        if priority:
-            self.priority = priority
+        if priority and priority != self.priority:
+            old["priority"] = self.priority
+            self.priority = _intern(priority)
+        self._notify("edit", old)
 
     def to_dict(self):
         """
@@ -75,20 +255,31 @@ class Task:
             "title": self.title,
             "description": self.description,
             "category": self.category,
-            "due_date": self.due_date,
+            "due_date": self.stored_due_date(),
             "priority": self.priority,
             "status": self.status,
         }
 
+    def stored_due_date(self):
+        """
+        Получить срок выполнения в виде для записи в хранилище.
+
+        :return: Исходный текст срока, прочитанного в другом формате, если срок с тех пор не изменен,
+            иначе строка гггг-мм-дд или пустая строка.
+        """
+        if self._due_text is not None and parse_legacy_date(self._due_text) == self.due_date:
+            return self._due_text
+        return format_date(self.due_date)
+
     @staticmethod
     def from_dict(data):
         """
-        Создать задачу из словаря.
+        Создать задачу из словаря, прочитанного из хранилища.
 
         :param data: Словарь с данными задачи.
         :return: Экземпляр задачи.
         """
-        return Task(
+        return Task.from_stored(
             task_id=data["id"],
             title=data["title"],
             description=data["description"],
@@ -98,6 +289,279 @@ class Task:
             status=data["status"],
         )
 
+    @staticmethod
+    def from_stored(task_id, title, description, category, due_date, priority, status):
+        """
+        Создать задачу по значениям полей, прочитанным из хранилища.
+
+        Срок не в формате гггг-мм-дд не прерывает загрузку (см. parse_stored_date()): его исходный текст
+        запоминается и записывается обратно без изменений, пока срок не изменят.
+
+        :param task_id: Уникальный идентификатор задачи.
+        :param title: Название задачи.
+        :param description: Описание задачи.
+        :param category: Категория задачи.
+        :param due_date: Сохраненное значение срока.
+        :param priority: Приоритет задачи.
+        :param status: Статус задачи.
+        :return: Экземпляр задачи.
+        """
+        task = Task(task_id, title, description, category, parse_stored_date(due_date, task_id), priority, status)
+        if due_date and type(due_date) is str and due_date != format_date(task.due_date):
+            task._due_text = due_date
+        return task
+
+
+class TaskList:
+    """
+    Коллекция задач с индексом по ID, сообщающая менеджеру о добавлении и удалении задач.
+
+    Задачи хранятся в словаре {id: задача}, поэтому поиск, добавление и удаление по ID
+    выполняются за O(1), а порядок обхода совпадает с порядком добавления.
+
+    Атрибуты:
+        Manager (TaskManager): Менеджер, которому принадлежит коллекция.
+    """
+
+    def __init__(self, manager, tasks=()):
+        """
+        Инициализация коллекции задач. Начальные задачи не считаются изменениями.
+
+        :param manager: Менеджер задач.
+        :param tasks: Начальные задачи.
+        """
+        self.manager = manager
+        self._by_id = {}
+        for task in tasks:
+            task._listener = manager._task_changed
+            self._by_id[task.id] = task
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __reversed__(self):
+        return reversed(self._by_id.values())
+
+    def __contains__(self, task):
+        return self._by_id.get(task.id) is task
+
+    def __getitem__(self, index):
+        """
+        Получить задачу (или срез задач) по позиции в порядке добавления.
+
+        Неотрицательные позиции и срезы с шагом 1 обходят только задачи до конца среза.
+
+        :param index: Позиция или срез.
+        :return: Задача или список задач.
+        """
+        if isinstance(index, slice):
+            if (index.start or 0) >= 0 and (index.stop is None or index.stop >= 0) and index.step in (None, 1):
+                return list(itertools.islice(self._by_id.values(), index.start, index.stop))
+        elif 0 <= index < len(self._by_id):
+            return next(itertools.islice(self._by_id.values(), index, None))
+        return list(self._by_id.values())[index]
+
+    def get(self, task_id):
+        """
+        Получить задачу по ID.
+
+        :param task_id: Идентификатор задачи.
+        :return: Задача или None, если не найдена.
+        """
+        return self._by_id.get(task_id)
+
+    def append(self, task):
+        """
+        Добавить задачу.
+
+        :param task: Задача.
+        :raises ValueError: Если задача с таким ID уже есть.
+        """
+        with self.manager._lock:
+            if task.id in self._by_id:
+                raise ValueError(f"Задача с ID {task.id} уже существует.")
+            self._by_id[task.id] = task
+            self.manager._task_added(task)
+
+    def remove(self, task):
+        """
+        Удалить задачу.
+
+        :param task: Задача.
+        :raises ValueError: Если задачи нет в коллекции.
+        """
+        with self.manager._lock:
+            if task not in self:
+                raise ValueError(f"Задача с ID {task.id} не найдена.")
+            self.manager._remember_tasks(self._by_id)
+            del self._by_id[task.id]
+            self.manager._task_removed(task)
+
+    def clear(self):
+        """
+        Удалить все задачи.
+        """
+        with self.manager._lock:
+            self.manager._remember_tasks(self._by_id)
+            for task in self._by_id.values():
+                task._listener = None
+            task_ids = list(self._by_id)
+            self._by_id.clear()
+            self.manager._tasks_cleared(task_ids)
+
+    def _put(self, task):
+        """
+        Добавить задачу или заменить задачу с тем же ID без уведомления менеджера.
+
+        :param task: Задача.
+        """
+        task._listener = self.manager._task_changed
+        self._by_id[task.id] = task
+
+    def _pop(self, task_id):
+        """
+        Удалить задачу без уведомления менеджера.
+
+        :param task_id: Идентификатор задачи.
+        :return: Удаленная задача или None, если ее не было.
+        """
+        task = self._by_id.pop(task_id, None)
+        if task is not None:
+            task._listener = None
+        return task
+
+    def _changed(self, task, old):
+        """
+        Учесть изменение полей задачи. Задачи хранятся в памяти целиком, поэтому ничего не делает.
+
+        :param task: Измененная задача.
+        :param old: Словарь прежних значений измененных полей.
+        """
+
+    def _pop_all(self):
+        """
+        Удалить все задачи без уведомления менеджера.
+        """
+        for task in self._by_id.values():
+            task._listener = None
+        self._by_id.clear()
+
+
+class ChangeSet:
+    """
+    ID задач, измененных с последнего сохранения.
+
+    ID попадает ровно в одно множество: задача, добавленная и затем измененная, остается
+    добавленной; добавленная и удаленная до сохранения не попадает никуда; удаленная
+    и добавленная заново с тем же ID считается измененной. Категории, удаленные целиком
+    без загрузки их задач (см. ShardedTaskManager), хранятся отдельно.
+
+    Атрибуты:
+        Added (set): ID добавленных задач.
+        Changed (set): ID сохраненных ранее задач, поля которых изменились.
+        Deleted (set): ID удаленных сохраненных ранее задач.
+        Dropped (set): Категории, удаленные целиком.
+    """
+
+    __slots__ = ("added", "changed", "deleted", "dropped")
+
+    def __init__(self, added=(), changed=(), deleted=(), dropped=()):
+        """
+        Инициализация набора изменений.
+
+        :param added: ID добавленных задач.
+        :param changed: ID измененных задач.
+        :param deleted: ID удаленных задач.
+        :param dropped: Категории, удаленные целиком.
+        """
+        self.added = set(added)
+        self.changed = set(changed)
+        self.deleted = set(deleted)
+        self.dropped = set(dropped)
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.deleted or self.dropped)
+
+    def __len__(self):
+        return len(self.added) + len(self.changed) + len(self.deleted) + len(self.dropped)
+
+    def __repr__(self):
+        return (
+            f"ChangeSet(added={self.added}, changed={self.changed}, deleted={self.deleted}, dropped={self.dropped})"
+        )
+
+    def copy(self):
+        """
+        Получить независимую копию набора.
+
+        :return: Новый набор изменений.
+        """
+        return ChangeSet(self.added, self.changed, self.deleted, self.dropped)
+
+    def add(self, task_id):
+        """
+        Отметить добавление задачи.
+
+        :param task_id: ID задачи.
+        """
+        if task_id in self.deleted:
+            self.deleted.discard(task_id)
+            self.changed.add(task_id)
+        else:
+            self.added.add(task_id)
+
+    def change(self, task_id):
+        """
+        Отметить изменение полей задачи.
+
+        :param task_id: ID задачи.
+        """
+        if task_id not in self.added:
+            self.changed.add(task_id)
+
+    def delete(self, task_id):
+        """
+        Отметить удаление задачи.
+
+        :param task_id: ID задачи.
+        """
+        if task_id in self.added:
+            self.added.discard(task_id)
+        else:
+            self.changed.discard(task_id)
+            self.deleted.add(task_id)
+
+    def clear(self, task_ids):
+        """
+        Отметить удаление всех задач.
+
+        :param task_ids: ID задач, которые были в коллекции перед очисткой.
+        """
+        for task_id in task_ids:
+            self.delete(task_id)
+
+    def drop(self, category):
+        """
+        Отметить удаление всех задач категории, ID которых не загружены.
+
+        :param category: Категория.
+        """
+        self.dropped.add(category)
+
+    def renumber(self, mapping):
+        """
+        Заменить ID добавленных задач, получивших новые ID.
+
+        :param mapping: Словарь {прежний ID: новый ID}.
+        """
+        for old_id, new_id in mapping.items():
+            if old_id in self.added:
+                self.added.discard(old_id)
+                self.added.add(new_id)
+
 
 class TaskManager:
     """
@@ -105,36 +569,684 @@ class TaskManager:
 
     Атрибуты:
         File_name (str): Имя файла для хранения задач.
-        Tasks (list): Список задач.
+        Storage: Хранилище задач (по умолчанию JournalStorage).
+        Tasks (TaskList): Коллекция задач.
+        Next_id (int): ID, который получит следующая добавленная задача.
+        Indexes (dict): Вторичные индексы по полям category, status, priority и due_date
+            (open_due_date содержит только невыполненные задачи), полнотекстовый индекс text,
+            счетчики задач stats и кэшированные порядки сортировки sort:<ключи>, созданные sort_tasks()
+            и show_tasks().
+        Search_index_file (str): Файл сохраненного полнотекстового индекса или None.
+        Stats_file (str): Файл сохраненных счетчиков задач или None.
+        First_page (list): Первые задачи, доступные до завершения фоновой загрузки, или None.
+        Page_size (int): Число задач на странице show_tasks.
+        Table_format (str): Формат таблицы tabulate или "fast" для вывода без tabulate.
+        Column_width (int): Максимальная ширина текстовых столбцов таблицы.
+        Save_delay (float): Задержка отложенной записи в секундах (0 — сохранять сразу).
+        Shared_read (bool): Подхватывать изменения других процессов перед каждым запросом.
+        Unsaved (ChangeSet): ID задач, добавленных, измененных и удаленных с последнего сохранения.
+
+    Несколько процессов могут работать с одним файлом задач: изменения сохраняются под
+    блокировкой файла, а перед сохранением менеджер применяет изменения, сохраненные
+    другими процессами после его последнего чтения.
     """
 
-    def __init__(self, file_name="tasks.json"):
+    first_page_size = 20
+    page_size = 20
+    # Держать ли в транзакции журнал отмены в памяти. Хранилища с собственным откатом его не ведут.
+    _undo_changes = True
+    table_format = "grid"
+    column_width = 40
+
+    def __init__(
+        self, file_name="tasks.json", storage=None, persist_search_index=False, background_load=False, save_delay=0,
+        shared_read=False, persist_stats=False,
+    ):
         """
         Инициализация менеджера задач.
 
+        При фоновой загрузке конструктор читает только первую страницу задач, а остальные
+        загружаются в отдельном потоке. Обращение к tasks, indexes и методам, которым нужны
+        все задачи, дожидается окончания загрузки.
+
         :param file_name: Имя файла для хранения задач.
+        :param storage: Хранилище задач. Если None, используется журнал рядом с file_name.
+        :param persist_search_index: Сохранять полнотекстовый индекс в <file_name>.search при закрытии.
+        :param background_load: Загружать задачи в фоновом потоке.
+        :param save_delay: Задержка отложенной записи в секундах. Если 0, save_tasks() сохраняет сразу.
+        :param shared_read: Режим совместного чтения: перед каждым запросом подхватывать изменения,
+            сохраненные другими процессами, без полной перезагрузки.
+        :param persist_stats: Сохранять счетчики задач в <file_name>.stats при закрытии. Сохраненные счетчики
+            не пересчитываются при загрузке и доступны get_statistics() еще во время фоновой загрузки.
         """
         self.file_name = file_name
-        self.tasks = self.load_tasks()
+        self.storage = storage if storage is not None else JournalStorage(file_name)
+        self.search_index_file = f"{file_name}.search" if persist_search_index else None
+        self.stats_file = f"{file_name}.stats" if persist_stats else None
+        self.shared_read = shared_read
+        self.save_delay = save_delay
+        self._lock = threading.RLock()
+        self._save_timer = None
+        self._save_error = None
+        self._batch_depth = 0
+        self._undo = None
+        self._undo_tasks = None
+        self.unsaved = ChangeSet()
+        self._loader = None
+        self._loader_error = None
+        self.first_page = None
+        self._indexes = self._create_indexes()
+        if background_load:
+            records = self.storage.iter_load()
+            self.first_page = [Task.from_dict(record) for record in itertools.islice(records, self.first_page_size)]
+            self._loader = threading.Thread(target=self._load_in_background, args=(records,), daemon=True)
+            self._loader.start()
+        else:
+            self.tasks = self.load_tasks()
+
+    @staticmethod
+    def _create_indexes():
+        """
+        Создать пустые вторичные индексы.
+
+        :return: Словарь {имя: индекс}.
+        """
+        return {
+            "category": HashIndex("category"),
+            "status": HashIndex("status"),
+            "priority": HashIndex("priority"),
+            "due_date": SortedIndex("due_date"),
+            "open_due_date": SortedIndex(
+                "due_date", condition=lambda task: task.status != "Выполнена", depends_on=("status",)
+            ),
+            "text": FullTextIndex(),
+            "stats": StatsIndex(),
+        }
+
+    @property
+    def tasks(self):
+        """
+        Коллекция задач. Если идет фоновая загрузка, дожидается ее окончания.
+        """
+        self.wait_until_loaded()
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks):
+        self._tasks = tasks
+
+    @property
+    def indexes(self):
+        """
+        Вторичные индексы. Если идет фоновая загрузка, дожидается ее окончания.
+        """
+        self.wait_until_loaded()
+        return self._indexes
+
+    def is_loading(self):
+        """
+        Проверить, идет ли фоновая загрузка задач.
+
+        :return: True, если загрузка еще не завершена.
+        """
+        return self._loader is not None and self._loader.is_alive()
+
+    def wait_until_loaded(self):
+        """
+        Дождаться окончания фоновой загрузки задач.
+
+        :raises Exception: Ошибка, возникшая при фоновой загрузке.
+        """
+        loader = self._loader
+        if loader is None or loader is threading.current_thread():
+            return
+        loader.join()
+        self._loader = None
+        if self._loader_error is not None:
+            error, self._loader_error = self._loader_error, None
+            raise error
+
+    def _load_in_background(self, records):
+        """
+        Загрузить оставшиеся задачи в фоновом потоке.
+
+        :param records: Генератор оставшихся словарей задач.
+        """
+        try:
+            tasks = itertools.chain(self.first_page, (Task.from_dict(record) for record in records))
+            self.tasks = self._build_tasks(tasks)
+        except Exception as error:
+            self.tasks = TaskList(self)
+            self._loader_error = error
 
     def load_tasks(self):
         """
-        Загрузить задачи из файла.
+        Загрузить задачи из хранилища, читая его потоково.
+
+        :return: Коллекция задач.
+        """
+        return self._build_tasks(Task.from_dict(task) for task in self.storage.iter_load())
+
+    @timed("load")
+    def _build_tasks(self, tasks):
+        """
+        Собрать коллекцию задач и построить по ней индексы.
+
+        :param tasks: Итерируемый набор задач.
+        :return: Коллекция задач.
+        """
+        tasks = TaskList(self, tasks)
+        profiler.count("loaded_tasks", len(tasks))
+        self.next_id = self.storage.next_id
+        for name, index in self._indexes.items():
+            if name == "text" and self.search_index_file:
+                if index.load(self.search_index_file, self.storage.fingerprint()):
+                    continue
+            if name == "stats" and self.stats_file:
+                if index.load(self.stats_file, self.storage.fingerprint()):
+                    continue
+            index.rebuild(tasks)
+        return tasks
+
+    def has_unsaved_changes(self):
+        """
+        Проверить, есть ли изменения задач, не сохраненные в хранилище.
 
-        :return: Список задач.
+        :return: True, если с последнего сохранения задачи добавлялись, изменялись или удалялись.
         """
-        if os.path.exists(self.file_name):
-            with open(self.file_name, "r", encoding="utf-8") as file:
-                return [Task.from_dict(task) for task in json.load(file)]
-        return []
+        return bool(self.unsaved)
 
     def save_tasks(self):
         """
-        Сохранить задачи в файл.
+        Сохранить изменения задач в хранилище.
+
+        Если несохраненных изменений нет, ничего не записывается. Внутри batch() сохранение
+        откладывается до конца транзакции. Если задан save_delay, изменения записываются
+        в фоновом потоке не позже чем через save_delay секунд, и все вызовы за это время
+        объединяются в одну запись.
         """
-        with open(self.file_name, "w", encoding="utf-8") as file:
-            json.dump([task.to_dict() for task in self.tasks], file, ensure_ascii=False, indent=4)
+        with self._lock:
+            if self._batch_depth or not self.unsaved:
+                return
+            if not self.save_delay:
+                self._persist()
+            elif self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self._save_in_background)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _save_in_background(self):
+        """
+        Выполнить отложенную запись. Во время транзакции запись пропускается: ее выполнит конец batch().
+        """
+        with self._lock:
+            self._save_timer = None
+            if self._batch_depth:
+                return
+            try:
+                self._persist()
+            except Exception as error:
+                self._save_error = error
+
+    @timed("save")
+    def _persist(self):
+        """
+        Записать изменения в хранилище под блокировкой файла и очистить набор несохраненных изменений.
+        """
+        with self._exclusive():
+            profiler.count("saved_changes", len(self.unsaved))
+            self.storage.save(self.tasks)
+        self.unsaved = ChangeSet()
+
+    def flush(self):
+        """
+        Немедленно записать несохраненные изменения, отменив запланированную отложенную запись.
+
+        :raises Exception: Ошибка, возникшая при отложенной записи в фоновом потоке.
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self.unsaved and not self._batch_depth:
+                self._persist()
+            if self._save_error is not None:
+                error, self._save_error = self._save_error, None
+                raise error
+
+    @contextmanager
+    def batch(self):
+        """
+        Объединить изменения в одну транзакцию.
+
+        Добавления, редактирования, отметки о выполнении и удаления внутри блока with
+        сохраняются одной записью при выходе из блока, а вызовы save_tasks() внутри блока
+        ничего не записывают. Если блок завершился исключением, все изменения отменяются
+        в памяти, в индексах, в хранилище и в наборе несохраненных изменений. Вложенные
+        вызовы batch() входят во внешнюю транзакцию.
+
+        На время транзакции удерживается исключительная блокировка файла задач, поэтому другие
+        процессы не могут сохранить изменения между ее началом и концом.
+
+        :return: Контекстный менеджер, возвращающий менеджер задач.
+        """
+        with ExitStack() as stack:
+            with self._lock:
+                if self._batch_depth:
+                    self._batch_depth += 1
+                    outer = False
+                else:
+                    self.wait_until_loaded()
+                    stack.enter_context(self.storage.lock())
+                    self._sync()
+                    self.storage.begin()
+                    self._undo = [] if self._undo_changes else None
+                    self._batch_depth = 1
+                    outer = True
+                next_id = self.next_id
+                unsaved = self.unsaved.copy() if outer else None
+            try:
+                yield self
+            except BaseException:
+                if outer:
+                    with self._lock:
+                        self._rollback(next_id)
+                        self.unsaved = unsaved
+                raise
+            finally:
+                with self._lock:
+                    self._batch_depth -= 1
+                    if outer:
+                        self._undo = self._undo_tasks = None
+            if outer:
+                self.save_tasks()
+
+    @contextmanager
+    def _exclusive(self):
+        """
+        Удерживать исключительную блокировку файла задач, применив перед этим изменения других процессов.
+
+        Внутри транзакции блокировку уже удерживает batch(), и изменения уже применены.
+
+        :return: Контекстный менеджер.
+        """
+        if self._batch_depth:
+            yield
+            return
+        with self.storage.lock():
+            self._sync()
+            yield
+
+    @timed("sync")
+    def refresh(self):
+        """
+        Подхватить изменения, сохраненные другими процессами.
+
+        Новые записи журнала применяются к задачам и индексам по одной. Если другой процесс
+        перезаписал файл целиком или уплотнил журнал, задачи загружаются заново, а несохраненные
+        изменения этого менеджера применяются к ним повторно. Во время транзакции и фоновой
+        загрузки ничего не делается.
+
+        :return: True, если были изменения других процессов.
+        """
+        with self._lock:
+            if self._batch_depth or self.is_loading():
+                return False
+            with self.storage.lock(shared=True):
+                return self._sync()
+
+    def _refresh_if_shared(self):
+        """
+        Подхватить изменения других процессов перед запросом в режиме совместного чтения.
+        """
+        if self.shared_read:
+            self.refresh()
+
+    def _sync(self):
+        """
+        Применить изменения, сохраненные другими процессами. Вызывается под блокировкой файла задач.
+
+        :return: True, если были изменения других процессов.
+        """
+        records = self.storage.changes()
+        if records is None:
+            self._reload()
+            return True
+        if records:
+            self._apply_changes(records)
+        return bool(records)
+
+    @staticmethod
+    def _assign(task, fields):
+        """
+        Присвоить полям задачи значения без уведомления владельца.
+
+        :param task: Задача.
+        :param fields: Словарь {поле: значение}.
+        :return: Словарь прежних значений измененных полей.
+        """
+        old = {}
+        for field, value in fields.items():
+            if field == "due_date":
+                value = parse_date(value)
+            if field != "id" and getattr(task, field) != value:
+                old[field] = getattr(task, field)
+                setattr(task, field, _intern(value) if field in _INTERNED_FIELDS else value)
+        if old:
+            task.version += 1
+        return old
+
+    def _apply_changes(self, records):
+        """
+        Применить к задачам и индексам записи журнала, сохраненные другим процессом.
+
+        Несохраненные задачи этого менеджера, ID которых занял другой процесс, получают новые ID.
+
+        :param records: Записи журнала.
+        """
+        tasks = self._tasks
+        indexes = self._indexes.values()
+        mapping, free_id = renumber(self.storage.pending, replay({}, records))
+        self.unsaved.renumber(mapping)
+        for old_id, new_id in mapping.items():
+            task = tasks._pop(old_id)
+            if task is not None:
+                for index in indexes:
+                    index.discard(task)
+                task.id = new_id
+                tasks._put(task)
+                for index in indexes:
+                    index.add(task)
+        for record in records:
+            match record["op"]:
+                case "add":
+                    task = tasks.get(record["task"]["id"])
+                    if task is None:
+                        task = Task.from_dict(record["task"])
+                        tasks._put(task)
+                        for index in indexes:
+                            index.add(task)
+                        continue
+                    fields = record["task"]
+                case "edit":
+                    task, fields = tasks.get(record["id"]), record["fields"]
+                case "mark_done":
+                    task, fields = tasks.get(record["id"]), {"status": "Выполнена"}
+                case "delete":
+                    task = tasks._pop(record["id"])
+                    if task is not None:
+                        for index in indexes:
+                            index.discard(task)
+                    continue
+                case "clear":
+                    tasks._pop_all()
+                    for index in indexes:
+                        index.clear()
+                    continue
+                case _:
+                    continue
+            if task is not None:
+                old = self._assign(task, fields)
+                if old:
+                    tasks._changed(task, old)
+                for index in indexes:
+                    index.update(task, old)
+        self.next_id = self.storage.next_id = max(self.next_id, free_id, replay({}, records, self.next_id))
+
+    def _reload(self):
+        """
+        Загрузить задачи заново и повторно применить к ним несохраненные изменения этого менеджера.
+
+        Объекты задач с прежними ID сохраняются, поэтому ссылки на них остаются действительными.
+        Несохраненные задачи, ID которых занял другой процесс, получают новые ID.
+        """
+        records = {record["id"]: record for record in self.storage.iter_load()}
+        mapping, free_id = renumber(self.storage.pending, self.storage.next_id)
+        self.unsaved.renumber(mapping)
+        next_id = replay(records, self.storage.pending, max(free_id, self.storage.next_id))
+        old = self._tasks._by_id
+        for old_id, new_id in mapping.items():
+            task = old.pop(old_id, None)
+            if task is not None:
+                task.id = new_id
+                old[new_id] = task
+        by_id = {}
+        for task_id, record in records.items():
+            task = old.pop(task_id, None)
+            if task is None:
+                task = Task.from_dict(record)
+            else:
+                self._assign(task, record)
+            task._listener = self._task_changed
+            by_id[task_id] = task
+        for task in old.values():
+            task._listener = None
+        self._tasks._by_id = by_id
+        for index in self._indexes.values():
+            index.rebuild(self._tasks)
+        self.next_id = self.storage.next_id = next_id
+
+    def _remember_tasks(self, by_id):
+        """
+        Запомнить состав и порядок задач перед первым удалением в транзакции.
+
+        :param by_id: Словарь {id: задача} коллекции до удаления.
+        """
+        if self._undo is not None and self._undo_tasks is None:
+            self._undo_tasks = dict(by_id)
 
+    def _rollback(self, next_id):
+        """
+        Отменить изменения транзакции в хранилище, в коллекции задач и в индексах.
+
+        Добавления и изменения полей отменяются по одному. Если в транзакции удалялись задачи,
+        коллекция восстанавливается по запомненному составу, а индексы перестраиваются.
+
+        :param next_id: Значение счетчика ID в начале транзакции.
+        """
+        self.storage.rollback()
+        self.next_id = next_id
+        by_id = self._tasks._by_id
+        indexes = self._indexes.values() if self._undo_tasks is None else ()
+        added = set()
+        for op, task, old in reversed(self._undo):
+            if op == "add":
+                added.add(id(task))
+                if by_id.get(task.id) is task:
+                    del by_id[task.id]
+                    task._listener = None
+                    for index in indexes:
+                        index.discard(task)
+            else:
+                current = {field: getattr(task, field) for field in old}
+                for field, value in old.items():
+                    setattr(task, field, value)
+                task.version += 1
+                if by_id.get(task.id) is task:
+                    for index in indexes:
+                        index.update(task, current)
+        if self._undo_tasks is not None:
+            by_id.clear()
+            for task_id, task in self._undo_tasks.items():
+                if id(task) not in added:
+                    task._listener = self._task_changed
+                    by_id[task_id] = task
+            for index in self._indexes.values():
+                index.rebuild(self._tasks)
+
+    def close(self):
+        """
+        Сохранить изменения, закрыть хранилище и сохранить полнотекстовый индекс и счетчики задач, если это включено.
+        """
+        self.flush()
+        if self.search_index_file or self.stats_file:
+            self.save_tasks()
+            self.refresh()
+        self.storage.close()
+        if self.search_index_file:
+            self.indexes["text"].save(
+                self.search_index_file, self.storage.fingerprint(), self.storage.fsync.policy != "never"
+            )
+        if self.stats_file:
+            self.indexes["stats"].save(
+                self.stats_file, self.storage.fingerprint(), self.storage.fsync.policy != "never"
+            )
+
+    def export_tasks(self, file_name):
+        """
+        Экспортировать задачи в файл формата tasks.json.
+
+        :param file_name: Имя файла для экспорта.
+        """
+        export_json(self.tasks, file_name)
+
+    def import_tasks(self, file_name):
+        """
+        Заменить задачи содержимым файла формата tasks.json одной транзакцией.
+
+        :param file_name: Имя файла для импорта.
+        """
+        records = import_json(file_name)
+        with self.batch():
+            self.tasks.clear()
+            for data in records:
+                self.tasks.append(Task.from_dict(data))
+
+    def append_tasks(self, records, chunk_size=10000):
+        """
+        Добавить задачи из потока словарей, выдавая им новые ID.
+
+        Записи читаются и сохраняются порциями по chunk_size задач (каждая порция — отдельная
+        транзакция), поэтому поток может быть сколь угодно длинным. Внутри batch() все порции входят
+        во внешнюю транзакцию. ID исходных записей не используются; задача без статуса считается невыполненной.
+
+        :param records: Итерируемый набор словарей с полями title, description, category, due_date, priority
+            и необязательным status.
+        :param chunk_size: Число задач в одной транзакции.
+        :return: Число добавленных задач.
+        :raises KeyError: Если в записи нет обязательного поля.
+        """
+        records = iter(records)
+        count = 0
+        while chunk := list(itertools.islice(records, chunk_size)):
+            with self.batch():
+                for data in chunk:
+                    self.tasks.append(self._new_task(self.next_id, data))
+            count += len(chunk)
+        return count
+
+    def replace_tasks(self, records, chunk_size=10000):
+        """
+        Заменить задачи потоком словарей, выдавая им новые ID.
+
+        Сначала все записи проверяются и пишутся во временный файл, поэтому ошибка во входных данных
+        оставляет прежние задачи без изменений. Затем прежние задачи удаляются отдельной транзакцией,
+        а новые добавляются через append_tasks() порциями по chunk_size задач, так что журнал отмены
+        и несохраненные записи хранилища не растут с длиной потока.
+
+        :param records: Итерируемый набор словарей в формате append_tasks().
+        :param chunk_size: Число задач в одной транзакции.
+        :return: Число добавленных задач.
+        :raises KeyError: Если в записи нет обязательного поля.
+        :raises ValueError: Если срок выполнения записи не является датой.
+        """
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as staged:
+            for data in records:
+                staged.write(json.dumps(self._new_task(0, data).to_dict(), ensure_ascii=False) + "\n")
+            staged.seek(0)
+            with self.batch():
+                self.tasks.clear()
+            return self.append_tasks(map(json.loads, staged), chunk_size)
+
+    @staticmethod
+    def _new_task(task_id, data):
+        """
+        Создать задачу по словарю импортируемой записи. Задача без статуса считается невыполненной.
+
+        :param task_id: Идентификатор новой задачи.
+        :param data: Словарь с полями title, description, category, due_date, priority и необязательным status.
+        :return: Задача.
+        :raises KeyError: Если в записи нет обязательного поля.
+        """
+        return Task(
+            task_id, data["title"], data["description"], data["category"], data["due_date"], data["priority"],
+            data.get("status") or "Не выполнена",
+        )
+
+    def _task_added(self, task):
+        """
+        Обработать добавление задачи в список.
+
+        :param task: Добавленная задача.
+        """
+        task._listener = self._task_changed
+        self.next_id = max(self.next_id, task.id + 1)
+        for index in self.indexes.values():
+            index.add(task)
+        self.storage.record("add", task=task.to_dict())
+        self.unsaved.add(task.id)
+        if self._undo is not None:
+            self._undo.append(("add", task, None))
+
+    def _task_removed(self, task):
+        """
+        Обработать удаление задачи из списка.
+
+        :param task: Удаленная задача.
+        """
+        task._listener = None
+        for index in self.indexes.values():
+            index.discard(task)
+        self.storage.record("delete", id=task.id)
+        self.unsaved.delete(task.id)
+
+    def _tasks_cleared(self, task_ids):
+        """
+        Обработать очистку списка задач. Нумерация задач начинается заново.
+
+        :param task_ids: ID задач, которые были в списке перед очисткой.
+        """
+        self.next_id = 1
+        for index in self.indexes.values():
+            index.clear()
+        self.storage.record("clear")
+        self.unsaved.clear(task_ids)
+
+    def _task_changed(self, task, op, old):
+        """
+        Обработать изменение полей задачи.
+
+        :param task: Измененная задача.
+        :param op: Тип изменения (edit или mark_done).
+        :param old: Словарь прежних значений измененных полей.
+        """
+        with self._lock:
+            self._tasks._changed(task, old)
+            for index in self.indexes.values():
+                index.update(task, old)
+            if op == "mark_done":
+                self.storage.record("mark_done", id=task.id)
+            else:
+                data = task.to_dict()
+                self.storage.record("edit", id=task.id, fields={field: data[field] for field in old})
+            self.unsaved.change(task.id)
+            if self._undo is not None:
+                self._undo.append(("change", task, old))
+
+    def delete_category(self, category):
+        """
+        Удалить все задачи категории одной транзакцией.
+
+        :param category: Категория.
+        :return: Число удаленных задач.
+        """
+        with self.batch():
+            tasks = self.filter_tasks(category=category)
+            for task in tasks:
+                self.tasks.remove(task)
+        return len(tasks)
+
+    @timed("add")
     def add_task(self, title, description, category, due_date, priority):
         """
         Добавить новую задачу.
@@ -144,12 +1256,15 @@ class TaskManager:
         :param category: Категория задачи.
         :param due_date: Срок выполнения задачи.
         :param priority: Приоритет задачи.
+        :return: Добавленная задача.
         """
-        new_id = max((task.id for task in self.tasks), default=0) + 1
-        new_task = Task(new_id, title, description, category, due_date, priority)
-        self.tasks.append(new_task)
-        self.save_tasks()
+        with self._lock, self._exclusive():
+            new_task = Task(self.next_id, title, description, category, due_date, priority)
+            self.tasks.append(new_task)
+            self.save_tasks()
+        return new_task
 
+    @timed("lookup")
     def get_task_by_id(self, task_id):
         """
         Получить задачу по ID.
@@ -157,25 +1272,248 @@ class TaskManager:
         :param task_id: Идентификатор задачи.
         :return: Задача с данным ID или None, если не найдена.
         """
-        return next((task for task in self.tasks if task.id == task_id), None)
+        self._refresh_if_shared()
+        return self.tasks.get(task_id)
 
-    def show_tasks(self, tasks=None):
+    def get_categories(self):
         """
-        Показать список задач.
+        Получить список категорий, в которых есть задачи.
+
+        :return: Список категорий.
+        """
+        self._refresh_if_shared()
+        return self.indexes["category"].values()
+
+    @timed("stats")
+    def get_statistics(self, today=None):
+        """
+        Получить сводную статистику задач по счетчикам, которые обновляются при каждом изменении задач.
+
+        Задачи не просматриваются, поэтому время не зависит от их числа. Во время фоновой загрузки
+        возвращаются сохраненные счетчики (см. persist_stats), если они соответствуют файлу задач;
+        иначе метод дожидается окончания загрузки.
+
+        :param today: Текущая дата (гггг-мм-дд или date) для числа просроченных задач. Если None, берется сегодняшняя.
+        :return: Словарь: total, done, open, overdue, completion_rate (доля выполненных задач от 0 до 1),
+            by_category, by_status и by_priority ({значение: число задач} по убыванию числа задач).
+        """
+        today = parse_date(today) or date.today()
+        if self.stats_file and self.is_loading():
+            stats = StatsIndex()
+            if stats.load(self.stats_file, self.storage.fingerprint()):
+                return stats.summary(today)
+        self._refresh_if_shared()
+        with self._lock:
+            return self._statistics().summary(today)
+
+    def _statistics(self):
+        """
+        Получить счетчики всех задач.
+
+        :return: Экземпляр StatsIndex.
+        """
+        return self.indexes["stats"]
+
+    @timed("filter")
+    def filter_tasks(self, category=None, status=None, priority=None, ignore_case=False):
+        """
+        Найти задачи по категории, статусу и приоритету с помощью индексов.
+
+        :param category: Категория задачи.
+        :param status: Статус задачи.
+        :param priority: Приоритет задачи.
+        :param ignore_case: Сравнивать значения без учета регистра.
+        :return: Список подходящих задач.
+        """
+        self._refresh_if_shared()
+        buckets = []
+        for field, value in (("category", category), ("status", status), ("priority", priority)):
+            if value is None:
+                continue
+            index = self.indexes[field]
+            if ignore_case:
+                value = value.casefold()
+                bucket = {
+                    task.id: task
+                    for key in index.values() if key.casefold() == value
+                    for task in index.get(key)
+                }
+            else:
+                bucket = index.buckets.get(value, {})
+            buckets.append(bucket)
+        if not buckets:
+            return list(self.tasks)
+        buckets.sort(key=len)
+        smallest, others = buckets[0], buckets[1:]
+        if not others:
+            return list(smallest.values())
+        return [task for task_id, task in smallest.items() if all(task_id in bucket for bucket in others)]
+
+    @timed("sort")
+    def sort_tasks(self, keys=DEFAULT_SORT, tasks=None):
+        """
+        Упорядочить задачи по нескольким ключам.
+
+        Порядок всех задач кэшируется для каждого набора ключей и обновляется при добавлении,
+        удалении и изменении задач, поэтому повторный запрос не сортирует список заново.
+        Переданный набор задач (например, результат поиска) сортируется без кэширования.
+
+        :param keys: Ключи сортировки: priority, due_date, status, category, title; префикс "-" —
+            по убыванию. По умолчанию — сначала высокий приоритет, затем ближайший срок.
+        :param tasks: Задачи для сортировки. Если None, сортируются все задачи.
+        :return: Новый упорядоченный список задач.
+        :raises ValueError: Если ключ сортировки неизвестен.
+        """
+        if tasks is not None:
+            return SortOrder(keys).sort(tasks)
+        self._refresh_if_shared()
+        return list(self._sorted(keys))
+
+    def _sorted(self, keys):
+        """
+        Получить кэшированный порядок всех задач, создав его при первом обращении.
+
+        :param keys: Ключи сортировки.
+        :return: Упорядоченная последовательность задач, которую нельзя изменять.
+        :raises ValueError: Если ключ сортировки неизвестен.
+        """
+        name = "sort:" + ",".join(keys)
+        with self._lock:
+            order = self.indexes.get(name)
+            if order is None:
+                order = self._indexes[name] = SortOrder(keys)
+            return order.ordered(self.tasks)
+
+    @timed("due")
+    def get_tasks_due_between(self, start, end):
+        """
+        Найти задачи со сроком выполнения в интервале.
+
+        :param start: Начало интервала (гггг-мм-дд или date, включительно).
+        :param end: Конец интервала (гггг-мм-дд или date, включительно).
+        :return: Список задач, упорядоченный по сроку.
+        :raises ValueError: Если граница интервала не является датой.
+        """
+        start, end = parse_date(start), parse_date(end)
+        self._refresh_if_shared()
+        return self.indexes["due_date"].range(start, end)
+
+    @timed("due")
+    def get_overdue_tasks(self, today=None):
+        """
+        Найти невыполненные задачи с истекшим сроком.
+
+        :param today: Текущая дата (гггг-мм-дд или date). Если None, берется сегодняшняя.
+        :return: Список задач, упорядоченный по сроку.
+        """
+        today = parse_date(today) or date.today()
+        self._refresh_if_shared()
+        return self.indexes["open_due_date"].range(end=today, include_end=False)
+
+    @timed("due")
+    def get_upcoming_tasks(self, limit=None, today=None, end=None):
+        """
+        Найти ближайшие по сроку невыполненные задачи, срок которых еще не истек.
+
+        Задачи берутся из упорядоченного индекса невыполненных задач: поиск начала занимает
+        O(log N), а выборка — O(limit).
+
+        :param limit: Максимальное число задач. Если None, возвращаются все.
+        :param today: Текущая дата (гггг-мм-дд или date). Если None, берется сегодняшняя.
+        :param end: Последний день (включительно). Если None, срок не ограничен сверху.
+        :return: Список задач, упорядоченный по сроку.
+        """
+        today = parse_date(today) or date.today()
+        self._refresh_if_shared()
+        return self.indexes["open_due_date"].range(today, parse_date(end), limit=limit)
+
+    def get_tasks_due_this_week(self, today=None):
+        """
+        Найти невыполненные задачи со сроком с сегодняшнего дня до конца недели (воскресенья).
+
+        :param today: Текущая дата (гггг-мм-дд или date). Если None, берется сегодняшняя.
+        :return: Список задач, упорядоченный по сроку.
+        """
+        today = parse_date(today) or date.today()
+        return self.get_upcoming_tasks(today=today, end=today + timedelta(days=6 - today.weekday()))
+
+    @timed("search")
+    def search_tasks(self, query, match_all=None):
+        """
+        Найти задачи по словам в названии и описании.
+
+        Слова запроса сопоставляются с началом слов задачи без учета регистра. По умолчанию
+        задача должна содержать все слова; если слова разделены OR или ИЛИ, достаточно любого.
+
+        :param query: Текст запроса.
+        :param match_all: True — все слова (AND), False — любое слово (OR), None — определить по запросу.
+        :return: Список задач, упорядоченный по убыванию релевантности.
+        """
+        query, match_all = self._parse_query(query, match_all)
+        self._refresh_if_shared()
+        return [self.tasks.get(task_id) for task_id in self.indexes["text"].search(query, match_all)]
+
+    @staticmethod
+    def _parse_query(query, match_all=None):
+        """
+        Определить режим поиска по запросу: слова через OR или ИЛИ означают поиск любого слова.
+
+        :param query: Текст запроса.
+        :param match_all: Явно заданный режим или None.
+        :return: Пара (текст запроса без OR/ИЛИ, режим поиска).
+        """
+        if match_all is None:
+            parts = _OR.split(query)
+            return " ".join(parts), len(parts) == 1
+        return query, match_all
+
+    @timed("render")
+    def show_tasks(self, tasks=None, page=1, page_size=None, sort_by=None):
+        """
+        Показать страницу списка задач.
+
+        Форматируются только задачи выводимой страницы, поэтому время вывода не зависит
+        от общего числа задач. Длинные значения обрезаются до column_width символов.
 
         :param tasks: Список задач для отображения. Если None, показываются все задачи.
+        :param page: Номер страницы, начиная с 1.
+        :param page_size: Число задач на странице. Если None, используется page_size менеджера.
+        :param sort_by: Ключи сортировки (см. sort_tasks). Все задачи берутся в кэшированном порядке,
+            переданный список сортируется. Если None, задачи выводятся в исходном порядке.
+        :return: Число страниц.
         """
+        if tasks is None:
+            self._refresh_if_shared()
+        if sort_by:
+            tasks = self._sorted(sort_by) if tasks is None else self.sort_tasks(sort_by, tasks)
+        loading = not tasks and page == 1 and self.is_loading()
         if not tasks:
-            tasks = self.tasks
+            tasks = self.first_page if loading else self.tasks
         if not tasks:
             print("Список задач пуст.")
-            return
+            return 0
+        page_size = page_size or self.page_size
+        page_count = -(-len(tasks) // page_size)
+        page = min(max(page, 1), page_count)
+        start = (page - 1) * page_size
+        width = self.column_width
         table = [
-            [task.id, task.title, task.category, task.due_date, task.priority, task.status]
-            for task in tasks
+            [task.id, _truncate(task.title, width), _truncate(task.category, width), format_date(task.due_date),
+             task.priority, task.status]
+            for task in tasks[start:start + page_size]
         ]
         headers = ["ID", "Название", "Категория", "Срок", "Приоритет", "Статус"]
-        print(tabulate(table, headers=headers, tablefmt="grid"))
+        profiler.count("rendered_tasks", len(table))
+        with profiler.measure("render.table", table_format=self.table_format):
+            if self.table_format == "fast":
+                print(_format_fast(table, headers))
+            else:
+                print(tabulate(table, headers=headers, tablefmt=self.table_format))
+        if loading:
+            print("Показаны первые задачи, загрузка остальных продолжается.")
+        elif page_count > 1:
+            print(f"Страница {page} из {page_count}, всего задач: {len(tasks)}.")
+        return page_count
 
 
 class MenuHandler:
@@ -185,8 +1523,18 @@ class MenuHandler:
     Атрибуты:
         Manager (TaskManager): Менеджер задач.
         Menus (dict): Словарь с пунктами меню и их обработчиками.
+        Sort_keys (tuple): Выбранный порядок сортировки списков задач или None (порядок добавления).
     """
 
+    sort_choices = [
+        ("Без сортировки (порядок добавления)", None),
+        ("По приоритету, затем по сроку", ("-priority", "due_date")),
+        ("По сроку выполнения, затем по приоритету", ("due_date", "-priority")),
+        ("По статусу, затем по сроку", ("status", "due_date")),
+        ("По категории, затем по приоритету", ("category", "-priority")),
+        ("По названию", ("title",)),
+    ]
+
     def __init__(self, manager):
         """
         Инициализация MenuHandler.
@@ -201,7 +1549,52 @@ class MenuHandler:
             "edit_task": self.edit_task_menu,
             "delete_task": self.delete_task_menu,
             "search_task": self.search_task_menu,
+            "statistics": self.statistics_menu,
         }
+        self.sort_keys = None
+
+    def browse_tasks(self, tasks=None, back_prompt="\nНажмите Enter для возврата в меню."):
+        """
+        Постраничный просмотр задач с переходом на следующую и предыдущую страницу.
+
+        Задачи выводятся в выбранном порядке сортировки: все задачи — в кэшированном
+        порядке менеджера, а переданный список сортируется один раз.
+
+        :param tasks: Список задач. Если None, показываются все задачи.
+        :param back_prompt: Приглашение для возврата в меню, если страница одна.
+        """
+        if tasks is not None and self.sort_keys:
+            tasks = self.manager.sort_tasks(self.sort_keys, tasks)
+        sort_by = self.sort_keys if tasks is None else None
+        page = 1
+        while True:
+            loading = tasks is None and not sort_by and self.manager.is_loading()
+            page_count = self.manager.show_tasks(tasks, page, sort_by=sort_by)
+            if page_count <= 1 and not loading:
+                input(back_prompt)
+                return
+            choice = input("\n[с] — следующая страница, [п] — предыдущая, Enter — возврат в меню: ").strip().lower()
+            if choice in ("с", "n"):
+                page = page + 1 if loading else min(page + 1, page_count)
+            elif choice in ("п", "p"):
+                page = max(page - 1, 1)
+            else:
+                return
+
+    def sort_menu(self):
+        """
+        Выбрать порядок сортировки списков задач.
+        """
+        current = next(label for label, keys in self.sort_choices if keys == self.sort_keys)
+        print(f"\nСортировка (сейчас: {current}):")
+        for idx, (label, _) in enumerate(self.sort_choices, start=1):
+            print(f"{idx}. {label}")
+        choice = input("\nВыберите порядок: ")
+        if choice.isdigit() and 0 < int(choice) <= len(self.sort_choices):
+            self.sort_keys = self.sort_choices[int(choice) - 1][1]
+            print(f"Порядок сортировки: {self.sort_choices[int(choice) - 1][0]}.")
+        else:
+            print("Неверный выбор. Порядок сортировки не изменен.")
 
     def execute(self):
         """
@@ -226,7 +1619,8 @@ class MenuHandler:
         print("3. Изменить задачу")
         print("4. Удалить задачу")
         print("5. Поиск задач")
-        print("6. Выход")
+        print("6. Статистика")
+        print("7. Выход")
         choice = input("\nВыберите действие: ")
 
         match choice:
@@ -241,6 +1635,8 @@ class MenuHandler:
             case "5":
                 return "search_task"
             case "6":
+                return "statistics"
+            case "7":
                 print("Выход из программы.")
                 return None
             case _:
@@ -256,33 +1652,85 @@ class MenuHandler:
         print("\nПросмотр задач:")
         print("1. Все задачи")
         print("2. По категории")
-        print("3. Назад")
+        print("3. Просроченные задачи")
+        print("4. По сроку выполнения")
+        print("5. Ближайшие задачи")
+        print("6. Задачи на этой неделе")
+        print("7. Сортировка")
+        print("8. Назад")
         choice = input("\nВыберите действие: ")
 
         match choice:
             case "1":
-                self.manager.show_tasks()
-                input("\nНажмите Enter для возврата в меню.")
+                self.browse_tasks()
                 return "view_tasks"
             case "2":
-                categories = {task.category for task in self.manager.tasks}
+                categories = self.manager.get_categories()
                 if not categories:
                     print("Категории отсутствуют.")
+                    input("\nНажмите Enter для возврата в меню.")
                 else:
                     print("\nКатегории:")
                     for idx, category in enumerate(categories, start=1):
                         print(f"{idx}. {category}")
                     category = input("\nВведите категорию или номер: ")
                     selected_category = (
-                        list(categories)[int(category) - 1]
+                        categories[int(category) - 1]
                         if category.isdigit() and 0 < int(category) <= len(categories)
                         else category
                     )
-                    tasks = [task for task in self.manager.tasks if task.category == selected_category]
-                    self.manager.show_tasks(tasks)
-                input("\nНажмите Enter для возврата в меню.")
+                    tasks = self.manager.filter_tasks(category=selected_category)
+                    if tasks:
+                        self.browse_tasks(tasks)
+                    else:
+                        print("Задачи не найдены по выбранной категории.")
+                        input("\nНажмите Enter для возврата в меню.")
                 return "view_tasks"
             case "3":
+                tasks = self.manager.get_overdue_tasks()
+                if tasks:
+                    self.browse_tasks(tasks)
+                else:
+                    print("Просроченных задач нет.")
+                    input("\nНажмите Enter для возврата в меню.")
+                return "view_tasks"
+            case "4":
+                start = input("Начало интервала (гггг-мм-дд): ")
+                end = input("Конец интервала (гггг-мм-дд): ")
+                try:
+                    tasks = self.manager.get_tasks_due_between(start, end)
+                except ValueError as error:
+                    print(error)
+                    input("\nНажмите Enter для возврата в меню.")
+                    return "view_tasks"
+                if tasks:
+                    self.browse_tasks(tasks)
+                else:
+                    print("Задачи в этом интервале не найдены.")
+                    input("\nНажмите Enter для возврата в меню.")
+                return "view_tasks"
+            case "5":
+                count = input(f"Сколько задач показать (по умолчанию {self.manager.page_size}): ")
+                limit = int(count) if count.isdigit() and int(count) > 0 else self.manager.page_size
+                tasks = self.manager.get_upcoming_tasks(limit)
+                if tasks:
+                    self.browse_tasks(tasks)
+                else:
+                    print("Невыполненных задач со сроком нет.")
+                    input("\nНажмите Enter для возврата в меню.")
+                return "view_tasks"
+            case "6":
+                tasks = self.manager.get_tasks_due_this_week()
+                if tasks:
+                    self.browse_tasks(tasks)
+                else:
+                    print("На этой неделе задач нет.")
+                    input("\nНажмите Enter для возврата в меню.")
+                return "view_tasks"
+            case "7":
+                self.sort_menu()
+                return "view_tasks"
+            case "8":
                 return "main_menu"
             case _:
                 print("Неверный выбор. Попробуйте снова.")
@@ -301,8 +1749,12 @@ class MenuHandler:
         due_date = input("Срок выполнения (гггг-мм-дд): ")
         priority = input("Приоритет задачи (низкий, средний, высокий): ")
 
-        self.manager.add_task(title, description, category, due_date, priority)
-        print("Задача добавлена.")
+        try:
+            self.manager.add_task(title, description, category, due_date, priority)
+        except ValueError as error:
+            print(error)
+        else:
+            print("Задача добавлена.")
         input("\nНажмите Enter для возврата в меню.")
         return "main_menu"
 
@@ -319,11 +1771,15 @@ class MenuHandler:
             title = input(f"Новое название ({task.title}): ")
             description = input(f"Новое описание ({task.description}): ")
             category = input(f"Новая категория ({task.category}): ")
-            due_date = input(f"Новый срок выполнения ({task.due_date}): ")
+            due_date = input(f"Новый срок выполнения ({format_date(task.due_date)}): ")
             priority = input(f"Новый приоритет ({task.priority}): ")
-            task.edit(title, description, category, due_date, priority)
-            self.manager.save_tasks()
-            print("Задача обновлена.")
+            try:
+                task.edit(title, description, category, due_date, priority)
+            except ValueError as error:
+                print(error)
+            else:
+                self.manager.save_tasks()
+                print("Задача обновлена.")
         else:
             print("Задача не найдена.")
         input("\nНажмите Enter для возврата в меню.")
@@ -355,11 +1811,8 @@ class MenuHandler:
                 return "delete_task"
             case "2":
                 category = input("Введите категорию для удаления: ")
-                tasks_to_delete = [task for task in self.manager.tasks if task.category == category]
-                for task in tasks_to_delete:
-                    self.manager.tasks.remove(task)
-                self.manager.save_tasks()
-                print("Задачи из категории удалены.")
+                count = self.manager.delete_category(category)
+                print(f"Удалено задач из категории: {count}.")
                 return "delete_task"
             case "3":
                 self.manager.tasks.clear()
@@ -380,29 +1833,31 @@ class MenuHandler:
         """
         while True:
             print("\nПоиск задач:")
-            print("1. Поиск по ключевому слову в названии задачи")
+            print("1. Поиск по ключевым словам в названии и описании задачи")
             print("2. Поиск по категории")
             print("3. Поиск по статусу выполнения")
-            print("4. Назад")
+            print("4. Сортировка результатов")
+            print("5. Назад")
             choice = input("\nВыберите действие: ")
 
             if choice == "1":
-                keyword = input("Введите ключевое слово для поиска: ")
-                tasks = [task for task in self.manager.tasks if keyword.lower() in task.title.lower()]
+                keyword = input("Введите ключевые слова для поиска (OR — любое из слов): ")
+                tasks = self.manager.search_tasks(keyword)
                 if tasks:
-                    self.manager.show_tasks(tasks)
+                    self.browse_tasks(tasks, "\nНажмите Enter для возврата в меню поиска.")
                 else:
                     print("Задачи не найдены по ключевому слову.")
-                input("\nНажмите Enter для возврата в меню поиска.")
+                    input("\nНажмите Enter для возврата в меню поиска.")
 
             elif choice == "2":
-                categories = {task.category for task in self.manager.tasks}
+                categories = self.manager.get_categories()
                 if not categories:
                     print("Категории отсутствуют.")
+                    input("\nНажмите Enter для возврата в меню поиска.")
                 else:
                     print("\nКатегории:")
                     # Выводим категории с номерами
-                    category_list = list(categories)
+                    category_list = categories
                     for idx, category in enumerate(category_list, start=1):
                         print(f"{idx}. {category}")
 
@@ -416,12 +1871,13 @@ class MenuHandler:
                         selected_category = category_input.strip()
 
                     # Фильтрация задач по выбранной категории
-                    tasks = [task for task in self.manager.tasks if task.category.lower() == selected_category.lower()]
+                    tasks = self.manager.filter_tasks(category=selected_category, ignore_case=True)
                     if tasks:
-                        self.manager.show_tasks(tasks)  # Выводим задачи по выбранной категории
+                        # Выводим задачи по выбранной категории
+                        self.browse_tasks(tasks, "\nНажмите Enter для возврата в меню поиска.")
                     else:
                         print("Задачи не найдены по выбранной категории.")
-                input("\nНажмите Enter для возврата в меню поиска.")
+                        input("\nНажмите Enter для возврата в меню поиска.")
 
             elif choice == "3":
                 # Предоставим пользователю выбор статуса
@@ -438,19 +1894,47 @@ class MenuHandler:
                     print("Неверный выбор. Попробуйте снова.")
                     continue
 
-                tasks = [task for task in self.manager.tasks if task.status.lower() == status.lower()]
+                tasks = self.manager.filter_tasks(status=status)
                 if tasks:
-                    self.manager.show_tasks(tasks)  # Выводим задачи с выбранным статусом
+                    # Выводим задачи с выбранным статусом
+                    self.browse_tasks(tasks, "\nНажмите Enter для возврата в меню поиска.")
                 else:
                     print(f"Задачи со статусом '{status}' не найдены.")
-                input("\nНажмите Enter для возврата в меню поиска.")
+                    input("\nНажмите Enter для возврата в меню поиска.")
 
             elif choice == "4":
+                self.sort_menu()
+
+            elif choice == "5":
                 return "main_menu"
 
             else:
                 print("Неверный выбор. Попробуйте снова.")
 
+    def statistics_menu(self):
+        """
+        Показать статистику задач: число задач, долю выполненных, число просроченных и распределение
+        по категориям, статусам и приоритетам.
+
+        :return: Главное меню.
+        """
+        stats = self.manager.get_statistics()
+        print("\nСтатистика задач:")
+        print(f"Всего задач: {stats['total']}")
+        print(f"Выполнено: {stats['done']} ({stats['completion_rate']:.1%})")
+        print(f"Не выполнено: {stats['open']}, из них просрочено: {stats['overdue']}")
+        for title, counts in (
+            ("По категориям", stats["by_category"]),
+            ("По статусам", stats["by_status"]),
+            ("По приоритетам", stats["by_priority"]),
+        ):
+            if counts:
+                print(f"\n{title}:")
+                for value, count in counts.items():
+                    print(f"  {value or '(не задано)'}: {count}")
+        input("\nНажмите Enter для возврата в меню.")
+        return "main_menu"
+
 
 def main():
     """
@@ -458,9 +1942,12 @@ def main():
 
     Создает экземпляры менеджера задач и обработчика меню, затем запускает меню.
     """
-    task_manager = TaskManager()
-    menu_handler = MenuHandler(task_manager)
-    menu_handler.execute()
+    with profile_session():
+        task_manager = TaskManager(background_load=True, shared_read=True, persist_stats=True)
+        try:
+            MenuHandler(task_manager).execute()
+        finally:
+            task_manager.close()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
+import os
+import tempfile
 import unittest
+from datetime import date
 from unittest.mock import patch
 from io import StringIO
 from task_manager import Task, TaskManager, MenuHandler
@@ -14,7 +17,7 @@ class TestTask(unittest.TestCase):
         self.assertEqual(task.title, "Test Task")
         self.assertEqual(task.description, "Description of the task")
         self.assertEqual(task.category, "Category1")
-        self.assertEqual(task.due_date, "2024-12-31")
+        self.assertEqual(task.due_date, date(2024, 12, 31))
         self.assertEqual(task.priority, "Средний")
         self.assertEqual(task.status, "Не выполнена")
 
@@ -27,9 +30,19 @@ class TestTask(unittest.TestCase):
         self.assertEqual(task.title, "Updated Task")
         self.assertEqual(task.description, "Updated description")
         self.assertEqual(task.category, "Category2")
-        self.assertEqual(task.due_date, "2024-11-30")
+        self.assertEqual(task.due_date, date(2024, 11, 30))
         self.assertEqual(task.priority, "Высокий")
 
+    def test_task_version(self):
+        """Тест на увеличение счетчика изменений только при фактическом изменении полей."""
+        task = Task(1, "Test Task", "Description", "Category1", "2024-12-31", "Средний")
+        task.edit(title="Test Task", priority="Средний")
+        self.assertEqual(task.version, 0)
+        task.edit(title="Updated Task")
+        task.mark_as_done()
+        task.mark_as_done()
+        self.assertEqual(task.version, 2)
+
     def test_task_to_dict(self):
         """Тест на преобразование задачи в словарь."""
         task = Task(1, "Test Task", "Description", "Category1", "2024-12-31", "Средний")
@@ -49,9 +62,15 @@ class TestTask(unittest.TestCase):
 class TestTaskManager(unittest.TestCase):
 
     def setUp(self):
-        """Подготовка к тестам: создаем экземпляр TaskManager с временным файлом."""
-        self.manager = TaskManager(file_name="test_tasks.json")
-        self.manager.tasks.clear()
+        """Подготовка к тестам: создаем экземпляр TaskManager с файлом во временном каталоге."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        self.manager = TaskManager(file_name=self.file_name)
+
+    def tearDown(self):
+        """Закрытие менеджера и удаление временного каталога."""
+        self.manager.close()
+        self.tmp_dir.cleanup()
 
     def test_add_task(self):
         """Тест на добавление задачи."""
@@ -73,11 +92,23 @@ class TestTaskManager(unittest.TestCase):
         self.assertEqual(task.id, 1)
         self.assertEqual(task.title, "Task 1")
 
+    def test_delete_task_by_id(self):
+        """Тест на удаление задачи через коллекцию задач."""
+        self.manager.add_task("Task 1", "Description", "Category1", "2024-12-31", "Средний")
+        self.manager.add_task("Task 2", "Description", "Category1", "2024-12-31", "Средний")
+
+        self.manager.tasks.remove(self.manager.get_task_by_id(1))
+
+        self.assertIsNone(self.manager.get_task_by_id(1))
+        self.assertEqual([task.id for task in self.manager.tasks], [2])
+        with self.assertRaises(ValueError):
+            self.manager.tasks.append(self.manager.get_task_by_id(2))
+
     def test_save_and_load_tasks(self):
         """Тест на сохранение и загрузку задач."""
         self.manager.add_task("Task 2", "Description", "Category2", "2024-12-31", "Низкий")
         self.manager.save_tasks()
-        new_manager = TaskManager(file_name="test_tasks.json")
+        new_manager = TaskManager(file_name=self.file_name)
 
         self.assertEqual(len(new_manager.tasks), 1)
         self.assertEqual(new_manager.tasks[0].title, "Task 2")
@@ -95,13 +126,48 @@ class TestTaskManager(unittest.TestCase):
         self.assertIn("Task 1", output)
         self.assertIn("Task 2", output)
 
+    def test_show_tasks_pages(self):
+        """Тест на постраничный вывод задач."""
+        for number in range(1, 6):
+            self.manager.add_task(f"Task {number}", "Description", "Category1", "2024-12-31", "Средний")
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            page_count = self.manager.show_tasks(page=3, page_size=2)
+            output = mock_stdout.getvalue()
+
+        self.assertEqual(page_count, 3)
+        self.assertIn("Task 5", output)
+        self.assertNotIn("Task 4", output)
+        self.assertIn("Страница 3 из 3", output)
+
+    def test_show_tasks_fast_format(self):
+        """Тест на вывод таблицы без tabulate с обрезкой длинных названий."""
+        self.manager.add_task("A" * 100, "Description", "Category1", "2024-12-31", "Средний")
+        self.manager.table_format = "fast"
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            self.manager.show_tasks()
+            output = mock_stdout.getvalue()
+
+        self.assertIn("A" * 39 + "…", output)
+        self.assertNotIn("+---", output)
+
 
 class TestMenuHandler(unittest.TestCase):
 
+    def setUp(self):
+        """Подготовка к тестам: создаем временный каталог для файла задач."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
     @patch("builtins.input", side_effect=["1"])
     def test_main_menu(self, mock_input):
         """Тест на выбор пунктов в главном меню."""
-        task_manager = TaskManager(file_name="test_tasks.json")
+        task_manager = TaskManager(file_name=self.file_name)
         menu_handler = MenuHandler(task_manager)
 
         # Вызов метода main_menu
@@ -110,6 +176,52 @@ class TestMenuHandler(unittest.TestCase):
         # Проверка, что метод выбора пункта меню был вызван
         mock_input.assert_called_once_with('\nВыберите действие: ')
 
+    @patch("builtins.input", side_effect=["с", "п", ""])
+    def test_browse_tasks(self, mock_input):
+        """Тест на переход по страницам списка задач."""
+        task_manager = TaskManager(file_name=self.file_name)
+        for number in range(1, 4):
+            task_manager.add_task(f"Task {number}", "Description", "Category1", "2024-12-31", "Средний")
+        task_manager.page_size = 2
+        menu_handler = MenuHandler(task_manager)
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            menu_handler.browse_tasks()
+            output = mock_stdout.getvalue()
+
+        self.assertEqual(mock_input.call_count, 3)
+        self.assertIn("Страница 2 из 2", output)
+        self.assertEqual(output.count("Страница 1 из 2"), 2)
+
+    @patch("builtins.input", side_effect=[""])
+    def test_statistics_menu(self, mock_input):
+        """Тест на вывод статистики задач."""
+        task_manager = TaskManager(file_name=self.file_name)
+        task_manager.add_task("Task 1", "Description", "Category1", "2000-01-01", "Высокий")
+        task_manager.add_task("Task 2", "Description", "Category2", "", "Средний").mark_as_done()
+        menu_handler = MenuHandler(task_manager)
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            self.assertEqual(menu_handler.statistics_menu(), "main_menu")
+            output = mock_stdout.getvalue()
+
+        self.assertIn("Всего задач: 2", output)
+        self.assertIn("Выполнено: 1 (50.0%)", output)
+        self.assertIn("Не выполнено: 1, из них просрочено: 1", output)
+        self.assertIn("  Category2: 1", output)
+
+    @patch("builtins.input", side_effect=["Task", "Description", "Category1", "31.12.2024", "Средний", ""])
+    def test_add_task_menu_rejects_invalid_date(self, mock_input):
+        """Тест на сообщение об ошибке при вводе срока не в формате гггг-мм-дд."""
+        task_manager = TaskManager(file_name=self.file_name)
+        menu_handler = MenuHandler(task_manager)
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            menu_handler.add_task_menu()
+
+        self.assertIn("Неверный срок выполнения", mock_stdout.getvalue())
+        self.assertEqual(len(task_manager.tasks), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
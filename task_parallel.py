@@ -0,0 +1,397 @@
+import functools
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from task_profile import profiler
+from task_serializer import get_serializer
+from task_storage import JournalStorage
+
+DEFAULT_CHUNK_SIZE = 20000
+
+_RECORD_START = re.compile(rb"\n[ \t]*\{")
+
+
+def _parse_range(path, start, end, array, backend):
+    """
+    Разобрать часть файла задач (выполняется в процессе пула).
+
+    :param path: Путь к файлу.
+    :param start: Смещение начала части в байтах (начало строки или позиция после открывающей скобки массива).
+    :param end: Смещение конца части в байтах.
+    :param array: Файл — JSON массив (tasks.json), а не JSONL.
+    :param backend: Имя библиотеки сериализации.
+    :return: Список словарей задач части.
+    """
+    loads = get_serializer(backend).loads
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+    if not array:
+        return [loads(line) for line in data.splitlines() if line.strip()]
+    data = data.strip()
+    if data.endswith(b"]"):
+        data = data[:-1].rstrip()
+    return loads(b"[" + data.rstrip(b",") + b"]")
+
+
+def _match_text(rows, words, match_all):
+    """
+    Найти строки, в названии или описании которых есть слова (выполняется в процессе пула).
+
+    :param rows: Список кортежей (id, название, описание).
+    :param words: Слова запроса в нижнем регистре (casefold).
+    :param match_all: True — все слова, False — любое слово.
+    :return: Список ID найденных задач.
+    """
+    check = all if match_all else any
+    found = []
+    for task_id, title, description in rows:
+        text = f"{title}\n{description}".casefold()
+        if check(word in text for word in words):
+            found.append(task_id)
+    return found
+
+
+def _match_regex(rows, pattern, flags):
+    """
+    Найти строки, название или описание которых соответствует регулярному выражению (выполняется в процессе пула).
+
+    :param rows: Список кортежей (id, название, описание).
+    :param pattern: Регулярное выражение.
+    :param flags: Флаги модуля re.
+    :return: Список ID найденных задач.
+    """
+    search = re.compile(pattern, flags).search
+    return [task_id for task_id, title, description in rows if search(title) or search(description)]
+
+
+def _match_predicate(records, predicate):
+    """
+    Найти задачи, для которых предикат истинен (выполняется в процессе пула).
+
+    :param records: Список словарей задач.
+    :param predicate: Функция словаря задачи, возвращающая bool.
+    :return: Список ID найденных задач.
+    """
+    return [record["id"] for record in records if predicate(record)]
+
+
+def _transform(records, function):
+    """
+    Вычислить изменения задач (выполняется в процессе пула).
+
+    :param records: Список словарей задач.
+    :param function: Функция словаря задачи, возвращающая словарь новых значений полей или None.
+    :return: Список пар (id, словарь новых значений) для задач, которые нужно изменить. Пустые значения
+        и значения, совпадающие с текущими, отбрасываются, как в Task.edit.
+    """
+    changes = []
+    for record in records:
+        fields = function(record)
+        if fields:
+            fields = {field: value for field, value in fields.items() if value and record[field] != value}
+            if fields:
+                changes.append((record["id"], fields))
+    return changes
+
+
+def _mark_done(predicate, record):
+    """
+    Изменение для массовой отметки о выполнении.
+
+    :param predicate: Функция словаря задачи или None (все задачи).
+    :param record: Словарь задачи.
+    :return: Словарь {status: Выполнена} или None.
+    """
+    if predicate is None or predicate(record):
+        return {"status": "Выполнена"}
+    return None
+
+
+def _recategorize(category, predicate, record):
+    """
+    Изменение для массового переноса задач в категорию.
+
+    :param category: Новая категория.
+    :param predicate: Функция словаря задачи или None (все задачи).
+    :param record: Словарь задачи.
+    :return: Словарь {category: новая категория} или None.
+    """
+    if predicate is None or predicate(record):
+        return {"category": category}
+    return None
+
+
+class ParallelEngine:
+    """
+    Параллельное выполнение тяжелых операций над задачами в пуле процессов.
+
+    Большие файлы задач разбираются частями, а полные просмотры (поиск подстрок, регулярные
+    выражения, произвольные предикаты) и массовые изменения выполняются над порциями задач
+    по chunk_size в разных процессах. Результаты порций объединяются в исходном порядке,
+    поэтому результат не зависит от числа процессов и совпадает с последовательным выполнением.
+    Изменения задач вычисляются в пуле, а применяются в основном процессе одной транзакцией
+    batch(), поэтому индексы, журнал и откат работают как обычно.
+
+    Предикаты и функции изменений передаются в другие процессы, поэтому должны быть функциями
+    уровня модуля (или их functools.partial). При workers=1 пул не создается и все выполняется
+    в текущем процессе.
+
+    Атрибуты:
+        Workers (int): Число процессов.
+        Chunk_size (int): Число задач в одной порции.
+    """
+
+    def __init__(self, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Инициализация. Пул процессов создается при первой параллельной операции.
+
+        :param workers: Число процессов. Если None, по числу процессоров.
+        :param chunk_size: Число задач в одной порции.
+        :raises ValueError: Если workers или chunk_size меньше 1.
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        if self.workers < 1 or chunk_size < 1:
+            raise ValueError("Число процессов и размер порции должны быть положительными.")
+        self.chunk_size = chunk_size
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Остановить пул процессов.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _map(self, function, jobs):
+        """
+        Выполнить функцию для каждого набора аргументов и вернуть результаты в исходном порядке.
+
+        :param function: Функция уровня модуля.
+        :param jobs: Список кортежей аргументов.
+        :return: Список результатов.
+        """
+        if self.workers == 1 or len(jobs) < 2:
+            return [function(*args) for args in jobs]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        return list(self._pool.map(function, *zip(*jobs)))
+
+    def _chunks(self, items):
+        """
+        Разбить последовательность на порции по chunk_size элементов.
+
+        :param items: Список.
+        :return: Список порций.
+        """
+        return [items[start:start + self.chunk_size] for start in range(0, len(items), self.chunk_size)]
+
+    def parse_file(self, path, serializer=None):
+        """
+        Разобрать файл задач формата tasks.json или JSONL частями в пуле процессов.
+
+        Файл делится на части по границам строк: в JSONL — по любой строке, в tasks.json — по строкам,
+        с которых начинается задача (так записывают файл сериализаторы task_serializer); первая часть
+        tasks.json начинается сразу после открывающей скобки массива. Файл, который нельзя разделить
+        (например, массив в одну строку), разбирается одной частью.
+
+        :param path: Путь к файлу.
+        :param serializer: Сериализатор. Если None, выбирается самый быстрый из установленных.
+        :return: Список словарей задач в порядке файла (пустой, если файла нет).
+        :raises ValueError: Если файл не является корректным JSON.
+        """
+        serializer = serializer or get_serializer()
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return []
+        with profiler.measure("parallel.parse", workers=self.workers):
+            with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                size = len(data)
+                first = re.search(rb"\S", data[:4096])
+                array = first is not None and first.group() == b"["
+                bounds = [first.end()] if array else []
+                parts = self.workers * 4
+                for part in range(parts):
+                    offset = size * part // parts
+                    if array:
+                        if not offset:
+                            continue
+                        match = _RECORD_START.search(data, max(offset - 1, 0))
+                        if match is None:
+                            break
+                        position = match.start() + 1
+                    else:
+                        position = data.find(b"\n", offset - 1) + 1 if offset else 0
+                        if offset and not position:
+                            break
+                    if not bounds or position > bounds[-1]:
+                        bounds.append(position)
+            bounds.append(size)
+            jobs = [(path, start, end, array, serializer.name) for start, end in zip(bounds, bounds[1:])]
+            return [record for records in self._map(_parse_range, jobs) for record in records]
+
+    def _scan(self, manager, function, rows, *args):
+        """
+        Выполнить просмотр порций задач в пуле и получить найденные задачи в порядке коллекции.
+
+        :param manager: Менеджер задач.
+        :param function: Функция порции, возвращающая список ID.
+        :param rows: Список строк задач для передачи в процессы.
+        :param args: Дополнительные аргументы функции.
+        :return: Список задач.
+        """
+        jobs = [(chunk, *args) for chunk in self._chunks(rows)]
+        return [manager.tasks.get(task_id) for found in self._map(function, jobs) for task_id in found]
+
+    @staticmethod
+    def _text_rows(manager):
+        """
+        Получить ID, названия и описания всех задач менеджера.
+
+        :param manager: Менеджер задач.
+        :return: Список кортежей.
+        """
+        manager._refresh_if_shared()
+        return [(task.id, task.title, task.description) for task in manager.tasks]
+
+    @staticmethod
+    def _records(manager):
+        """
+        Получить словари всех задач менеджера.
+
+        :param manager: Менеджер задач.
+        :return: Список словарей задач.
+        """
+        manager._refresh_if_shared()
+        return [task.to_dict() for task in manager.tasks]
+
+    def search(self, manager, query, match_all=None):
+        """
+        Найти задачи, в названии или описании которых есть подстроки запроса, без учета регистра.
+
+        В отличие от TaskManager.search_tasks, который ищет по полнотекстовому индексу начала слов,
+        здесь проверяется вхождение в любом месте текста, поэтому просматриваются все задачи.
+
+        :param manager: Менеджер задач.
+        :param query: Слова запроса через пробел (через OR или ИЛИ — любое из слов).
+        :param match_all: True — все слова, False — любое слово, None — определить по запросу.
+        :return: Список задач в порядке коллекции.
+        """
+        query, match_all = manager._parse_query(query, match_all)
+        words = query.casefold().split()
+        if not words:
+            return []
+        with profiler.measure("parallel.search", workers=self.workers):
+            return self._scan(manager, _match_text, self._text_rows(manager), words, match_all)
+
+    def search_regex(self, manager, pattern, flags=re.IGNORECASE):
+        """
+        Найти задачи, название или описание которых соответствует регулярному выражению.
+
+        :param manager: Менеджер задач.
+        :param pattern: Регулярное выражение.
+        :param flags: Флаги модуля re (по умолчанию без учета регистра).
+        :return: Список задач в порядке коллекции.
+        :raises ValueError: Если регулярное выражение некорректно.
+        """
+        try:
+            re.compile(pattern, flags)
+        except re.error as error:
+            raise ValueError(f"Некорректное регулярное выражение: {error}.") from None
+        with profiler.measure("parallel.regex", workers=self.workers):
+            return self._scan(manager, _match_regex, self._text_rows(manager), pattern, flags)
+
+    def select(self, manager, predicate):
+        """
+        Найти задачи, для словаря которых предикат истинен.
+
+        :param manager: Менеджер задач.
+        :param predicate: Функция уровня модуля: словарь задачи -> bool.
+        :return: Список задач в порядке коллекции.
+        """
+        with profiler.measure("parallel.select", workers=self.workers):
+            return self._scan(manager, _match_predicate, self._records(manager), predicate)
+
+    def transform(self, manager, function):
+        """
+        Изменить задачи: новые значения полей вычисляются в пуле, а применяются одной транзакцией.
+
+        Изменения применяются в порядке коллекции: поле status (только значение «Выполнена») —
+        через Task.mark_as_done, остальные — через Task.edit.
+
+        :param manager: Менеджер задач.
+        :param function: Функция уровня модуля: словарь задачи -> словарь новых значений полей или None.
+        :return: Число измененных задач.
+        :raises ValueError: Если функция меняет ID или задает статус, отличный от «Выполнена».
+        """
+        with profiler.measure("parallel.transform", workers=self.workers):
+            jobs = [(chunk, function) for chunk in self._chunks(self._records(manager))]
+            changes = [change for changes in self._map(_transform, jobs) for change in changes]
+            for _, fields in changes:
+                if "id" in fields or fields.get("status", "Выполнена") != "Выполнена":
+                    raise ValueError("Массовое изменение может менять только поля задачи и отмечать ее выполненной.")
+            with manager.batch():
+                for task_id, fields in changes:
+                    task = manager.tasks.get(task_id)
+                    status = fields.pop("status", None)
+                    if fields:
+                        task.edit(**fields)
+                    if status is not None:
+                        task.mark_as_done()
+        return len(changes)
+
+    def mark_done(self, manager, predicate=None):
+        """
+        Отметить выполненными все задачи, для которых предикат истинен.
+
+        :param manager: Менеджер задач.
+        :param predicate: Функция уровня модуля: словарь задачи -> bool. Если None — все задачи.
+        :return: Число задач, отмеченных выполненными.
+        """
+        return self.transform(manager, functools.partial(_mark_done, predicate))
+
+    def recategorize(self, manager, category, predicate=None):
+        """
+        Перенести в категорию все задачи, для которых предикат истинен.
+
+        :param manager: Менеджер задач.
+        :param category: Новая категория.
+        :param predicate: Функция уровня модуля: словарь задачи -> bool. Если None — все задачи.
+        :return: Число перенесенных задач.
+        """
+        return self.transform(manager, functools.partial(_recategorize, category, predicate))
+
+
+class ParallelJournalStorage(JournalStorage):
+    """
+    Хранилище JournalStorage, снимок которого при загрузке разбирается частями в пуле процессов.
+
+    Атрибуты:
+        Engine (ParallelEngine): Пул процессов для разбора снимка.
+    """
+
+    def __init__(self, file_name, engine, **kwargs):
+        """
+        Инициализация хранилища.
+
+        :param file_name: Имя файла снимка.
+        :param engine: Экземпляр ParallelEngine.
+        :param kwargs: Параметры JournalStorage (compact_every, fsync, serializer).
+        """
+        super().__init__(file_name, **kwargs)
+        self.engine = engine
+
+    def read_snapshot(self):
+        """
+        Разобрать снимок в пуле процессов.
+
+        :return: Итератор словарей задач (пустой, если снимка нет).
+        """
+        return iter(self.engine.parse_file(self.file_name, self.serializer))
@@ -0,0 +1,126 @@
+import io
+import json
+import os
+import re
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from task_benchmark import write_task_file
+from task_cli import main
+from task_manager import TaskManager
+from task_parallel import ParallelEngine, ParallelJournalStorage
+from task_serializer import get_serializer
+from task_storage import import_json
+
+
+def is_high_priority(record):
+    """Предикат для пула процессов: задача с высоким приоритетом."""
+    return record["priority"] == "Высокий"
+
+
+def ids(tasks):
+    """Получить ID задач."""
+    return [task.id for task in tasks]
+
+
+class TestParallelEngine(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем временный каталог, файл задач и движки с одним и двумя процессами."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        write_task_file(self.file_name, 500, seed=3)
+        self.records = import_json(self.file_name)
+        self.engines = [ParallelEngine(1, chunk_size=64), ParallelEngine(2, chunk_size=64)]
+
+    def tearDown(self):
+        """Остановка пулов процессов и удаление временного каталога."""
+        for engine in self.engines:
+            engine.close()
+        self.tmp_dir.cleanup()
+
+    def test_parse_file(self):
+        """Тест на разбор tasks.json (и компактного) и JSONL частями: результат совпадает с разбором целиком."""
+        jsonl = os.path.join(self.tmp_dir.name, "tasks.jsonl")
+        write_task_file(jsonl, 500, seed=3)
+        one_line = os.path.join(self.tmp_dir.name, "one_line.json")
+        with open(one_line, "w", encoding="utf-8") as file:
+            json.dump(self.records, file, ensure_ascii=False)
+        compact = os.path.join(self.tmp_dir.name, "compact.json")
+        with open(compact, "wb") as file:
+            get_serializer("json", compact=True).write_tasks(file, self.records)
+        empty = os.path.join(self.tmp_dir.name, "empty.json")
+        with open(empty, "w", encoding="utf-8") as file:
+            file.write("[]")
+        for engine in self.engines:
+            for path in (self.file_name, jsonl, one_line, compact):
+                for serializer in (None, get_serializer("json")):
+                    self.assertEqual(engine.parse_file(path, serializer), self.records)
+            self.assertEqual(engine.parse_file(empty), [])
+            self.assertEqual(engine.parse_file(os.path.join(self.tmp_dir.name, "missing.json")), [])
+
+    def test_search(self):
+        """Тест на поиск подстрок, регулярных выражений и предикатов: порядок и результат не зависят от процессов."""
+        manager = TaskManager(self.file_name)
+        expected_text = [
+            task.id for task in manager.tasks
+            if "чет" in task.title.casefold() or "чет" in task.description.casefold()
+        ]
+        pattern = re.compile(r"^отправ", re.IGNORECASE)
+        expected_regex = [
+            task.id for task in manager.tasks if pattern.search(task.title) or pattern.search(task.description)
+        ]
+        expected_high = [task.id for task in manager.tasks if task.priority == "Высокий"]
+        self.assertTrue(expected_text and expected_regex and expected_high)
+        for engine in self.engines:
+            self.assertEqual(ids(engine.search(manager, "ЧЕТ")), expected_text)
+            self.assertEqual(ids(engine.search_regex(manager, r"^отправ")), expected_regex)
+            self.assertEqual(ids(engine.select(manager, is_high_priority)), expected_high)
+            self.assertEqual(engine.search(manager, "   "), [])
+            with self.assertRaisesRegex(ValueError, "регулярное выражение"):
+                engine.search_regex(manager, "(")
+        manager.close()
+
+    def test_bulk_changes(self):
+        """Тест на массовую отметку и перенос в категорию: изменения сохраняются в журнал одной транзакцией."""
+        for engine in self.engines:
+            file_name = os.path.join(self.tmp_dir.name, f"bulk-{engine.workers}.json")
+            write_task_file(file_name, 500, seed=3)
+            manager = TaskManager(file_name)
+            high = [task for task in manager.tasks if task.priority == "Высокий"]
+            pending = [task for task in high if task.status != "Выполнена"]
+            self.assertEqual(engine.mark_done(manager, is_high_priority), len(pending))
+            self.assertEqual(engine.mark_done(manager, is_high_priority), 0)
+            self.assertEqual(engine.recategorize(manager, "Срочно", is_high_priority), len(high))
+            manager.close()
+
+            manager = TaskManager(file_name, storage=ParallelJournalStorage(file_name, engine))
+            high = manager.filter_tasks(priority="Высокий")
+            self.assertTrue(all(task.status == "Выполнена" and task.category == "Срочно" for task in high))
+            self.assertEqual(ids(manager.filter_tasks(category="Срочно")), ids(high))
+            manager.close()
+
+    def test_invalid_arguments(self):
+        """Тест на проверку числа процессов и размера порции."""
+        for workers, chunk_size in ((0, 10), (2, 0)):
+            with self.assertRaises(ValueError):
+                ParallelEngine(workers, chunk_size)
+
+    def test_cli_search(self):
+        """Тест на команду search с --substring и --regex."""
+        manager = TaskManager(self.file_name)
+        expected = ids(self.engines[0].search(manager, "чет"))
+        expected_regex = ids(self.engines[0].search_regex(manager, r"^отправ"))
+        manager.close()
+        for argv, result in ((["--substring", "чет"], expected), (["--regex", "^отправ"], expected_regex)):
+            output = io.StringIO()
+            with redirect_stdout(output), redirect_stderr(io.StringIO()):
+                code = main(["--file", self.file_name, "search", *argv, "--workers", "2", "--format", "jsonl"])
+            self.assertEqual(code, 0)
+            self.assertEqual([json.loads(line)["id"] for line in output.getvalue().splitlines()], result)
+        with redirect_stderr(io.StringIO()):
+            self.assertEqual(main(["--file", self.file_name, "search", "--regex", "("]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,338 @@
+import cProfile
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from tabulate import tabulate
+
+PROFILE_ENV = "TASK_PROFILE"
+SLOW_ENV = "TASK_PROFILE_SLOW_MS"
+CPROFILE_ENV = "TASK_CPROFILE"
+TRACEMALLOC_ENV = "TASK_TRACEMALLOC"
+
+slow_log = logging.getLogger("task_manager.slow")
+
+
+class OperationStats:
+    """
+    Накопленное время одной операции.
+
+    Атрибуты:
+        Count (int): Число вызовов.
+        Total (float): Суммарное время в секундах.
+        Max (float): Наибольшее время одного вызова в секундах.
+    """
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def to_dict(self):
+        """
+        Преобразовать статистику в словарь с временем в миллисекундах.
+
+        :return: Словарь с полями count, total_ms, mean_ms и max_ms.
+        """
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class _Instrumented:
+    """
+    Метод, отмеченный декоратором timed(). При создании класса заменяется исходной функцией
+    или обертками профилировщика, если профилирование включено.
+    """
+
+    def __init__(self, profiler, name, func):
+        """
+        Инициализация отметки.
+
+        :param profiler: Профилировщик.
+        :param name: Имя операции.
+        :param func: Исходная функция.
+        """
+        self.profiler = profiler
+        self.name = name
+        self.func = func
+
+    def __set_name__(self, owner, attribute):
+        self.profiler.register(owner, attribute, self.func, self.name)
+
+
+class Profiler:
+    """
+    Таймеры и счетчики операций менеджера задач.
+
+    Методы отмечаются декоратором timed(), участки кода — контекстным менеджером measure().
+    Пока профилирование выключено, в классах стоят исходные функции без оберток, поэтому
+    инструментирование горячих путей (например, поиска задачи по ID) ничего не стоит: обертки
+    подставляются в классы при включении и убираются при выключении. Операции дольше
+    slow_threshold записываются в журнал task_manager.slow одной строкой JSON и в список
+    slow_operations.
+
+    Атрибуты:
+        Enabled (bool): Собирать таймеры и счетчики.
+        Slow_threshold (float): Порог медленной операции в секундах или None.
+        Timers (dict): Статистика времени по именам операций.
+        Counters (dict): Счетчики по именам.
+        Slow_operations (deque): Последние медленные операции (не больше slow_limit).
+    """
+
+    slow_limit = 100
+
+    def __init__(self, enabled=False, slow_threshold=None):
+        """
+        Инициализация профилировщика.
+
+        :param enabled: Собирать таймеры и счетчики.
+        :param slow_threshold: Порог медленной операции в секундах или None.
+        """
+        self._enabled = enabled or slow_threshold is not None
+        self.slow_threshold = slow_threshold
+        self.timers = {}
+        self.counters = {}
+        self.slow_operations = deque(maxlen=self.slow_limit)
+        self._lock = threading.Lock()
+        self._methods = []
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        """
+        Создать профилировщик по переменным окружения TASK_PROFILE и TASK_PROFILE_SLOW_MS.
+
+        :param environ: Переменные окружения.
+        :return: Профилировщик.
+        :raises ValueError: Если порог медленной операции не является числом.
+        """
+        slow_ms = environ.get(SLOW_ENV)
+        return cls(environ.get(PROFILE_ENV, "") not in ("", "0"), float(slow_ms) / 1000 if slow_ms else None)
+
+    @property
+    def enabled(self):
+        """
+        Собираются ли таймеры и счетчики. Присваивание подставляет или убирает обертки методов.
+        """
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled):
+        self._enabled = bool(enabled)
+        for owner, attribute, func, wrapper in self._methods:
+            setattr(owner, attribute, wrapper if self._enabled else func)
+
+    def enable(self, slow_threshold=None):
+        """
+        Включить профилирование.
+
+        :param slow_threshold: Порог медленной операции в секундах. Если None, порог не меняется.
+        """
+        if slow_threshold is not None:
+            self.slow_threshold = slow_threshold
+        self.enabled = True
+
+    def disable(self):
+        """
+        Выключить профилирование. Собранная статистика сохраняется.
+        """
+        self.enabled = False
+
+    def reset(self):
+        """
+        Очистить собранную статистику.
+        """
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+            self.slow_operations.clear()
+
+    def record(self, name, elapsed, **details):
+        """
+        Учесть время выполнения операции.
+
+        :param name: Имя операции.
+        :param elapsed: Время выполнения в секундах.
+        :param details: Подробности, которые записываются в журнал медленных операций.
+        """
+        with self._lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                stats = self.timers[name] = OperationStats()
+            stats.count += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+        if self.slow_threshold is not None and elapsed >= self.slow_threshold:
+            entry = {"operation": name, "duration_ms": round(elapsed * 1000, 3), "time": time.time(), **details}
+            self.slow_operations.append(entry)
+            slow_log.warning(json.dumps(entry, ensure_ascii=False, default=str), extra={"operation": entry})
+
+    def count(self, name, amount=1):
+        """
+        Увеличить счетчик, если профилирование включено.
+
+        :param name: Имя счетчика.
+        :param amount: Величина увеличения.
+        """
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def measure(self, name, **details):
+        """
+        Измерить время выполнения блока кода.
+
+        :param name: Имя операции.
+        :param details: Подробности для журнала медленных операций.
+        :return: Контекстный менеджер.
+        """
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, **details)
+
+    def timed(self, name):
+        """
+        Декоратор метода класса, измеряющий время его выполнения.
+
+        :param name: Имя операции.
+        :return: Декоратор.
+        """
+        return functools.partial(_Instrumented, self, name)
+
+    def register(self, owner, attribute, func, name):
+        """
+        Установить метод класса: обертку с таймером, если профилирование включено, иначе исходную функцию.
+
+        :param owner: Класс.
+        :param attribute: Имя метода.
+        :param func: Исходная функция.
+        :param name: Имя операции.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - started)
+
+        self._methods.append((owner, attribute, func, wrapper))
+        setattr(owner, attribute, wrapper if self._enabled else func)
+
+    def stats(self):
+        """
+        Получить собранную статистику.
+
+        :return: Словарь с ключами timers ({операция: count, total_ms, mean_ms, max_ms}), counters
+            и slow (последние медленные операции).
+        """
+        with self._lock:
+            return {
+                "timers": {name: stats.to_dict() for name, stats in sorted(self.timers.items())},
+                "counters": dict(sorted(self.counters.items())),
+                "slow": list(self.slow_operations),
+            }
+
+    def report(self):
+        """
+        Сформировать текстовый отчет о собранной статистике.
+
+        :return: Таблицы таймеров и счетчиков.
+        """
+        stats = self.stats()
+        if not stats["timers"] and not stats["counters"]:
+            return "Статистика профилирования пуста."
+        rows = [
+            [name, timer["count"], timer["total_ms"], timer["mean_ms"], timer["max_ms"]]
+            for name, timer in sorted(stats["timers"].items(), key=lambda item: -item[1]["total_ms"])
+        ]
+        lines = [tabulate(rows, headers=["Операция", "Вызовов", "Всего, мс", "Среднее, мс", "Макс., мс"])]
+        if stats["counters"]:
+            lines.append(tabulate(stats["counters"].items(), headers=["Счетчик", "Значение"]))
+        if stats["slow"]:
+            lines.append(f"Медленных операций: {len(stats['slow'])}.")
+        return "\n\n".join(lines)
+
+
+profiler = Profiler.from_env()
+
+
+def timed(name):
+    """
+    Декоратор метода класса, измеряющий время его выполнения общим профилировщиком profiler.
+
+    :param name: Имя операции.
+    :return: Декоратор.
+    """
+    return profiler.timed(name)
+
+
+@contextmanager
+def profile_session(report=False, environ=os.environ, stream=None):
+    """
+    Профилировать сеанс работы программы по переменным окружения.
+
+    TASK_CPROFILE=<файл> сохраняет профиль cProfile (читается модулем pstats или snakeviz),
+    TASK_TRACEMALLOC=<файл> — самые крупные места выделения памяти по данным tracemalloc,
+    а при TASK_PROFILE=1 по окончании сеанса выводится отчет таймеров и счетчиков.
+
+    :param report: Включить профилировщик и вывести отчет независимо от TASK_PROFILE.
+    :param environ: Переменные окружения.
+    :param stream: Поток для отчета. Если None, используется sys.stderr.
+    :return: Контекстный менеджер.
+    """
+    report = report or environ.get(PROFILE_ENV, "") not in ("", "0")
+    enabled = profiler.enabled
+    if report:
+        profiler.enable()
+    cprofile_file = environ.get(CPROFILE_ENV)
+    tracemalloc_file = environ.get(TRACEMALLOC_ENV)
+    profile = cProfile.Profile() if cprofile_file else None
+    if tracemalloc_file:
+        tracemalloc.start()
+    if profile is not None:
+        profile.enable()
+    try:
+        yield profiler
+    finally:
+        if profile is not None:
+            profile.disable()
+            profile.dump_stats(cprofile_file)
+        if tracemalloc_file:
+            _dump_allocations(tracemalloc.take_snapshot(), tracemalloc_file)
+            tracemalloc.stop()
+        if report:
+            print(profiler.report(), file=stream or sys.stderr)
+        profiler.enabled = enabled
+
+
+def _dump_allocations(snapshot, file_name, limit=50):
+    """
+    Записать самые крупные места выделения памяти в текстовый файл.
+
+    :param snapshot: Снимок tracemalloc.
+    :param file_name: Имя файла.
+    :param limit: Число записей.
+    """
+    statistics = snapshot.statistics("lineno")
+    with open(file_name, "w", encoding="utf-8") as file:
+        file.write(f"Всего выделено: {sum(stat.size for stat in statistics) / 1024:.1f} КиБ\n")
+        for stat in statistics[:limit]:
+            file.write(f"{stat}\n")
@@ -0,0 +1,106 @@
+import io
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from task_manager import TaskManager
+from task_sqlite import SqliteTaskManager
+from task_profile import CPROFILE_ENV, TRACEMALLOC_ENV, Profiler, profile_session, profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: включаем общий профилировщик и создаем менеджер во временном каталоге."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        self.enabled = profiler.enabled
+        profiler.reset()
+        profiler.enable()
+
+    def tearDown(self):
+        """Восстановление профилировщика и удаление временного каталога."""
+        profiler.enabled = self.enabled
+        profiler.slow_threshold = None
+        profiler.reset()
+        self.tmp_dir.cleanup()
+
+    def test_manager_operations(self):
+        """Тест на таймеры и счетчики загрузки, сохранения, добавления, поиска и вывода задач."""
+        manager = TaskManager(file_name=self.file_name)
+        for number in range(3):
+            manager.add_task(f"Отчет {number}", "Description", "Работа", "2024-12-31", "Высокий")
+        manager.get_task_by_id(2)
+        manager.filter_tasks(category="Работа")
+        manager.search_tasks("отчет")
+        with redirect_stdout(io.StringIO()):
+            manager.show_tasks()
+        manager.close()
+        TaskManager(file_name=self.file_name).close()
+
+        stats = profiler.stats()
+        for operation in ("load", "save", "add", "lookup", "filter", "search", "render", "render.table"):
+            self.assertIn(operation, stats["timers"])
+        self.assertEqual(stats["timers"]["add"]["count"], 3)
+        self.assertEqual(stats["counters"]["loaded_tasks"], 3)
+        self.assertEqual(stats["counters"]["saved_changes"], 3)
+        self.assertEqual(stats["counters"]["rendered_tasks"], 3)
+        self.assertIn("lookup", profiler.report())
+
+    def test_disabled(self):
+        """Тест на то, что выключенный профилировщик ничего не собирает и не оборачивает методы."""
+        self.assertTrue(hasattr(TaskManager.get_task_by_id, "__wrapped__"))
+        profiler.disable()
+        self.assertFalse(hasattr(TaskManager.get_task_by_id, "__wrapped__"))
+        manager = TaskManager(file_name=self.file_name)
+        manager.add_task("Task 1", "Description", "Работа", "", "Низкий")
+        manager.close()
+        self.assertEqual(profiler.stats(), {"timers": {}, "counters": {}, "slow": []})
+
+    def test_slow_operations(self):
+        """Тест на журнал медленных операций в формате JSON."""
+        profiler.enable(slow_threshold=0)
+        manager = TaskManager(file_name=self.file_name)
+        with self.assertLogs("task_manager.slow") as logs:
+            manager.add_task("Task 1", "Description", "Работа", "", "Низкий")
+        manager.close()
+        entries = [json.loads(record.getMessage()) for record in logs.records]
+        self.assertEqual([entry["operation"] for entry in entries], ["save", "add"])
+        self.assertEqual(profiler.stats()["slow"][-2:], entries)
+
+    def test_sqlite_operations(self):
+        """Тест на таймеры запросов SqliteTaskManager, переопределяющих методы TaskManager."""
+        manager = SqliteTaskManager(os.path.join(self.tmp_dir.name, "tasks.db"))
+        manager.add_task("Отчет", "Description", "Работа", "2024-12-31", "Высокий")
+        manager.filter_tasks(category="Работа")
+        manager.search_tasks("отчет")
+        manager.close()
+        self.assertEqual([profiler.stats()["timers"][name]["count"] for name in ("add", "filter", "search")], [1, 1, 1])
+
+    def test_from_env(self):
+        """Тест на настройку профилировщика переменными окружения."""
+        self.assertFalse(Profiler.from_env({}).enabled)
+        self.assertTrue(Profiler.from_env({"TASK_PROFILE": "1"}).enabled)
+        slow = Profiler.from_env({"TASK_PROFILE_SLOW_MS": "50"})
+        self.assertEqual((slow.enabled, slow.slow_threshold), (True, 0.05))
+
+    def test_profile_session(self):
+        """Тест на сохранение профиля cProfile, отчета tracemalloc и вывод отчета таймеров."""
+        profiler.disable()
+        cprofile_file = os.path.join(self.tmp_dir.name, "tasks.prof")
+        tracemalloc_file = os.path.join(self.tmp_dir.name, "tasks.alloc")
+        output = io.StringIO()
+        environ = {CPROFILE_ENV: cprofile_file, TRACEMALLOC_ENV: tracemalloc_file}
+        with profile_session(report=True, environ=environ, stream=output):
+            TaskManager(file_name=self.file_name).close()
+        self.assertFalse(profiler.enabled)
+        self.assertIn("load", output.getvalue())
+        self.assertGreater(pstats.Stats(cprofile_file).total_calls, 0)
+        with open(tracemalloc_file, encoding="utf-8") as file:
+            self.assertTrue(file.readline().startswith("Всего выделено"))
+
+
+if __name__ == "__main__":
+    unittest.main()
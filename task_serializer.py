@@ -0,0 +1,311 @@
+import itertools
+import json
+from json.encoder import encode_basestring
+from operator import attrgetter, itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+FIELDS = ("id", "title", "description", "category", "due_date", "priority", "status")
+BACKENDS = ("json", "orjson", "msgspec")
+
+_PRETTY = "    {\n" + ",\n".join(f'        "{field}": %s' for field in FIELDS) + "\n    }"
+_COMPACT = "{" + ",".join(f'"{field}":%s' for field in FIELDS) + "}"
+_task_attributes = attrgetter(*FIELDS)
+_record_values = itemgetter(*FIELDS)
+
+
+def _task_values(task):
+    """
+    Получить значения полей объекта задачи в порядке FIELDS. Срок выполнения (date) записывается как гггг-мм-дд,
+    а срок, прочитанный в другом формате и не измененный, — в исходном виде (см. Task.stored_due_date()).
+
+    :param task: Задача.
+    :return: Кортеж значений.
+    """
+    task_id, title, description, category, due_date, priority, status = _task_attributes(task)
+    if task._due_text is not None:
+        return task_id, title, description, category, task.stored_due_date(), priority, status
+    return task_id, title, description, category, due_date.isoformat() if due_date else "", priority, status
+
+
+def _values(item):
+    """
+    Получить значения полей задачи или словаря задачи в порядке FIELDS.
+
+    :param item: Задача или словарь задачи.
+    :return: Кортеж значений.
+    """
+    return _record_values(item) if type(item) is dict else _task_values(item)
+
+
+def _encode_slow(values, pretty):
+    """
+    Сериализовать задачу с нестандартными типами значений полей стандартным модулем json.
+
+    :param values: Значения полей в порядке FIELDS.
+    :param pretty: Использовать отступы формата tasks.json.
+    :return: Строка JSON объекта.
+    """
+    record = dict(zip(FIELDS, values))
+    if not pretty:
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    return "    " + json.dumps(record, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+
+
+class JsonSerializer:
+    """
+    Сериализатор задач на стандартном модуле json.
+
+    Задачи записываются напрямую из атрибутов объектов Task (или из словарей) по шаблону,
+    без промежуточного списка словарей. Обычный режим дает тот же текст, что и
+    json.dump(..., ensure_ascii=False, indent=4), компактный — массив без отступов,
+    по одной задаче на строку. Оба читаются любым сериализатором.
+
+    Атрибуты:
+        Name (str): Имя библиотеки.
+        Compact (bool): Писать снимок без отступов.
+        Streaming (bool): Снимок, загружаемый целиком, читается потоково (см. task_storage.iter_snapshot);
+            если False, он разбирается одним вызовом load_tasks(). Загрузка задач менеджером по одной
+            (iter_load хранилищ) потоковая при любом сериализаторе.
+    """
+
+    name = "json"
+    streaming = True
+    chunk_size = 10000
+
+    def __init__(self, compact=False):
+        """
+        Инициализация сериализатора.
+
+        :param compact: Писать снимок без отступов.
+        """
+        self.compact = compact
+
+    def dumps(self, value):
+        """
+        Сериализовать значение в одну строку JSON.
+
+        :param value: Значение.
+        :return: Байты в кодировке UTF-8 без перевода строки.
+        """
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data):
+        """
+        Разобрать JSON.
+
+        :param data: Байты или строка.
+        :return: Значение.
+        :raises ValueError: Если данные не являются корректным JSON.
+        """
+        return json.loads(data)
+
+    def _encode_chunk(self, items, template):
+        """
+        Сериализовать порцию задач по шаблону.
+
+        :param items: Список задач или словарей задач.
+        :param template: Шаблон одной задачи с местами для значений полей.
+        :return: Список строк, по одной на задачу.
+        """
+        encoded = []
+        for values in map(_values, items):
+            try:
+                encoded.append(template % (int.__repr__(values[0]), *map(encode_basestring, values[1:])))
+            except TypeError:
+                encoded.append(_encode_slow(values, template is _PRETTY))
+        return encoded
+
+    def encode_chunk(self, items, pretty):
+        """
+        Сериализовать порцию задач.
+
+        :param items: Список задач или словарей задач.
+        :param pretty: Использовать отступы формата tasks.json.
+        :return: Список строк или байтов, по одному элементу на задачу.
+        """
+        return self._encode_chunk(items, _PRETTY if pretty else _COMPACT)
+
+    def write_tasks(self, file, tasks, jsonl=False):
+        """
+        Записать задачи в файл порциями по chunk_size задач.
+
+        :param file: Файл, открытый на запись в двоичном режиме.
+        :param tasks: Итерируемый набор задач или словарей задач.
+        :param jsonl: Писать построчный формат JSONL вместо JSON массива.
+        """
+        pretty = not (jsonl or self.compact)
+        separator = "\n" if jsonl else ",\n"
+        tasks = iter(tasks)
+        written = False
+        while True:
+            chunk = list(itertools.islice(tasks, self.chunk_size))
+            if not chunk:
+                break
+            encoded = self.encode_chunk(chunk, pretty)
+            if isinstance(encoded[0], bytes):
+                text = separator.encode("utf-8").join(encoded)
+            else:
+                text = separator.join(encoded).encode("utf-8")
+            if jsonl:
+                file.write(text + b"\n")
+            else:
+                file.write((b",\n" if written else b"[\n" if pretty else b"[") + text)
+            written = True
+        if not jsonl:
+            file.write((b"\n]" if pretty else b"]\n") if written else b"[]")
+
+    def load_tasks(self, data):
+        """
+        Разобрать снимок задач целиком: JSON массив или JSONL.
+
+        :param data: Содержимое файла в байтах.
+        :return: Список словарей задач.
+        """
+        stripped = data.lstrip()
+        if not stripped:
+            return []
+        if stripped[:1] == b"[":
+            return self.loads(stripped)
+        return [self.loads(line) for line in stripped.splitlines() if line.strip()]
+
+
+class OrjsonSerializer(JsonSerializer):
+    """
+    Сериализатор задач на библиотеке orjson.
+
+    Снимок, загружаемый целиком (импорт, load() хранилища), разбирается одним вызовом, что быстрее потокового
+    чтения стандартным модулем.
+    """
+
+    name = "orjson"
+    streaming = False
+
+    def dumps(self, value):
+        """
+        Сериализовать значение в одну строку JSON.
+
+        :param value: Значение.
+        :return: Байты в кодировке UTF-8 без перевода строки.
+        """
+        return orjson.dumps(value)
+
+    def loads(self, data):
+        """
+        Разобрать JSON.
+
+        :param data: Байты или строка.
+        :return: Значение.
+        :raises ValueError: Если данные не являются корректным JSON.
+        """
+        return orjson.loads(data)
+
+    def encode_chunk(self, items, pretty):
+        """
+        Сериализовать порцию задач. Компактный формат сериализует orjson, формат с отступами — шаблон.
+
+        :param items: Список задач или словарей задач.
+        :param pretty: Использовать отступы формата tasks.json.
+        :return: Список строк или байтов, по одному элементу на задачу.
+        """
+        if pretty:
+            return self._encode_chunk(items, _PRETTY)
+        return [orjson.dumps(item if type(item) is dict else dict(zip(FIELDS, _task_values(item)))) for item in items]
+
+
+class MsgspecSerializer(JsonSerializer):
+    """
+    Сериализатор задач на библиотеке msgspec.
+
+    Снимок, загружаемый целиком (импорт, load() хранилища), разбирается одним вызовом, что быстрее потокового
+    чтения стандартным модулем.
+    """
+
+    name = "msgspec"
+    streaming = False
+
+    def __init__(self, compact=False):
+        """
+        Инициализация сериализатора.
+
+        :param compact: Писать снимок без отступов.
+        """
+        super().__init__(compact)
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, value):
+        """
+        Сериализовать значение в одну строку JSON.
+
+        :param value: Значение.
+        :return: Байты в кодировке UTF-8 без перевода строки.
+        """
+        return self._encoder.encode(value)
+
+    def loads(self, data):
+        """
+        Разобрать JSON.
+
+        :param data: Байты или строка.
+        :return: Значение.
+        :raises ValueError: Если данные не являются корректным JSON.
+        """
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as error:
+            raise ValueError(str(error)) from None
+
+    def encode_chunk(self, items, pretty):
+        """
+        Сериализовать порцию задач. Компактный формат сериализует msgspec, формат с отступами — шаблон.
+
+        :param items: Список задач или словарей задач.
+        :param pretty: Использовать отступы формата tasks.json.
+        :return: Список строк или байтов, по одному элементу на задачу.
+        """
+        if pretty:
+            return self._encode_chunk(items, _PRETTY)
+        return [
+            self._encoder.encode(item if type(item) is dict else dict(zip(FIELDS, _task_values(item))))
+            for item in items
+        ]
+
+
+_SERIALIZERS = {"json": JsonSerializer, "orjson": OrjsonSerializer, "msgspec": MsgspecSerializer}
+_MODULES = {"json": json, "orjson": orjson, "msgspec": msgspec}
+
+
+def available_backends():
+    """
+    Получить имена установленных библиотек сериализации.
+
+    :return: Список имен в порядке предпочтения: сначала ускоренные, затем json.
+    """
+    return [backend for backend in ("orjson", "msgspec", "json") if _MODULES[backend] is not None]
+
+
+def get_serializer(backend="auto", compact=False):
+    """
+    Создать сериализатор задач.
+
+    :param backend: json, orjson, msgspec или auto — самая быстрая из установленных библиотек.
+    :param compact: Писать снимок без отступов.
+    :return: Сериализатор.
+    :raises ValueError: Если библиотека неизвестна или не установлена.
+    """
+    if backend == "auto":
+        backend = available_backends()[0]
+    if backend not in _SERIALIZERS:
+        raise ValueError(f"Неизвестная библиотека сериализации: {backend}. Допустимые значения: {BACKENDS}.")
+    if _MODULES[backend] is None:
+        raise ValueError(f"Библиотека {backend} не установлена.")
+    return _SERIALIZERS[backend](compact)
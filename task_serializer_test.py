@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from task_manager import Task, TaskManager
+from task_serializer import available_backends, get_serializer
+from task_storage import JournalStorage, JsonStorage, iter_snapshot
+
+
+class TestSerializers(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: задачи со спецсимволами и временный каталог."""
+        self.records = [
+            {
+                "id": 1, "title": 'Отчет "Q4"', "description": "Строка 1\nСтрока 2\t\\ \u0001", "category": "Работа",
+                "due_date": "2024-12-31", "priority": "Высокий", "status": "Не выполнена",
+            },
+            {
+                "id": 2, "title": "Ёлка 🎄", "description": "", "category": "Личное", "due_date": "",
+                "priority": "Низкий", "status": "Выполнена",
+            },
+        ]
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def dump(self, serializer, items, jsonl=False):
+        """Записать задачи сериализатором и вернуть байты."""
+        file = io.BytesIO()
+        serializer.write_tasks(file, items, jsonl)
+        return file.getvalue()
+
+    def test_pretty_format_matches_json_dump(self):
+        """Тест на совпадение формата с отступами с json.dump(indent=4) для задач, словарей и пустого списка."""
+        for backend in available_backends():
+            serializer = get_serializer(backend)
+            for records in (self.records, [], [dict(self.records[0], due_date=None)]):
+                expected = json.dumps(records, ensure_ascii=False, indent=4).encode("utf-8")
+                self.assertEqual(self.dump(serializer, records), expected)
+            tasks = [Task.from_dict(record) for record in self.records]
+            self.assertEqual(self.dump(serializer, tasks), self.dump(serializer, self.records))
+
+    def test_roundtrip_between_backends(self):
+        """Тест на чтение снимков, записанных любой библиотекой в любом режиме, всеми библиотеками."""
+        file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        for writer in available_backends():
+            for compact, jsonl in ((False, False), (True, False), (False, True)):
+                data = self.dump(get_serializer(writer, compact), self.records, jsonl)
+                for reader in available_backends():
+                    self.assertEqual(get_serializer(reader).load_tasks(data), self.records)
+                with open(file_name, "wb") as file:
+                    file.write(data)
+                self.assertEqual(list(iter_snapshot(file_name, chunk_size=16)), self.records)
+
+    def test_storages_with_each_backend(self):
+        """Тест на сохранение и загрузку задач хранилищами с разными сериализаторами."""
+        for backend in available_backends():
+            for storage_class in (JsonStorage, JournalStorage):
+                file_name = os.path.join(self.tmp_dir.name, f"{backend}.{storage_class.__name__}.json")
+                storage = storage_class(file_name, serializer=get_serializer(backend, compact=True))
+                manager = TaskManager(file_name=file_name, storage=storage)
+                for record in self.records:
+                    manager.add_task(
+                        record["title"], record["description"], record["category"], record["due_date"],
+                        record["priority"],
+                    )
+                manager.get_task_by_id(2).mark_as_done()
+                manager.save_tasks()
+                manager.close()
+
+                reloaded = TaskManager(file_name=file_name, storage=storage_class(file_name))
+                self.assertEqual([task.to_dict() for task in reloaded.tasks], self.records)
+
+    def test_whole_file_decode_only_for_bulk_loads(self):
+        """Тест на загрузку с сериализатором без потокового чтения: задачи по одной читаются потоково."""
+        for storage_class in (JsonStorage, JournalStorage):
+            file_name = os.path.join(self.tmp_dir.name, f"{storage_class.__name__}.json")
+            with open(file_name, "w", encoding="utf-8") as file:
+                json.dump(self.records, file, ensure_ascii=False)
+            serializer = get_serializer("json")
+            serializer.streaming = False
+            storage = storage_class(file_name, serializer=serializer)
+            with patch.object(serializer, "load_tasks", side_effect=AssertionError("файл прочитан целиком")):
+                self.assertEqual(next(storage.iter_load()), self.records[0])
+                manager = TaskManager(file_name=file_name, storage=storage)
+                self.assertEqual([task.to_dict() for task in manager.tasks], self.records)
+                manager.close()
+        with patch.object(serializer, "load_tasks", return_value=self.records) as load_tasks:
+            self.assertEqual(JsonStorage(file_name, serializer=serializer).load(), self.records)
+        load_tasks.assert_called_once()
+
+    def test_chunked_write(self):
+        """Тест на запись задач несколькими порциями: на границе порций задачи не теряются."""
+        records = [dict(self.records[index % 2], id=index + 1) for index in range(7)]
+        for backend in available_backends():
+            serializer = get_serializer(backend)
+            serializer.chunk_size = 3
+            for jsonl in (False, True):
+                self.assertEqual(serializer.load_tasks(self.dump(serializer, iter(records), jsonl)), records)
+
+    def test_unknown_backend(self):
+        """Тест на ошибку при выборе неизвестной или неустановленной библиотеки."""
+        with self.assertRaises(ValueError):
+            get_serializer("pickle")
+        missing = [backend for backend in ("orjson", "msgspec") if backend not in available_backends()]
+        for backend in missing:
+            with self.assertRaises(ValueError):
+                get_serializer(backend)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,361 @@
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+from task_binary import BINARY_EXTENSION, BinaryTaskManager
+from task_manager import TaskManager
+from task_profile import profile_session, profiler
+from task_shard import SHARDS_EXTENSION, ShardedTaskManager
+
+TASK_FIELDS = ("title", "description", "category", "due_date", "priority")
+server_log = logging.getLogger("task_manager.server")
+
+
+class RequestError(Exception):
+    """
+    Ошибка запроса к серверу задач.
+
+    Атрибуты:
+        Status (HTTPStatus): HTTP статус ответа.
+    """
+
+    def __init__(self, status, message):
+        """
+        Инициализация ошибки.
+
+        :param status: HTTP статус ответа.
+        :param message: Текст ошибки.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class TaskServer:
+    """
+    HTTP/JSON сервер задач на asyncio.
+
+    Сервер держит один менеджер задач в памяти и обслуживает одновременные запросы без блокировки
+    цикла событий: обращения к менеджеру выполняются по очереди в отдельном потоке, а изменения
+    записываются на диск отложенной записью менеджера (save_delay), объединяясь в одно сохранение.
+
+    Запросы:
+        GET /tasks?category=&status=&priority=&offset=&limit= — список задач с фильтрацией.
+        POST /tasks — добавить задачу, тело: title, description, category, due_date, priority.
+        GET /tasks/<id> — получить задачу.
+        PATCH /tasks/<id> — изменить поля задачи; {"status": "Выполнена"} отмечает задачу выполненной.
+        DELETE /tasks/<id> — удалить задачу.
+        GET /search?q=&offset=&limit= — полнотекстовый поиск.
+        GET /categories — список категорий.
+        GET /stats?today= — статистика задач (см. TaskManager.get_statistics).
+        GET /profile — статистика профилирования (см. task_profile); ?reset=1 очищает ее после ответа.
+
+    Атрибуты:
+        Manager (TaskManager): Менеджер задач.
+        Host (str): Адрес, на котором принимаются соединения.
+        Port (int): Порт. Если при создании передан 0, после start() здесь фактический порт.
+    """
+
+    def __init__(self, manager, host="127.0.0.1", port=8080):
+        """
+        Инициализация сервера.
+
+        :param manager: Менеджер задач.
+        :param host: Адрес, на котором принимаются соединения.
+        :param port: Порт (0 — выбрать свободный).
+        """
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self._server = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-server")
+
+    async def start(self):
+        """
+        Начать принимать соединения.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Запустить сервер и обслуживать запросы до отмены.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Остановить сервер и сохранить изменения менеджера.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.manager.close)
+        self._executor.shutdown()
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Обслужить соединение: читать запросы и отвечать на них, пока клиент не закроет соединение.
+
+        :param reader: Поток чтения соединения.
+        :param writer: Поток записи соединения.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("utf-8").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, payload = await loop.run_in_executor(self._executor, self._respond, method, target, body)
+                data = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, method, target, body):
+        """
+        Выполнить запрос и сформировать ответ.
+
+        :param method: HTTP метод.
+        :param target: Путь запроса со строкой параметров.
+        :param body: Тело запроса.
+        :return: Пара (HTTP статус, данные ответа или None).
+        """
+        try:
+            url = urlsplit(target)
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Тело запроса должно быть объектом JSON.")
+            return self._dispatch(method, url.path.rstrip("/").split("/")[1:], query, data)
+        except RequestError as error:
+            return error.status, {"error": str(error)}
+        except json.JSONDecodeError:
+            return HTTPStatus.BAD_REQUEST, {"error": "Некорректный JSON."}
+        except ValueError as error:
+            return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        except Exception:
+            server_log.exception("Ошибка при обработке запроса %s %s", method, target)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Внутренняя ошибка сервера."}
+
+    def _dispatch(self, method, parts, query, data):
+        """
+        Выбрать обработчик запроса по методу и пути.
+
+        :param method: HTTP метод.
+        :param parts: Части пути.
+        :param query: Параметры строки запроса.
+        :param data: Тело запроса.
+        :return: Пара (HTTP статус, данные ответа или None).
+        :raises RequestError: Если путь или метод не поддерживается.
+        """
+        match method, parts:
+            case "GET", ["tasks"]:
+                tasks = self.manager.filter_tasks(
+                    category=query.get("category"), status=query.get("status"), priority=query.get("priority")
+                )
+                return HTTPStatus.OK, self._page(tasks, query)
+            case "POST", ["tasks"]:
+                fields = self._fields(data)
+                missing = [field for field in TASK_FIELDS if field not in fields]
+                if missing:
+                    raise RequestError(HTTPStatus.BAD_REQUEST, f"Не заданы поля: {', '.join(missing)}.")
+                task = self.manager.add_task(**fields)
+                return HTTPStatus.CREATED, task.to_dict()
+            case "GET", ["tasks", task_id]:
+                return HTTPStatus.OK, self._task(task_id).to_dict()
+            case "PATCH", ["tasks", task_id]:
+                task = self._task(task_id)
+                fields = self._fields(data)
+                if data.get("status", "Выполнена") != "Выполнена":
+                    raise RequestError(HTTPStatus.BAD_REQUEST, "Статус можно изменить только на «Выполнена».")
+                with self.manager.batch():
+                    task.edit(**fields)
+                    if "status" in data:
+                        task.mark_as_done()
+                return HTTPStatus.OK, task.to_dict()
+            case "DELETE", ["tasks", task_id]:
+                self.manager.tasks.remove(self._task(task_id))
+                self.manager.save_tasks()
+                return HTTPStatus.NO_CONTENT, None
+            case "GET", ["search"]:
+                return HTTPStatus.OK, self._page(self.manager.search_tasks(query.get("q", "")), query)
+            case "GET", ["categories"]:
+                return HTTPStatus.OK, self.manager.get_categories()
+            case "GET", ["stats"]:
+                return HTTPStatus.OK, self.manager.get_statistics(query.get("today"))
+            case "GET", ["profile"]:
+                stats = dict(profiler.stats(), enabled=profiler.enabled)
+                if query.get("reset") == "1":
+                    profiler.reset()
+                return HTTPStatus.OK, stats
+            case _, ["tasks"] | ["tasks", _] | ["search"] | ["categories"] | ["stats"] | ["profile"]:
+                raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, f"Метод {method} не поддерживается.")
+        raise RequestError(HTTPStatus.NOT_FOUND, "Неизвестный путь.")
+
+    @staticmethod
+    def _fields(data):
+        """
+        Выбрать поля задачи из тела запроса.
+
+        :param data: Тело запроса.
+        :return: Словарь {поле: значение} для заданных полей.
+        :raises RequestError: Если значение поля не строка.
+        """
+        fields = {field: data[field] for field in TASK_FIELDS if data.get(field) is not None}
+        invalid = [field for field, value in fields.items() if not isinstance(value, str)]
+        if invalid:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Поля должны быть строками: {', '.join(invalid)}.")
+        return fields
+
+    def _task(self, task_id):
+        """
+        Найти задачу по ID из пути запроса.
+
+        :param task_id: ID задачи в виде строки.
+        :return: Задача.
+        :raises RequestError: Если ID некорректен или задача не найдена.
+        """
+        task = self.manager.get_task_by_id(int(task_id)) if task_id.isdigit() else None
+        if task is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, "Задача не найдена.")
+        return task
+
+    @staticmethod
+    def _page(tasks, query):
+        """
+        Выбрать страницу списка задач по параметрам offset и limit.
+
+        :param tasks: Список задач.
+        :param query: Параметры строки запроса.
+        :return: Словарь с общим числом задач и задачами страницы.
+        :raises RequestError: Если offset или limit некорректны.
+        """
+        try:
+            offset = int(query.get("offset", 0))
+            limit = int(query.get("limit", 100))
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "offset и limit должны быть целыми числами.") from None
+        return {"total": len(tasks), "tasks": [task.to_dict() for task in tasks[offset:offset + limit]]}
+
+
+class TaskClient:
+    """
+    Асинхронный клиент сервера задач с постоянным соединением.
+
+    Атрибуты:
+        Host (str): Адрес сервера.
+        Port (int): Порт сервера.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8080):
+        """
+        Инициализация клиента.
+
+        :param host: Адрес сервера.
+        :param port: Порт сервера.
+        """
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def request(self, method, path, data=None):
+        """
+        Выполнить запрос к серверу.
+
+        :param method: HTTP метод.
+        :param path: Путь запроса со строкой параметров.
+        :param data: Тело запроса (будет преобразовано в JSON) или None.
+        :return: Пара (HTTP статус, данные ответа или None).
+        """
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        body = b"" if data is None else json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self._writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n\r\n".encode("utf-8")
+            + body
+        )
+        await self._writer.drain()
+        status = int((await self._reader.readline()).split()[1])
+        length = 0
+        while (line := await self._reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        payload = await self._reader.readexactly(length)
+        return status, json.loads(payload) if payload else None
+
+    async def close(self):
+        """
+        Закрыть соединение.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+
+async def serve(file_name, host, port, save_delay):
+    """
+    Запустить сервер задач и обслуживать запросы до прерывания.
+
+    :param file_name: Имя файла задач. Файл .bin открывается как двоичный снимок (см. task_binary),
+        каталог .shards — как хранилище по сегментам категорий (см. task_shard).
+    :param host: Адрес, на котором принимаются соединения.
+    :param port: Порт.
+    :param save_delay: Задержка отложенной записи в секундах.
+    """
+    if file_name.endswith(BINARY_EXTENSION):
+        manager = BinaryTaskManager(file_name, save_delay=save_delay)
+    elif file_name.endswith(SHARDS_EXTENSION):
+        manager = ShardedTaskManager(file_name, save_delay=save_delay)
+    else:
+        manager = TaskManager(file_name, background_load=True, save_delay=save_delay)
+    server = TaskServer(manager, host, port)
+    await server.start()
+    print(f"Сервер задач запущен на http://{server.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    """
+    Запустить сервер задач из командной строки.
+    """
+    parser = argparse.ArgumentParser(description="HTTP/JSON сервер менеджера задач.")
+    parser.add_argument("--file", default="tasks.json", help="Файл задач.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--save-delay", type=float, default=0.5, help="Задержка отложенной записи, с.")
+    args = parser.parse_args()
+    try:
+        with profile_session():
+            asyncio.run(serve(args.file, args.host, args.port, args.save_delay))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
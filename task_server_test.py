@@ -0,0 +1,121 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from urllib.parse import quote
+from task_manager import TaskManager
+from task_profile import profiler
+from task_server import TaskClient, TaskServer
+
+
+class TestTaskServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """Подготовка к тестам: запускаем сервер на свободном порту с менеджером во временном каталоге."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        self.server = TaskServer(TaskManager(file_name=self.file_name, save_delay=0.05), port=0)
+        await self.server.start()
+        self.client = TaskClient(port=self.server.port)
+
+    async def asyncTearDown(self):
+        """Остановка сервера и удаление временного каталога."""
+        await self.client.close()
+        await self.server.close()
+        self.tmp_dir.cleanup()
+
+    async def add(self, title, category="Работа"):
+        """Добавить задачу через сервер."""
+        return await self.client.request("POST", "/tasks", {
+            "title": title, "description": "Description", "category": category, "due_date": "2024-12-31",
+            "priority": "Низкий",
+        })
+
+    async def test_crud(self):
+        """Тест на добавление, получение, изменение и удаление задачи."""
+        status, task = await self.add("Task 1")
+        self.assertEqual((status, task["id"], task["status"]), (201, 1, "Не выполнена"))
+
+        status, task = await self.client.request("PATCH", "/tasks/1", {"title": "Updated", "status": "Выполнена"})
+        self.assertEqual((status, task["title"], task["status"]), (200, "Updated", "Выполнена"))
+        self.assertEqual(await self.client.request("GET", "/tasks/1"), (200, task))
+
+        self.assertEqual(await self.client.request("DELETE", "/tasks/1"), (204, None))
+        status, error = await self.client.request("GET", "/tasks/1")
+        self.assertEqual((status, error["error"]), (404, "Задача не найдена."))
+
+    async def test_filter_search_and_categories(self):
+        """Тест на фильтрацию, постраничный вывод, поиск, список категорий и статистику."""
+        for number in range(5):
+            await self.add(f"Отчет {number}", "Работа" if number % 2 else "Личное")
+
+        status, page = await self.client.request("GET", f"/tasks?category={quote('Личное')}&limit=2")
+        self.assertEqual((status, page["total"]), (200, 3))
+        self.assertEqual([task["id"] for task in page["tasks"]], [1, 3])
+        status, page = await self.client.request("GET", f"/search?q={quote('отчет')}&offset=4")
+        self.assertEqual((page["total"], len(page["tasks"])), (5, 1))
+        self.assertEqual(await self.client.request("GET", "/categories"), (200, ["Личное", "Работа"]))
+        status, statistics = await self.client.request("GET", "/stats?today=2025-01-01")
+        self.assertEqual((status, statistics["total"], statistics["overdue"]), (200, 5, 5))
+        self.assertEqual(statistics["by_category"], {"Личное": 3, "Работа": 2})
+
+    async def test_invalid_requests(self):
+        """Тест на ответы с ошибкой для некорректных запросов."""
+        status, error = await self.client.request("POST", "/tasks", {"title": "Task 1"})
+        self.assertEqual(status, 400)
+        self.assertIn("description", error["error"])
+        self.assertEqual((await self.client.request("PATCH", "/tasks/1", {"title": "Task 1"}))[0], 404)
+        await self.add("Task 1")
+        self.assertEqual((await self.client.request("PATCH", "/tasks/1", {"title": 1}))[0], 400)
+        self.assertEqual((await self.client.request("PATCH", "/tasks/1", {"status": "Не выполнена"}))[0], 400)
+        self.assertEqual((await self.client.request("PATCH", "/tasks/1", {"due_date": "31.12.2024"}))[0], 400)
+        self.assertEqual((await self.client.request("PUT", "/tasks"))[0], 405)
+        self.assertEqual((await self.client.request("GET", "/unknown"))[0], 404)
+        self.assertEqual((await self.client.request("GET", "/tasks?limit=x"))[0], 400)
+        self.assertEqual((await self.client.request("GET", "/stats?today=x"))[0], 400)
+
+    async def test_internal_error(self):
+        """Тест на ответ 500 при ошибке обработчика: соединение продолжает обслуживать запросы."""
+        await self.add("Task 1")
+        with patch.object(self.server.manager, "save_tasks", side_effect=OSError("No space left on device")):
+            with self.assertLogs("task_manager.server") as logs:
+                status, error = await self.client.request("DELETE", "/tasks/1")
+        self.assertEqual((status, error["error"]), (500, "Внутренняя ошибка сервера."))
+        self.assertIn("DELETE /tasks/1", logs.output[0])
+        self.assertEqual((await self.client.request("GET", "/categories"))[0], 200)
+
+    async def test_profile(self):
+        """Тест на статистику профилирования и ее очистку."""
+        enabled = profiler.enabled
+        profiler.reset()
+        profiler.enable()
+        try:
+            await self.add("Task 1")
+            status, stats = await self.client.request("GET", "/profile?reset=1")
+            self.assertEqual((status, stats["enabled"], stats["timers"]["add"]["count"]), (200, True, 1))
+            self.assertEqual((await self.client.request("GET", "/profile"))[1]["timers"], {})
+        finally:
+            profiler.enabled = enabled
+
+    async def test_concurrent_requests_are_saved(self):
+        """Тест на одновременные запросы нескольких клиентов и сохранение изменений на диск."""
+        clients = [TaskClient(port=self.server.port) for _ in range(4)]
+
+        async def add_many(client, number):
+            for index in range(10):
+                await client.request("POST", "/tasks", {
+                    "title": f"Task {number}-{index}", "description": "", "category": "Работа",
+                    "due_date": "2024-12-31", "priority": "Низкий",
+                })
+            await client.close()
+
+        await asyncio.gather(*(add_many(client, number) for number, client in enumerate(clients)))
+        await asyncio.sleep(0.2)
+
+        tasks = TaskManager(file_name=self.file_name).tasks
+        self.assertEqual(sorted(task.id for task in tasks), list(range(1, 41)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,953 @@
+import itertools
+import json
+import os
+from task_index import StatsIndex
+from task_manager import Task, TaskManager
+from task_profile import profiler, timed
+from task_serializer import get_serializer
+from task_storage import (
+    FileLock, FsyncPolicy, _file_key, _fsync_directory, _fsync_file, _write_atomic, _write_snapshot, export_json,
+    file_fingerprint, renumber, replay,
+)
+
+SHARDS_EXTENSION = ".shards"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+SHARD_SUFFIX = ".jsonl"
+
+
+def _read_manifest(path):
+    """
+    Прочитать манифест сегментов.
+
+    :param path: Путь к файлу манифеста.
+    :return: Словарь с ключами version, next_id, next_file и shards (пустой манифест, если файла нет).
+    :raises ValueError: Если версия манифеста не поддерживается.
+    """
+    if not os.path.exists(path):
+        return {"version": MANIFEST_VERSION, "next_id": 1, "next_file": 1, "shards": []}
+    with open(path, "rb") as file:
+        manifest = json.loads(file.read())
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(
+            f"Неподдерживаемая версия манифеста сегментов: {manifest.get('version')} (ожидается {MANIFEST_VERSION})."
+        )
+    return manifest
+
+
+class ShardedStorage:
+    """
+    Хранилище задач, разбитое на сегменты по категориям.
+
+    Каталог file_name содержит по одному файлу JSONL на категорию и манифест manifest.json
+    со списком сегментов: категория, имя файла, число задач, диапазон ID и счетчики задач
+    сегмента (StatsIndex.to_dict). Сегменты читаются
+    по одному (load_shard), поэтому менеджеру не нужно загружать все задачи. Сохранение
+    переписывает только измененные сегменты: каждый записывается в новый файл, затем атомарно
+    заменяется манифест, и только после этого удаляются прежние файлы. Читатель всегда видит
+    согласованный набор сегментов: при сбое остаются прежний манифест и прежние файлы.
+
+    Несколько процессов могут работать с одним каталогом: сохранение выполняется под
+    исключительной блокировкой, а если манифест заменил другой процесс, changes() сообщает,
+    что задачи нужно загрузить заново.
+
+    Атрибуты:
+        File_name (str): Каталог сегментов.
+        Manifest_name (str): Имя файла манифеста.
+        Next_id (int): Счетчик ID на момент последнего чтения манифеста или сохранения.
+        Shards (dict): Записи манифеста {категория: запись} в порядке манифеста.
+        Fsync (FsyncPolicy): Политика сброса файлов на диск.
+        Pending (list): Изменения с прошлого сохранения.
+        Lock (FileLock): Блокировка каталога между процессами.
+        Serializer (JsonSerializer): Сериализатор сегментов.
+    """
+
+    def __init__(self, file_name, fsync="always", serializer=None):
+        """
+        Инициализация хранилища. Каталог создается, если его нет.
+
+        :param file_name: Каталог сегментов.
+        :param fsync: Политика fsync (always, batched, never).
+        :param serializer: Сериализатор (см. task_serializer.get_serializer). Если None, выбирается
+            самый быстрый из установленных.
+        """
+        self.file_name = file_name
+        self.manifest_name = os.path.join(file_name, MANIFEST_NAME)
+        self.serializer = serializer or get_serializer()
+        self.next_id = 1
+        self.shards = {}
+        self.fsync = FsyncPolicy(fsync)
+        self.pending = []
+        self._savepoint = (0, 1)
+        self._next_file = 1
+        self._handles = {}
+        self._unsynced = []
+        self._seen = None
+        os.makedirs(file_name, exist_ok=True)
+        self.lock = FileLock(os.path.join(file_name, "manifest.lock"))
+
+    def open_manifest(self):
+        """
+        Прочитать манифест и открыть файлы сегментов, не читая их содержимое.
+
+        Открытый файл остается читаемым, даже если другой процесс заменит сегмент и удалит
+        прежний файл, поэтому сегменты, загруженные позже, соответствуют прочитанному манифесту.
+
+        :return: Словарь {категория: запись манифеста} в порядке манифеста.
+        :raises ValueError: Если версия манифеста не поддерживается.
+        """
+        handles = {}
+        try:
+            with self.lock(shared=True):
+                manifest = _read_manifest(self.manifest_name)
+                self._seen = _file_key(self.manifest_name)
+                for entry in manifest["shards"]:
+                    handles[entry["category"]] = open(os.path.join(self.file_name, entry["file"]), "rb")
+        except BaseException:
+            for handle in handles.values():
+                handle.close()
+            raise
+        self._close_handles()
+        self._handles = handles
+        self.shards = {entry["category"]: entry for entry in manifest["shards"]}
+        self.next_id = manifest["next_id"]
+        self._next_file = manifest["next_file"]
+        return {category: dict(entry) for category, entry in self.shards.items()}
+
+    def load_shard(self, category):
+        """
+        Прочитать задачи сегмента категории из манифеста, прочитанного open_manifest().
+
+        :param category: Категория.
+        :return: Список словарей задач.
+        """
+        handle = self._handles[category]
+        handle.seek(0)
+        loads = self.serializer.loads
+        return [loads(line) for line in handle if line.strip()]
+
+    def load(self):
+        """
+        Загрузить задачи всех сегментов.
+
+        :return: Список словарей задач.
+        """
+        return list(self.iter_load())
+
+    def iter_load(self):
+        """
+        Загружать задачи по сегментам.
+
+        :return: Генератор словарей задач.
+        """
+        for category in self.open_manifest():
+            yield from self.load_shard(category)
+
+    def record(self, op, **data):
+        """
+        Зарегистрировать изменение. Сегменты переписываются при сохранении.
+
+        :param op: Тип операции (add, edit, mark_done, delete, clear, drop).
+        :param data: Данные операции.
+        """
+        self.pending.append({"op": op, **data})
+        if op == "add":
+            self.next_id = max(self.next_id, data["task"]["id"] + 1)
+        elif op == "clear":
+            self.next_id = 1
+
+    def begin(self):
+        """
+        Начать транзакцию: запомнить, сколько изменений накоплено, и значение счетчика ID.
+        """
+        self._savepoint = (len(self.pending), self.next_id)
+
+    def rollback(self):
+        """
+        Отменить изменения, зарегистрированные после begin(). Файлы до сохранения не менялись.
+        """
+        size, self.next_id = self._savepoint
+        del self.pending[size:]
+
+    def changes(self):
+        """
+        Проверить, не заменил ли манифест другой процесс после последнего чтения или сохранения.
+
+        :return: Пустой список, если манифест не менялся, или None, если задачи нужно загрузить заново.
+        """
+        return [] if _file_key(self.manifest_name) == self._seen else None
+
+    def save(self, tasks):
+        """
+        Переписать измененные сегменты и манифест.
+
+        Коллекция ShardedTaskList сообщает, какие сегменты изменились. Для других коллекций
+        (например, TaskList обычного TaskManager) переписываются все сегменты. Сегмент,
+        в котором не осталось задач, удаляется из манифеста.
+
+        :param tasks: Коллекция задач.
+        """
+        if isinstance(tasks, ShardedTaskList):
+            dirty = list(tasks.dirty)
+
+            def shard(category):
+                return list(tasks.shard(category).values())
+        else:
+            groups = {}
+            for task in tasks:
+                groups.setdefault(task.category, []).append(task)
+            dirty = [*self.shards, *(category for category in groups if category not in self.shards)]
+
+            def shard(category):
+                return groups.get(category, [])
+
+        fsync = self.fsync.due()
+        shards = dict(self.shards)
+        written = []
+        for category in dirty:
+            records = shard(category)
+            if not records:
+                shards.pop(category, None)
+                continue
+            name = f"{self._next_file:06d}{SHARD_SUFFIX}"
+            self._next_file += 1
+            path = os.path.join(self.file_name, name)
+            _write_snapshot(path, records, fsync, self.serializer)
+            written.append(path)
+            ids = [task.id for task in records]
+            stats = StatsIndex()
+            stats.rebuild(records)
+            shards[category] = {
+                "category": category, "file": name, "count": len(records), "min_id": min(ids), "max_id": max(ids),
+                "stats": stats.to_dict(),
+            }
+        manifest = {
+            "version": MANIFEST_VERSION, "next_id": self.next_id, "next_file": self._next_file,
+            "shards": list(shards.values()),
+        }
+        data = json.dumps(manifest, ensure_ascii=False, indent=4).encode("utf-8")
+        _write_atomic(self.manifest_name, lambda file: file.write(data), fsync)
+        self._unsynced = [] if fsync else [*self._unsynced, *written, self.manifest_name]
+        self._seen = _file_key(self.manifest_name)
+        for category in dirty:
+            handle = self._handles.pop(category, None)
+            if handle is not None:
+                handle.close()
+            if category in shards:
+                self._handles[category] = open(os.path.join(self.file_name, shards[category]["file"]), "rb")
+        self.shards = shards
+        self._remove_unused()
+        self.pending.clear()
+        if isinstance(tasks, ShardedTaskList):
+            tasks.dirty.clear()
+
+    def _remove_unused(self):
+        """
+        Удалить файлы сегментов, которых нет в манифесте: замененные при сохранении и оставшиеся после сбоя.
+
+        Вызывается под исключительной блокировкой. Файл, который нельзя удалить (в Windows — открытый
+        другим процессом), удаляется при следующем сохранении.
+        """
+        used = {entry["file"] for entry in self.shards.values()}
+        for name in os.listdir(self.file_name):
+            if name.endswith(SHARD_SUFFIX) and name not in used:
+                try:
+                    os.remove(os.path.join(self.file_name, name))
+                except OSError:
+                    pass
+
+    def _close_handles(self):
+        """
+        Закрыть файлы сегментов.
+        """
+        for handle in self._handles.values():
+            handle.close()
+        self._handles = {}
+
+    def fingerprint(self):
+        """
+        Получить отпечаток сохраненных данных.
+
+        :return: Значение, которое меняется при каждом сохранении.
+        """
+        return file_fingerprint(self.manifest_name)
+
+    def close(self):
+        """
+        Сбросить на диск файлы последних сохранений, если политика fsync их отложила, и закрыть файлы сегментов.
+        """
+        if self._unsynced and self.fsync.policy != "never":
+            for path in self._unsynced:
+                if os.path.exists(path):
+                    _fsync_file(path)
+            _fsync_directory(self.manifest_name)
+        self._unsynced = []
+        self._close_handles()
+
+
+class ShardedTaskList:
+    """
+    Коллекция задач, разбитая на сегменты по категориям, с загрузкой сегмента при первом обращении.
+
+    Поддерживает тот же интерфейс, что и TaskList. Число задач и список категорий берутся
+    из манифеста без чтения сегментов. Порядок обхода — по сегментам в порядке манифеста
+    (новые категории — в конце), внутри сегмента — в порядке добавления. Позиция задачи
+    находится по числу задач в сегментах, поэтому страница списка загружает только сегменты,
+    на которые она приходится, а поиск по ID — только сегменты, в диапазон ID которых попадает ID.
+    Задача всегда лежит в сегменте своей категории: при изменении категории она переносится.
+
+    Атрибуты:
+        Manager (ShardedTaskManager): Менеджер, которому принадлежит коллекция.
+        Dirty (dict): Категории сегментов, измененных с последнего сохранения (ключи словаря).
+    """
+
+    def __init__(self, manager, entries):
+        """
+        Инициализация коллекции. Сегменты не загружаются.
+
+        :param manager: Менеджер задач.
+        :param entries: Записи манифеста {категория: запись} (см. ShardedStorage.open_manifest).
+        """
+        self.manager = manager
+        self.dirty = {}
+        self._order = dict.fromkeys(entries)
+        self._entries = dict(entries)
+        self._shards = {}
+
+    def _count(self, category):
+        """
+        Получить число задач сегмента, не загружая его.
+
+        :param category: Категория.
+        :return: Число задач.
+        """
+        shard = self._shards.get(category)
+        return len(shard) if shard is not None else self._entries[category]["count"]
+
+    def _load(self, category):
+        """
+        Загрузить сегмент из хранилища и добавить его задачи в индексы менеджера.
+
+        :param category: Категория незагруженного сегмента.
+        :return: Словарь {id: задача} сегмента.
+        """
+        with profiler.measure("load.shard", category=category):
+            listener = self.manager._task_changed
+            shard = {}
+            for record in self.manager.storage.load_shard(category):
+                task = Task.from_dict(record)
+                task._listener = listener
+                shard[task.id] = task
+            del self._entries[category]
+            self._shards[category] = shard
+            self.manager._shard_loaded(shard.values())
+        return shard
+
+    def _shard(self, category):
+        """
+        Получить сегмент категории, загрузив его при первом обращении или создав пустой для новой категории.
+
+        :param category: Категория.
+        :return: Словарь {id: задача} сегмента.
+        """
+        with self.manager._lock:
+            shard = self._shards.get(category)
+            if shard is None:
+                if category in self._entries:
+                    shard = self._load(category)
+                else:
+                    shard = self._shards[category] = {}
+                    self._order[category] = None
+            return shard
+
+    def _iter_from(self, index):
+        """
+        Перебрать задачи, начиная с позиции index в порядке обхода. Сегменты до этой позиции не загружаются.
+
+        :param index: Позиция первой задачи.
+        :return: Генератор задач.
+        """
+        for category in list(self._order):
+            count = self._count(category)
+            if index >= count:
+                index -= count
+                continue
+            yield from itertools.islice(self._shard(category).values(), index, None)
+            index = 0
+
+    def __len__(self):
+        return sum(self._count(category) for category in self._order)
+
+    def __iter__(self):
+        return self._iter_from(0)
+
+    def __contains__(self, task):
+        shard = self._shards.get(task.category)
+        return shard is not None and shard.get(task.id) is task
+
+    def __getitem__(self, index):
+        """
+        Получить задачу (или срез задач) по позиции в порядке обхода, загружая только нужные сегменты.
+
+        :param index: Позиция или срез.
+        :return: Задача или список задач.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return list(itertools.islice(self._iter_from(start), max(stop - start, 0)))
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс задачи вне диапазона.")
+        return next(self._iter_from(index))
+
+    def get(self, task_id):
+        """
+        Получить задачу по ID. Из незагруженных сегментов загружаются только те, в диапазон ID которых он попадает.
+
+        :param task_id: Идентификатор задачи.
+        :return: Задача или None, если не найдена.
+        """
+        for shard in list(self._shards.values()):
+            task = shard.get(task_id)
+            if task is not None:
+                return task
+        for category, entry in list(self._entries.items()):
+            if entry["min_id"] <= task_id <= entry["max_id"]:
+                task = self._shard(category).get(task_id)
+                if task is not None:
+                    return task
+        return None
+
+    def append(self, task):
+        """
+        Добавить задачу в сегмент ее категории.
+
+        Задача с ID не меньше счетчика ID менеджера заведомо новая, поэтому сегменты для проверки
+        повторяющегося ID читаются только для меньших ID.
+
+        :param task: Задача.
+        :raises ValueError: Если задача с таким ID уже есть.
+        """
+        with self.manager._lock:
+            if task.id < self.manager.next_id and self.get(task.id) is not None:
+                raise ValueError(f"Задача с ID {task.id} уже существует.")
+            self._shard(task.category)[task.id] = task
+            self.dirty[task.category] = None
+            self.manager._task_added(task)
+
+    def remove(self, task):
+        """
+        Удалить задачу.
+
+        :param task: Задача.
+        :raises ValueError: Если задачи нет в коллекции.
+        """
+        with self.manager._lock:
+            if task not in self:
+                raise ValueError(f"Задача с ID {task.id} не найдена.")
+            self.manager._remember_tasks(self)
+            self._pop(task.id)
+            self.dirty[task.category] = None
+            self.manager._task_removed(task)
+
+    def clear(self):
+        """
+        Удалить все задачи. Незагруженные сегменты не читаются.
+        """
+        with self.manager._lock:
+            self.manager._remember_tasks(self)
+            task_ids = [task_id for shard in self._shards.values() for task_id in shard]
+            unloaded = list(self._entries)
+            self._pop_all()
+            self.manager._tasks_cleared(task_ids)
+            for category in unloaded:
+                self.manager.unsaved.drop(category)
+
+    def drop(self, category):
+        """
+        Удалить сегмент категории целиком. Незагруженный сегмент не читается.
+
+        :param category: Категория.
+        :return: Число удаленных задач.
+        """
+        with self.manager._lock:
+            if category not in self._order:
+                return 0
+            self.manager._remember_tasks(self)
+            count = self._count(category)
+            self.manager._shard_dropped(category, self._drop(category))
+            return count
+
+    def _put(self, task):
+        """
+        Добавить задачу или заменить задачу с тем же ID без уведомления менеджера.
+
+        :param task: Задача.
+        """
+        task._listener = self.manager._task_changed
+        current = self.get(task.id)
+        if current is not None and current.category != task.category:
+            del self._shards[current.category][task.id]
+        self._shard(task.category)[task.id] = task
+
+    def _pop(self, task_id):
+        """
+        Удалить задачу без уведомления менеджера.
+
+        :param task_id: Идентификатор задачи.
+        :return: Удаленная задача или None, если ее не было.
+        """
+        task = self.get(task_id)
+        if task is not None:
+            del self._shards[task.category][task_id]
+            task._listener = None
+        return task
+
+    def _changed(self, task, old):
+        """
+        Учесть изменение полей задачи: при изменении категории перенести задачу в сегмент новой категории.
+
+        :param task: Измененная задача.
+        :param old: Словарь прежних значений измененных полей.
+        """
+        category = old.get("category", task.category)
+        shard = self._shards.get(category)
+        if shard is None or shard.get(task.id) is not task:
+            return
+        if category != task.category:
+            del shard[task.id]
+            self.dirty[category] = None
+            self._shard(task.category)[task.id] = task
+        self.dirty[task.category] = None
+
+    def _pop_all(self):
+        """
+        Удалить все задачи без уведомления менеджера: все сегменты будут удалены при сохранении.
+        """
+        for task in self.loaded():
+            task._listener = None
+        self.dirty.update(self._order)
+        self._order, self._entries, self._shards = {}, {}, {}
+
+    def _drop(self, category):
+        """
+        Удалить сегмент категории без уведомления менеджера.
+
+        :param category: Категория.
+        :return: Список загруженных задач сегмента (пустой, если сегмент не был загружен).
+        """
+        self._order.pop(category, None)
+        self._entries.pop(category, None)
+        tasks = list(self._shards.pop(category, {}).values())
+        for task in tasks:
+            task._listener = None
+        self.dirty[category] = None
+        return tasks
+
+    def replay(self, records):
+        """
+        Применить записи изменений без уведомления менеджера, отмечая затронутые сегменты измененными.
+
+        :param records: Записи изменений (см. ShardedStorage.record).
+        """
+        for record in records:
+            match record["op"]:
+                case "add":
+                    task = self.get(record["task"]["id"])
+                    if task is None:
+                        task = Task.from_dict(record["task"])
+                        self._put(task)
+                        self.dirty[task.category] = None
+                        continue
+                    fields = record["task"]
+                case "edit":
+                    task, fields = self.get(record["id"]), record["fields"]
+                case "mark_done":
+                    task, fields = self.get(record["id"]), {"status": "Выполнена"}
+                case "delete":
+                    task = self._pop(record["id"])
+                    if task is not None:
+                        self.dirty[task.category] = None
+                    continue
+                case "clear":
+                    self._pop_all()
+                    continue
+                case "drop":
+                    self._drop(record["category"])
+                    continue
+                case _:
+                    continue
+            if task is not None:
+                old = self.manager._assign(task, fields)
+                if old:
+                    self._changed(task, old)
+
+    def checkpoint(self):
+        """
+        Запомнить состав коллекции (для отката транзакции).
+
+        :return: Непрозрачное значение для restore().
+        """
+        shards = {category: dict(shard) for category, shard in self._shards.items()}
+        return dict(self._order), dict(self._entries), shards
+
+    def restore(self, checkpoint, skip=()):
+        """
+        Восстановить состав коллекции, запомненный checkpoint(). Сегменты, загруженные позже, снова считаются
+        незагруженными.
+
+        :param checkpoint: Значение, полученное от checkpoint().
+        :param skip: Идентификаторы объектов (id()) добавленных задач, которые не нужно восстанавливать.
+        """
+        order, entries, shards = checkpoint
+        for task in self.loaded():
+            task._listener = None
+        self._order, self._entries = dict(order), dict(entries)
+        self._shards = {
+            category: {task_id: task for task_id, task in shard.items() if id(task) not in skip}
+            for category, shard in shards.items()
+        }
+        listener = self.manager._task_changed
+        for task in self.loaded():
+            task._listener = listener
+
+    def loaded(self):
+        """
+        Перебрать задачи загруженных сегментов.
+
+        :return: Генератор задач.
+        """
+        for shard in list(self._shards.values()):
+            yield from shard.values()
+
+    def load_all(self):
+        """
+        Загрузить все сегменты.
+        """
+        for category in list(self._entries):
+            self._shard(category)
+
+    def load_categories(self, category, ignore_case=False):
+        """
+        Загрузить сегменты категории.
+
+        :param category: Категория.
+        :param ignore_case: Загрузить сегменты всех категорий, совпадающих без учета регистра.
+        """
+        if ignore_case:
+            category = category.casefold()
+            names = [name for name in self._entries if name.casefold() == category]
+        else:
+            names = [category] if category in self._entries else []
+        for name in names:
+            self._shard(name)
+
+    def shard(self, category):
+        """
+        Получить задачи сегмента, загрузив его при необходимости.
+
+        :param category: Категория.
+        :return: Словарь {id: задача} (пустой, если категории нет).
+        """
+        return self._shard(category) if category in self._order else {}
+
+    def unloaded_stats(self):
+        """
+        Получить счетчики задач незагруженных сегментов из манифеста. Сегменты, для которых в манифесте нет
+        счетчиков (манифест записан до их появления), загружаются.
+
+        :return: Список словарей счетчиков (см. StatsIndex.to_dict).
+        """
+        for category, entry in list(self._entries.items()):
+            if "stats" not in entry:
+                self._shard(category)
+        return [entry["stats"] for entry in self._entries.values()]
+
+    def categories(self):
+        """
+        Получить категории, в которых есть задачи, не загружая сегменты.
+
+        :return: Список категорий в порядке обхода.
+        """
+        return [category for category in self._order if self._count(category)]
+
+    def records(self):
+        """
+        Перебрать все задачи в виде словарей, не создавая объекты Task для незагруженных сегментов.
+
+        :return: Генератор словарей задач.
+        """
+        for category in list(self._order):
+            shard = self._shards.get(category)
+            if shard is None:
+                yield from self.manager.storage.load_shard(category)
+            else:
+                for task in shard.values():
+                    yield task.to_dict()
+
+
+class ShardedTaskManager(TaskManager):
+    """
+    Менеджер задач, хранящий каждую категорию в отдельном сегменте и загружающий сегменты по требованию.
+
+    Запуск читает только манифест. Сегмент категории загружается при первом обращении к ее задачам:
+    выводе страницы, фильтре по категории, поиске по ID. Запросы по всем задачам (поиск по словам,
+    запросы по сроку, сортировка, фильтр без категории) загружают все сегменты. Индексы TaskManager
+    строятся по загруженным задачам и дополняются при загрузке сегментов, а статистика складывается
+    из счетчиков загруженных сегментов и счетчиков остальных из манифеста. Сохранение переписывает
+    только измененные сегменты, а delete_category() удаляет сегмент категории, не читая его.
+
+    Атрибуты:
+        File_name (str): Каталог сегментов.
+        Storage (ShardedStorage): Хранилище задач.
+        Tasks (ShardedTaskList): Коллекция задач.
+    """
+
+    def __init__(self, file_name="tasks.shards", storage=None, save_delay=0, shared_read=False):
+        """
+        Инициализация менеджера задач.
+
+        :param file_name: Каталог сегментов.
+        :param storage: Хранилище ShardedStorage. Если None, используется каталог file_name.
+        :param save_delay: Задержка отложенной записи в секундах (0 — сохранять сразу).
+        :param shared_read: Подхватывать изменения других процессов перед каждым запросом.
+        """
+        super().__init__(
+            file_name, storage=storage if storage is not None else ShardedStorage(file_name), save_delay=save_delay,
+            shared_read=shared_read,
+        )
+
+    @timed("load")
+    def load_tasks(self):
+        """
+        Прочитать манифест сегментов. Сегменты загружаются при первом обращении к их задачам.
+
+        :return: Коллекция задач.
+        """
+        tasks = ShardedTaskList(self, self.storage.open_manifest())
+        self.next_id = self.storage.next_id
+        return tasks
+
+    def _shard_loaded(self, tasks):
+        """
+        Добавить задачи загруженного сегмента в индексы.
+
+        :param tasks: Задачи сегмента.
+        """
+        tasks = list(tasks)
+        profiler.count("loaded_tasks", len(tasks))
+        for index in self._indexes.values():
+            for task in tasks:
+                index.add(task)
+
+    def _shard_dropped(self, category, tasks):
+        """
+        Обработать удаление сегмента категории целиком.
+
+        :param category: Категория.
+        :param tasks: Загруженные задачи сегмента.
+        """
+        for task in tasks:
+            for index in self._indexes.values():
+                index.discard(task)
+            self.unsaved.delete(task.id)
+        self.storage.record("drop", category=category)
+        self.unsaved.drop(category)
+
+    def _rebuild_indexes(self):
+        """
+        Перестроить индексы по задачам загруженных сегментов.
+        """
+        tasks = list(self._tasks.loaded())
+        for index in self._indexes.values():
+            index.rebuild(tasks)
+
+    def _reload(self):
+        """
+        Прочитать манифест заново и повторно применить несохраненные изменения этого менеджера.
+
+        Объекты задач загруженных сегментов сохраняются, поэтому ссылки на них остаются действительными.
+        Несохраненные задачи, ID которых занял другой процесс, получают новые ID.
+        """
+        entries = self.storage.open_manifest()
+        mapping, free_id = renumber(self.storage.pending, self.storage.next_id)
+        self.unsaved.renumber(mapping)
+        old, tasks = self._tasks, ShardedTaskList(self, entries)
+        tasks.replay(self.storage.pending)
+        for task in list(old.loaded()):
+            task.id = mapping.get(task.id, task.id)
+            current = tasks.get(task.id)
+            if current is None:
+                task._listener = None
+            elif current is not task:
+                self._assign(task, current.to_dict())
+                tasks._put(task)
+        self._tasks = tasks
+        self._rebuild_indexes()
+        self.next_id = self.storage.next_id = replay({}, self.storage.pending, max(free_id, self.storage.next_id))
+
+    def _remember_tasks(self, tasks):
+        """
+        Запомнить состав задач перед первым удалением в транзакции.
+
+        :param tasks: Коллекция задач.
+        """
+        if self._undo is not None and self._undo_tasks is None:
+            self._undo_tasks = tasks.checkpoint()
+
+    def _rollback(self, next_id):
+        """
+        Отменить изменения транзакции в хранилище, в коллекции задач и в индексах.
+
+        Если в транзакции удалялись задачи, сначала восстанавливается запомненный состав сегментов,
+        затем отменяются изменения полей (с переносом задач между сегментами), а индексы перестраиваются.
+
+        :param next_id: Значение счетчика ID в начале транзакции.
+        """
+        self.storage.rollback()
+        self.next_id = next_id
+        tasks = self._tasks
+        indexes = self._indexes.values() if self._undo_tasks is None else ()
+        added = {id(task) for op, task, _ in self._undo if op == "add"}
+        if self._undo_tasks is not None:
+            tasks.restore(self._undo_tasks, added)
+        for op, task, old in reversed(self._undo):
+            if op == "add":
+                if task in tasks:
+                    tasks._pop(task.id)
+                    for index in indexes:
+                        index.discard(task)
+            else:
+                current = {field: getattr(task, field) for field in old}
+                for field, value in old.items():
+                    setattr(task, field, value)
+                task.version += 1
+                tasks._changed(task, current)
+                if task in tasks:
+                    for index in indexes:
+                        index.update(task, current)
+        if self._undo_tasks is not None:
+            self._rebuild_indexes()
+
+    def export_tasks(self, file_name):
+        """
+        Экспортировать задачи в файл формата tasks.json, не создавая объекты задач незагруженных сегментов.
+
+        :param file_name: Имя файла для экспорта.
+        """
+        export_json(self.tasks.records(), file_name)
+
+    def get_categories(self):
+        """
+        Получить список категорий, в которых есть задачи, по манифесту.
+
+        :return: Список категорий.
+        """
+        self._refresh_if_shared()
+        return self.tasks.categories()
+
+    def _statistics(self):
+        """
+        Сложить счетчики задач загруженных сегментов со счетчиками незагруженных сегментов из манифеста.
+
+        :return: Экземпляр StatsIndex.
+        """
+        unloaded = self.tasks.unloaded_stats()
+        stats = StatsIndex()
+        stats.merge(self._indexes["stats"].to_dict())
+        for data in unloaded:
+            stats.merge(data)
+        return stats
+
+    def delete_category(self, category):
+        """
+        Удалить все задачи категории, удалив ее сегмент. Незагруженный сегмент не читается.
+
+        :param category: Категория.
+        :return: Число удаленных задач.
+        """
+        with self._lock, self._exclusive():
+            count = self.tasks.drop(category)
+            self.save_tasks()
+        return count
+
+    def filter_tasks(self, category=None, status=None, priority=None, ignore_case=False):
+        """
+        Найти задачи по категории, статусу и приоритету. С категорией загружаются только ее сегменты,
+        без категории — все.
+
+        :param category: Категория задачи.
+        :param status: Статус задачи.
+        :param priority: Приоритет задачи.
+        :param ignore_case: Сравнивать значения без учета регистра.
+        :return: Список подходящих задач.
+        """
+        self._refresh_if_shared()
+        if category is None:
+            self.tasks.load_all()
+        else:
+            self.tasks.load_categories(category, ignore_case)
+        return super().filter_tasks(category, status, priority, ignore_case)
+
+    def _sorted(self, keys):
+        """
+        Получить кэшированный порядок всех задач, загрузив все сегменты.
+
+        :param keys: Ключи сортировки.
+        :return: Упорядоченная последовательность задач, которую нельзя изменять.
+        :raises ValueError: Если ключ сортировки неизвестен.
+        """
+        self.tasks.load_all()
+        return super()._sorted(keys)
+
+    def get_tasks_due_between(self, start, end):
+        """
+        Найти задачи со сроком выполнения в интервале, загрузив все сегменты.
+
+        :param start: Начало интервала (гггг-мм-дд или date, включительно).
+        :param end: Конец интервала (гггг-мм-дд или date, включительно).
+        :return: Список задач, упорядоченный по сроку.
+        :raises ValueError: Если граница интервала не является датой.
+        """
+        self._refresh_if_shared()
+        self.tasks.load_all()
+        return super().get_tasks_due_between(start, end)
+
+    def get_overdue_tasks(self, today=None):
+        """
+        Найти невыполненные задачи с истекшим сроком, загрузив все сегменты.
+
+        :param today: Текущая дата (гггг-мм-дд или date). Если None, берется сегодняшняя.
+        :return: Список задач, упорядоченный по сроку.
+        """
+        self._refresh_if_shared()
+        self.tasks.load_all()
+        return super().get_overdue_tasks(today)
+
+    def get_upcoming_tasks(self, limit=None, today=None, end=None):
+        """
+        Найти ближайшие по сроку невыполненные задачи, загрузив все сегменты.
+
+        :param limit: Максимальное число задач. Если None, возвращаются все.
+        :param today: Текущая дата (гггг-мм-дд или date). Если None, берется сегодняшняя.
+        :param end: Последний день (включительно). Если None, срок не ограничен сверху.
+        :return: Список задач, упорядоченный по сроку.
+        """
+        self._refresh_if_shared()
+        self.tasks.load_all()
+        return super().get_upcoming_tasks(limit, today, end)
+
+    def search_tasks(self, query, match_all=None):
+        """
+        Найти задачи по словам в названии и описании, загрузив все сегменты.
+
+        :param query: Текст запроса (слова через OR или ИЛИ — любое из слов).
+        :param match_all: True — все слова (AND), False — любое слово (OR), None — определить по запросу.
+        :return: Список задач, упорядоченный по убыванию релевантности.
+        """
+        self._refresh_if_shared()
+        self.tasks.load_all()
+        return super().search_tasks(query, match_all)
@@ -0,0 +1,200 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from operator import itemgetter
+from task_benchmark import generate_realistic_tasks
+from task_manager import Task, TaskManager
+from task_shard import MANIFEST_NAME, ShardedStorage, ShardedTaskManager
+from task_storage import import_json
+
+
+def ids(tasks):
+    """Получить ID задач."""
+    return [task.id for task in tasks]
+
+
+class TestShardedTaskManager(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем временный каталог и одинаковые задачи в сегментах и в tasks.json."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.shards")
+        self.records = list(generate_realistic_tasks(300, seed=5))
+        self.expected = TaskManager(os.path.join(self.tmp_dir.name, "tasks.json"))
+        for manager in (ShardedTaskManager(self.file_name), self.expected):
+            with manager.batch():
+                for record in self.records:
+                    manager.tasks.append(Task.from_dict(record))
+            if manager is not self.expected:
+                manager.close()
+
+    def tearDown(self):
+        """Закрытие менеджера и удаление временного каталога."""
+        self.expected.close()
+        self.tmp_dir.cleanup()
+
+    def manifest(self):
+        """Прочитать манифест сегментов."""
+        with open(os.path.join(self.file_name, MANIFEST_NAME), encoding="utf-8") as file:
+            return {entry["category"]: entry for entry in json.load(file)["shards"]}
+
+    def assertSameQueries(self, manager):
+        """Проверить, что запросы менеджера дают те же задачи, что и TaskManager (порядок обхода — по сегментам)."""
+        expected = self.expected
+        self.assertEqual(
+            sorted((task.to_dict() for task in manager.tasks), key=itemgetter("id")),
+            [task.to_dict() for task in expected.tasks],
+        )
+        self.assertEqual(sorted(manager.get_categories()), sorted(expected.get_categories()))
+        for criteria in ({"category": "Работа"}, {"category": "работа", "status": "выполнена"}, {"priority": "Нет"}):
+            ignore_case = criteria.get("category", "").islower()
+            self.assertEqual(
+                sorted(ids(manager.filter_tasks(**criteria, ignore_case=ignore_case))),
+                sorted(ids(expected.filter_tasks(**criteria, ignore_case=ignore_case))),
+            )
+        self.assertEqual(
+            ids(manager.get_tasks_due_between("2025-01-01", "2025-01-15")),
+            ids(expected.get_tasks_due_between("2025-01-01", "2025-01-15")),
+        )
+        self.assertEqual(ids(manager.get_overdue_tasks("2025-01-10")), ids(expected.get_overdue_tasks("2025-01-10")))
+        self.assertEqual(ids(manager.search_tasks("отчет OR счет")), ids(expected.search_tasks("отчет OR счет")))
+        self.assertEqual(ids(manager.sort_tasks()), ids(expected.sort_tasks()))
+        self.assertEqual(manager.get_statistics("2025-01-10"), expected.get_statistics("2025-01-10"))
+
+    def test_lazy_loading(self):
+        """Тест на то, что запуск, вывод страницы и фильтр по категории загружают только нужные сегменты."""
+        manager = ShardedTaskManager(self.file_name)
+        self.assertEqual((len(manager.tasks), manager.tasks._shards), (300, {}))
+        self.assertEqual(sorted(manager.get_categories()), sorted(self.manifest()))
+        first = next(iter(self.manifest()))
+        with redirect_stdout(io.StringIO()):
+            manager.show_tasks(page=1, page_size=10)
+        self.assertEqual(list(manager.tasks._shards), [first])
+        self.assertEqual(
+            ids(manager.filter_tasks(category="Дом")), ids(self.expected.filter_tasks(category="Дом"))
+        )
+        self.assertEqual(set(manager.tasks._shards), {first, "Дом"})
+        task = manager.get_task_by_id(150)
+        self.assertEqual(task.to_dict(), self.expected.get_task_by_id(150).to_dict())
+        self.assertEqual(set(manager.tasks._shards), {first, "Дом", task.category})
+        manager.close()
+
+    def test_statistics(self):
+        """Тест на статистику по счетчикам манифеста и загруженных сегментов без загрузки остальных сегментов."""
+        manager = ShardedTaskManager(self.file_name)
+        self.assertEqual(manager.get_statistics("2025-01-10"), self.expected.get_statistics("2025-01-10"))
+        self.assertEqual(manager.tasks._shards, {})
+        for manager in (manager, self.expected):
+            manager.get_task_by_id(5).edit(category="Новая", due_date="2025-01-01")
+            manager.add_task("Счет за свет", "", "Дом", "2025-01-02", "Высокий")
+            manager.delete_category("Учеба")
+        statistics = self.expected.get_statistics("2025-01-10")
+        self.assertEqual(manager.get_statistics("2025-01-10"), statistics)
+        manager.close()
+        manager = ShardedTaskManager(self.file_name)
+        self.assertEqual(manager.get_statistics("2025-01-10"), statistics)
+        self.assertEqual(manager.tasks._shards, {})
+        manager.close()
+
+    def test_changes(self):
+        """Тест на запросы после изменений и на то, что сохранение переписывает только измененные сегменты."""
+        before = self.manifest()
+        manager = ShardedTaskManager(self.file_name)
+        for manager in (manager, self.expected):
+            with manager.batch():
+                manager.get_task_by_id(3).edit(title="Новый отчет", category="Новая", due_date="2025-01-05")
+                manager.get_task_by_id(8).mark_as_done()
+                manager.tasks.remove(manager.get_task_by_id(10))
+                manager.add_task("Счет за свет", "Оплатить", "Работа", "2025-01-12", "Высокий")
+        changed = {self.records[index]["category"] for index in (2, 9)} | {"Новая", "Работа"}
+        if self.records[7]["status"] != "Выполнена":
+            changed.add(self.records[7]["category"])
+        after = self.manifest()
+        self.assertEqual({category for category in after if after[category] != before.get(category)}, changed)
+        self.assertSameQueries(manager)
+        manager.close()
+
+        manager = ShardedTaskManager(self.file_name)
+        self.assertSameQueries(manager)
+        files = {entry["file"] for entry in self.manifest().values()}
+        self.assertEqual({name for name in os.listdir(self.file_name) if name.endswith(".jsonl")}, files)
+        manager.close()
+
+    def test_delete_category(self):
+        """Тест на удаление категории без чтения ее сегмента."""
+        manager = ShardedTaskManager(self.file_name)
+        count = len(self.expected.filter_tasks(category="Работа"))
+        self.assertEqual(manager.delete_category("Работа"), count)
+        self.assertEqual(self.expected.delete_category("Работа"), count)
+        self.assertEqual(manager.tasks._shards, {})
+        self.assertNotIn("Работа", self.manifest())
+        self.assertEqual(manager.delete_category("Работа"), 0)
+        manager.close()
+        manager = ShardedTaskManager(self.file_name)
+        self.assertSameQueries(manager)
+        manager.close()
+
+    def test_rollback(self):
+        """Тест на откат транзакции с изменением категории, удалением сегмента, очисткой и добавлением задач."""
+        manager = ShardedTaskManager(self.file_name)
+        task = manager.get_task_by_id(7)
+        category = task.category
+        with self.assertRaises(RuntimeError), manager.batch():
+            task.edit(category="Другая")
+            manager.delete_category("Дом")
+            manager.tasks.clear()
+            manager.add_task("Новая", "", "Работа", "", "Низкий")
+            raise RuntimeError
+        self.assertEqual(task.category, category)
+        self.assertIs(manager.get_task_by_id(7), task)
+        self.assertFalse(manager.has_unsaved_changes())
+        self.assertSameQueries(manager)
+        manager.close()
+
+    def test_other_process_changes(self):
+        """Тест на изменения другого процесса: задачи загружаются заново, объекты загруженных задач сохраняются."""
+        manager = ShardedTaskManager(self.file_name)
+        task = manager.get_task_by_id(5)
+        other = ShardedTaskManager(self.file_name)
+        other.get_task_by_id(5).edit(title="Изменено другим процессом")
+        other.add_task("Чужая задача", "", "Дом", "", "Низкий")
+        other.delete_category("Учеба")
+        other.close()
+        manager.add_task("Своя задача", "", "Дом", "", "Низкий")
+        self.assertIs(manager.get_task_by_id(5), task)
+        self.assertEqual(task.title, "Изменено другим процессом")
+        self.assertEqual([manager.get_task_by_id(301).title, manager.get_task_by_id(302).title], [
+            "Чужая задача", "Своя задача",
+        ])
+        self.assertEqual(manager.filter_tasks(category="Учеба"), [])
+        manager.close()
+
+    def test_storage(self):
+        """Тест на запись хранилища из обычного списка задач, экспорт и проверку версии манифеста."""
+        file_name = os.path.join(self.tmp_dir.name, "copy.shards")
+        storage = ShardedStorage(file_name)
+        storage.next_id = self.expected.next_id
+        storage.save(self.expected.tasks)
+        storage.close()
+        self.assertEqual(
+            sorted(record["id"] for record in ShardedStorage(file_name).load()), ids(self.expected.tasks)
+        )
+        manager = ShardedTaskManager(file_name)
+        export = os.path.join(self.tmp_dir.name, "export.json")
+        manager.export_tasks(export)
+        self.assertEqual(
+            sorted(import_json(export), key=itemgetter("id")), [task.to_dict() for task in self.expected.tasks]
+        )
+        manager.close()
+
+        with open(os.path.join(file_name, MANIFEST_NAME), "w", encoding="utf-8") as file:
+            json.dump({"version": 99, "shards": []}, file)
+        with self.assertRaisesRegex(ValueError, "версия"):
+            ShardedStorage(file_name).open_manifest()
+
+
+if __name__ == "__main__":
+    unittest.main()
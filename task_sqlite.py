@@ -0,0 +1,680 @@
+import sqlite3
+from datetime import date
+from task_index import SORT_KEYS, StatsIndex, priority_rank, tokenize
+from task_manager import Task, TaskManager, format_date, parse_date
+from task_profile import timed
+from task_storage import FileLock, FsyncPolicy, export_json, file_fingerprint, import_json
+
+COLUMNS = ("id", "title", "description", "category", "due_date", "priority", "status")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_category ON tasks (category);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS tasks_due_date ON tasks (due_date);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS stats (
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (field, value)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS tasks_stats_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO stats VALUES ('category', NEW.category, 1), ('status', NEW.status, 1), ('priority', NEW.priority, 1)
+        ON CONFLICT DO UPDATE SET count = count + 1;
+    INSERT INTO stats SELECT 'open_due', NEW.due_date, 1 WHERE NEW.due_date != '' AND NEW.status != 'Выполнена'
+        ON CONFLICT DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_stats_delete AFTER DELETE ON tasks BEGIN
+    UPDATE stats SET count = count - 1 WHERE (field = 'category' AND value = OLD.category)
+        OR (field = 'status' AND value = OLD.status) OR (field = 'priority' AND value = OLD.priority)
+        OR (field = 'open_due' AND value = OLD.due_date AND OLD.status != 'Выполнена');
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_stats_update AFTER UPDATE OF category, due_date, priority, status ON tasks BEGIN
+    UPDATE stats SET count = count - 1 WHERE (field = 'category' AND value = OLD.category)
+        OR (field = 'status' AND value = OLD.status) OR (field = 'priority' AND value = OLD.priority)
+        OR (field = 'open_due' AND value = OLD.due_date AND OLD.status != 'Выполнена');
+    INSERT INTO stats VALUES ('category', NEW.category, 1), ('status', NEW.status, 1), ('priority', NEW.priority, 1)
+        ON CONFLICT DO UPDATE SET count = count + 1;
+    INSERT INTO stats SELECT 'open_due', NEW.due_date, 1 WHERE NEW.due_date != '' AND NEW.status != 'Выполнена'
+        ON CONFLICT DO UPDATE SET count = count + 1;
+END;
+"""
+
+_COUNT_STATS = """
+BEGIN;
+DELETE FROM stats;
+INSERT INTO stats SELECT 'category', category, COUNT(*) FROM tasks GROUP BY category;
+INSERT INTO stats SELECT 'status', status, COUNT(*) FROM tasks GROUP BY status;
+INSERT INTO stats SELECT 'priority', priority, COUNT(*) FROM tasks GROUP BY priority;
+INSERT INTO stats SELECT 'open_due', due_date, COUNT(*) FROM tasks
+    WHERE due_date != '' AND status != 'Выполнена' GROUP BY due_date;
+INSERT OR REPLACE INTO meta VALUES ('stats', 1);
+COMMIT;
+"""
+
+_SYNCHRONOUS = {"always": "FULL", "batched": "NORMAL", "never": "OFF"}
+
+_INSERT = "INSERT OR REPLACE INTO tasks VALUES (:id, :title, :description, :category, :due_date, :priority, :status)"
+_SELECT = "SELECT id, title, description, category, due_date, priority, status FROM tasks"
+_SORT_EXPRESSIONS = {
+    "priority": ("priority_rank(priority)",),
+    "due_date": ("due_date = ''", "due_date"),
+    "status": ("status = 'Выполнена'",),
+    "category": ("casefold(category)",),
+    "title": ("casefold(title)",),
+}
+
+
+def sort_order(keys):
+    """
+    Построить выражение ORDER BY для ключей сортировки с тем же порядком, что и task_index.SortOrder.
+
+    :param keys: Ключи сортировки (см. TaskManager.sort_tasks).
+    :return: Выражение ORDER BY.
+    :raises ValueError: Если ключ неизвестен или ключи не заданы.
+    """
+    if not keys:
+        raise ValueError("Не заданы ключи сортировки.")
+    terms = []
+    for key in keys:
+        field = key.removeprefix("-")
+        if field not in SORT_KEYS:
+            raise ValueError(f"Неизвестный ключ сортировки: {key}. Допустимые: {', '.join(SORT_KEYS)}.")
+        direction = " DESC" if key.startswith("-") else ""
+        terms.extend(expression + direction for expression in _SORT_EXPRESSIONS[field])
+    return ", ".join(terms + ["id"])
+
+
+class SqliteStorage:
+    """
+    Хранилище задач в базе SQLite.
+
+    База работает в режиме WAL, а политика fsync соответствует режиму synchronous SQLite:
+    always — FULL, batched — NORMAL (сброс на диск при контрольных точках WAL), never — OFF.
+    Каждое изменение сразу выполняется одним запросом в открытой транзакции, а save()
+    фиксирует транзакцию, поэтому сохранение не зависит от общего числа задач. Запросы
+    используют постоянный текст с параметрами, и модуль sqlite3 повторно использует
+    их подготовленные выражения. Для поиска по словам создается таблица FTS5, если она
+    поддерживается сборкой SQLite. Счетчики задач по категориям, статусам, приоритетам
+    и срокам невыполненных задач хранятся в таблице stats и обновляются триггерами
+    при каждом изменении задач; в базе, созданной до их появления, они считаются при открытии.
+
+    Атрибуты:
+        File_name (str): Имя файла базы.
+        Connection (sqlite3.Connection): Соединение с базой.
+        Has_fts (bool): Доступен ли полнотекстовый поиск FTS5.
+        Next_id (int): Счетчик ID.
+        Fsync (FsyncPolicy): Политика сброса базы на диск.
+        Lock (FileLock): Блокировка между процессами, согласующая выдачу ID задач.
+        Pending (list): Всегда пуст: изменения сразу выполняются в базе.
+    """
+
+    def __init__(self, file_name, fsync="batched"):
+        """
+        Инициализация хранилища: открытие базы и создание таблиц и индексов.
+
+        :param file_name: Имя файла базы.
+        :param fsync: Политика fsync (always, batched, never).
+        """
+        self.file_name = file_name
+        self.fsync = FsyncPolicy(fsync)
+        self.lock = FileLock(f"{file_name}.lock")
+        self.pending = []
+        self.connection = sqlite3.connect(file_name, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(f"PRAGMA synchronous={_SYNCHRONOUS[fsync]}")
+        self.connection.executescript(_SCHEMA)
+        self.connection.execute("PRAGMA recursive_triggers=ON")
+        if self.connection.execute("SELECT 1 FROM meta WHERE key = 'stats'").fetchone() is None:
+            self.connection.executescript(_COUNT_STATS)
+        self.connection.create_function("priority_rank", 1, priority_rank, deterministic=True)
+        self.connection.create_function("casefold", 1, str.casefold, deterministic=True)
+        try:
+            self.connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(title, description)")
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        self.connection.commit()
+        self.next_id = self._saved_next_id = self._stored_next_id()
+        self._data_version = self._read_data_version()
+
+    def _stored_next_id(self):
+        """
+        Прочитать счетчик ID из базы.
+
+        :return: Следующий свободный ID.
+        """
+        row = self.connection.execute(
+            "SELECT MAX(COALESCE((SELECT value FROM meta WHERE key = 'next_id'), 1), "
+            "(SELECT COALESCE(MAX(id), 0) + 1 FROM tasks))"
+        ).fetchone()
+        return row[0]
+
+    def _read_data_version(self):
+        """
+        Получить номер версии данных, который меняется, когда изменения фиксирует другое соединение.
+
+        :return: Номер версии.
+        """
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self):
+        """
+        Загрузить все задачи.
+
+        :return: Список словарей задач.
+        """
+        return list(self.iter_load())
+
+    def iter_load(self):
+        """
+        Загружать задачи по одной в порядке ID.
+
+        :return: Генератор словарей задач.
+        """
+        for row in self.connection.execute(f"{_SELECT} ORDER BY id"):
+            yield dict(zip(COLUMNS, row))
+
+    def _index_text(self, task_id, title, description):
+        """
+        Записать слова задачи в таблицу полнотекстового поиска.
+
+        Текст приводится к тому же виду, что и в FullTextIndex (регистр, «ё» как «е»).
+
+        :param task_id: Идентификатор задачи.
+        :param title: Название задачи.
+        :param description: Описание задачи.
+        """
+        if self.has_fts:
+            self.connection.execute("DELETE FROM tasks_fts WHERE rowid = ?", (task_id,))
+            self.connection.execute(
+                "INSERT INTO tasks_fts (rowid, title, description) VALUES (?, ?, ?)",
+                (task_id, " ".join(tokenize(title)), " ".join(tokenize(description))),
+            )
+
+    def record(self, op, **data):
+        """
+        Выполнить изменение в открытой транзакции.
+
+        :param op: Тип операции (add, edit, mark_done, delete, clear).
+        :param data: Данные операции.
+        """
+        match op:
+            case "add":
+                task = data["task"]
+                self.connection.execute(_INSERT, task)
+                self._index_text(task["id"], task["title"], task["description"])
+                self.next_id = max(self.next_id, task["id"] + 1)
+            case "edit":
+                fields = {field: value for field, value in data["fields"].items() if field in COLUMNS[1:]}
+                assignments = ", ".join(f"{field} = :{field}" for field in fields)
+                self.connection.execute(f"UPDATE tasks SET {assignments} WHERE id = :id", {**fields, "id": data["id"]})
+                if "title" in fields or "description" in fields:
+                    row = self.connection.execute("SELECT title, description FROM tasks WHERE id = ?", (data["id"],))
+                    self._index_text(data["id"], *row.fetchone())
+            case "mark_done":
+                self.connection.execute("UPDATE tasks SET status = 'Выполнена' WHERE id = ?", (data["id"],))
+            case "delete":
+                self.connection.execute("DELETE FROM tasks WHERE id = ?", (data["id"],))
+                if self.has_fts:
+                    self.connection.execute("DELETE FROM tasks_fts WHERE rowid = ?", (data["id"],))
+            case "clear":
+                self.connection.execute("DELETE FROM tasks")
+                if self.has_fts:
+                    self.connection.execute("DELETE FROM tasks_fts")
+                self.next_id = 1
+
+    def begin(self):
+        """
+        Начать транзакцию: зафиксировать предыдущие изменения, чтобы rollback() отменял только новые.
+        """
+        self.save(None)
+        self._saved_next_id = self.next_id
+
+    def changes(self):
+        """
+        Проверить, не зафиксировал ли изменения другой процесс, и обновить счетчик ID.
+
+        :return: Пустой список, если база не менялась, или None, если задачи в памяти нужно загрузить заново.
+        """
+        version = self._read_data_version()
+        if version == self._data_version:
+            return []
+        self._data_version = version
+        self.next_id = max(self.next_id, self._stored_next_id())
+        return None
+
+    def rollback(self):
+        """
+        Отменить изменения, выполненные после begin().
+        """
+        self.connection.rollback()
+        self.next_id = self._saved_next_id
+
+    def save(self, tasks):
+        """
+        Зафиксировать изменения.
+
+        :param tasks: Коллекция задач (не используется: изменения уже записаны в транзакции).
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)", (self.next_id,)
+        )
+        self.connection.commit()
+
+    def import_records(self, records):
+        """
+        Заменить все задачи набором словарей одной транзакцией.
+
+        :param records: Итерируемый набор словарей задач.
+        """
+        self.record("clear")
+        records = list(records)
+        self.connection.executemany(_INSERT, records)
+        if self.has_fts:
+            self.connection.executemany(
+                "INSERT INTO tasks_fts (rowid, title, description) VALUES (?, ?, ?)",
+                ((r["id"], " ".join(tokenize(r["title"])), " ".join(tokenize(r["description"]))) for r in records),
+            )
+        self.next_id = max((record["id"] for record in records), default=0) + 1
+        self.save(None)
+
+    def select(self, where="", params=(), order="id", limit=-1, offset=0):
+        """
+        Выбрать строки задач.
+
+        :param where: Условие WHERE (без ключевого слова) с параметрами "?".
+        :param params: Значения параметров условия.
+        :param order: Выражение ORDER BY.
+        :param limit: Максимальное число строк (-1 — без ограничения).
+        :param offset: Число пропускаемых строк.
+        :return: Курсор со строками задач в порядке COLUMNS.
+        """
+        condition = f" WHERE {where}" if where else ""
+        return self.connection.execute(
+            f"{_SELECT}{condition} ORDER BY {order} LIMIT ? OFFSET ?", (*params, limit, offset)
+        )
+
+    def count(self):
+        """
+        Получить число задач по счетчикам таблицы stats, не просматривая задачи.
+
+        :return: Число задач.
+        """
+        return self.connection.execute("SELECT COALESCE(SUM(count), 0) FROM stats WHERE field = 'status'").fetchone()[0]
+
+    def stats(self):
+        """
+        Прочитать счетчики задач из таблицы stats. Значения, счетчики которых стали нулевыми, и сроки
+        не в формате гггг-мм-дд из баз, записанных до проверки сроков, пропускаются.
+
+        :return: Экземпляр StatsIndex.
+        """
+        data = {"total": 0, "category": {}, "status": {}, "priority": {}, "open_due": {}}
+        for field, value, count in self.connection.execute("SELECT field, value, count FROM stats WHERE count > 0"):
+            if field == "open_due":
+                try:
+                    parse_date(value)
+                except ValueError:
+                    continue
+            data[field][value] = count
+        data["total"] = sum(data["status"].values())
+        stats = StatsIndex()
+        stats.merge(data)
+        return stats
+
+    def fingerprint(self):
+        """
+        Получить отпечаток сохраненных данных.
+
+        :return: Значение, которое меняется при каждом сохранении.
+        """
+        return file_fingerprint(self.file_name, f"{self.file_name}-wal")
+
+    def close(self):
+        """
+        Зафиксировать изменения и закрыть соединение.
+        """
+        self.save(None)
+        self.connection.close()
+
+
+class SqliteTaskList:
+    """
+    Коллекция задач, хранящихся в SQLite.
+
+    Поддерживает тот же интерфейс, что и TaskList, но не держит задачи в памяти:
+    объекты Task создаются при обращении, а их изменения записываются в базу.
+
+    Атрибуты:
+        Manager (SqliteTaskManager): Менеджер, которому принадлежит коллекция.
+        Order (str): Выражение ORDER BY, задающее порядок обхода и позиции задач.
+    """
+
+    def __init__(self, manager, order="id"):
+        """
+        Инициализация коллекции.
+
+        :param manager: Менеджер задач.
+        :param order: Выражение ORDER BY (по умолчанию — по ID).
+        """
+        self.manager = manager
+        self.storage = manager.storage
+        self.order = order
+
+    def _task(self, row):
+        """
+        Создать задачу по строке базы.
+
+        :param row: Строка таблицы tasks.
+        :return: Задача, изменения которой записываются в базу.
+        """
+        task = Task.from_stored(*row)
+        task._listener = self.manager._task_changed
+        return task
+
+    def tasks(self, rows):
+        """
+        Создать задачи по строкам базы.
+
+        :param rows: Итерируемый набор строк таблицы tasks.
+        :return: Список задач.
+        """
+        return [self._task(row) for row in rows]
+
+    def __len__(self):
+        return self.storage.count()
+
+    def __iter__(self):
+        for row in self.storage.select(order=self.order):
+            yield self._task(row)
+
+    def __contains__(self, task):
+        return self.get(task.id) is not None
+
+    def __getitem__(self, index):
+        """
+        Получить задачу (или срез задач) по позиции в порядке order.
+
+        :param index: Позиция или срез.
+        :return: Задача или список задач.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            tasks = self.tasks(self.storage.select(order=self.order, limit=max(stop - start, 0), offset=start))
+            return tasks[::step]
+        if index < 0:
+            index += len(self)
+        row = self.storage.select(order=self.order, limit=1, offset=index).fetchone() if index >= 0 else None
+        if row is None:
+            raise IndexError("Индекс задачи вне диапазона.")
+        return self._task(row)
+
+    def get(self, task_id):
+        """
+        Получить задачу по ID.
+
+        :param task_id: Идентификатор задачи.
+        :return: Задача или None, если не найдена.
+        """
+        row = self.storage.select("id = ?", (task_id,)).fetchone()
+        return None if row is None else self._task(row)
+
+    def append(self, task):
+        """
+        Добавить задачу.
+
+        :param task: Задача.
+        :raises ValueError: Если задача с таким ID уже есть.
+        """
+        with self.manager._lock:
+            if task in self:
+                raise ValueError(f"Задача с ID {task.id} уже существует.")
+            self.manager._task_added(task)
+
+    def remove(self, task):
+        """
+        Удалить задачу.
+
+        :param task: Задача.
+        :raises ValueError: Если задачи нет в базе.
+        """
+        with self.manager._lock:
+            if task not in self:
+                raise ValueError(f"Задача с ID {task.id} не найдена.")
+            self.manager._task_removed(task)
+
+    def clear(self):
+        """
+        Удалить все задачи.
+        """
+        with self.manager._lock:
+            task_ids = [row[0] for row in self.storage.connection.execute("SELECT id FROM tasks")]
+            self.manager._tasks_cleared(task_ids)
+
+    def _changed(self, task, old):
+        """
+        Учесть изменение полей задачи. Изменения сразу записываются в базу, поэтому ничего не делает.
+
+        :param task: Измененная задача.
+        :param old: Словарь прежних значений измененных полей.
+        """
+
+
+class SqliteTaskManager(TaskManager):
+    """
+    Менеджер задач, хранящий задачи в SQLite и не загружающий их в память.
+
+    Фильтры по категории, статусу, приоритету и сроку выполняются SQL запросами
+    по индексам базы, а поиск по словам — через FTS5.
+
+    Атрибуты:
+        File_name (str): Имя файла базы.
+        Storage (SqliteStorage): Хранилище задач.
+        Tasks (SqliteTaskList): Коллекция задач.
+    """
+
+    # Транзакция отменяется откатом базы, поэтому добавленные задачи не нужно держать в памяти до ее конца.
+    _undo_changes = False
+
+    def __init__(self, file_name="tasks.db", storage=None, save_delay=0):
+        """
+        Инициализация менеджера задач.
+
+        :param file_name: Имя файла базы.
+        :param storage: Хранилище SqliteStorage. Если None, открывается база file_name.
+        :param save_delay: Задержка отложенной фиксации изменений в секундах (0 — фиксировать сразу).
+        """
+        super().__init__(
+            file_name, storage=storage if storage is not None else SqliteStorage(file_name), save_delay=save_delay,
+        )
+
+    @staticmethod
+    def _create_indexes():
+        """
+        Создать вторичные индексы: их роль выполняют индексы базы.
+
+        :return: Пустой словарь.
+        """
+        return {}
+
+    def load_tasks(self):
+        """
+        Открыть коллекцию задач в базе (задачи не загружаются в память).
+
+        :return: Коллекция задач.
+        """
+        self.next_id = self.storage.next_id
+        return SqliteTaskList(self)
+
+    def _sync(self):
+        """
+        Обновить счетчик ID, если другой процесс зафиксировал изменения. Задачи читаются из базы при каждом запросе.
+
+        :return: True, если были изменения других процессов.
+        """
+        changed = self.storage.changes() is None
+        self.next_id = max(self.next_id, self.storage.next_id)
+        return changed
+
+    def _rollback(self, next_id):
+        """
+        Отменить изменения транзакции. Задачи хранятся только в базе, поэтому достаточно отката базы.
+
+        :param next_id: Значение счетчика ID в начале транзакции.
+        """
+        self.storage.rollback()
+        self.next_id = next_id
+
+    def import_tasks(self, file_name):
+        """
+        Заменить задачи содержимым файла формата tasks.json одной транзакцией.
+
+        :param file_name: Имя файла для импорта.
+        """
+        self.storage.import_records(import_json(file_name))
+        self.next_id = self.storage.next_id
+
+    def export_tasks(self, file_name):
+        """
+        Экспортировать задачи в файл формата tasks.json.
+
+        :param file_name: Имя файла для экспорта.
+        """
+        export_json(self.storage.iter_load(), file_name)
+
+    def _statistics(self):
+        """
+        Получить счетчики задач из таблицы stats базы.
+
+        :return: Экземпляр StatsIndex.
+        """
+        return self.storage.stats()
+
+    def get_categories(self):
+        """
+        Получить список категорий, в которых есть задачи.
+
+        :return: Список категорий.
+        """
+        rows = self.storage.connection.execute("SELECT category FROM tasks GROUP BY category ORDER BY MIN(id)")
+        return [category for category, in rows]
+
+    @timed("filter")
+    def filter_tasks(self, category=None, status=None, priority=None, ignore_case=False):
+        """
+        Найти задачи по категории, статусу и приоритету SQL запросом.
+
+        :param category: Категория задачи.
+        :param status: Статус задачи.
+        :param priority: Приоритет задачи.
+        :param ignore_case: Сравнивать значения без учета регистра.
+        :return: Список подходящих задач.
+        """
+        conditions, params = [], []
+        for field, value in (("category", category), ("status", status), ("priority", priority)):
+            if value is None:
+                continue
+            if ignore_case:
+                rows = self.storage.connection.execute(f"SELECT DISTINCT {field} FROM tasks")
+                values = [key for key, in rows if key.casefold() == value.casefold()]
+            else:
+                values = [value]
+            conditions.append(f"{field} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        return self.tasks.tasks(self.storage.select(" AND ".join(conditions), params))
+
+    def _sorted(self, keys):
+        """
+        Получить задачи в порядке сортировки: коллекцию, читающую из базы только запрошенные задачи.
+
+        :param keys: Ключи сортировки.
+        :return: Коллекция SqliteTaskList с порядком ORDER BY по ключам.
+        :raises ValueError: Если ключ сортировки неизвестен.
+        """
+        return SqliteTaskList(self, sort_order(keys))
+
+    @timed("due")
+    def get_tasks_due_between(self, start, end):
+        """
+        Найти задачи со сроком выполнения в интервале.
+
+        :param start: Начало интервала (гггг-мм-дд или date, включительно).
+        :param end: Конец интервала (гггг-мм-дд или date, включительно).
+        :return: Список задач, упорядоченный по сроку.
+        :raises ValueError: Если граница интервала не является датой.
+        """
+        start, end = format_date(parse_date(start)), format_date(parse_date(end))
+        rows = self.storage.select("due_date != '' AND due_date BETWEEN ? AND ?", (start, end), "due_date, id")
+        return self.tasks.tasks(rows)
+
+    @timed("due")
+    def get_overdue_tasks(self, today=None):
+        """
+        Найти невыполненные задачи с истекшим сроком.
+
+        :param today: Текущая дата (гггг-мм-дд или date). Если None, берется сегодняшняя.
+        :return: Список задач, упорядоченный по сроку.
+        """
+        today = format_date(parse_date(today) or date.today())
+        rows = self.storage.select(
+            "due_date != '' AND due_date < ? AND status != 'Выполнена'", (today,), "due_date, id"
+        )
+        return self.tasks.tasks(rows)
+
+    @timed("due")
+    def get_upcoming_tasks(self, limit=None, today=None, end=None):
+        """
+        Найти ближайшие по сроку невыполненные задачи, срок которых еще не истек.
+
+        :param limit: Максимальное число задач. Если None, возвращаются все.
+        :param today: Текущая дата (гггг-мм-дд или date). Если None, берется сегодняшняя.
+        :param end: Последний день (включительно). Если None, срок не ограничен сверху.
+        :return: Список задач, упорядоченный по сроку.
+        """
+        conditions = ["due_date >= ?", "status != 'Выполнена'"]
+        params = [format_date(parse_date(today) or date.today())]
+        if end:
+            conditions.append("due_date <= ?")
+            params.append(format_date(parse_date(end)))
+        rows = self.storage.select(" AND ".join(conditions), params, "due_date, id", -1 if limit is None else limit)
+        return self.tasks.tasks(rows)
+
+    @timed("search")
+    def search_tasks(self, query, match_all=None):
+        """
+        Найти задачи по словам в названии и описании с помощью FTS5.
+
+        :param query: Текст запроса (слова через OR или ИЛИ — любое из слов).
+        :param match_all: True — все слова (AND), False — любое слово (OR), None — определить по запросу.
+        :return: Список задач, упорядоченный по убыванию релевантности.
+        """
+        query, match_all = self._parse_query(query, match_all)
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        if not self.storage.has_fts:
+            tasks = []
+            for task in self.tasks:
+                words = tokenize(f"{task.title} {task.description}")
+                found = [any(word.startswith(term) for word in words) for term in terms]
+                if all(found) if match_all else any(found):
+                    tasks.append(task)
+            return tasks
+        expression = (" AND " if match_all else " OR ").join(f'"{term}"*' for term in terms)
+        rows = self.storage.connection.execute(
+            "SELECT tasks.id, tasks.title, tasks.description, tasks.category, tasks.due_date, tasks.priority, "
+            "tasks.status FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid "
+            "WHERE tasks_fts MATCH ? ORDER BY bm25(tasks_fts, 2.0, 1.0), tasks.id",
+            (expression,),
+        )
+        return self.tasks.tasks(rows)
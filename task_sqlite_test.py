@@ -0,0 +1,141 @@
+import os
+import tempfile
+import unittest
+from task_manager import TaskManager
+from task_sqlite import SqliteStorage, SqliteTaskManager
+
+
+class TestSqliteTaskManager(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем базу задач во временном каталоге."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.db")
+        self.manager = SqliteTaskManager(file_name=self.file_name)
+        self.manager.add_task("Квартальный отчет", "Собрать цифры", "Работа", "2024-12-01", "Высокий")
+        self.manager.add_task("Купить ёлку", "Отчет не нужен", "Личное", "2024-12-05", "Средний")
+        self.manager.add_task("Позвонить маме", "Про отчет и ёлку", "Личное", "2024-12-10", "Низкий")
+
+    def tearDown(self):
+        """Закрытие базы и удаление временного каталога."""
+        self.manager.close()
+        self.tmp_dir.cleanup()
+
+    def test_changes_survive_reopen(self):
+        """Тест на сохранение изменений, удаления и счетчика ID в базе."""
+        self.manager.get_task_by_id(1).edit(title="Годовой отчет")
+        self.manager.get_task_by_id(2).mark_as_done()
+        self.manager.tasks.remove(self.manager.get_task_by_id(3))
+        self.manager.save_tasks()
+
+        reopened = SqliteTaskManager(file_name=self.file_name)
+        reopened.add_task("Новая задача", "Описание", "Работа", "2024-12-31", "Низкий")
+
+        self.assertEqual([task.title for task in reopened.tasks], ["Годовой отчет", "Купить ёлку", "Новая задача"])
+        self.assertEqual(reopened.get_task_by_id(2).status, "Выполнена")
+        self.assertEqual(reopened.tasks[-1].id, 4)
+        reopened.close()
+
+    def test_statistics(self):
+        """Тест на счетчики задач в таблице stats: изменения, откат транзакции и подсчет в базе без счетчиков."""
+        self.manager.get_task_by_id(1).edit(category="Личное", due_date="2024-11-01")
+        self.manager.get_task_by_id(2).mark_as_done()
+        with self.assertRaises(RuntimeError), self.manager.batch():
+            self.manager.tasks.remove(self.manager.get_task_by_id(3))
+            raise RuntimeError
+        self.manager.add_task("Билеты", "", "Отпуск", "", "Низкий")
+        self.manager.save_tasks()
+        expected = {
+            "total": 4, "done": 1, "open": 3, "overdue": 1, "completion_rate": 0.25,
+            "by_category": {"Личное": 3, "Отпуск": 1},
+            "by_status": {"Не выполнена": 3, "Выполнена": 1},
+            "by_priority": {"Высокий": 1, "Средний": 1, "Низкий": 2},
+        }
+        self.assertEqual(self.manager.get_statistics("2024-12-06"), expected)
+        self.assertEqual(len(self.manager.tasks), 4)
+
+        self.manager.storage.connection.executescript("DELETE FROM stats; DELETE FROM meta WHERE key = 'stats';")
+        reopened = SqliteTaskManager(file_name=self.file_name)
+        self.assertEqual(reopened.get_statistics("2024-12-06"), expected)
+        reopened.close()
+
+    def test_legacy_due_dates(self):
+        """Тест на базу, записанную до проверки сроков: срок в другом формате читается и не перезаписывается."""
+        connection = self.manager.storage.connection
+        connection.execute("UPDATE tasks SET due_date = '31.12.2024' WHERE id = 1")
+        connection.execute("UPDATE tasks SET due_date = 'завтра' WHERE id = 2")
+        self.manager.save_tasks()
+        self.assertEqual(self.manager.get_task_by_id(1).due_date.isoformat(), "2024-12-31")
+        with self.assertLogs("task_manager.load"):
+            self.assertIsNone(self.manager.get_task_by_id(2).due_date)
+        self.manager.get_task_by_id(1).edit(title="Новое название")
+        self.manager.get_task_by_id(3).mark_as_done()
+        self.manager.save_tasks()
+        rows = connection.execute("SELECT due_date FROM tasks WHERE id IN (1, 2) ORDER BY id")
+        self.assertEqual([due_date for due_date, in rows], ["31.12.2024", "завтра"])
+        self.assertEqual(self.manager.get_statistics("2025-01-01")["overdue"], 0)
+
+    def test_queries_run_in_sql(self):
+        """Тест на фильтры, запросы по сроку и поиск по словам."""
+        self.manager.get_task_by_id(1).mark_as_done()
+
+        self.assertEqual(self.manager.get_categories(), ["Работа", "Личное"])
+        self.assertEqual([task.id for task in self.manager.filter_tasks(category="личное", ignore_case=True)], [2, 3])
+        self.assertEqual([task.id for task in self.manager.filter_tasks(status="Выполнена")], [1])
+        self.assertEqual([task.id for task in self.manager.get_overdue_tasks("2024-12-06")], [2])
+        self.assertEqual([task.id for task in self.manager.get_tasks_due_between("2024-12-02", "2024-12-10")], [2, 3])
+        self.assertEqual([task.id for task in self.manager.get_upcoming_tasks(1, "2024-12-01")], [2])
+        self.assertEqual([task.id for task in self.manager.get_tasks_due_this_week("2024-12-02")], [2])
+
+    def test_sort_matches_memory(self):
+        """Тест на совпадение сортировки в SQL с сортировкой задач в памяти."""
+        self.manager.add_task("альфа", "Описание", "личное", "", "высокий")
+        self.manager.get_task_by_id(2).mark_as_done()
+        tasks = list(self.manager.tasks)
+        for keys in (("-priority", "due_date"), ("due_date",), ("-due_date", "title"), ("status", "category")):
+            expected = [task.id for task in self.manager.sort_tasks(keys, tasks)]
+            self.assertEqual([task.id for task in self.manager.sort_tasks(keys)], expected)
+        self.assertEqual([task.id for task in self.manager.search_tasks("ОТЧЁТ")], [1, 2, 3])
+        self.assertEqual([task.id for task in self.manager.search_tasks("отч елк")], [2, 3])
+        self.assertEqual([task.id for task in self.manager.search_tasks("купить OR позвонить")], [2, 3])
+
+    def test_batch_rollback(self):
+        """Тест на откат транзакции в базе."""
+        with self.assertRaises(RuntimeError):
+            with self.manager.batch():
+                self.manager.add_task("Новая задача", "Описание", "Работа", "2024-12-31", "Низкий")
+                self.manager.get_task_by_id(1).edit(title="Годовой отчет")
+                self.manager.tasks.clear()
+                raise RuntimeError("Ошибка в транзакции")
+
+        titles = [task.title for task in self.manager.tasks]
+        self.assertEqual(titles, ["Квартальный отчет", "Купить ёлку", "Позвонить маме"])
+        self.assertEqual(self.manager.next_id, 4)
+
+    def test_json_import_and_export(self):
+        """Тест на импорт и экспорт задач в формате tasks.json."""
+        export_name = os.path.join(self.tmp_dir.name, "export.json")
+        self.manager.export_tasks(export_name)
+
+        other = SqliteTaskManager(file_name=os.path.join(self.tmp_dir.name, "other.db"))
+        other.import_tasks(export_name)
+        in_memory = TaskManager(file_name=export_name)
+
+        self.assertEqual([task.to_dict() for task in other.tasks], [task.to_dict() for task in in_memory.tasks])
+        self.assertEqual(other.next_id, 4)
+        other.close()
+
+    def test_sqlite_storage_for_in_memory_manager(self):
+        """Тест на использование SqliteStorage обычным TaskManager."""
+        self.manager.close()
+        manager = TaskManager(file_name=self.file_name, storage=SqliteStorage(self.file_name))
+        manager.get_task_by_id(3).edit(category="Работа")
+        manager.save_tasks()
+        manager.close()
+
+        self.manager = SqliteTaskManager(file_name=self.file_name)
+        self.assertEqual([task.id for task in self.manager.filter_tasks(category="Работа")], [1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
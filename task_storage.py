@@ -0,0 +1,923 @@
+import itertools
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from task_serializer import get_serializer
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_VALUE_START = re.compile(r"[^\s,]")
+
+FSYNC_POLICIES = ("always", "batched", "never")
+
+
+def iter_snapshot(path, chunk_size=1 << 16):
+    """
+    Прочитать снимок задач потоково, не загружая файл целиком.
+
+    Поддерживаются исходный формат tasks.json (JSON массив) и построчный формат JSONL
+    (по одному JSON объекту на строку). Формат определяется по первому символу файла.
+
+    :param path: Путь к файлу снимка.
+    :param chunk_size: Размер читаемого за раз блока в символах.
+    :return: Генератор словарей задач (пустой, если файла нет).
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as file:
+        buffer = file.read(chunk_size)
+        start = _VALUE_START.search(buffer)
+        if start is None:
+            return
+        if buffer[start.start()] != "[":
+            lines = itertools.chain((buffer + file.readline()).splitlines(), file)
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        decoder = json.JSONDecoder()
+        position = start.start() + 1
+        eof = False
+        while True:
+            match = _VALUE_START.search(buffer, position)
+            if match is not None and buffer[match.start()] == "]":
+                return
+            if match is not None:
+                position = match.start()
+                try:
+                    record, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    if end < len(buffer) or eof:
+                        yield record
+                        position = end
+                        continue
+            elif eof:
+                raise json.JSONDecodeError("Незавершенный массив задач", buffer, position)
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+
+def _read_snapshot(path, serializer=None):
+    """
+    Прочитать снимок задач в формате tasks.json или JSONL.
+
+    :param path: Путь к файлу снимка.
+    :param serializer: Сериализатор (см. task_serializer). Если None, выбирается самый быстрый из установленных.
+    :return: Список словарей задач (пустой, если файла нет).
+    """
+    serializer = serializer or get_serializer()
+    if serializer.streaming or not os.path.exists(path):
+        return list(iter_snapshot(path))
+    with open(path, "rb") as file:
+        return serializer.load_tasks(file.read())
+
+
+def _fsync_file(path):
+    """
+    Сбросить на диск содержимое файла.
+
+    :param path: Путь к файлу.
+    """
+    with open(path, "rb+") as file:
+        os.fsync(file.fileno())
+
+
+def _fsync_directory(path):
+    """
+    Сбросить на диск запись каталога, чтобы переименование файла пережило отключение питания.
+
+    :param path: Путь к файлу в каталоге.
+    """
+    if os.name != "posix":
+        return
+    descriptor = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _write_atomic(path, write, fsync=True):
+    """
+    Атомарно записать файл: во временный файл в том же каталоге, затем переименованием.
+
+    :param path: Путь к файлу.
+    :param write: Функция, записывающая содержимое в файл, открытый на запись в двоичном режиме.
+    :param fsync: Сбросить файл и каталог на диск.
+    """
+    descriptor, tmp_path = tempfile.mkstemp(
+        prefix=f"{os.path.basename(path)}.", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path))
+    )
+    try:
+        with open(descriptor, "wb") as file:
+            write(file)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if fsync:
+        _fsync_directory(path)
+
+
+def _write_snapshot(path, records, fsync=True, serializer=None):
+    """
+    Атомарно записать снимок задач: во временный файл в том же каталоге, затем переименованием.
+
+    Читатель видит либо прежний файл, либо новый целиком. Файлы с расширением .jsonl
+    записываются построчно, остальные — в формате tasks.json.
+
+    :param path: Путь к файлу снимка.
+    :param records: Итерируемый набор задач или словарей задач.
+    :param fsync: Сбросить файл и каталог на диск, чтобы снимок пережил отключение питания.
+    :param serializer: Сериализатор. Если None, выбирается самый быстрый из установленных.
+    """
+    serializer = serializer or get_serializer()
+    _write_atomic(path, lambda file: serializer.write_tasks(file, records, path.endswith(".jsonl")), fsync)
+
+
+def _read_journal(path, repair=False, offset=0, serializer=None):
+    """
+    Прочитать записи журнала.
+
+    Недописанная последняя строка (обрыв записи при сбое) игнорируется. Записи batch,
+    объединяющие изменения одного сохранения, разворачиваются в отдельные записи.
+
+    :param path: Путь к файлу журнала.
+    :param repair: Обрезать файл после последней целой строки, чтобы новые записи не дописывались к обрывку.
+    :param offset: Позиция в байтах, с которой начинается чтение.
+    :param serializer: Сериализатор. Если None, выбирается самый быстрый из установленных.
+    :return: Пара (список записей журнала, позиция после последней целой строки).
+    """
+    if not os.path.exists(path):
+        return [], 0
+    loads = (serializer or get_serializer()).loads
+    records = []
+    valid_size = offset
+    with open(path, "rb") as file:
+        file.seek(offset)
+        for line in file:
+            try:
+                record = loads(line)
+            except ValueError:
+                break
+            if not line.endswith(b"\n"):
+                break
+            valid_size += len(line)
+            if record["op"] == "batch":
+                records.extend(record["records"])
+            else:
+                records.append(record)
+    if repair and valid_size < os.path.getsize(path):
+        with open(path, "r+b") as file:
+            file.truncate(valid_size)
+    return records, valid_size
+
+
+def _file_key(path):
+    """
+    Получить идентичность файла: номер inode, размер и время изменения.
+
+    Файлы заменяются переименованием, поэтому новая версия файла получает новый inode.
+
+    :param path: Путь к файлу.
+    :return: Тройка (inode, размер, время изменения) или None, если файла нет.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class FileLock:
+    """
+    Рекомендательная блокировка файла задач между процессами.
+
+    Разделяемую блокировку (чтение) могут держать несколько процессов одновременно,
+    исключительную (запись) — только один. Внутри процесса блокировка реентерабельна:
+    вложенные захваты только увеличивают счетчик, а разделяемая блокировка на время
+    вложенного исключительного захвата повышается. Потоки одного процесса захватывают
+    блокировку по очереди. На Windows любая блокировка исключительная.
+
+    Атрибуты:
+        Path (str): Имя файла блокировки.
+    """
+
+    def __init__(self, path):
+        """
+        Инициализация блокировки.
+
+        :param path: Имя файла блокировки.
+        """
+        self.path = path
+        self._mutex = threading.RLock()
+        self._file = None
+        self._depth = 0
+        self._shared = False
+
+    def _acquire(self, shared):
+        """
+        Захватить блокировку файла, дождавшись ее освобождения другими процессами.
+
+        :param shared: Захватить разделяемую блокировку.
+        """
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _release(self):
+        """
+        Освободить блокировку файла.
+        """
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @contextmanager
+    def __call__(self, shared=False):
+        """
+        Удерживать блокировку внутри блока with.
+
+        :param shared: Разделяемая блокировка для чтения вместо исключительной.
+        :return: Контекстный менеджер.
+        """
+        with self._mutex:
+            upgrade = fcntl is not None and self._depth > 0 and self._shared and not shared
+            if self._depth == 0:
+                self._file = open(self.path, "a+b")
+                self._acquire(shared)
+                self._shared = shared
+            elif upgrade:
+                self._acquire(False)
+                self._shared = False
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._release()
+                    self._file.close()
+                    self._file = None
+                elif upgrade:
+                    self._acquire(True)
+                    self._shared = True
+
+
+class FsyncPolicy:
+    """
+    Политика сброса записанных данных на диск (fsync).
+
+    always — после каждого сохранения; batched — не чаще раза в interval секунд
+    и при закрытии хранилища; never — никогда (данные переживают аварийное завершение
+    процесса, но не отключение питания).
+
+    Атрибуты:
+        Policy (str): Название политики.
+        Interval (float): Минимальный интервал между fsync для политики batched.
+    """
+
+    def __init__(self, policy="always", interval=1.0):
+        """
+        Инициализация политики.
+
+        :param policy: Название политики (always, batched, never).
+        :param interval: Минимальный интервал между fsync в секундах для политики batched.
+        :raises ValueError: Если политика неизвестна.
+        """
+        if policy not in FSYNC_POLICIES:
+            raise ValueError(f"Неизвестная политика fsync: {policy}. Допустимые: {', '.join(FSYNC_POLICIES)}.")
+        self.policy = policy
+        self.interval = interval
+        self._last_sync = time.monotonic()
+
+    def due(self):
+        """
+        Проверить, нужно ли выполнить fsync после текущей записи.
+
+        :return: True, если нужно.
+        """
+        if self.policy != "batched":
+            return self.policy == "always"
+        now = time.monotonic()
+        if now - self._last_sync < self.interval:
+            return False
+        self._last_sync = now
+        return True
+
+
+def file_fingerprint(*paths):
+    """
+    Получить отпечаток файлов по их размеру и времени изменения.
+
+    :param paths: Пути к файлам.
+    :return: Список пар [размер, время изменения] (None для отсутствующих файлов).
+    """
+    result = []
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            result.append([stat.st_size, stat.st_mtime_ns])
+        else:
+            result.append(None)
+    return result
+
+
+def replay(tasks, records, next_id=1):
+    """
+    Применить записи журнала к словарю задач.
+
+    Все операции записывают абсолютные значения, поэтому повторное применение
+    того же журнала не меняет результат.
+
+    :param tasks: Словарь {id: словарь задачи}, изменяется на месте.
+    :param records: Записи журнала.
+    :param next_id: Значение счетчика ID до применения журнала.
+    :return: Значение счетчика ID после применения журнала.
+    """
+    for record in records:
+        match record["op"]:
+            case "meta":
+                next_id = max(next_id, record["next_id"])
+            case "add":
+                tasks[record["task"]["id"]] = dict(record["task"])
+                next_id = max(next_id, record["task"]["id"] + 1)
+            case "edit":
+                if record["id"] in tasks:
+                    tasks[record["id"]].update(record["fields"])
+            case "mark_done":
+                if record["id"] in tasks:
+                    tasks[record["id"]]["status"] = "Выполнена"
+            case "delete":
+                tasks.pop(record["id"], None)
+            case "clear":
+                tasks.clear()
+                next_id = 1
+    return next_id
+
+
+def renumber(records, next_id):
+    """
+    Выдать новые ID задачам, добавленным записями, если их ID уже мог занять другой процесс.
+
+    Задача получает новый ID, если ее ID меньше next_id — счетчика ID в данных другого
+    процесса. Ссылки на прежний ID в последующих записях (edit, mark_done, delete)
+    заменяются тоже. Записи после clear не меняются: очистка удаляет и чужие задачи.
+
+    :param records: Записи журнала, изменяются на месте.
+    :param next_id: Счетчик ID в данных другого процесса.
+    :return: Пара (словарь {прежний ID: новый ID}, следующий свободный ID).
+    """
+    added = [record["task"]["id"] for record in records if record["op"] == "add"]
+    free_id = max([next_id, *(task_id + 1 for task_id in added)])
+    mapping = {}
+    for record in records:
+        if record["op"] == "clear":
+            break
+        if record["op"] == "add" and record["task"]["id"] < next_id:
+            mapping[record["task"]["id"]] = free_id
+            record["task"] = {**record["task"], "id": free_id}
+            free_id += 1
+        elif record.get("id") in mapping:
+            record["id"] = mapping[record["id"]]
+    return mapping, free_id
+
+
+def coalesce(records):
+    """
+    Объединить записи журнала: для каждой задачи остается не больше одной записи add или edit.
+
+    Изменения полей задачи сливаются в ее запись add или в одну запись edit, запись add
+    заменяет предыдущие записи задачи, задача, добавленная и удаленная в тех же записях,
+    не упоминается вовсе, а записи до clear отбрасываются. Результат replay() от объединенных
+    записей совпадает с результатом от исходных. Исходные записи не изменяются.
+
+    :param records: Записи журнала без meta и batch.
+    :return: Список объединенных записей.
+    """
+    result = []
+    latest = {}
+    for record in records:
+        match record["op"]:
+            case "clear":
+                result, latest = [record], {}
+                continue
+            case "add":
+                target = latest.get(record["task"]["id"])
+                if target is not None:
+                    target["op"] = None
+                record = latest[record["task"]["id"]] = {"op": "add", "task": dict(record["task"])}
+            case "edit" | "mark_done":
+                fields = record["fields"] if record["op"] == "edit" else {"status": "Выполнена"}
+                target = latest.get(record["id"])
+                if target is not None:
+                    target["task" if target["op"] == "add" else "fields"].update(fields)
+                    continue
+                record = latest[record["id"]] = {"op": "edit", "id": record["id"], "fields": dict(fields)}
+            case "delete":
+                target = latest.pop(record["id"], None)
+                if target is not None:
+                    op, target["op"] = target["op"], None
+                    if op == "add":
+                        continue
+        result.append(record)
+    return [record for record in result if record["op"] is not None]
+
+
+def _record_id(record):
+    """
+    Получить ID задачи, к которой относится запись журнала.
+
+    :param record: Запись журнала.
+    :return: ID задачи или None для записей meta и clear.
+    """
+    if record["op"] == "add":
+        return record["task"]["id"]
+    return record.get("id")
+
+
+def _snapshot_next_id(tasks):
+    """
+    Вычислить счетчик ID по содержимому снимка.
+
+    :param tasks: Словарь {id: словарь задачи}.
+    :return: Следующий свободный ID.
+    """
+    return max(tasks, default=0) + 1
+
+
+class JsonStorage:
+    """
+    Хранилище задач в одном JSON файле (исходный формат tasks.json).
+
+    Каждое сохранение полностью перезаписывает файл через временный файл и переименование.
+    Формат файла не хранит счетчик ID, поэтому после загрузки он равен максимальному ID плюс один.
+    Изменения с прошлого сохранения накапливаются, чтобы их можно было повторно применить,
+    если файл за это время перезаписал другой процесс.
+
+    Атрибуты:
+        File_name (str): Имя файла для хранения задач.
+        Next_id (int): Счетчик ID, восстановленный при загрузке.
+        Fsync (FsyncPolicy): Политика сброса файла на диск.
+        Pending (list): Изменения с прошлого сохранения.
+        Lock (FileLock): Блокировка файла между процессами.
+        Serializer (JsonSerializer): Сериализатор файла задач.
+    """
+
+    def __init__(self, file_name, fsync="always", serializer=None):
+        """
+        Инициализация хранилища.
+
+        :param file_name: Имя файла для хранения задач.
+        :param fsync: Политика fsync (always, batched, never).
+        :param serializer: Сериализатор (см. task_serializer.get_serializer). Если None, выбирается
+            самый быстрый из установленных, формат файла — с отступами.
+        """
+        self.file_name = file_name
+        self.serializer = serializer or get_serializer()
+        self.next_id = 1
+        self.fsync = FsyncPolicy(fsync)
+        self._unsynced = False
+        self.pending = []
+        self._savepoint = 0
+        self.lock = FileLock(f"{file_name}.lock")
+        self._seen = None
+
+    def load(self):
+        """
+        Загрузить задачи из файла целиком: ускоренная библиотека сериализации разбирает файл одним вызовом.
+
+        :return: Список словарей задач.
+        """
+        self._seen = _file_key(self.file_name)
+        tasks = _read_snapshot(self.file_name, self.serializer)
+        self.next_id = max((task["id"] for task in tasks), default=0) + 1
+        return tasks
+
+    def iter_load(self):
+        """
+        Загружать задачи из файла по одной, читая его потоково при любом сериализаторе. Счетчик ID
+        известен после завершения обхода.
+
+        :return: Генератор словарей задач.
+        """
+        self._seen = _file_key(self.file_name)
+        next_id = 1
+        for task in iter_snapshot(self.file_name):
+            next_id = max(next_id, task["id"] + 1)
+            yield task
+        self.next_id = next_id
+
+    def record(self, op, **data):
+        """
+        Зарегистрировать изменение. Файл перезаписывается целиком при сохранении.
+
+        :param op: Тип операции (add, edit, mark_done, delete, clear).
+        :param data: Данные операции.
+        """
+        self.pending.append({"op": op, **data})
+
+    def begin(self):
+        """
+        Начать транзакцию: запомнить, сколько изменений накоплено.
+        """
+        self._savepoint = len(self.pending)
+
+    def rollback(self):
+        """
+        Отменить изменения, зарегистрированные после begin(). Файл до сохранения не менялся.
+        """
+        del self.pending[self._savepoint:]
+
+    def changes(self):
+        """
+        Проверить, не перезаписал ли файл другой процесс после последней загрузки или сохранения.
+
+        :return: Пустой список, если файл не менялся, или None, если задачи нужно загрузить заново.
+        """
+        return [] if _file_key(self.file_name) == self._seen else None
+
+    def save(self, tasks):
+        """
+        Сохранить задачи в файл через временный файл, чтобы при сбое остался прежний файл целиком.
+
+        Задачи сериализуются напрямую из объектов, без промежуточного списка словарей.
+
+        :param tasks: Список задач.
+        """
+        fsync = self.fsync.due()
+        _write_snapshot(self.file_name, tasks, fsync, self.serializer)
+        self._unsynced = not fsync
+        self.pending.clear()
+        self._seen = _file_key(self.file_name)
+
+    def fingerprint(self):
+        """
+        Получить отпечаток сохраненных данных.
+
+        :return: Значение, которое меняется при каждом сохранении.
+        """
+        return file_fingerprint(self.file_name)
+
+    def close(self):
+        """
+        Сбросить на диск последнее сохранение, если политика fsync его отложила.
+        """
+        if self._unsynced and self.fsync.policy != "never" and os.path.exists(self.file_name):
+            _fsync_file(self.file_name)
+            _fsync_directory(self.file_name)
+        self._unsynced = False
+
+
+class JournalStorage:
+    """
+    Хранилище задач со снимком и журналом упреждающей записи.
+
+    Снимок хранится в исходном формате tasks.json, а изменения дописываются
+    в журнал <file_name>.journal по одной JSON записи на строку. Если с прошлого
+    сохранения накопилось несколько изменений, они записываются одной строкой batch:
+    при сбое во время записи строка отбрасывается целиком. Когда журнал
+    становится длиннее compact_every записей, он запечатывается в <file_name>.journal.1
+    и в фоновом потоке сливается со снимком. Новый журнал начинается с записи meta
+    со счетчиком ID, поэтому ID удаленных задач не выдаются повторно.
+
+    Несколько процессов могут работать с одними файлами: запись в журнал и его
+    запечатывание выполняются под исключительной блокировкой, а changes() читает
+    только записи, которые другие процессы дописали после последнего чтения.
+
+    Атрибуты:
+        File_name (str): Имя файла снимка.
+        Journal_name (str): Имя файла журнала.
+        Compact_every (int): Размер журнала, после которого запускается уплотнение.
+        Next_id (int): Счетчик ID на момент последней загрузки или сохранения.
+        Fsync (FsyncPolicy): Политика сброса журнала на диск.
+        Pending (list): Изменения, еще не записанные в журнал.
+        Lock (FileLock): Блокировка файлов между процессами.
+        Serializer (JsonSerializer): Сериализатор снимка и записей журнала.
+    """
+
+    _compactions = {}
+    _compactions_lock = threading.Lock()
+
+    def __init__(self, file_name, compact_every=10000, fsync="always", serializer=None):
+        """
+        Инициализация хранилища.
+
+        :param file_name: Имя файла снимка.
+        :param compact_every: Число записей журнала, после которого запускается уплотнение.
+        :param fsync: Политика fsync журнала (always, batched, never). Снимок при уплотнении
+            сбрасывается на диск при любой политике, кроме never.
+        :param serializer: Сериализатор (см. task_serializer.get_serializer). Если None, выбирается
+            самый быстрый из установленных, формат снимка — с отступами.
+        """
+        self.file_name = file_name
+        self.serializer = serializer or get_serializer()
+        self.journal_name = f"{file_name}.journal"
+        self.sealed_name = f"{file_name}.journal.1"
+        self.compact_every = compact_every
+        self.pending = []
+        self.journal_size = 0
+        self.next_id = 1
+        self._savepoint = (0, 1)
+        self.fsync = FsyncPolicy(fsync)
+        self._unsynced = False
+        self.lock = FileLock(f"{file_name}.lock")
+        self._snapshot_seen = None
+        self._position = None
+
+    def load(self):
+        """
+        Загрузить задачи: снимок плюс запечатанный и текущий журналы.
+
+        :return: Список словарей задач.
+        """
+        return list(self.iter_load())
+
+    def iter_load(self):
+        """
+        Загружать задачи по одной, читая снимок потоково.
+
+        Журналы читаются заранее под разделяемой блокировкой, чтобы другой процесс не запечатал
+        журнал между их чтением. Задачи снимка, которых журнал не касается, отдаются сразу;
+        к остальным применяются их записи журнала. Задачи, добавленные журналом (или удаленные
+        и добавленные заново), отдаются в конце. Счетчик ID известен после завершения обхода.
+
+        :return: Генератор словарей задач.
+        """
+        with self.lock(shared=True):
+            records = self._read_journals()
+
+        cleared_at = max((i for i, record in enumerate(records) if record["op"] == "clear"), default=None)
+        if cleared_at is not None:
+            tasks = {}
+            self.next_id = replay(tasks, records[cleared_at:])
+            yield from tasks.values()
+            return
+
+        by_id = {}
+        for record in records:
+            task_id = _record_id(record)
+            if task_id is not None:
+                by_id.setdefault(task_id, []).append(record)
+        next_id = 1
+        tail_ids = set(by_id)
+        for task in self.read_snapshot():
+            next_id = max(next_id, task["id"] + 1)
+            task_records = by_id.get(task["id"])
+            if task_records is None:
+                yield task
+                continue
+            if any(record["op"] == "delete" for record in task_records):
+                continue
+            tail_ids.discard(task["id"])
+            tasks = {task["id"]: task}
+            replay(tasks, task_records)
+            yield tasks[task["id"]]
+
+        tail = {}
+        replay(tail, (record for record in records if _record_id(record) in tail_ids))
+        self.next_id = replay({}, records, next_id)
+        yield from tail.values()
+
+    def _read_journals(self):
+        """
+        Прочитать запечатанный и текущий журналы и запомнить, до какого места они прочитаны.
+
+        Вызывается под разделяемой блокировкой, чтобы другой процесс не запечатал журнал между их чтением.
+
+        :return: Записи обоих журналов по порядку.
+        """
+        sealed, _ = _read_journal(self.sealed_name, serializer=self.serializer)
+        journal, end = _read_journal(self.journal_name, repair=True, serializer=self.serializer)
+        self._snapshot_seen = _file_key(self.file_name)
+        journal_key = _file_key(self.journal_name)
+        self._position = (journal_key and journal_key[0], end)
+        self.journal_size = len(journal)
+        return sealed + journal
+
+    def read_snapshot(self):
+        """
+        Читать задачи снимка по одной, без записей журнала.
+
+        :return: Итератор словарей задач (пустой, если снимка нет).
+        """
+        return iter_snapshot(self.file_name)
+
+    def write_snapshot(self, records, fsync=True):
+        """
+        Атомарно записать снимок задач.
+
+        :param records: Итерируемый набор задач или словарей задач.
+        :param fsync: Сбросить файл и каталог на диск.
+        """
+        _write_snapshot(self.file_name, records, fsync, self.serializer)
+
+    def record(self, op, **data):
+        """
+        Зарегистрировать изменение. Запись попадет в журнал при следующем сохранении.
+
+        :param op: Тип операции (add, edit, mark_done, delete, clear).
+        :param data: Данные операции.
+        """
+        self.pending.append({"op": op, **data})
+        if op == "add":
+            self.next_id = max(self.next_id, data["task"]["id"] + 1)
+        elif op == "clear":
+            self.next_id = 1
+
+    def begin(self):
+        """
+        Начать транзакцию: запомнить, сколько изменений накоплено и значение счетчика ID.
+        """
+        self._savepoint = (len(self.pending), self.next_id)
+
+    def rollback(self):
+        """
+        Отменить изменения, зарегистрированные после begin().
+        """
+        size, self.next_id = self._savepoint
+        del self.pending[size:]
+
+    def changes(self):
+        """
+        Прочитать записи, которые другие процессы дописали в журнал после последнего чтения или сохранения.
+
+        Вызывается под блокировкой. Если другой процесс успел запечатать журнал, дочитывается
+        запечатанный журнал и читается новый. Если снимок был перезаписан уплотнением,
+        отдельные записи восстановить нельзя, и задачи нужно загрузить заново.
+
+        :return: Список записей журнала или None, если задачи нужно загрузить заново.
+        """
+        if self._position is None or _file_key(self.file_name) != self._snapshot_seen:
+            return None
+        inode, offset = self._position
+        journal = _file_key(self.journal_name)
+        if journal is not None and journal[0] == inode:
+            if journal[1] == offset:
+                return []
+            records, end = _read_journal(self.journal_name, repair=True, offset=offset, serializer=self.serializer)
+            self.journal_size += len(records)
+        else:
+            sealed = _file_key(self.sealed_name)
+            if inode is not None and (sealed is None or sealed[0] != inode):
+                return None
+            records, _ = _read_journal(
+                self.sealed_name, offset=offset if inode is not None else 0, serializer=self.serializer
+            )
+            current, end = _read_journal(self.journal_name, repair=True, serializer=self.serializer)
+            records.extend(current)
+            self.journal_size = len(current)
+            inode = journal and journal[0]
+        self._position = (inode, end)
+        self.next_id = replay({}, records, self.next_id)
+        return records
+
+    def save(self, tasks):
+        """
+        Дописать накопленные изменения в журнал одной строкой.
+
+        Изменения объединяются (см. coalesce): задача, измененная с прошлого сохранения
+        несколько раз, записывается один раз с итоговыми значениями полей.
+
+        :param tasks: Коллекция задач (не используется: изменения уже накоплены).
+        """
+        records = coalesce(self.pending)
+        if not records:
+            self.pending.clear()
+            return
+        record = records[0] if len(records) == 1 else {"op": "batch", "records": records}
+        with self.lock(), open(self.journal_name, "ab") as file:
+            file.write(self.serializer.dumps(record) + b"\n")
+            if self.fsync.due():
+                file.flush()
+                os.fsync(file.fileno())
+                self._unsynced = False
+            else:
+                self._unsynced = True
+            self._position = (os.fstat(file.fileno()).st_ino, file.tell())
+        self.journal_size += len(records)
+        self.pending.clear()
+        if self.journal_size >= self.compact_every:
+            self.compact()
+
+    def compact(self, wait=False):
+        """
+        Запечатать журнал и слить его со снимком в фоновом потоке.
+
+        Если остался запечатанный журнал от прерванного или еще идущего уплотнения,
+        он сначала сливается со снимком в текущем потоке.
+
+        :param wait: Дождаться завершения уплотнения.
+        """
+        with self.lock():
+            if os.path.exists(self.sealed_name):
+                self._merge_sealed(_file_key(self.sealed_name))
+            if os.path.exists(self.journal_name):
+                os.replace(self.journal_name, self.sealed_name)
+            with open(self.journal_name, "wb") as file:
+                file.write(self.serializer.dumps({"op": "meta", "next_id": self.next_id}) + b"\n")
+                if self.fsync.policy != "never":
+                    file.flush()
+                    os.fsync(file.fileno())
+                self._position = (os.fstat(file.fileno()).st_ino, file.tell())
+            if self.fsync.policy != "never":
+                _fsync_directory(self.journal_name)
+            self.journal_size = 1
+            sealed = _file_key(self.sealed_name)
+        thread = threading.Thread(target=self._merge_sealed, args=(sealed,), daemon=True)
+        with self._compactions_lock:
+            self._compactions[os.path.abspath(self.file_name)] = thread
+        thread.start()
+        if wait:
+            thread.join()
+
+    def _merge_sealed(self, sealed):
+        """
+        Применить запечатанный журнал к снимку и удалить его.
+
+        Новый снимок строится без блокировки, а заменяет прежний под исключительной блокировкой
+        и только если запечатанный журнал не изменился, то есть его не слил другой процесс.
+
+        :param sealed: Идентичность запечатанного журнала (см. _file_key), который нужно слить.
+        """
+        tasks = {task["id"]: task for task in self.read_snapshot()}
+        replay(tasks, _read_journal(self.sealed_name, serializer=self.serializer)[0], _snapshot_next_id(tasks))
+        with self.lock():
+            if _file_key(self.sealed_name) != sealed:
+                return
+            current = _file_key(self.file_name) == self._snapshot_seen
+            self.write_snapshot(tasks.values(), self.fsync.policy != "never")
+            os.remove(self.sealed_name)
+            if current:
+                self._snapshot_seen = _file_key(self.file_name)
+
+    def wait_for_compaction(self):
+        """
+        Дождаться завершения фонового уплотнения этого файла, если оно идет.
+        """
+        with self._compactions_lock:
+            thread = self._compactions.pop(os.path.abspath(self.file_name), None)
+        if thread is not None:
+            thread.join()
+
+    def fingerprint(self):
+        """
+        Получить отпечаток сохраненных данных.
+
+        :return: Значение, которое меняется при каждом сохранении.
+        """
+        return file_fingerprint(self.file_name, self.sealed_name, self.journal_name)
+
+    def close(self):
+        """
+        Сохранить накопленные изменения, сбросить журнал на диск и дождаться уплотнения.
+        """
+        self.save(None)
+        if self._unsynced and self.fsync.policy != "never" and os.path.exists(self.journal_name):
+            _fsync_file(self.journal_name)
+        self._unsynced = False
+        self.wait_for_compaction()
+
+
+def export_json(records, file_name, serializer=None):
+    """
+    Экспортировать задачи в файл формата tasks.json.
+
+    :param records: Итерируемый набор задач или словарей задач.
+    :param file_name: Имя файла для экспорта.
+    :param serializer: Сериализатор. Если None, выбирается самый быстрый из установленных.
+    """
+    _write_snapshot(file_name, records, serializer=serializer)
+
+
+def import_json(file_name, serializer=None):
+    """
+    Импортировать задачи из файла формата tasks.json.
+
+    :param file_name: Имя файла для импорта.
+    :param serializer: Сериализатор. Если None, выбирается самый быстрый из установленных.
+    :return: Список словарей задач.
+    """
+    return _read_snapshot(file_name, serializer)
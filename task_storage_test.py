@@ -0,0 +1,528 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from task_manager import TaskManager
+from task_storage import JournalStorage, JsonStorage, coalesce, import_json, iter_snapshot, replay
+
+
+class TestJournalStorage(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем временный каталог для файлов задач."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def test_changes_are_appended_to_journal(self):
+        """Тест на то, что изменения дописываются в журнал, а снимок не перезаписывается."""
+        manager = TaskManager(file_name=self.file_name)
+        manager.add_task("Task 1", "Description", "Category1", "2024-12-31", "Средний")
+        manager.add_task("Task 2", "Description", "Category2", "2024-12-31", "Низкий")
+
+        self.assertFalse(os.path.exists(self.file_name))
+        with open(f"{self.file_name}.journal", encoding="utf-8") as file:
+            self.assertEqual(len(file.readlines()), 2)
+
+    def test_reload_replays_journal(self):
+        """Тест на восстановление состояния из журнала при загрузке."""
+        manager = TaskManager(file_name=self.file_name)
+        manager.add_task("Task 1", "Description", "Category1", "2024-12-31", "Средний")
+        manager.add_task("Task 2", "Description", "Category2", "2024-12-31", "Низкий")
+        manager.get_task_by_id(1).edit(title="Updated Task")
+        manager.get_task_by_id(1).mark_as_done()
+        manager.tasks.remove(manager.get_task_by_id(2))
+        manager.save_tasks()
+
+        new_manager = TaskManager(file_name=self.file_name)
+
+        self.assertEqual(len(new_manager.tasks), 1)
+        self.assertEqual(new_manager.tasks[0].title, "Updated Task")
+        self.assertEqual(new_manager.tasks[0].status, "Выполнена")
+
+    def test_id_counter_survives_delete_and_reload(self):
+        """Тест на то, что ID удаленной задачи не выдается повторно после перезагрузки и уплотнения."""
+        manager = TaskManager(file_name=self.file_name, storage=JournalStorage(self.file_name, compact_every=2))
+        manager.add_task("Task 1", "Description", "Category1", "2024-12-31", "Средний")
+        manager.add_task("Task 2", "Description", "Category1", "2024-12-31", "Средний")
+        manager.tasks.remove(manager.get_task_by_id(2))
+        manager.save_tasks()
+        manager.storage.close()
+
+        new_manager = TaskManager(file_name=self.file_name)
+        new_manager.add_task("Task 3", "Description", "Category1", "2024-12-31", "Средний")
+
+        self.assertIsNone(new_manager.get_task_by_id(2))
+        self.assertEqual(new_manager.get_task_by_id(3).title, "Task 3")
+
+    def test_compaction_merges_journal_into_snapshot(self):
+        """Тест на уплотнение журнала в снимок."""
+        manager = TaskManager(file_name=self.file_name, storage=JournalStorage(self.file_name, compact_every=3))
+        for number in range(4):
+            manager.add_task(f"Task {number}", "Description", "Category1", "2024-12-31", "Средний")
+        manager.storage.close()
+
+        self.assertEqual(len(import_json(self.file_name)), 3)
+        self.assertEqual(len(TaskManager(file_name=self.file_name).tasks), 4)
+
+    def test_export_and_import(self):
+        """Тест на экспорт и импорт задач в формате tasks.json."""
+        manager = TaskManager(file_name=self.file_name)
+        manager.add_task("Task 1", "Description", "Category1", "2024-12-31", "Средний")
+        export_name = os.path.join(self.tmp_dir.name, "export.json")
+        manager.export_tasks(export_name)
+
+        legacy = TaskManager(file_name=export_name, storage=JsonStorage(export_name))
+        other = TaskManager(file_name=os.path.join(self.tmp_dir.name, "other.json"))
+        other.import_tasks(export_name)
+
+        self.assertEqual(legacy.tasks[0].title, "Task 1")
+        self.assertEqual([task.to_dict() for task in other.tasks], [task.to_dict() for task in manager.tasks])
+
+
+class TestStreamingLoad(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем временный каталог и набор задач."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.records = [
+            {"id": task_id, "title": f"Задача {task_id}", "description": "Описание, с [скобками] и {фигурными}",
+             "category": "Работа", "due_date": "2024-12-01", "priority": "Высокий", "status": "Не выполнена"}
+            for task_id in range(1, 51)
+        ]
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def test_iter_snapshot_formats(self):
+        """Тест на потоковое чтение JSON массива и JSONL при маленьком размере блока."""
+        for name in ("tasks.json", "tasks.jsonl"):
+            file_name = os.path.join(self.tmp_dir.name, name)
+            manager = TaskManager(file_name=file_name, storage=JsonStorage(file_name))
+            manager.import_tasks(self._write_export())
+
+            self.assertEqual(list(iter_snapshot(file_name, chunk_size=7)), self.records)
+
+    def test_journal_iter_load_matches_replay(self):
+        """Тест на то, что потоковая загрузка журнала дает то же, что полное применение журнала."""
+        file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        manager = TaskManager(file_name=file_name, storage=JournalStorage(file_name, compact_every=60))
+        manager.import_tasks(self._write_export())
+        manager.get_task_by_id(3).edit(title="Updated Task")
+        manager.tasks.remove(manager.get_task_by_id(5))
+        manager.add_task("New Task", "Description", "Личное", "2024-12-31", "Низкий")
+        manager.get_task_by_id(7).mark_as_done()
+        manager.storage.close()
+
+        expected = {record["id"]: dict(record) for record in self.records}
+        replay(expected, [
+            {"op": "edit", "id": 3, "fields": {"title": "Updated Task"}},
+            {"op": "delete", "id": 5},
+            {"op": "add", "task": manager.get_task_by_id(51).to_dict()},
+            {"op": "mark_done", "id": 7},
+        ])
+        self.assertEqual(JournalStorage(file_name).load(), list(expected.values()))
+
+    def test_background_load(self):
+        """Тест на фоновую загрузку: первая страница доступна сразу, остальные задачи — после ожидания."""
+        file_name = self._write_export()
+        manager = TaskManager(file_name=file_name, storage=JsonStorage(file_name), background_load=True)
+
+        self.assertEqual([task.id for task in manager.first_page], list(range(1, manager.first_page_size + 1)))
+        self.assertEqual(len(manager.tasks), 50)
+        self.assertFalse(manager.is_loading())
+        self.assertEqual(manager.next_id, 51)
+
+    def _write_export(self):
+        """Записать набор задач в файл формата tasks.json и вернуть его имя."""
+        file_name = os.path.join(self.tmp_dir.name, "export.json")
+        with open(file_name, "w", encoding="utf-8") as file:
+            json.dump(self.records, file, ensure_ascii=False, indent=4)
+        return file_name
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем менеджер задач с двумя сохраненными задачами."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        self.journal_name = f"{self.file_name}.journal"
+        self.manager = TaskManager(file_name=self.file_name)
+        self.manager.add_task("Отчет", "Description", "Работа", "2024-12-01", "Высокий")
+        self.manager.add_task("Покупки", "Description", "Личное", "2024-12-05", "Средний")
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def _journal_lines(self):
+        """Прочитать строки журнала."""
+        with open(self.journal_name, encoding="utf-8") as file:
+            return file.readlines()
+
+    def _state(self, manager):
+        """Получить задачи, счетчик ID и результаты запросов по индексам."""
+        return (
+            [task.to_dict() for task in manager.tasks],
+            manager.next_id,
+            [task.id for task in manager.filter_tasks(category="Работа")],
+            [task.id for task in manager.get_overdue_tasks("2024-12-31")],
+            [task.id for task in manager.search_tasks("отчет")],
+        )
+
+    def test_batch_is_saved_as_one_record(self):
+        """Тест на сохранение всех изменений транзакции одной записью журнала."""
+        with self.manager.batch():
+            for number in range(3):
+                self.manager.add_task(f"Task {number}", "Description", "Работа", "2024-12-31", "Низкий")
+            self.manager.get_task_by_id(1).mark_as_done()
+            self.manager.tasks.remove(self.manager.get_task_by_id(2))
+            self.assertEqual(len(self._journal_lines()), 2)
+
+        self.assertEqual(len(self._journal_lines()), 3)
+        self.assertEqual(self._state(TaskManager(file_name=self.file_name)), self._state(self.manager))
+
+    def test_rollback_restores_tasks_indexes_and_journal(self):
+        """Тест на откат добавлений, изменений и удалений при исключении."""
+        expected = self._state(self.manager)
+        for clear in (False, True):
+            with self.assertRaises(RuntimeError):
+                with self.manager.batch():
+                    self.manager.add_task("Новый отчет", "Description", "Работа", "2024-11-01", "Низкий")
+                    self.manager.get_task_by_id(1).edit(title="План", category="Личное")
+                    self.manager.get_task_by_id(2).mark_as_done()
+                    if clear:
+                        self.manager.tasks.remove(self.manager.get_task_by_id(1))
+                        self.manager.tasks.clear()
+                    raise RuntimeError("Ошибка в транзакции")
+
+            self.assertEqual(self._state(self.manager), expected)
+        self.manager.add_task("Task 3", "Description", "Работа", "2024-12-31", "Низкий")
+
+        self.assertEqual(len(self._journal_lines()), 3)
+        self.assertEqual(self._state(TaskManager(file_name=self.file_name)), self._state(self.manager))
+
+    def test_save_delay_coalesces_saves(self):
+        """Тест на объединение частых сохранений при отложенной записи."""
+        manager = TaskManager(file_name=self.file_name, save_delay=0.05)
+        for number in range(3):
+            manager.add_task(f"Task {number}", "Description", "Работа", "2024-12-31", "Низкий")
+        self.assertEqual(len(self._journal_lines()), 2)
+
+        time.sleep(0.3)
+        self.assertEqual(len(self._journal_lines()), 3)
+
+        manager.get_task_by_id(3).mark_as_done()
+        manager.save_tasks()
+        manager.close()
+        self.assertEqual(len(self._journal_lines()), 4)
+        self.assertEqual(TaskManager(file_name=self.file_name).get_task_by_id(3).status, "Выполнена")
+
+
+class TestDirtyTracking(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем менеджер задач с двумя сохраненными задачами."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        self.manager = TaskManager(file_name=self.file_name)
+        self.manager.add_task("Отчет", "Description", "Работа", "2024-12-01", "Высокий")
+        self.manager.add_task("Покупки", "Description", "Личное", "2024-12-05", "Средний")
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def _sets(self):
+        """Получить множества добавленных, измененных и удаленных ID."""
+        unsaved = self.manager.unsaved
+        return unsaved.added, unsaved.changed, unsaved.deleted
+
+    def test_unsaved_ids(self):
+        """Тест на учет добавленных, измененных и удаленных ID с последнего сохранения."""
+        self.assertFalse(self.manager.has_unsaved_changes())
+        with self.manager.batch():
+            self.manager.get_task_by_id(1).edit(title="План")
+            self.manager.tasks.remove(self.manager.get_task_by_id(2))
+            self.manager.add_task("Task 3", "Description", "Работа", "2024-12-31", "Низкий")
+            self.manager.add_task("Task 4", "Description", "Работа", "2024-12-31", "Низкий")
+            self.manager.get_task_by_id(3).mark_as_done()
+            self.manager.tasks.remove(self.manager.get_task_by_id(4))
+            self.assertEqual(self._sets(), ({3}, {1}, {2}))
+        self.assertFalse(self.manager.has_unsaved_changes())
+
+        with self.manager.batch():
+            self.manager.tasks.clear()
+            self.assertEqual(self._sets(), (set(), set(), {1, 3}))
+
+    def test_rollback_restores_unsaved_ids(self):
+        """Тест на восстановление множеств несохраненных ID при откате транзакции."""
+        manager = TaskManager(file_name=self.file_name, save_delay=10)
+        manager.get_task_by_id(1).mark_as_done()
+        with self.assertRaises(RuntimeError):
+            with manager.batch():
+                manager.get_task_by_id(2).edit(title="План")
+                manager.tasks.clear()
+                raise RuntimeError("Ошибка в транзакции")
+        self.assertEqual((manager.unsaved.added, manager.unsaved.changed, manager.unsaved.deleted), (set(), {1}, set()))
+        manager.close()
+        self.assertFalse(manager.has_unsaved_changes())
+
+    def test_redundant_saves_are_skipped(self):
+        """Тест на пропуск записи, если задачи не менялись или получили прежние значения."""
+        storage = JsonStorage(self.file_name)
+        manager = TaskManager(file_name=self.file_name, storage=storage)
+        manager.add_task("Отчет", "Description", "Работа", "2024-12-01", "Высокий")
+        manager.get_task_by_id(1).mark_as_done()
+        manager.save_tasks()
+        fingerprint = storage.fingerprint()
+        time.sleep(0.01)
+
+        manager.get_task_by_id(1).mark_as_done()
+        manager.get_task_by_id(1).edit(title="Отчет", category="Работа")
+        manager.save_tasks()
+        with manager.batch():
+            pass
+        self.assertEqual(storage.fingerprint(), fingerprint)
+
+    def test_journal_writes_each_task_once(self):
+        """Тест на запись в журнал только итоговых значений задач, измененных несколько раз."""
+        with self.manager.batch():
+            for number in range(10):
+                self.manager.get_task_by_id(1).edit(title=f"Отчет {number}")
+            self.manager.get_task_by_id(1).mark_as_done()
+            task = self.manager.add_task("Task 3", "Description", "Работа", "2024-12-31", "Низкий")
+            task.edit(description="Описание")
+            self.manager.add_task("Task 4", "Description", "Работа", "2024-12-31", "Низкий")
+            self.manager.tasks.remove(self.manager.get_task_by_id(4))
+
+        with open(f"{self.file_name}.journal", encoding="utf-8") as file:
+            record = json.loads(file.readlines()[-1])
+        self.assertEqual(record["records"], [
+            {"op": "edit", "id": 1, "fields": {"title": "Отчет 9", "status": "Выполнена"}},
+            {"op": "add", "task": task.to_dict()},
+        ])
+        reloaded = TaskManager(file_name=self.file_name)
+        self.assertEqual([task.to_dict() for task in reloaded.tasks], [task.to_dict() for task in self.manager.tasks])
+
+    def test_coalesce_matches_replay(self):
+        """Тест на совпадение результата объединенных и исходных записей на случайных последовательностях."""
+        rng = random.Random(7)
+        for _ in range(200):
+            records = []
+            for _ in range(30):
+                task_id = rng.randint(1, 6)
+                match rng.choice(("add", "edit", "edit", "mark_done", "delete", "clear")):
+                    case "add":
+                        records.append({"op": "add", "task": {"id": task_id, "title": "Task", "status": ""}})
+                    case "edit":
+                        records.append({"op": "edit", "id": task_id, "fields": {"title": str(rng.random())}})
+                    case "mark_done":
+                        records.append({"op": "mark_done", "id": task_id})
+                    case "delete":
+                        records.append({"op": "delete", "id": task_id})
+                    case "clear":
+                        if rng.random() < 0.2:
+                            records.append({"op": "clear"})
+            initial = {task_id: {"id": task_id, "title": "Saved", "status": ""} for task_id in (1, 2, 3)}
+            expected, actual = json.loads(json.dumps(initial)), json.loads(json.dumps(initial))
+            replay(expected, records)
+            merged = coalesce(records)
+            replay(actual, merged)
+            self.assertEqual(actual, expected)
+            ids = [record["task"]["id"] if record["op"] == "add" else record["id"]
+                   for record in merged if record["op"] in ("add", "edit")]
+            self.assertEqual(len(ids), len(set(ids)))
+
+
+_JSON_WRITER = """
+import sys
+from task_manager import Task, TaskManager
+from task_storage import JsonStorage
+
+name = sys.argv[1]
+manager = TaskManager(file_name=name, storage=JsonStorage(name, fsync="never"))
+version = int(manager.tasks[0].title) if len(manager.tasks) else 0
+while True:
+    version += 1
+    with manager.batch():
+        manager.tasks.clear()
+        for task_id in range(1, 2001):
+            manager.tasks.append(Task(task_id, str(version), "Description", "Работа", "2024-12-31", "Низкий"))
+    print(version, flush=True)
+"""
+
+_JOURNAL_WRITER = """
+import sys
+from task_manager import TaskManager
+from task_storage import JournalStorage
+
+name = sys.argv[1]
+manager = TaskManager(file_name=name, storage=JournalStorage(name, compact_every=500, fsync="never"))
+while True:
+    with manager.batch():
+        for _ in range(50):
+            manager.add_task("Task", "Description", "Работа", "2024-12-31", "Низкий")
+    print(len(manager.tasks), flush=True)
+"""
+
+
+class TestCrashSafety(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем временный каталог для файлов задач."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+        self.rng = random.Random(0)
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def _kill_mid_write(self, script):
+        """Запустить процесс, пишущий задачи, убить его в случайный момент и вернуть последнюю выведенную строку."""
+        process = subprocess.Popen(
+            [sys.executable, "-c", script, self.file_name], stdout=subprocess.PIPE, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        last = process.stdout.readline()
+        time.sleep(self.rng.uniform(0.02, 0.3))
+        process.kill()
+        output, _ = process.communicate()
+        lines = output.split()
+        return int(lines[-1] if lines else last)
+
+    def test_snapshot_survives_kill(self):
+        """Тест на то, что после аварийного завершения загружается последний целиком записанный файл."""
+        for _ in range(3):
+            committed = self._kill_mid_write(_JSON_WRITER)
+            tasks = TaskManager(file_name=self.file_name, storage=JsonStorage(self.file_name)).tasks
+
+            self.assertEqual(len(tasks), 2000)
+            self.assertEqual(len({task.title for task in tasks}), 1)
+            self.assertIn(int(tasks[0].title), (committed, committed + 1))
+
+    def test_journal_survives_kill(self):
+        """Тест на то, что после аварийного завершения журнал содержит только целые транзакции."""
+        for _ in range(3):
+            committed = self._kill_mid_write(_JOURNAL_WRITER)
+            manager = TaskManager(file_name=self.file_name, storage=JournalStorage(self.file_name, compact_every=500))
+            count = len(manager.tasks)
+
+            self.assertIn(count, (committed, committed + 50))
+            self.assertEqual([task.id for task in manager.tasks], list(range(1, count + 1)))
+            manager.add_task("Task", "Description", "Работа", "2024-12-31", "Низкий")
+            manager.storage.close()
+            self.assertEqual(len(TaskManager(file_name=self.file_name).tasks), count + 1)
+
+
+_CONCURRENT_WRITER = """
+import sys
+from task_manager import TaskManager
+
+manager = TaskManager(file_name=sys.argv[1])
+for number in range(25):
+    task = manager.add_task(f"Task {number}", "Description", "Работа", "2024-12-31", "Низкий")
+    task.edit(description=f"Edited {task.id}")
+    manager.save_tasks()
+manager.close()
+"""
+
+
+class TestConcurrentAccess(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем временный каталог для файлов задач."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "tasks.json")
+
+    def tearDown(self):
+        """Удаление временного каталога."""
+        self.tmp_dir.cleanup()
+
+    def test_journal_writers_see_each_other(self):
+        """Тест на то, что менеджеры одного журнала не теряют и не дублируют изменения друг друга."""
+        first = TaskManager(file_name=self.file_name)
+        second = TaskManager(file_name=self.file_name)
+        first.add_task("Task 1", "Description", "Работа", "2024-12-31", "Низкий")
+        second.add_task("Task 2", "Description", "Личное", "2024-12-31", "Низкий")
+        second.get_task_by_id(1).mark_as_done()
+        second.save_tasks()
+
+        self.assertTrue(first.refresh())
+        self.assertEqual([task.id for task in first.filter_tasks(status="Выполнена")], [1])
+        self.assertEqual([task.title for task in first.tasks], ["Task 1", "Task 2"])
+        self.assertEqual(len(TaskManager(file_name=self.file_name).tasks), 2)
+
+    def test_json_writers_merge(self):
+        """Тест на слияние изменений, если другой процесс перезаписал файл целиком."""
+        first = TaskManager(file_name=self.file_name, storage=JsonStorage(self.file_name))
+        first.add_task("Task 1", "Description", "Работа", "2024-12-31", "Низкий")
+        second = TaskManager(file_name=self.file_name, storage=JsonStorage(self.file_name))
+        task = first.get_task_by_id(1)
+
+        second.get_task_by_id(1).edit(title="Updated Task")
+        second.save_tasks()
+        first.add_task("Task 2", "Description", "Личное", "2024-12-31", "Низкий")
+
+        self.assertIs(first.get_task_by_id(1), task)
+        self.assertEqual(task.title, "Updated Task")
+        reloaded = TaskManager(file_name=self.file_name, storage=JsonStorage(self.file_name))
+        self.assertEqual([task.title for task in reloaded.tasks], ["Updated Task", "Task 2"])
+
+    def test_unsaved_task_gets_new_id(self):
+        """Тест на перенумерацию несохраненной задачи, ID которой занял другой процесс."""
+        first = TaskManager(file_name=self.file_name, save_delay=60)
+        second = TaskManager(file_name=self.file_name)
+        task = first.add_task("Task 1", "Description", "Работа", "2024-12-31", "Низкий")
+        second.add_task("Task 2", "Description", "Личное", "2024-12-31", "Низкий")
+        task.edit(description="Edited")
+        first.close()
+
+        self.assertEqual(task.id, 2)
+        reloaded = TaskManager(file_name=self.file_name)
+        self.assertEqual([(task.id, task.description) for task in reloaded.tasks], [(1, "Description"), (2, "Edited")])
+
+    def test_shared_read_applies_changes_incrementally(self):
+        """Тест на режим совместного чтения: изменения других процессов применяются без перезагрузки."""
+        writer = TaskManager(file_name=self.file_name)
+        writer.add_task("Task 1", "Description", "Работа", "2024-12-31", "Низкий")
+        reader = TaskManager(file_name=self.file_name, shared_read=True)
+        task = reader.get_task_by_id(1)
+
+        writer.get_task_by_id(1).edit(category="Личное")
+        writer.save_tasks()
+        writer.add_task("Отчет", "Description", "Работа", "2024-12-31", "Низкий")
+
+        self.assertEqual(reader.filter_tasks(category="Личное"), [task])
+        self.assertEqual([task.id for task in reader.search_tasks("отчет")], [2])
+        self.assertEqual(reader.next_id, 3)
+
+    def test_concurrent_processes(self):
+        """Тест на одновременную запись из нескольких процессов."""
+        processes = [
+            subprocess.Popen(
+                [sys.executable, "-c", _CONCURRENT_WRITER, self.file_name],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+            )
+            for _ in range(4)
+        ]
+        for process in processes:
+            self.assertEqual(process.wait(), 0)
+
+        tasks = TaskManager(file_name=self.file_name).tasks
+        self.assertEqual(sorted(task.id for task in tasks), list(range(1, 101)))
+        self.assertTrue(all(task.description == f"Edited {task.id}" for task in tasks))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+import bisect
+from array import array
+from task_manager import Task
+
+
+class TaskStore:
+    """
+    Колоночное хранилище задач для больших объемов данных только для чтения или редких изменений.
+
+    Каждое поле хранится отдельным столбцом: ID — в массиве array, название и описание — в списках
+    строк, а категория, срок, приоритет и статус кодируются словарем значений и хранятся как
+    небольшие целые числа. Объекты Task создаются только при обращении к задаче; изменения,
+    сделанные через такой объект (edit, mark_as_done), записываются обратно в столбцы.
+
+    ID задач должны добавляться по возрастанию: поиск по ID выполняется двоичным поиском.
+
+    Хранилище не подключено к TaskManager и не сохраняется в файл: оно используется для сравнения
+    расхода памяти в task_benchmark.py (команда memory).
+
+    Атрибуты:
+        Ids (array): Столбец ID задач.
+        Columns (dict): Столбцы названия и описания.
+        Codes (dict): Столбцы кодов категории, срока, приоритета и статуса.
+        Dictionaries (dict): Значения, соответствующие кодам, для каждого кодируемого поля.
+    """
+
+    text_fields = ("title", "description")
+    coded_fields = ("category", "due_date", "priority", "status")
+
+    def __init__(self):
+        """
+        Инициализация пустого хранилища.
+        """
+        self.ids = array("q")
+        self.alive = bytearray()
+        self.columns = {field: [] for field in self.text_fields}
+        self.codes = {field: array("I") for field in self.coded_fields}
+        self.dictionaries = {field: [] for field in self.coded_fields}
+        self._code_of = {field: {} for field in self.coded_fields}
+        self._removed = 0
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Построить хранилище по словарям задач в формате tasks.json.
+
+        :param records: Итерируемый набор словарей задач.
+        :return: Экземпляр TaskStore.
+        """
+        store = cls()
+        for record in sorted(records, key=lambda data: data["id"]):
+            store.append(record)
+        return store
+
+    def __len__(self):
+        return len(self.ids) - self._removed
+
+    def __iter__(self):
+        for position in range(len(self.ids)):
+            if self.alive[position]:
+                yield self._view(position)
+
+    def _encode(self, field, value):
+        """
+        Получить код значения кодируемого поля, добавив значение в словарь при необходимости.
+
+        :param field: Имя поля.
+        :param value: Значение поля.
+        :return: Код значения.
+        """
+        code = self._code_of[field].get(value)
+        if code is None:
+            code = self._code_of[field][value] = len(self.dictionaries[field])
+            self.dictionaries[field].append(value)
+        return code
+
+    def _position(self, task_id):
+        """
+        Найти позицию задачи в столбцах.
+
+        :param task_id: Идентификатор задачи.
+        :return: Позиция или None, если задачи нет.
+        """
+        position = bisect.bisect_left(self.ids, task_id)
+        if position < len(self.ids) and self.ids[position] == task_id and self.alive[position]:
+            return position
+        return None
+
+    def _view(self, position):
+        """
+        Создать объект Task для задачи в данной позиции.
+
+        :param position: Позиция задачи в столбцах.
+        :return: Задача, изменения которой записываются обратно в хранилище.
+        """
+        values = {field: self.columns[field][position] for field in self.text_fields}
+        for field in self.coded_fields:
+            values[field] = self.dictionaries[field][self.codes[field][position]]
+        task = Task.from_stored(self.ids[position], **values)
+        task._listener = self._view_changed
+        return task
+
+    def _view_changed(self, task, op, old):
+        """
+        Записать изменения объекта Task обратно в столбцы.
+
+        :param task: Измененная задача.
+        :param op: Тип изменения.
+        :param old: Словарь прежних значений измененных полей.
+        """
+        position = self._position(task.id)
+        if position is None:
+            return
+        data = task.to_dict()
+        for field in old:
+            value = data[field]
+            if field in self.codes:
+                self.codes[field][position] = self._encode(field, value)
+            else:
+                self.columns[field][position] = value
+
+    def append(self, record):
+        """
+        Добавить задачу.
+
+        :param record: Словарь задачи или объект Task.
+        :raises ValueError: Если ID задачи не больше ID последней добавленной задачи.
+        """
+        if isinstance(record, Task):
+            record = record.to_dict()
+        if self.ids and record["id"] <= self.ids[-1]:
+            raise ValueError(f"ID задач должны возрастать: {record['id']} после {self.ids[-1]}.")
+        self.ids.append(record["id"])
+        self.alive.append(1)
+        for field in self.text_fields:
+            self.columns[field].append(record[field])
+        for field in self.coded_fields:
+            self.codes[field].append(self._encode(field, record[field]))
+
+    def get(self, task_id):
+        """
+        Получить задачу по ID.
+
+        :param task_id: Идентификатор задачи.
+        :return: Задача или None, если не найдена.
+        """
+        position = self._position(task_id)
+        return None if position is None else self._view(position)
+
+    def remove(self, task_id):
+        """
+        Удалить задачу по ID. Место в столбцах освобождается при compact().
+
+        :param task_id: Идентификатор задачи.
+        :raises KeyError: Если задача не найдена.
+        """
+        position = self._position(task_id)
+        if position is None:
+            raise KeyError(task_id)
+        self.alive[position] = 0
+        self.columns["title"][position] = self.columns["description"][position] = ""
+        self._removed += 1
+
+    def compact(self):
+        """
+        Освободить место, занятое удаленными задачами.
+        """
+        keep = [position for position in range(len(self.ids)) if self.alive[position]]
+        self.ids = array("q", (self.ids[position] for position in keep))
+        self.alive = bytearray(b"\x01" * len(keep))
+        for field in self.text_fields:
+            self.columns[field] = [self.columns[field][position] for position in keep]
+        for field in self.coded_fields:
+            self.codes[field] = array("I", (self.codes[field][position] for position in keep))
+        self._removed = 0
+
+    def filter(self, **criteria):
+        """
+        Найти задачи по точному совпадению кодируемых полей без создания объектов для остальных задач.
+
+        :param criteria: Значения полей category, due_date, priority и status.
+        :return: Список задач.
+        """
+        wanted = []
+        for field, value in criteria.items():
+            code = self._code_of[field].get(value)
+            if code is None:
+                return []
+            wanted.append((self.codes[field], code))
+        return [
+            self._view(position)
+            for position in range(len(self.ids))
+            if self.alive[position] and all(column[position] == code for column, code in wanted)
+        ]
+
+    def to_records(self):
+        """
+        Получить словари задач в формате tasks.json.
+
+        :return: Генератор словарей задач.
+        """
+        for task in self:
+            yield task.to_dict()
@@ -0,0 +1,45 @@
+import unittest
+from task_manager import Task
+from task_store import TaskStore
+
+
+class TestTaskStore(unittest.TestCase):
+
+    def setUp(self):
+        """Подготовка к тестам: создаем колоночное хранилище из трех задач."""
+        self.records = [
+            Task(1, "Task 1", "Description", "Работа", "2024-12-01", "Высокий").to_dict(),
+            Task(2, "Task 2", "Description", "Личное", "2024-12-05", "Средний").to_dict(),
+            Task(3, "Task 3", "Description", "Работа", "2024-12-10", "Низкий").to_dict(),
+        ]
+        self.store = TaskStore.from_records(reversed(self.records))
+
+    def test_round_trip(self):
+        """Тест на то, что хранилище возвращает те же задачи в порядке ID."""
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(list(self.store.to_records()), self.records)
+        self.assertEqual(self.store.dictionaries["category"], ["Работа", "Личное"])
+
+    def test_views_write_back(self):
+        """Тест на запись изменений объекта Task обратно в столбцы."""
+        self.store.get(2).edit(title="Updated Task", category="Работа")
+        self.store.get(3).mark_as_done()
+
+        self.assertEqual(self.store.get(2).title, "Updated Task")
+        self.assertEqual([task.id for task in self.store.filter(category="Работа")], [1, 2, 3])
+        self.assertEqual([task.id for task in self.store.filter(category="Работа", status="Выполнена")], [3])
+
+    def test_remove_and_compact(self):
+        """Тест на удаление задач и освобождение места."""
+        self.store.remove(2)
+        self.assertIsNone(self.store.get(2))
+        self.assertEqual(len(self.store), 2)
+
+        self.store.compact()
+        self.assertEqual([task.id for task in self.store], [1, 3])
+        with self.assertRaises(ValueError):
+            self.store.append(self.records[0])
+
+
+if __name__ == "__main__":
+    unittest.main()